@@ -28,11 +28,17 @@ from datetime import datetime, timedelta, timezone
 from .config import config
 
 # Import database and models
-from .models import db, User
+from .models import db
+from .utils.current_user import UserProfile, get_current_profile
+from .utils.data_stamp import data_validators, is_revalidated_path
+from .utils.goal_sweeper import start_sweeper_thread
 
 # Import routes
 from .routes import register_blueprints
 
+# Import CLI commands
+from .commands import register_commands
+
 
 def create_app(config_name: Optional[str] = None) -> Flask:
     """Application factory function.
@@ -82,6 +88,12 @@ def create_app(config_name: Optional[str] = None) -> Flask:
     # Register blueprints (routes)
     register_blueprints(app)
 
+    # Register maintenance CLI commands
+    register_commands(app)
+
+    # Expire overdue goals in the background when GOAL_SWEEP_INTERVAL is set
+    start_sweeper_thread(app)
+
     # --- Logging Setup ---
     if not app.debug and not app.testing:
         # In production, log to a file
@@ -117,12 +129,29 @@ def create_app(config_name: Optional[str] = None) -> Flask:
         # Set user context for templates
         g.user = session.get("user_id")
 
+    @app.before_request
+    def revalidate_user_data():
+        """Answer conditional GETs for the user's unchanged pages with a 304"""
+        from flask import request
+
+        g.data_etag = None
+        if (
+            request.method not in ("GET", "HEAD")
+            or "user_id" not in session
+            or "_flashes" in session  # Pending messages need a fresh render
+            or not is_revalidated_path(request.path)
+        ):
+            return None
+
+        today = datetime.now(timezone.utc).date()
+        g.data_etag, g.data_last_modified = data_validators(session["user_id"], today)
+        if request.if_none_match.contains_weak(g.data_etag):
+            return app.response_class(status=304)
+        return None
+
     @app.context_processor
-    def inject_user() -> Dict[str, Optional["User"]]:
-        user = None
-        if "user_id" in session:
-            user = User.query.get(session["user_id"])
-        return dict(current_user=user)
+    def inject_user() -> Dict[str, Optional[UserProfile]]:
+        return dict(current_user=get_current_profile())
 
     @app.context_processor
     def inject_server_time() -> Dict[str, str]:
@@ -137,9 +166,17 @@ def create_app(config_name: Optional[str] = None) -> Flask:
     def add_caching_headers(response):
         """Add caching headers for static assets and performance optimization"""
         from flask import request
+
+        # Personal pages and API responses are revalidated against the user's
+        # data version on every use
+        if g.get("data_etag") and response.status_code in (200, 304):
+            response.set_etag(g.data_etag, weak=True)
+            response.last_modified = g.data_last_modified
+            response.cache_control.private = True
+            response.cache_control.no_cache = True
         
         # Only add caching headers for successful responses
-        if response.status_code == 200:
+        elif response.status_code == 200:
             # Cache static assets for 1 year
             if (request.path.startswith('/static/') or 
                 request.path.endswith(('.css', '.js', '.png', '.jpg', '.jpeg', '.gif', '.ico', '.svg', '.woff', '.woff2', '.ttf'))):
@@ -149,10 +186,14 @@ def create_app(config_name: Optional[str] = None) -> Flask:
                 response.add_etag()
                 response.make_conditional(request)
             
-            # Cache HTML pages for a short time
+            # HTML embeds the session's CSRF token, so it is never cached by
+            # shared caches; signed-in pages are revalidated on every use
             elif response.content_type and response.content_type.startswith('text/html'):
-                response.cache_control.max_age = 300  # 5 minutes
-                response.cache_control.public = True
+                response.cache_control.private = True
+                if "user_id" in session:
+                    response.cache_control.no_cache = True
+                else:
+                    response.cache_control.max_age = 300  # 5 minutes
         
         return response
 
@@ -0,0 +1,224 @@
+"""
+Maintenance commands for the Flask CLI.
+
+Run with ``flask --app 'app:create_app()' <command>``.
+"""
+
+from typing import List, Optional
+import click
+from flask import Flask
+from .models import db, User
+
+
+def _selected_user_ids(user_id: Optional[int]) -> List[int]:
+    """Return the single requested user, or every user ordered by ID."""
+    if user_id is not None:
+        return [user_id]
+    return [row.id for row in db.session.query(User.id).order_by(User.id)]
+
+
+@click.command("rebuild-streaks")
+@click.option("--user-id", type=int, default=None, help="Only rebuild this user.")
+def rebuild_streaks_command(user_id: Optional[int]) -> None:
+    """Rebuild the stored streak state from diary history."""
+    from .utils.streak_engine import rebuild_streak_state
+
+    user_ids = _selected_user_ids(user_id)
+    for uid in user_ids:
+        state = rebuild_streak_state(uid)
+        db.session.commit()
+        click.echo(
+            f"User {uid}: current run {state.current_length}, "
+            f"longest {state.longest}"
+        )
+
+    click.echo(f"Rebuilt streak state for {len(user_ids)} user(s).")
+
+
+@click.command("rebuild-word-index")
+@click.option("--user-id", type=int, default=None, help="Only rebuild this user.")
+def rebuild_word_index_command(user_id: Optional[int]) -> None:
+    """Backfill the word cloud index from existing diary entries."""
+    from .utils.word_index import rebuild_word_index
+
+    for uid in _selected_user_ids(user_id):
+        word_count = rebuild_word_index(uid)
+        db.session.commit()
+        click.echo(f"User {uid}: indexed {word_count} distinct words")
+
+    click.echo("Word index rebuild complete.")
+
+
+@click.command("rebuild-daily-stats")
+@click.option("--user-id", type=int, default=None, help="Only rebuild this user.")
+@click.option("--min-user-id", type=int, default=None, help="First user ID.")
+@click.option("--max-user-id", type=int, default=None, help="Last user ID.")
+@click.option("--dry-run", is_flag=True, help="Show the differences only.")
+def rebuild_daily_stats_command(
+    user_id: Optional[int],
+    min_user_id: Optional[int],
+    max_user_id: Optional[int],
+    dry_run: bool,
+) -> None:
+    """Rebuild DailyStats points from the PointsLog in bulk."""
+    from .utils.stats_rebuild import bulk_rebuild_daily_stats
+
+    if user_id is not None:
+        min_user_id = max_user_id = user_id
+
+    def report_progress(done: int, total: int) -> None:
+        click.echo(f"Checked {done}/{total} user(s)")
+
+    result = bulk_rebuild_daily_stats(
+        min_user_id=min_user_id,
+        max_user_id=max_user_id,
+        dry_run=dry_run,
+        progress=report_progress,
+    )
+
+    for change in result.changes:
+        old = "missing" if change.old_points is None else change.old_points
+        click.echo(
+            f"User {change.user_id} {change.date.isoformat()}: "
+            f"{old} -> {change.new_points}"
+        )
+    omitted = result.inserted + result.updated - len(result.changes)
+    if omitted > 0:
+        click.echo(f"... and {omitted} more change(s)")
+
+    verb = "Would insert" if dry_run else "Inserted"
+    click.echo(
+        f"{verb} {result.inserted}, updated {result.updated}, "
+        f"{result.unchanged} unchanged day(s) for {result.users_changed} "
+        f"of {result.users_scanned} user(s)."
+    )
+
+
+@click.command("rebuild-rollups")
+@click.option("--user-id", type=int, default=None, help="Only rebuild this user.")
+def rebuild_rollups_command(user_id: Optional[int]) -> None:
+    """Rebuild the weekly and monthly rollups from daily stats and entries."""
+    from .utils.rollups import rebuild_rollups
+
+    user_ids = _selected_user_ids(user_id)
+    for uid in user_ids:
+        rebuild_rollups(uid)
+        db.session.commit()
+
+    click.echo(f"Rebuilt rollups for {len(user_ids)} user(s).")
+
+
+@click.command("check-rollups")
+@click.option("--user-id", type=int, default=None, help="Only check this user.")
+@click.option("--chunk-size", type=int, default=200, help="Users per query.")
+def check_rollups_command(user_id: Optional[int], chunk_size: int) -> None:
+    """Compare the stored rollups with daily stats and diary entries."""
+    from .utils.rollups import check_rollups
+
+    user_ids = _selected_user_ids(user_id)
+    mismatches = []
+    for start in range(0, len(user_ids), chunk_size):
+        mismatches.extend(check_rollups(user_ids[start : start + chunk_size]))
+
+    for m in mismatches:
+        click.echo(
+            f"User {m.user_id} {m.period} {m.period_start.isoformat()} {m.column}: "
+            f"stored {m.stored}, expected {m.expected}"
+        )
+    if mismatches:
+        users = len({m.user_id for m in mismatches})
+        raise click.ClickException(
+            f"{len(mismatches)} rollup value(s) differ for {users} user(s); "
+            "run 'flask rebuild-rollups' to fix them."
+        )
+    click.echo(f"Rollups are consistent for {len(user_ids)} user(s).")
+
+
+@click.command("reconcile-point-totals")
+@click.option("--user-id", type=int, default=None, help="Only check this user.")
+@click.option("--chunk-size", type=int, default=200, help="Users per query.")
+@click.option("--dry-run", is_flag=True, help="Show the differences only.")
+def reconcile_point_totals_command(
+    user_id: Optional[int], chunk_size: int, dry_run: bool
+) -> None:
+    """Compare the stored point totals with daily stats and fix any that differ."""
+    from .utils.point_totals import reconcile_point_totals
+
+    user_ids = _selected_user_ids(user_id)
+    mismatches = []
+    for start in range(0, len(user_ids), chunk_size):
+        chunk = user_ids[start : start + chunk_size]
+        mismatches.extend(reconcile_point_totals(chunk, dry_run=dry_run))
+
+    for m in mismatches:
+        click.echo(f"User {m.user_id}: stored {m.stored}, expected {m.expected}")
+    if mismatches:
+        verb = "Would fix" if dry_run else "Fixed"
+        click.echo(f"{verb} the point totals of {len(mismatches)} user(s).")
+    else:
+        click.echo(f"Point totals are consistent for {len(user_ids)} user(s).")
+
+
+@click.command("points-worker")
+@click.option("--once", is_flag=True, help="Apply pending events once and exit.")
+@click.option("--interval", type=float, default=2.0, help="Idle poll interval (s).")
+@click.option("--batch-size", type=int, default=100, help="Events per pass.")
+def points_worker_command(once: bool, interval: float, batch_size: int) -> None:
+    """Apply queued point awards from the points outbox."""
+    from .utils.points_outbox import process_pending_events, run_worker
+
+    if once:
+        applied = process_pending_events(batch_size)
+        click.echo(f"Applied {applied} points event(s).")
+        return
+
+    click.echo("Points worker started.")
+    run_worker(poll_interval=interval, batch_size=batch_size)
+
+
+@click.command("export-worker")
+@click.option("--once", is_flag=True, help="Build pending exports once and exit.")
+@click.option("--interval", type=float, default=5.0, help="Idle poll interval (s).")
+def export_worker_command(once: bool, interval: float) -> None:
+    """Build queued data export archives."""
+    from .utils.export_jobs import (
+        cleanup_expired_exports,
+        process_pending_exports,
+        run_export_worker,
+    )
+
+    if once:
+        built = process_pending_exports()
+        removed = cleanup_expired_exports()
+        click.echo(f"Built {built} export(s), removed {removed} expired export(s).")
+        return
+
+    click.echo("Export worker started.")
+    run_export_worker(poll_interval=interval)
+
+
+@click.command("sweep-goals")
+@click.option("--grace-days", type=int, default=None, help="Days overdue goals stay.")
+@click.option("--batch-size", type=int, default=500, help="Goals per UPDATE.")
+def sweep_goals_command(grace_days: Optional[int], batch_size: int) -> None:
+    """Mark goals left active after their grace period as not completed."""
+    from .utils.goal_sweeper import sweep_overdue_goals
+
+    result = sweep_overdue_goals(grace_days=grace_days, batch_size=batch_size)
+    click.echo(
+        f"Expired {result.goals_expired} goal(s) for {result.users} user(s) "
+        f"in {result.batches} batch(es), awarding {result.points_awarded} point(s)."
+    )
+
+
+def register_commands(app: Flask) -> None:
+    """Register all CLI commands with the Flask app"""
+    app.cli.add_command(rebuild_streaks_command)
+    app.cli.add_command(rebuild_word_index_command)
+    app.cli.add_command(rebuild_daily_stats_command)
+    app.cli.add_command(rebuild_rollups_command)
+    app.cli.add_command(check_rollups_command)
+    app.cli.add_command(reconcile_point_totals_command)
+    app.cli.add_command(points_worker_command)
+    app.cli.add_command(export_worker_command)
+    app.cli.add_command(sweep_goals_command)
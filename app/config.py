@@ -33,6 +33,46 @@ class Config:
     GOOGLE_ANALYTICS_ID = os.environ.get("GOOGLE_ANALYTICS_ID")
     GOOGLE_SEARCH_CONSOLE_ID = os.environ.get("GOOGLE_SEARCH_CONSOLE_ID")
     
+    # Cache the logged-in user's name and email across requests (per process)
+    USER_PROFILE_CACHE = os.environ.get("USER_PROFILE_CACHE", "false").lower() == "true"
+    USER_PROFILE_CACHE_TIMEOUT = int(
+        os.environ.get("USER_PROFILE_CACHE_TIMEOUT", "300")
+    )
+
+    # Apply queued point awards at the end of the request instead of in the
+    # points worker process
+    POINTS_OUTBOX_INLINE = (
+        os.environ.get("POINTS_OUTBOX_INLINE", "false").lower() == "true"
+    )
+
+    # Background data exports: archives are written to EXPORT_DIR (defaults to
+    # <instance>/exports) and deleted after EXPORT_RETENTION_HOURS. Jobs still
+    # running after EXPORT_JOB_TIMEOUT_MINUTES are assumed dead and failed
+    EXPORT_DIR = os.environ.get("EXPORT_DIR")
+    EXPORT_RETENTION_HOURS = int(os.environ.get("EXPORT_RETENTION_HOURS", "24"))
+    EXPORT_JOB_TIMEOUT_MINUTES = int(
+        os.environ.get("EXPORT_JOB_TIMEOUT_MINUTES", "30")
+    )
+    EXPORT_JOBS_INLINE = (
+        os.environ.get("EXPORT_JOBS_INLINE", "false").lower() == "true"
+    )
+
+    # Overdue goals stay active for review GOAL_EXPIRY_GRACE_DAYS after their
+    # end date, then ``flask sweep-goals`` marks them as not completed and
+    # awards GOAL_EXPIRY_POINTS each. GOAL_SWEEP_INTERVAL (seconds) also runs
+    # the sweep in a thread of the web process, for single-node deployments.
+    GOAL_EXPIRY_GRACE_DAYS = int(os.environ.get("GOAL_EXPIRY_GRACE_DAYS", "7"))
+    GOAL_EXPIRY_POINTS = int(os.environ.get("GOAL_EXPIRY_POINTS", "0"))
+    GOAL_SWEEP_INTERVAL = int(os.environ.get("GOAL_SWEEP_INTERVAL", "0"))
+
+    # Diary search: "auto" picks PostgreSQL full-text search or SQLite FTS5
+    # based on the database, "like" forces plain substring matching
+    SEARCH_BACKEND = os.environ.get("SEARCH_BACKEND", "auto")
+
+    # Part of every personal page's ETag, so pages cached before a deploy are
+    # refetched after it (defaults to a fingerprint of templates and assets)
+    RELEASE_ID = os.environ.get("RELEASE_ID")
+
     # URL generation
     PREFERRED_URL_SCHEME = 'https'
 
@@ -63,6 +103,8 @@ class DevelopmentConfig(Config):
     """Development environment configuration"""
 
     DEBUG = True
+    POINTS_OUTBOX_INLINE = True
+    EXPORT_JOBS_INLINE = True
     # You might want a separate dev database
     SQLALCHEMY_DATABASE_URI = os.environ.get("DEV_DATABASE_URL", "sqlite:///users.db")
 
@@ -82,6 +124,8 @@ class TestingConfig(Config):
     DEBUG = True
     # Use in-memory database for tests
     SQLALCHEMY_DATABASE_URI = "sqlite:///:memory:"
+    # Apply point awards within the request, no worker process in tests
+    POINTS_OUTBOX_INLINE = True
     # Disable CSRF for easier testing
     WTF_CSRF_ENABLED = False
 
@@ -3,6 +3,32 @@ from .user import User
 from .diary_entry import DiaryEntry
 from .daily_stats import DailyStats
 from .goal import Goal
+from .goal_stats import GoalStats
 from .points_log import PointsLog
+from .points_outbox import PointsOutboxEvent
+from .export_job import ExportJob
+from .maintenance_checkpoint import MaintenanceCheckpoint
+from .stats_rollup import StatsRollup
+from .user_data_stamp import UserDataStamp
+from .user_streak import UserStreak
+from .user_totals import UserTotals
+from .word_frequency import WordFrequency
+from . import search_index
 
-__all__ = ["db", "User", "DiaryEntry", "DailyStats", "Goal", "PointsLog"]
+__all__ = [
+    "db",
+    "User",
+    "DiaryEntry",
+    "DailyStats",
+    "Goal",
+    "GoalStats",
+    "PointsLog",
+    "PointsOutboxEvent",
+    "ExportJob",
+    "MaintenanceCheckpoint",
+    "StatsRollup",
+    "UserDataStamp",
+    "UserStreak",
+    "UserTotals",
+    "WordFrequency",
+]
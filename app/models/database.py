@@ -1,3 +1,41 @@
 from flask_sqlalchemy import SQLAlchemy
 
 db = SQLAlchemy()
+
+
+def get_executor(connection=None):
+    """Return the connection to run statements on, or the session.
+
+    Flush-time event listeners pass the flush's connection, so their writes
+    join the transaction being flushed; everyone else uses the session.
+    """
+    return connection if connection is not None else db.session
+
+
+def get_dialect(connection=None):
+    """Return the dialect of ``connection``, or of the session's bind."""
+    if connection is not None:
+        return connection.dialect
+    return db.session.get_bind().dialect
+
+
+def dialect_insert(dialect, table):
+    """Return an INSERT for ``table`` that supports ON CONFLICT upserts.
+
+    Both PostgreSQL and SQLite understand ``INSERT ... ON CONFLICT DO UPDATE``;
+    SQLAlchemy only exposes it through the dialect-specific constructs.
+
+    Args:
+        dialect: The dialect of the connection the statement will run on.
+        table: The table to insert into.
+
+    Returns:
+        A dialect-specific Insert with ``on_conflict_do_update`` available.
+    """
+    if dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect.name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        raise NotImplementedError(f"Upserts are not supported on {dialect.name}")
+    return insert(table)
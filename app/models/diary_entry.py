@@ -10,3 +10,8 @@ class DiaryEntry(db.Model):
     rating = db.Column(db.Integer, nullable=False)
 
     user = db.relationship("User", backref="entries")
+
+    # Same index as migration 1d01d06679e8; serves the reader's date navigation
+    __table_args__ = (
+        db.Index("idx_diary_entry_user_date", "user_id", "entry_date"),
+    )
@@ -0,0 +1,46 @@
+from datetime import datetime, timezone
+from .database import db
+import enum
+
+
+class ExportStatus(enum.Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    READY = "ready"
+    FAILED = "failed"
+
+
+class ExportJob(db.Model):
+    """A data export built in the background and downloaded as a zip archive."""
+
+    __tablename__ = "export_jobs"
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False)
+
+    status = db.Column(
+        db.String(20), nullable=False, default=ExportStatus.PENDING.value
+    )
+    file_name = db.Column(db.String(255), nullable=True)  # Inside EXPORT_DIR
+    file_size = db.Column(db.Integer, nullable=True)
+    error = db.Column(db.Text, nullable=True)
+
+    created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
+    started_at = db.Column(db.DateTime, nullable=True)
+    finished_at = db.Column(db.DateTime, nullable=True)
+
+    __table_args__ = (
+        db.Index("idx_export_jobs_user_created", "user_id", "created_at"),
+        db.Index("idx_export_jobs_status", "status"),
+    )
+
+    def __repr__(self) -> str:
+        return f"<ExportJob {self.id}: user {self.user_id} {self.status}>"
+
+    @property
+    def is_ready(self) -> bool:
+        return self.status == ExportStatus.READY.value
+
+    @property
+    def is_in_progress(self) -> bool:
+        return self.status in (ExportStatus.PENDING.value, ExportStatus.RUNNING.value)
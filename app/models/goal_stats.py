@@ -0,0 +1,87 @@
+from sqlalchemy import event, inspect
+from .database import db
+from .goal import Goal
+
+
+class GoalStats(db.Model):
+    """How many of a user's goals finished with each status, per category.
+
+    Rows are kept up to date as goals are created, completed, failed or
+    deleted, so goal statistics are read from a handful of counters instead
+    of aggregating every past goal. Only completed and failed goals are
+    counted. Category and status hold the enum names stored on goals.
+    """
+
+    __tablename__ = "goal_stats"
+
+    user_id = db.Column(db.Integer, db.ForeignKey("users.id"), primary_key=True)
+    category = db.Column(db.String(20), primary_key=True)
+    status = db.Column(db.String(10), primary_key=True)
+    count = db.Column(db.Integer, nullable=False, default=0)
+
+    def __repr__(self) -> str:
+        return f"<GoalStats {self.user_id}: {self.category} {self.status} {self.count}>"
+
+
+# Stands in for a value that was changed without being loaded first
+_UNKNOWN = object()
+
+
+def _previous(target: Goal, name: str):
+    history = inspect(target).attrs[name].history
+    if history.deleted:
+        return history.deleted[0]
+    return _UNKNOWN if history.added else getattr(target, name)
+
+
+@event.listens_for(Goal, "after_insert")
+def _count_new_goal(mapper, connection, target: Goal) -> None:
+    """Count a goal that was created already finished."""
+    from ..utils.goal_helpers import record_goal_change
+
+    record_goal_change(
+        target.user_id,
+        None,
+        (target.category, target.status),
+        connection=connection,
+    )
+
+
+@event.listens_for(Goal, "after_update")
+def _count_changed_goal(mapper, connection, target: Goal) -> None:
+    """Move a goal between counters when its status or category changes.
+
+    Values assigned on an expired goal have no recorded previous value, so
+    the user's counters are recounted instead.
+    """
+    from ..utils.goal_helpers import rebuild_goal_stats, record_goal_change
+
+    state = inspect(target)
+    if not (
+        state.attrs.status.history.has_changes()
+        or state.attrs.category.history.has_changes()
+    ):
+        return
+    old_state = (_previous(target, "category"), _previous(target, "status"))
+    if _UNKNOWN in old_state:
+        rebuild_goal_stats([target.user_id], connection=connection)
+        return
+    record_goal_change(
+        target.user_id,
+        old_state,
+        (target.category, target.status),
+        connection=connection,
+    )
+
+
+@event.listens_for(Goal, "after_delete")
+def _count_deleted_goal(mapper, connection, target: Goal) -> None:
+    """Stop counting a deleted goal."""
+    from ..utils.goal_helpers import record_goal_change
+
+    record_goal_change(
+        target.user_id,
+        (target.category, target.status),
+        None,
+        connection=connection,
+    )
@@ -0,0 +1,34 @@
+from datetime import datetime, timezone
+from .database import db
+
+
+class MaintenanceCheckpoint(db.Model):
+    """Progress of a long-running maintenance job, one row per job name.
+
+    Jobs commit the checkpoint in the same transaction as each chunk of work,
+    so after a crash they resume after the last (user_id, date) they finished.
+    """
+
+    __tablename__ = "maintenance_checkpoints"
+
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(100), nullable=False, unique=True)
+
+    # Last position committed; jobs that work per user leave last_date empty
+    last_user_id = db.Column(db.Integer, nullable=True)
+    last_date = db.Column(db.Date, nullable=True)
+    processed = db.Column(db.Integer, nullable=False, default=0)
+
+    started_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
+    updated_at = db.Column(db.DateTime, nullable=True)
+    finished_at = db.Column(db.DateTime, nullable=True)
+
+    def __repr__(self) -> str:
+        return (
+            f"<MaintenanceCheckpoint {self.name}: "
+            f"{self.last_user_id}/{self.last_date} ({self.processed})>"
+        )
+
+    @property
+    def is_finished(self) -> bool:
+        return self.finished_at is not None
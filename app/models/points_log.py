@@ -8,6 +8,7 @@ class PointsSourceType(enum.Enum):
     DIARY_ENTRY = "diary_entry"
     GOAL_COMPLETED = "goal_completed"
     GOAL_FAILED = "goal_failed"
+    GOAL_EXPIRED = "goal_expired"
     DAILY_LOGIN = "daily_login"
     STREAK_7_DAY = "streak_7_day"
     STREAK_30_DAY = "streak_30_day"
@@ -38,6 +39,14 @@ class PointsLog(db.Model):
     # Relationships
     user = db.relationship("User", backref="points_log")
 
+    # Every hot lookup filters on (user_id, date): the daily breakdown orders
+    # by created_at, the login-bonus and streak-milestone checks filter on
+    # source_type
+    __table_args__ = (
+        db.Index("idx_points_log_user_date_source", "user_id", "date", "source_type"),
+        db.Index("idx_points_log_user_date_created", "user_id", "date", "created_at"),
+    )
+
     def __repr__(self) -> str:
         return f"<PointsLog {self.user_id}: {self.points}pts from {self.source_type.value} on {self.date}>"
 
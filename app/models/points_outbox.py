@@ -0,0 +1,39 @@
+from datetime import datetime, timezone
+from .database import db
+
+
+class PointsOutboxEvent(db.Model):
+    """A pending point award, written in the same transaction as its source.
+
+    Diary and goal writes append one row here and return; the points worker
+    applies the award, the daily stats and the streak milestones later. The
+    (event_type, source_id) pair is unique, so an event can only be queued and
+    applied once.
+    """
+
+    __tablename__ = "points_outbox"
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False)
+
+    # A PointsSourceType value and the diary entry or goal ID it refers to
+    event_type = db.Column(db.String(20), nullable=False)
+    source_id = db.Column(db.Integer, nullable=False)
+    payload = db.Column(db.JSON, nullable=False, default=dict)
+
+    # Day the points are for, fixed when the event is written
+    event_date = db.Column(db.Date, nullable=False)
+    created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
+
+    # Processing state
+    processed_at = db.Column(db.DateTime, nullable=True)
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    last_error = db.Column(db.Text, nullable=True)
+
+    __table_args__ = (
+        db.UniqueConstraint("event_type", "source_id", name="outbox_source_uc"),
+        db.Index("idx_points_outbox_pending", "processed_at", "id"),
+    )
+
+    def __repr__(self) -> str:
+        return f"<PointsOutboxEvent {self.id}: {self.event_type} {self.source_id}>"
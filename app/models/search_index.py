@@ -0,0 +1,57 @@
+"""
+Full-text search index DDL for diary entries.
+
+PostgreSQL gets a GIN index over ``to_tsvector('english', content)``; SQLite
+gets an external-content FTS5 table kept in sync by triggers. Both are created
+alongside the diary_entry table by ``db.create_all()`` and by migration
+e2b6f4a8c1d9 for existing databases.
+"""
+
+from sqlalchemy import DDL, event
+from .diary_entry import DiaryEntry
+
+SQLITE_FTS_TABLE = "diary_entry_fts"
+
+POSTGRES_TSVECTOR = "to_tsvector('english', content)"
+
+SQLITE_FTS_DDL = [
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {SQLITE_FTS_TABLE} USING fts5("
+    "content, content='diary_entry', content_rowid='id')",
+    f"CREATE TRIGGER IF NOT EXISTS {SQLITE_FTS_TABLE}_ai AFTER INSERT ON diary_entry "
+    f"BEGIN INSERT INTO {SQLITE_FTS_TABLE}(rowid, content) "
+    "VALUES (new.id, new.content); END",
+    f"CREATE TRIGGER IF NOT EXISTS {SQLITE_FTS_TABLE}_ad AFTER DELETE ON diary_entry "
+    f"BEGIN INSERT INTO {SQLITE_FTS_TABLE}({SQLITE_FTS_TABLE}, rowid, content) "
+    "VALUES ('delete', old.id, old.content); END",
+    f"CREATE TRIGGER IF NOT EXISTS {SQLITE_FTS_TABLE}_au AFTER UPDATE ON diary_entry "
+    f"BEGIN INSERT INTO {SQLITE_FTS_TABLE}({SQLITE_FTS_TABLE}, rowid, content) "
+    "VALUES ('delete', old.id, old.content); "
+    f"INSERT INTO {SQLITE_FTS_TABLE}(rowid, content) "
+    "VALUES (new.id, new.content); END",
+]
+
+POSTGRES_FTS_DDL = [
+    "CREATE INDEX IF NOT EXISTS idx_diary_entry_content_fts "
+    f"ON diary_entry USING GIN ({POSTGRES_TSVECTOR})",
+]
+
+for statement in SQLITE_FTS_DDL:
+    event.listen(
+        DiaryEntry.__table__,
+        "after_create",
+        DDL(statement).execute_if(dialect="sqlite"),
+    )
+
+for statement in POSTGRES_FTS_DDL:
+    event.listen(
+        DiaryEntry.__table__,
+        "after_create",
+        DDL(statement).execute_if(dialect="postgresql"),
+    )
+
+# The FTS5 shadow table is not part of the metadata, so drop it explicitly
+event.listen(
+    DiaryEntry.__table__,
+    "before_drop",
+    DDL(f"DROP TABLE IF EXISTS {SQLITE_FTS_TABLE}").execute_if(dialect="sqlite"),
+)
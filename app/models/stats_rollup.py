@@ -0,0 +1,121 @@
+from sqlalchemy import event, inspect
+from .database import db
+from .daily_stats import DailyStats
+from .diary_entry import DiaryEntry
+
+
+class StatsRollup(db.Model):
+    """Per-user totals for one week or one month of daily stats and entries.
+
+    Weeks start on Monday and months on the 1st. Rows are kept up to date as
+    DailyStats and DiaryEntry rows are written, so the progress page reads a
+    handful of rollups instead of scanning every day of a user's history.
+    Weekday columns use SQL's day-of-week order, Sunday first.
+    """
+
+    __tablename__ = "stats_rollups"
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False)
+    period = db.Column(db.String(5), nullable=False)  # "week" or "month"
+    period_start = db.Column(db.Date, nullable=False)
+
+    points = db.Column(db.Integer, nullable=False, default=0)
+    active_days = db.Column(db.Integer, nullable=False, default=0)  # points > 0
+    entry_count = db.Column(db.Integer, nullable=False, default=0)
+    positive_count = db.Column(db.Integer, nullable=False, default=0)
+    negative_count = db.Column(db.Integer, nullable=False, default=0)
+    first_entry_date = db.Column(db.Date, nullable=True)
+
+    # Points, active days and diary entries per weekday
+    sun_points = db.Column(db.Integer, nullable=False, default=0)
+    sun_days = db.Column(db.Integer, nullable=False, default=0)
+    sun_entries = db.Column(db.Integer, nullable=False, default=0)
+    mon_points = db.Column(db.Integer, nullable=False, default=0)
+    mon_days = db.Column(db.Integer, nullable=False, default=0)
+    mon_entries = db.Column(db.Integer, nullable=False, default=0)
+    tue_points = db.Column(db.Integer, nullable=False, default=0)
+    tue_days = db.Column(db.Integer, nullable=False, default=0)
+    tue_entries = db.Column(db.Integer, nullable=False, default=0)
+    wed_points = db.Column(db.Integer, nullable=False, default=0)
+    wed_days = db.Column(db.Integer, nullable=False, default=0)
+    wed_entries = db.Column(db.Integer, nullable=False, default=0)
+    thu_points = db.Column(db.Integer, nullable=False, default=0)
+    thu_days = db.Column(db.Integer, nullable=False, default=0)
+    thu_entries = db.Column(db.Integer, nullable=False, default=0)
+    fri_points = db.Column(db.Integer, nullable=False, default=0)
+    fri_days = db.Column(db.Integer, nullable=False, default=0)
+    fri_entries = db.Column(db.Integer, nullable=False, default=0)
+    sat_points = db.Column(db.Integer, nullable=False, default=0)
+    sat_days = db.Column(db.Integer, nullable=False, default=0)
+    sat_entries = db.Column(db.Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        db.UniqueConstraint(
+            "user_id", "period", "period_start", name="user_period_start_uc"
+        ),
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"<StatsRollup {self.user_id}: {self.period} {self.period_start} "
+            f"{self.points}pts>"
+        )
+
+
+@event.listens_for(DailyStats, "after_insert")
+def _rollup_new_stats(mapper, connection, target: DailyStats) -> None:
+    """Add a new day's points to its week and month."""
+    from ..utils.rollups import record_stats_change
+
+    record_stats_change(
+        target.user_id, target.date, 0, target.points or 0, connection=connection
+    )
+
+
+@event.listens_for(DailyStats, "after_update")
+def _rollup_changed_stats(mapper, connection, target: DailyStats) -> None:
+    """Apply the change in a day's points to its week and month."""
+    from ..utils.rollups import record_stats_change
+
+    history = inspect(target).attrs.points.history
+    if not history.has_changes():
+        return
+    old_points = history.deleted[0] if history.deleted else 0
+    record_stats_change(
+        target.user_id,
+        target.date,
+        old_points or 0,
+        target.points or 0,
+        connection=connection,
+    )
+
+
+@event.listens_for(DailyStats, "after_delete")
+def _rollup_deleted_stats(mapper, connection, target: DailyStats) -> None:
+    """Take a deleted day's points out of its week and month."""
+    from ..utils.rollups import record_stats_change
+
+    record_stats_change(
+        target.user_id, target.date, target.points or 0, 0, connection=connection
+    )
+
+
+@event.listens_for(DiaryEntry, "after_insert")
+def _rollup_new_entry(mapper, connection, target: DiaryEntry) -> None:
+    """Count a new diary entry in its week and month."""
+    from ..utils.rollups import record_entry_change
+
+    record_entry_change(
+        target.user_id, target.entry_date, target.rating, 1, connection=connection
+    )
+
+
+@event.listens_for(DiaryEntry, "after_delete")
+def _rollup_deleted_entry(mapper, connection, target: DiaryEntry) -> None:
+    """Stop counting a deleted diary entry in its week and month."""
+    from ..utils.rollups import record_entry_change
+
+    record_entry_change(
+        target.user_id, target.entry_date, target.rating, -1, connection=connection
+    )
@@ -0,0 +1,45 @@
+from sqlalchemy import event
+from .database import db
+from .daily_stats import DailyStats
+from .diary_entry import DiaryEntry
+from .goal import Goal
+from .points_log import PointsLog
+from .user import User
+
+
+class UserDataStamp(db.Model):
+    """A version and timestamp for a user's data, one row per user.
+
+    Bumped by diary entry, daily stats, goal, points and profile writes so
+    the user's pages can answer conditional GETs without running any of
+    their queries.
+    """
+
+    __tablename__ = "user_data_stamps"
+
+    user_id = db.Column(db.Integer, db.ForeignKey("users.id"), primary_key=True)
+    updated_at = db.Column(db.DateTime(timezone=True), nullable=False)
+    version = db.Column(db.BigInteger, nullable=False, default=0)
+
+    def __repr__(self) -> str:
+        return f"<UserDataStamp {self.user_id}: v{self.version}>"
+
+
+def _touch_user_data(mapper, connection, target) -> None:
+    """Record that one of the user's rows was written."""
+    from ..utils.data_stamp import touch_user_data
+
+    touch_user_data(target.user_id, connection=connection)
+
+
+for _model in (DiaryEntry, DailyStats, Goal, PointsLog):
+    for _event in ("after_insert", "after_update", "after_delete"):
+        event.listen(_model, _event, _touch_user_data)
+
+
+@event.listens_for(User, "after_update")
+def _touch_user_profile(mapper, connection, target: User) -> None:
+    """Record a change to the user's name, email or password."""
+    from ..utils.data_stamp import touch_user_data
+
+    touch_user_data(target.id, connection=connection)
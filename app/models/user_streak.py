@@ -0,0 +1,45 @@
+from typing import Optional
+from datetime import date
+from sqlalchemy import event
+from .database import db
+from .diary_entry import DiaryEntry
+
+
+class UserStreak(db.Model):
+    """Incrementally maintained streak state, one row per user.
+
+    Updated in O(1) whenever a diary entry is inserted, so the write path never
+    has to scan the user's diary history to know their streaks.
+    """
+
+    __tablename__ = "user_streaks"
+
+    user_id = db.Column(db.Integer, db.ForeignKey("users.id"), primary_key=True)
+
+    # Run of consecutive diary days ending on last_entry_date
+    current_run_start = db.Column(db.Date, nullable=True)
+    current_length = db.Column(db.Integer, nullable=False, default=0)
+
+    longest = db.Column(db.Integer, nullable=False, default=0)
+    last_entry_date = db.Column(db.Date, nullable=True)
+
+    def __repr__(self) -> str:
+        return f"<UserStreak {self.user_id}: {self.current_length}/{self.longest}>"
+
+    @staticmethod
+    def current_as_of(
+        last_entry_date: Optional[date], current_length: int, today: date
+    ) -> int:
+        """Return the streak ending on ``today`` for a stored run.
+
+        A run only counts as the current streak while its last day is today.
+        """
+        return current_length if last_entry_date == today else 0
+
+
+@event.listens_for(DiaryEntry, "after_insert")
+def _record_diary_entry_streak(mapper, connection, target: DiaryEntry) -> None:
+    """Keep the user's streak state in step with new diary entries."""
+    from ..utils.streak_engine import record_entry
+
+    record_entry(target.user_id, target.entry_date, connection=connection)
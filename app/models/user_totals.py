@@ -0,0 +1,56 @@
+from sqlalchemy import event, inspect
+from .database import db
+from .daily_stats import DailyStats
+
+
+class UserTotals(db.Model):
+    """Running totals for a user, one row per user.
+
+    total_points is the sum of the user's daily_stats points. It is adjusted
+    in the same transaction as every DailyStats write, so reading a user's
+    total is a primary-key lookup instead of a SUM over their history.
+    """
+
+    __tablename__ = "user_totals"
+
+    user_id = db.Column(db.Integer, db.ForeignKey("users.id"), primary_key=True)
+    total_points = db.Column(db.BigInteger, nullable=False, default=0)
+
+    def __repr__(self) -> str:
+        return f"<UserTotals {self.user_id}: {self.total_points}pts>"
+
+
+@event.listens_for(DailyStats, "after_insert")
+def _total_new_stats(mapper, connection, target: DailyStats) -> None:
+    """Add a new day's points to the user's total."""
+    from ..utils.point_totals import add_to_total_points
+
+    add_to_total_points(target.user_id, target.points or 0, connection=connection)
+
+
+@event.listens_for(DailyStats, "after_update")
+def _total_changed_stats(mapper, connection, target: DailyStats) -> None:
+    """Apply the change in a day's points to the user's total.
+
+    Points assigned without loading the old value first are recounted.
+    """
+    from ..utils.point_totals import add_to_total_points, rebuild_point_totals
+
+    history = inspect(target).attrs.points.history
+    if not history.has_changes():
+        return
+    if history.deleted:
+        old_points = history.deleted[0] or 0
+        add_to_total_points(
+            target.user_id, (target.points or 0) - old_points, connection=connection
+        )
+    else:
+        rebuild_point_totals([target.user_id], connection=connection)
+
+
+@event.listens_for(DailyStats, "after_delete")
+def _total_deleted_stats(mapper, connection, target: DailyStats) -> None:
+    """Take a deleted day's points out of the user's total."""
+    from ..utils.point_totals import add_to_total_points
+
+    add_to_total_points(target.user_id, -(target.points or 0), connection=connection)
@@ -0,0 +1,42 @@
+from sqlalchemy import event
+from .database import db
+from .diary_entry import DiaryEntry
+
+
+class WordFrequency(db.Model):
+    """Per-user word counts across all diary entries, for the word cloud.
+
+    Maintained incrementally as diary entries are written and deleted, so the
+    word cloud is a top-N lookup instead of a re-count of the whole diary.
+    """
+
+    __tablename__ = "word_frequencies"
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False)
+    word = db.Column(db.String(64), nullable=False)
+    count = db.Column(db.Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        db.UniqueConstraint("user_id", "word", name="user_word_uc"),
+        db.Index("idx_word_frequencies_user_count", "user_id", "count"),
+    )
+
+    def __repr__(self) -> str:
+        return f"<WordFrequency {self.user_id}: {self.word}={self.count}>"
+
+
+@event.listens_for(DiaryEntry, "after_insert")
+def _index_diary_entry_words(mapper, connection, target: DiaryEntry) -> None:
+    """Add a new entry's words to the user's word counts."""
+    from ..utils.word_index import add_to_word_index
+
+    add_to_word_index(target.user_id, target.content, connection=connection)
+
+
+@event.listens_for(DiaryEntry, "after_delete")
+def _unindex_diary_entry_words(mapper, connection, target: DiaryEntry) -> None:
+    """Remove a deleted entry's words from the user's word counts."""
+    from ..utils.word_index import remove_from_word_index
+
+    remove_from_word_index(target.user_id, target.content, connection=connection)
@@ -16,6 +16,7 @@ from datetime import date, datetime, timezone
 from ..models import User, DailyStats, PointsLog, db
 from ..models.points_log import PointsSourceType
 from ..utils.points_service import award_login_bonus
+from ..utils.current_user import get_current_user
 from ..forms import LoginForm, RegisterForm
 
 auth_bp = Blueprint("auth", __name__)
@@ -106,7 +107,7 @@ def logout() -> WerkzeugResponse:
     """
     user_id = session.get("user_id")
     if user_id:
-        user = db.session.get(User, user_id)
+        user = get_current_user()
         if user:
             current_app.logger.info(f"User {user.email} logged out.")
     session.clear()
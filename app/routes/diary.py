@@ -2,13 +2,15 @@ from typing import Union
 from flask import Blueprint, render_template, request, redirect, session, flash
 from werkzeug.wrappers import Response as WerkzeugResponse
 from datetime import date, timedelta
-from ..models import User, DiaryEntry, DailyStats, db
+from ..models import DiaryEntry, DailyStats, db
 from ..utils.progress_helpers import (
     get_recent_entries,
     get_current_streak,
     get_total_points,
 )
-from ..utils.points_service import award_diary_points, PointsService
+from ..models.points_log import PointsSourceType
+from ..utils.points_outbox import enqueue_points_event, apply_inline
+from ..utils.current_user import get_current_profile
 from ..forms import DiaryEntryForm
 
 diary_bp = Blueprint("diary", __name__)
@@ -20,12 +22,7 @@ def diary_entry() -> Union[str, tuple[str, int], WerkzeugResponse]:
         return redirect("/login")
 
     user_id = session["user_id"]
-    user = db.session.get(User, user_id)
-
-    if user.user_name:
-        display_name = user.user_name
-    else:
-        display_name = user.email.split("@")[0]
+    display_name = get_current_profile().display_name
 
     form = DiaryEntryForm()
 
@@ -36,17 +33,21 @@ def diary_entry() -> Union[str, tuple[str, int], WerkzeugResponse]:
         # Create diary entry first
         new_entry = DiaryEntry(user_id=user_id, content=content, rating=rating)
         db.session.add(new_entry)
-        db.session.flush()  # Flush to get the ID for points service
-
-        # Award points through the points service (this will also update DailyStats)
-        award_diary_points(user_id, new_entry.id, rating)
+        db.session.flush()  # Flush to get the ID for the points event
+
+        # Queue the points award; the points worker applies it together with
+        # DailyStats and streak milestones
+        event_id = enqueue_points_event(
+            user_id,
+            PointsSourceType.DIARY_ENTRY,
+            new_entry.id,
+            {"rating": rating},
+            event_date=new_entry.entry_date,
+        )
 
-        # Commit all changes
+        # Commit the entry and its points event together
         db.session.commit()
-
-        # Check for streak milestones after diary entry and points are committed
-        current_streak = get_current_streak(user_id)
-        PointsService.check_and_award_streak_milestones(user_id, current_streak)
+        apply_inline(event_id)
 
         # Clear the form for the next entry
         form = DiaryEntryForm(formdata=None)
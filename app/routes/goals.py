@@ -1,4 +1,4 @@
-from typing import Union, Tuple
+from typing import Any, Dict, Optional, Union, Tuple
 from flask import (
     Blueprint,
     render_template,
@@ -11,29 +11,140 @@ from flask import (
     Response,
 )
 from werkzeug.wrappers import Response as WerkzeugResponse
-from ..models.goal import GoalCategory, GoalStatus
+from ..models.goal import Goal, GoalCategory, GoalStatus
+from ..models.points_log import PointsSourceType
 from ..models import User, DailyStats, db
 from ..utils.goal_helpers import (
     get_current_goals,
-    get_overdue_goals,
     create_goal,
     update_goal_progress,
     complete_goal,
     fail_goal,
-    get_goal_history,
-    get_goal_statistics,
     get_predefined_goals,
+    goal_to_dict,
+    load_goals_overview,
 )
 from ..utils.progress_helpers import get_recent_entries
-from ..utils.points_service import award_goal_completion_points, award_goal_failure_points
+from ..utils.points_outbox import enqueue_points_event, apply_inline
+from ..utils.points_service import describe_award
 from ..forms import GoalForm, GoalProgressForm
 from datetime import date
 
 goals_bp = Blueprint("goals", __name__)
 
 
+def _render_goals_page(
+    user_id: int,
+    status: int = 200,
+    goal_form: Optional[GoalForm] = None,
+    progress_form: Optional[GoalProgressForm] = None,
+) -> Tuple[str, int]:
+    """Render the goals page from one overview load.
+
+    Args:
+        user_id: The ID of the logged-in user.
+        status: HTTP status code for the response.
+        goal_form: Create form to show (a fresh one when None).
+        progress_form: Progress form to show (a fresh one when None).
+
+    Returns:
+        The rendered goals template and status code.
+    """
+    overview = load_goals_overview(user_id)
+
+    # Check if user should see onboarding tour (new user with no entries)
+    is_new_user = not get_recent_entries(user_id, limit=1)
+
+    return (
+        render_template(
+            "goals/goals.html",
+            current_goals=overview.current,
+            overdue_goals=overview.overdue,
+            goal_history=overview.history,
+            goal_stats=overview.stats,
+            predefined_goals=get_predefined_goals(),
+            categories=GoalCategory,
+            goal_form=goal_form or GoalForm(),
+            progress_form=progress_form or GoalProgressForm(),
+            is_new_user=is_new_user,
+        ),
+        status,
+    )
+
+
+def _finish_goal(
+    goal_id: int, user_id: int, status: GoalStatus
+) -> Tuple[Optional[Goal], Optional[int]]:
+    """Complete or fail one of the user's active goals and queue its award.
+
+    Args:
+        goal_id: The ID of the goal.
+        user_id: The ID of the logged-in user, who must own the goal.
+        status: GoalStatus.COMPLETED or GoalStatus.FAILED.
+
+    Returns:
+        (goal, points): the goal (None if not found) and the points queued for
+        it, 0 if they were queued before, or None if the goal had already
+        finished with the other status.
+    """
+    if status == GoalStatus.COMPLETED:
+        goal = complete_goal(goal_id, user_id, commit=False)
+        source_type = PointsSourceType.GOAL_COMPLETED
+    else:
+        goal = fail_goal(goal_id, user_id, commit=False)
+        source_type = PointsSourceType.GOAL_FAILED
+    if goal is None or goal.status != status:
+        return goal, None
+
+    # Queue the award for the points worker (10 for completed, 1 for failed)
+    event_id = enqueue_points_event(
+        user_id, source_type, goal.id, {"goal_title": goal.title}
+    )
+    # Commit the status change and its points event together
+    db.session.commit()
+    apply_inline(event_id)
+    points = describe_award(source_type, goal_title=goal.title)[0]
+    return goal, points if event_id is not None else 0
+
+
+def _finished_message(goal: Goal) -> Tuple[str, str]:
+    """The flash message and category for a goal that was just finished."""
+    description_text = f" - {goal.description}" if goal.description else ""
+    if goal.status == GoalStatus.COMPLETED:
+        return (
+            "Congratulations! You completed your goal: "
+            f'"{goal.title}"{description_text}',
+            "success",
+        )
+    return f'Goal marked as failed: "{goal.title}"{description_text}', "warning"
+
+
+def _already_finished_message(goal: Goal) -> str:
+    label = "not completed" if goal.status == GoalStatus.FAILED else "completed"
+    return f'"{goal.title}" has already been marked as {label}.'
+
+
+def _goal_payload(goal: Goal) -> Dict[str, Any]:
+    """A goal's JSON with the URLs the goals page posts its actions to."""
+    payload = goal_to_dict(goal)
+    payload["urls"] = {
+        "complete": url_for("goals.mark_goal_complete", goal_id=goal.id),
+        "fail": url_for("goals.mark_goal_failed", goal_id=goal.id),
+        "complete_json": url_for("goals.complete_goal_json", goal_id=goal.id),
+        "fail_json": url_for("goals.fail_goal_json", goal_id=goal.id),
+    }
+    return payload
+
+
+def _flash_form_errors(form) -> None:
+    """Flash each validation error on a submitted form."""
+    for field, errors in form.errors.items():
+        for error in errors:
+            flash(error, "danger")
+
+
 @goals_bp.route("/goals")
-def goals_page() -> Union[str, WerkzeugResponse]:
+def goals_page() -> Union[Tuple[str, int], WerkzeugResponse]:
     """Display the main goals page with current and historical goals.
     
     Returns:
@@ -42,31 +153,7 @@ def goals_page() -> Union[str, WerkzeugResponse]:
     if "user_id" not in session:
         return redirect("/login")
 
-    user_id = session["user_id"]
-    current_goals = get_current_goals(user_id)
-    overdue_goals = get_overdue_goals(user_id)
-    goal_history = get_goal_history(user_id, limit=10)
-    goal_stats = get_goal_statistics(user_id)
-    predefined_goals = get_predefined_goals()
-    goal_form = GoalForm()
-    progress_form = GoalProgressForm()
-
-    # Check if user should see onboarding tour (new user with no entries)
-    recent_entries = get_recent_entries(user_id)
-    is_new_user = len(recent_entries) == 0
-
-    return render_template(
-        "goals/goals.html",
-        current_goals=current_goals,
-        overdue_goals=overdue_goals,
-        goal_history=goal_history,
-        goal_stats=goal_stats,
-        predefined_goals=predefined_goals,
-        categories=GoalCategory,
-        goal_form=goal_form,
-        progress_form=progress_form,
-        is_new_user=is_new_user,
-    )
+    return _render_goals_page(session["user_id"])
 
 
 @goals_bp.route("/goals/create", methods=["POST"])
@@ -109,35 +196,8 @@ def create_new_goal() -> Union[WerkzeugResponse, Tuple[str, int]]:
             flash("An error occurred while creating your goal.", "danger")
             return redirect(url_for("goals.goals_page"), 500)
     else:
-        user_id = session["user_id"]
-        current_goals = get_current_goals(user_id)
-        overdue_goals = get_overdue_goals(user_id)
-        goal_history = get_goal_history(user_id, limit=10)
-        goal_stats = get_goal_statistics(user_id)
-        predefined_goals = get_predefined_goals()
-
-        # Check if user should see onboarding tour (new user with no entries)
-        recent_entries = get_recent_entries(user_id)
-        is_new_user = len(recent_entries) == 0
-
-        # Flash validation errors
-        for field, errors in form.errors.items():
-            for error in errors:
-                flash(error, "danger")
-        return (
-            render_template(
-                "goals/goals.html",
-                current_goals=current_goals,
-                overdue_goals=overdue_goals,
-                goal_history=goal_history,
-                goal_stats=goal_stats,
-                predefined_goals=predefined_goals,
-                categories=GoalCategory,
-                goal_form=form,
-                is_new_user=is_new_user,
-            ),
-            400,
-        )
+        _flash_form_errors(form)
+        return _render_goals_page(session["user_id"], 400, goal_form=form)
 
 
 @goals_bp.route("/goals/<int:goal_id>/update", methods=["POST"])
@@ -161,7 +221,7 @@ def update_goal(goal_id: int) -> Union[WerkzeugResponse, Tuple[str, int]]:
                 form.progress_notes.data.strip() if form.progress_notes.data else None
             )
 
-            goal = update_goal_progress(goal_id, progress_notes)
+            goal = update_goal_progress(goal_id, progress_notes, session["user_id"])
 
             if goal:
                 flash("Goal progress updated successfully!", "success")
@@ -174,35 +234,13 @@ def update_goal(goal_id: int) -> Union[WerkzeugResponse, Tuple[str, int]]:
             flash("An error occurred while updating your goal.", "danger")
             return redirect(url_for("goals.goals_page"), 500)
     else:
-        user_id = session["user_id"]
-        current_goals = get_current_goals(user_id)
-        overdue_goals = get_overdue_goals(user_id)
-        goal_history = get_goal_history(user_id, limit=10)
-        goal_stats = get_goal_statistics(user_id)
-        predefined_goals = get_predefined_goals()
-
-        # Flash validation errors
-        for field, errors in form.errors.items():
-            for error in errors:
-                flash(error, "danger")
-        return (
-            render_template(
-                "goals/goals.html",
-                current_goals=current_goals,
-                overdue_goals=overdue_goals,
-                goal_history=goal_history,
-                goal_stats=goal_stats,
-                predefined_goals=predefined_goals,
-                categories=GoalCategory,
-                goal_form=GoalForm(),  # Pass a new GoalForm for the create section
-                progress_form=form,
-            ),
-            400,
-        )  # Pass the progress form with errors
+        _flash_form_errors(form)
+        # Pass the progress form with errors
+        return _render_goals_page(session["user_id"], 400, progress_form=form)
 
 
 @goals_bp.route("/goals/<int:goal_id>/complete", methods=["POST"])
-def mark_goal_complete(goal_id: int) -> Tuple[str, int]:
+def mark_goal_complete(goal_id: int) -> Union[WerkzeugResponse, Tuple[str, int]]:
     """Mark a goal as completed and award points.
     
     Args:
@@ -211,185 +249,168 @@ def mark_goal_complete(goal_id: int) -> Tuple[str, int]:
     Returns:
         Rendered goals template with status message.
     """
+    return _mark_goal_finished(goal_id, GoalStatus.COMPLETED)
+
+
+@goals_bp.route("/goals/<int:goal_id>/fail", methods=["POST"])
+def mark_goal_failed(goal_id: int) -> Union[WerkzeugResponse, Tuple[str, int]]:
+    return _mark_goal_finished(goal_id, GoalStatus.FAILED)
+
+
+def _mark_goal_finished(
+    goal_id: int, status: GoalStatus
+) -> Union[WerkzeugResponse, Tuple[str, int]]:
     if "user_id" not in session:
         return redirect("/login")
 
+    user_id = session["user_id"]
     try:
-        user_id = session["user_id"]
-        goal = complete_goal(goal_id)
-
-        if goal:
-            # Award 10 points for completed goal through points service
-            award_goal_completion_points(user_id, goal.id, goal.title)
-            description_text = f" - {goal.description}" if goal.description else ""
-            flash(
-                f'Congratulations! You completed your goal: "{goal.title}"{description_text}', "success"
-            )
-            # Re-render the page with a 200 OK status for success
-            user_id = session["user_id"]
-            current_goals = get_current_goals(user_id)
-            overdue_goals = get_overdue_goals(user_id)
-            goal_history = get_goal_history(user_id, limit=10)
-            goal_stats = get_goal_statistics(user_id)
-            predefined_goals = get_predefined_goals()
-            goal_form = GoalForm()
-            progress_form = GoalProgressForm()
-
-            return (
-                render_template(
-                    "goals/goals.html",
-                    current_goals=current_goals,
-                    overdue_goals=overdue_goals,
-                    goal_history=goal_history,
-                    goal_stats=goal_stats,
-                    predefined_goals=predefined_goals,
-                    categories=GoalCategory,
-                    goal_form=goal_form,
-                    progress_form=progress_form,
-                ),
-                200,
-            )
-        else:
+        goal, points = _finish_goal(goal_id, user_id, status)
+
+        if not goal:
             flash("Goal not found.", "danger")
+            return _render_goals_page(user_id, 404)
+        if points is None:
+            flash(_already_finished_message(goal), "warning")
+            return _render_goals_page(user_id, 409)
 
-        user_id = session["user_id"]
-        current_goals = get_current_goals(user_id)
-        overdue_goals = get_overdue_goals(user_id)
-        goal_history = get_goal_history(user_id, limit=10)
-        goal_stats = get_goal_statistics(user_id)
-        predefined_goals = get_predefined_goals()
-        goal_form = GoalForm()
-        progress_form = GoalProgressForm()
-
-        return (
-            render_template(
-                "goals/goals.html",
-                current_goals=current_goals,
-                overdue_goals=overdue_goals,
-                goal_history=goal_history,
-                goal_stats=goal_stats,
-                predefined_goals=predefined_goals,
-                categories=GoalCategory,
-                goal_form=goal_form,
-                progress_form=progress_form,
-            ),
-            404,
-        )
+        flash(*_finished_message(goal))
+        # Re-render the page with a 200 OK status for success
+        return _render_goals_page(user_id)
 
     except Exception as e:
-        flash("An error occurred while completing your goal.", "danger")
-        user_id = session["user_id"]
-        current_goals = get_current_goals(user_id)
-        overdue_goals = get_overdue_goals(user_id)
-        goal_history = get_goal_history(user_id, limit=10)
-        goal_stats = get_goal_statistics(user_id)
-        predefined_goals = get_predefined_goals()
-        goal_form = GoalForm()
-        progress_form = GoalProgressForm()
+        db.session.rollback()
+        action = "completing" if status == GoalStatus.COMPLETED else "failing"
+        flash(f"An error occurred while {action} your goal.", "danger")
+        return _render_goals_page(user_id, 500)
 
-        return (
-            render_template(
-                "goals/goals.html",
-                current_goals=current_goals,
-                overdue_goals=overdue_goals,
-                goal_history=goal_history,
-                goal_stats=goal_stats,
-                predefined_goals=predefined_goals,
-                categories=GoalCategory,
-                goal_form=goal_form,
-                progress_form=progress_form,
-            ),
-            500,
-        )
 
+@goals_bp.route("/api/goals", methods=["POST"])
+def create_goal_json() -> Tuple[Response, int]:
+    """Create a new goal and return it as JSON.
 
-@goals_bp.route("/goals/<int:goal_id>/fail", methods=["POST"])
-def mark_goal_failed(goal_id: int) -> Tuple[str, int]:
+    Returns:
+        JSON with the new goal, or the form errors.
+    """
     if "user_id" not in session:
-        return redirect("/login")
+        return jsonify({"error": "Unauthorized"}), 401
+
+    form = GoalForm()
+    if not form.validate_on_submit():
+        return jsonify({"errors": form.errors}), 400
+
     try:
-        user_id = session["user_id"]
-        goal = fail_goal(goal_id)
-        if goal:
-            # Award 1 point for failed goal through points service
-            award_goal_failure_points(user_id, goal.id, goal.title)
-            description_text = f" - {goal.description}" if goal.description else ""
-            flash(f'Goal marked as failed: "{goal.title}"{description_text}', "warning")
-            # Re-render the page with a 200 OK status for success
-            user_id = session["user_id"]
-            current_goals = get_current_goals(user_id)
-            overdue_goals = get_overdue_goals(user_id)
-            goal_history = get_goal_history(user_id, limit=10)
-            goal_stats = get_goal_statistics(user_id)
-            predefined_goals = get_predefined_goals()
-            goal_form = GoalForm()
-            progress_form = GoalProgressForm()
-
-            return (
-                render_template(
-                    "goals/goals.html",
-                    current_goals=current_goals,
-                    overdue_goals=overdue_goals,
-                    goal_history=goal_history,
-                    goal_stats=goal_stats,
-                    predefined_goals=predefined_goals,
-                    categories=GoalCategory,
-                    goal_form=goal_form,
-                    progress_form=progress_form,
-                ),
-                200,
-            )
-        else:
-            flash("Goal not found.", "danger")
-            user_id = session["user_id"]
-            current_goals = get_current_goals(user_id)
-            overdue_goals = get_overdue_goals(user_id)
-            goal_history = get_goal_history(user_id, limit=10)
-            goal_stats = get_goal_statistics(user_id)
-            predefined_goals = get_predefined_goals()
-            goal_form = GoalForm()
-            progress_form = GoalProgressForm()
-
-            return (
-                render_template(
-                    "goals/goals.html",
-                    current_goals=current_goals,
-                    overdue_goals=overdue_goals,
-                    goal_history=goal_history,
-                    goal_stats=goal_stats,
-                    predefined_goals=predefined_goals,
-                    categories=GoalCategory,
-                    goal_form=goal_form,
-                    progress_form=progress_form,
-                ),
-                404,
-            )
-    except Exception as e:
-        flash("An error occurred while failing your goal.", "danger")
-        user_id = session["user_id"]
-        current_goals = get_current_goals(user_id)
-        overdue_goals = get_overdue_goals(user_id)
-        goal_history = get_goal_history(user_id, limit=10)
-        goal_stats = get_goal_statistics(user_id)
-        predefined_goals = get_predefined_goals()
-        goal_form = GoalForm()
-        progress_form = GoalProgressForm()
+        category = GoalCategory(form.category.data)
+    except ValueError:
+        return jsonify({"errors": {"category": ["Invalid goal category."]}}), 400
+
+    goal = create_goal(
+        user_id=session["user_id"],
+        category=category,
+        title=form.title.data.strip(),
+        description=form.description.data.strip() if form.description.data else None,
+    )
+    return (
+        jsonify(
+            {
+                "goal": _goal_payload(goal),
+                "message": f'Goal "{goal.title}" created successfully!',
+            }
+        ),
+        201,
+    )
+
 
+@goals_bp.route("/api/goals/<int:goal_id>/update", methods=["POST"])
+def update_goal_json(goal_id: int) -> Tuple[Response, int]:
+    """Update a goal's progress notes and return the goal as JSON.
+
+    Args:
+        goal_id: The ID of the goal to update.
+
+    Returns:
+        JSON with the updated goal, or an error.
+    """
+    if "user_id" not in session:
+        return jsonify({"error": "Unauthorized"}), 401
+
+    form = GoalProgressForm()
+    if not form.validate_on_submit():
+        return jsonify({"errors": form.errors}), 400
+
+    progress_notes = (
+        form.progress_notes.data.strip() if form.progress_notes.data else None
+    )
+    goal = update_goal_progress(goal_id, progress_notes, session["user_id"])
+    if goal is None:
+        return jsonify({"error": "Goal not found."}), 404
+
+    return (
+        jsonify(
+            {
+                "goal": _goal_payload(goal),
+                "message": "Goal progress updated successfully!",
+            }
+        ),
+        200,
+    )
+
+
+@goals_bp.route("/api/goals/<int:goal_id>/complete", methods=["POST"])
+def complete_goal_json(goal_id: int) -> Tuple[Response, int]:
+    """Mark a goal as completed and return what changed as JSON.
+
+    Args:
+        goal_id: The ID of the goal to mark as complete.
+
+    Returns:
+        JSON with the goal, the points awarded and a message.
+    """
+    return _finish_goal_json(goal_id, GoalStatus.COMPLETED)
+
+
+@goals_bp.route("/api/goals/<int:goal_id>/fail", methods=["POST"])
+def fail_goal_json(goal_id: int) -> Tuple[Response, int]:
+    """Mark a goal as not completed and return what changed as JSON.
+
+    Args:
+        goal_id: The ID of the goal to mark as failed.
+
+    Returns:
+        JSON with the goal, the points awarded and a message.
+    """
+    return _finish_goal_json(goal_id, GoalStatus.FAILED)
+
+
+def _finish_goal_json(goal_id: int, status: GoalStatus) -> Tuple[Response, int]:
+    if "user_id" not in session:
+        return jsonify({"error": "Unauthorized"}), 401
+
+    user_id = session["user_id"]
+    goal, points = _finish_goal(goal_id, user_id, status)
+    if goal is None:
+        return jsonify({"error": "Goal not found."}), 404
+    if points is None:
         return (
-            render_template(
-                "goals/goals.html",
-                current_goals=current_goals,
-                overdue_goals=overdue_goals,
-                goal_history=goal_history,
-                goal_stats=goal_stats,
-                predefined_goals=predefined_goals,
-                categories=GoalCategory,
-                goal_form=goal_form,
-                progress_form=progress_form,
+            jsonify(
+                {"error": _already_finished_message(goal), "goal": _goal_payload(goal)}
             ),
-            500,
+            409,
         )
 
+    message, category = _finished_message(goal)
+    return (
+        jsonify(
+            {
+                "goal": _goal_payload(goal),
+                "points_awarded": points,
+                "message": message,
+                "category": category,
+            }
+        ),
+        200,
+    )
+
 
 @goals_bp.route("/api/goals/suggestions/<category>")
 def get_goal_suggestions(category: str) -> Tuple[Response, int]:
@@ -427,19 +448,4 @@ def get_current_goal_api() -> Union[Tuple[Response, int], Response]:
 
     user_id = session["user_id"]
     current_goals = get_current_goals(user_id)
-    goals_data = [
-        {
-            "id": g.id,
-            "title": g.title,
-            "category": g.category.value,
-            "description": g.description,
-            "status": g.status.value,
-            "progress_notes": g.progress_notes,
-            "days_remaining": g.days_remaining,
-            "progress_percentage": g.progress_percentage,
-            "week_start": g.week_start.strftime("%Y-%m-%d"),
-            "week_end": g.week_end.strftime("%Y-%m-%d"),
-        }
-        for g in current_goals
-    ]
-    return jsonify({"goals": goals_data})
+    return jsonify({"goals": [goal_to_dict(g) for g in current_goals]})
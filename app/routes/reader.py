@@ -1,41 +1,41 @@
-from typing import Union
-from flask import Blueprint, render_template, redirect, session, request
+from typing import Optional, Union
+from flask import Blueprint, jsonify, render_template, redirect, session, request
 from werkzeug.wrappers import Response as WerkzeugResponse
 from datetime import datetime
-from ..models import User, DiaryEntry, db
+from ..models import DiaryEntry
 from ..utils import handle_search
+from ..utils.current_user import get_current_profile
+from ..utils.diary_navigation import get_diary_date_range, get_day_navigation
+from ..utils.search_helpers import get_search_page
 from ..utils.progress_helpers import get_recent_entries
 
 reader_bp = Blueprint("reader", __name__)
 
 
+def _parse_rating(rating_param: str) -> Optional[int]:
+    """Convert the rating query parameter to -1, 1 or None"""
+    if rating_param:
+        try:
+            rating = int(rating_param)
+            if rating in [-1, 1]:
+                return rating
+        except ValueError:
+            pass
+    return None
+
+
 @reader_bp.route("/read-diary")
 def read_diary() -> Union[str, WerkzeugResponse]:
     if "user_id" not in session:
         return redirect("/login")
 
     user_id = session["user_id"]
-    user = User.query.get(user_id)
+    display_name = get_current_profile().display_name
 
-    # Get display name
-    if user.user_name:
-        display_name = user.user_name
-    else:
-        display_name = user.email.split("@")[0]
-
-    # Get all dates that have diary entries (sorted chronologically)
-    diary_dates = (
-        db.session.query(DiaryEntry.entry_date)
-        .filter_by(user_id=user_id)
-        .distinct()
-        .order_by(DiaryEntry.entry_date)
-        .all()
-    )
-
-    # Convert to list of date objects
-    diary_dates = [row.entry_date for row in diary_dates]
+    # First and last diary dates, for the front page and date picker
+    date_range = get_diary_date_range(user_id)
 
-    if not diary_dates:
+    if date_range.first is None:
         # No entries yet - show empty state
         # Check if user should see onboarding tour (new user with no entries)
         recent_entries = get_recent_entries(user_id)
@@ -49,21 +49,14 @@ def read_diary() -> Union[str, WerkzeugResponse]:
     search_text = request.args.get("search", "").strip()
     search_date = request.args.get("search_date", "").strip()
     rating_param = request.args.get("rating", "").strip()
+    sort = request.args.get("sort", "date").strip()
     
-    # Convert rating parameter to integer if provided
-    rating = None
-    if rating_param:
-        try:
-            rating = int(rating_param)
-            if rating not in [-1, 1]:
-                rating = None
-        except ValueError:
-            rating = None
+    rating = _parse_rating(rating_param)
 
     # Handle search functionality
     if search_text or search_date or rating is not None:
         return handle_search(
-            user_id, display_name, diary_dates, search_text, search_date, rating
+            user_id, display_name, date_range, search_text, search_date, rating, sort
         )
 
     # Get the date parameter from URL (existing functionality)
@@ -71,7 +64,7 @@ def read_diary() -> Union[str, WerkzeugResponse]:
 
     if not date_param:
         # Show front page
-        first_entry_date = diary_dates[0]
+        first_entry_date = date_range.first
         # Check if user should see onboarding tour (new user with no entries)
         recent_entries = get_recent_entries(user_id)
         is_new_user = len(recent_entries) == 0
@@ -81,7 +74,7 @@ def read_diary() -> Union[str, WerkzeugResponse]:
             display_name=display_name,
             first_entry_date=first_entry_date,
             show_front_page=True,
-            diary_dates=diary_dates,
+            date_range=date_range,
             is_new_user=is_new_user,
         )
 
@@ -92,8 +85,9 @@ def read_diary() -> Union[str, WerkzeugResponse]:
         # Invalid date format, redirect to front page
         return redirect("/read-diary")
 
-    # Check if this date has entries
-    if current_date not in diary_dates:
+    # Check if this date has entries and find its neighbours for navigation
+    navigation = get_day_navigation(user_id, current_date)
+    if not navigation.exists:
         # No entries for this date, redirect to front page
         return redirect("/read-diary")
 
@@ -104,15 +98,6 @@ def read_diary() -> Union[str, WerkzeugResponse]:
         .all()
     )
 
-    # Find current date index for navigation
-    current_index = diary_dates.index(current_date)
-
-    # Determine previous and next dates
-    prev_date = diary_dates[current_index - 1] if current_index > 0 else None
-    next_date = (
-        diary_dates[current_index + 1] if current_index < len(diary_dates) - 1 else None
-    )
-
     # Format the date for display (e.g., "Monday, May 5th 2025")
     day_name = current_date.strftime("%A")
     month_name = current_date.strftime("%B")
@@ -137,9 +122,42 @@ def read_diary() -> Union[str, WerkzeugResponse]:
         entries=entries,
         current_date=current_date,
         formatted_date=formatted_date,
-        prev_date=prev_date,
-        next_date=next_date,
-        diary_dates=diary_dates,
+        prev_date=navigation.prev_date,
+        next_date=navigation.next_date,
+        date_range=date_range,
         show_day_page=True,
         is_new_user=is_new_user,
     )
+
+
+@reader_bp.route("/api/diary-search")
+def diary_search_page():
+    """Return a further page of diary search results as JSON"""
+    if "user_id" not in session:
+        return jsonify({"error": "Unauthorized"}), 401
+
+    try:
+        results, next_cursor = get_search_page(
+            session["user_id"],
+            request.args.get("search", "").strip(),
+            request.args.get("search_date", "").strip(),
+            _parse_rating(request.args.get("rating", "").strip()),
+            request.args.get("sort", "date").strip(),
+            cursor=request.args.get("cursor") or None,
+        )
+    except ValueError:
+        return jsonify({"error": "Invalid cursor"}), 400
+
+    return jsonify(
+        {
+            "results": [
+                {
+                    "date": result["date"].isoformat(),
+                    "formatted_date": result["formatted_date"],
+                    "snippet": result["snippet"],
+                }
+                for result in results
+            ],
+            "next_cursor": next_cursor,
+        }
+    )
@@ -1,3 +1,4 @@
+import os
 from typing import Union, Tuple
 from flask import (
     Blueprint,
@@ -8,16 +9,38 @@ from flask import (
     send_file,
     flash,
     jsonify,
-    make_response,
     request,
+    abort,
     Response,
+    stream_with_context,
 )
 from werkzeug.wrappers import Response as WerkzeugResponse
-from ..models import User, DiaryEntry, Goal, DailyStats, db
+from ..models import (
+    User,
+    DiaryEntry,
+    Goal,
+    GoalStats,
+    DailyStats,
+    StatsRollup,
+    UserDataStamp,
+    UserTotals,
+    UserStreak,
+    WordFrequency,
+    PointsOutboxEvent,
+    ExportJob,
+    db,
+)
 from ..forms import DeleteAccountForm, ChangeUsernameForm, ChangePasswordForm
 from ..utils.progress_helpers import get_recent_entries
+from ..utils.current_user import get_current_user, invalidate_user_profile
+from ..utils.export_helpers import generate_csv_export, generate_json_export
+from ..utils.export_jobs import (
+    delete_export_job,
+    get_export_path,
+    get_latest_export_job,
+    request_export,
+)
 from werkzeug.security import check_password_hash
-import io, csv, json
 
 user_bp = Blueprint("user", __name__)
 
@@ -27,7 +50,7 @@ def profile() -> Union[str, WerkzeugResponse]:
     if "user_id" not in session:
         return redirect(url_for("auth.login_page"))
 
-    user = db.session.get(User, session["user_id"])
+    user = get_current_user()
     username_form = ChangeUsernameForm()
     password_form = ChangePasswordForm()
 
@@ -35,9 +58,12 @@ def profile() -> Union[str, WerkzeugResponse]:
     recent_entries = get_recent_entries(session["user_id"])
     is_new_user = len(recent_entries) == 0
 
+    latest_export = get_latest_export_job(session["user_id"])
+
     return render_template(
         "user/settings.html",
         user=user,
+        latest_export=latest_export,
         username_form=username_form,
         password_form=password_form,
         is_new_user=is_new_user,
@@ -49,7 +75,7 @@ def change_username() -> WerkzeugResponse:
     if "user_id" not in session:
         return redirect(url_for("auth.login_page"))
 
-    user = db.session.get(User, session["user_id"])
+    user = get_current_user()
     form = ChangeUsernameForm()
 
     if form.validate_on_submit():
@@ -57,6 +83,7 @@ def change_username() -> WerkzeugResponse:
             # Update username
             user.user_name = form.new_username.data.strip()
             db.session.commit()
+            invalidate_user_profile(user.id)
 
             flash("Username updated successfully!", "success")
             return redirect(url_for("user.profile"))
@@ -79,7 +106,7 @@ def change_password() -> WerkzeugResponse:
     if "user_id" not in session:
         return redirect(url_for("auth.login_page"))
 
-    user = db.session.get(User, session["user_id"])
+    user = get_current_user()
     form = ChangePasswordForm()
 
     if form.validate_on_submit():
@@ -113,45 +140,16 @@ def change_password() -> WerkzeugResponse:
 def download_data_json() -> Union[Response, WerkzeugResponse]:
     if "user_id" not in session:
         return redirect(url_for("auth.login_page"))
-    user_id = session["user_id"]
-    user = User.query.get(user_id)
-    diary_entries = DiaryEntry.query.filter_by(user_id=user_id).all()
-    goals = Goal.query.filter_by(user_id=user_id).all()
-    stats = DailyStats.query.filter_by(user_id=user_id).all()
-    data = {
-        "user": {"email": user.email, "user_name": user.user_name},
-        "diary_entries": [
-            {"date": e.entry_date.isoformat(), "content": e.content, "rating": e.rating}
-            for e in diary_entries
-        ],
-        "goals": [
-            {
-                "title": g.title,
-                "category": (
-                    g.category.value
-                    if hasattr(g.category, "value")
-                    else str(g.category)
-                ),
-                "status": (
-                    g.status.value if hasattr(g.status, "value") else str(g.status)
-                ),
-                "created_at": g.created_at.isoformat() if g.created_at else None,
-            }
-            for g in goals
-        ],
-        "stats": [
-            {
-                "date": s.date.isoformat(),
-                "points": s.points,
-                "current_streak": s.current_streak,
-                "longest_streak": s.longest_streak,
-            }
-            for s in stats
-        ],
-    }
-    response = make_response(json.dumps(data, indent=2))
+    user = get_current_user()
+
+    # Stream the document so memory stays flat for long diaries
+    response = Response(
+        stream_with_context(
+            generate_json_export(user.id, user.email, user.user_name)
+        ),
+        mimetype="application/json",
+    )
     response.headers["Content-Disposition"] = "attachment; filename=user_data.json"
-    response.mimetype = "application/json"
     return response
 
 
@@ -160,47 +158,117 @@ def download_data_csv() -> Union[Response, WerkzeugResponse]:
     if "user_id" not in session:
         return redirect(url_for("auth.login_page"))
     user_id = session["user_id"]
-    output = io.StringIO()
-    writer = csv.writer(output)
-    writer.writerow(["Diary Entries"])
-    writer.writerow(["Date", "Content", "Rating"])
-    for e in DiaryEntry.query.filter_by(user_id=user_id).all():
-        writer.writerow([e.entry_date, e.content, e.rating])
-    writer.writerow([])
-    writer.writerow(["Goals"])
-    writer.writerow(["Title", "Category", "Status", "Created At"])
-    for g in Goal.query.filter_by(user_id=user_id).all():
-        writer.writerow([g.title, g.category, g.status, g.created_at])
-    writer.writerow([])
-    writer.writerow(["Stats"])
-    writer.writerow(["Date", "Points", "Current Streak", "Longest Streak"])
-    for s in DailyStats.query.filter_by(user_id=user_id).all():
-        writer.writerow([s.date, s.points, s.current_streak, s.longest_streak])
-    response = make_response(output.getvalue())
+
+    # Stream rows as they are fetched instead of building the file in memory
+    response = Response(
+        stream_with_context(generate_csv_export(user_id)), mimetype="text/csv"
+    )
     response.headers["Content-Disposition"] = "attachment; filename=user_data.csv"
-    response.mimetype = "text/csv"
     return response
 
 
+def _export_job_payload(job: ExportJob) -> dict:
+    """Serialize an export job for the status endpoint"""
+    return {
+        "id": job.id,
+        "status": job.status,
+        "file_size": job.file_size,
+        "created_at": job.created_at.isoformat() if job.created_at else None,
+        "finished_at": job.finished_at.isoformat() if job.finished_at else None,
+        "status_url": url_for("user.export_status", job_id=job.id),
+        "download_url": (
+            url_for("user.export_download", job_id=job.id) if job.is_ready else None
+        ),
+    }
+
+
+def _get_own_export_job(job_id: int) -> ExportJob:
+    """Load an export job belonging to the logged-in user, or 404"""
+    job = db.session.get(ExportJob, job_id)
+    if job is None or job.user_id != session["user_id"]:
+        abort(404)
+    return job
+
+
+@user_bp.route("/download-data/export", methods=["POST"])
+def request_data_export() -> Union[Response, WerkzeugResponse, Tuple[Response, int]]:
+    """Queue a background export archive of all the user's data"""
+    if "user_id" not in session:
+        return redirect(url_for("auth.login_page"))
+
+    job = request_export(session["user_id"])
+
+    if request.accept_mimetypes.best == "application/json":
+        return jsonify(_export_job_payload(job)), 202
+
+    if job.is_ready:
+        flash("Your data export is ready to download.", "success")
+    else:
+        flash(
+            "Your data export is being prepared. Check back here in a few minutes.",
+            "info",
+        )
+    return redirect(url_for("user.profile"))
+
+
+@user_bp.route("/download-data/export/<int:job_id>")
+def export_status(job_id: int) -> Union[Response, WerkzeugResponse]:
+    """Report the status of an export job"""
+    if "user_id" not in session:
+        return redirect(url_for("auth.login_page"))
+
+    return jsonify(_export_job_payload(_get_own_export_job(job_id)))
+
+
+@user_bp.route("/download-data/export/<int:job_id>/download")
+def export_download(job_id: int) -> Union[Response, WerkzeugResponse]:
+    """Serve a finished export archive, with range and conditional support"""
+    if "user_id" not in session:
+        return redirect(url_for("auth.login_page"))
+
+    path = get_export_path(_get_own_export_job(job_id))
+    if path is None or not os.path.exists(path):
+        abort(404)
+
+    return send_file(
+        path,
+        mimetype="application/zip",
+        as_attachment=True,
+        download_name="user_data.zip",
+        conditional=True,
+        max_age=0,
+    )
+
+
 @user_bp.route("/delete-account", methods=["GET", "POST"])
 def delete_account() -> Union[str, WerkzeugResponse]:
     if "user_id" not in session:
         return redirect(url_for("auth.login_page"))
 
     form = DeleteAccountForm()
-    user = db.session.get(User, session["user_id"])
+    user = get_current_user()
 
     if form.validate_on_submit():
         if user and user.check_password(form.password.data):
             try:
                 # Delete associated data first
                 DailyStats.query.filter_by(user_id=user.id).delete()
+                StatsRollup.query.filter_by(user_id=user.id).delete()
+                UserStreak.query.filter_by(user_id=user.id).delete()
+                UserDataStamp.query.filter_by(user_id=user.id).delete()
+                UserTotals.query.filter_by(user_id=user.id).delete()
+                PointsOutboxEvent.query.filter_by(user_id=user.id).delete()
+                for job in ExportJob.query.filter_by(user_id=user.id):
+                    delete_export_job(job)
+                WordFrequency.query.filter_by(user_id=user.id).delete()
+                GoalStats.query.filter_by(user_id=user.id).delete()
                 Goal.query.filter_by(user_id=user.id).delete()
                 DiaryEntry.query.filter_by(user_id=user.id).delete()
 
                 # Delete the user
                 db.session.delete(user)
                 db.session.commit()
+                invalidate_user_profile(user.id)
 
                 session.clear()
                 flash("Your account has been successfully deleted.", "success")
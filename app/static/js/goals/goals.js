@@ -1,3 +1,9 @@
 document.addEventListener('DOMContentLoaded',function(){const category_select=document.getElementById('category');const title_input=document.getElementById('title');const suggestions_container=document.getElementById('suggestions');const suggestions_list=document.getElementById('suggestions_list');if(category_select&&title_input){category_select.addEventListener('change',function(){const selected_category=this.value;if(selected_category){const csrf_token=document.querySelector('meta[name="csrf-token"]').getAttribute('content');fetch(`/api/goals/suggestions/${encodeURIComponent(selected_category)}`,{headers:{'X-CSRFToken':csrf_token}}).then(response=>response.json()).then(data=>{if(data.suggestions&&data.suggestions.length>0){suggestions_list.innerHTML='';data.suggestions.forEach(suggestion=>{const item=document.createElement('div');item.className='suggestion_item';item.textContent=suggestion;item.addEventListener('click',function(){title_input.value=suggestion;suggestions_container.style.display='none';});suggestions_list.appendChild(item);});suggestions_container.style.display='block';}else{suggestions_container.style.display='none';}}).catch(error=>{console.error('Error fetching suggestions:',error);suggestions_container.style.display='none';});}else{suggestions_container.style.display='none';}});document.addEventListener('click',function(e){if(!suggestions_container.contains(e.target)&&e.target!==category_select){suggestions_container.style.display='none';}});}const progressBars=document.querySelectorAll('.progress-bar');progressBars.forEach(bar=>{const width=bar.style.width;bar.style.width='0%';setTimeout(()=>{bar.style.width=width;},300);});const goalForm=document.querySelector('form[action*="create_new_goal"]');if(goalForm){goalForm.addEventListener('submit',function(e){const category=document.getElementById('category').value;const title=document.getElementById('title').value.trim();if(!category){e.preventDefault();showAlert('Please select a goal category.','warning');return false;}if(!title){e.preventDefault();showAlert('Please enter a goal title.','warning');return false;}});}const progressTextarea=document.getElementById('progress_notes');if(progressTextarea){let saveTimeout;progressTextarea.addEventListener('input',function(){clearTimeout(saveTimeout);saveTimeout=setTimeout(()=>{console.log('Progress notes changed:',this.value);},2000);});}const completeButtons=document.querySelectorAll('form[action*="mark_goal_complete"] button');completeButtons.forEach(button=>{button.addEventListener('click',function(e){if(!confirm('Are you sure you want to mark this goal as completed?')){e.preventDefault();return false;}});});function showAlert(message,type='info'){const alertDiv=document.createElement('div');alertDiv.className=`alert alert-${type}alert-dismissible fade show`;alertDiv.innerHTML=`
 ${message}<button type="button" class="btn-close" data-bs-dismiss="alert"></button>`;const container=document.querySelector('.container');container.insertBefore(alertDiv,container.firstChild);setTimeout(()=>{if(alertDiv.parentNode){alertDiv.remove();}},5000);}const goalCards=document.querySelectorAll('.goal-card');goalCards.forEach(card=>{card.addEventListener('mouseenter',function(){this.style.transform='translateY(-5px)';});card.addEventListener('mouseleave',function(){this.style.transform='translateY(0)';});});const statNumbers=document.querySelectorAll('.stat-number');statNumbers.forEach(stat=>{const finalValue=parseFloat(stat.textContent);if(!isNaN(finalValue)){animateNumber(stat,0,finalValue,1000);}});function animateNumber(element,start,end,duration){const startTime=performance.now();const isPercentage=element.textContent.includes('%');function updateNumber(currentTime){const elapsed=currentTime-startTime;const progress=Math.min(elapsed/duration,1);const current=start+(end-start)*progress;element.textContent=isPercentage ?
-Math.round(current)+'%':Math.round(current);if(progress<1){requestAnimationFrame(updateNumber);}}requestAnimationFrame(updateNumber);}window.toggle_extra_goals=function(){const extraGoals=document.querySelectorAll('.extra-goal');const btn=document.getElementById('show_more_goals_btn');let expanded=false;extraGoals.forEach(goal=>{if(goal.classList.contains('d-none')){goal.classList.remove('d-none');expanded=true;}else{goal.classList.add('d-none');}});if(btn){btn.textContent=expanded ? 'Show less':'Show more';}}});
\ No newline at end of file
+Math.round(current)+'%':Math.round(current);if(progress<1){requestAnimationFrame(updateNumber);}}requestAnimationFrame(updateNumber);}const csrf_meta=document.querySelector('meta[name="csrf-token"]');const HISTORY_LIMIT=10;const HISTORY_VISIBLE=5;const NO_ACTIVE_GOALS_HTML=[
+'<div class="card goal-card mb-4"><div class="card-body text-center">','<div class="card-icon mb-3"><i class="fas fa-plus-circle"></i></div>','<p class="text-white">No active goals. Set a new goal to get started!</p>','</div></div>'
+].join('');function escape_html(text){const element=document.createElement('div');element.textContent=text;return element.innerHTML;}function format_date(iso){const [year,month,day]=iso.slice(0,10).split('-').map(Number);return new Date(Date.UTC(year,month-1,day)).toLocaleDateString('en-US',{month:'short',day:'2-digit',year:'numeric',timeZone:'UTC'});}function post_json_form(form){return fetch(form.dataset.jsonAction,{method:'POST',body:new FormData(form),credentials:'same-origin',headers:{'Accept':'application/json','X-CSRFToken':csrf_meta ? csrf_meta.getAttribute('content'):''}}).then(response=>response.json().then(data=>({ok:response.ok,status:response.status,data:data})));}function active_goal_card(goal){const csrf_token=csrf_meta ? csrf_meta.getAttribute('content'):'';const card=document.createElement('div');card.className='card goal-card current-goal mb-4';card.dataset.goalId=goal.id;card.innerHTML=[
+'<div class="card-header"><div class="d-flex justify-content-between align-items-center">','<div class="d-flex align-items-center"><div class="card-icon me-3"><i class="fas fa-bullseye"></i></div>','<h5 class="mb-0 text-white">Active Goal</h5></div>',`<div><span class="badge bg-primary">${escape_html(goal.category)}</span></div></div></div>`,'<div class="card-body">',`<h4 class="goal-title text-white">${escape_html(goal.title)}</h4>`,goal.description ? `<p class="goal-description text-white">${escape_html(goal.description)}</p>`:'',`<div class="mb-2"><span class="badge bg-secondary">${'Start:\u0020'+format_date(goal.week_start)}</span>`,`<span class="badge bg-dark">${'End:\u0020'+format_date(goal.week_end)}</span></div>`,'<div class="progress-section mb-3"><div class="d-flex justify-content-between mb-2">','<span class="progress-label text-white">Week Progress</span>',`<span class="progress-percentage text-white">${goal.progress_percentage.toFixed(1)+'%'}</span></div>`,`<div class="progress"><div class="progress-bar" role="progressbar" style="width:${goal.progress_percentage}%" aria-valuenow="${goal.progress_percentage}" aria-valuemin="0" aria-valuemax="100"></div></div>`,`<small class="text-white">${goal.days_remaining+' days remaining'}</small></div>`,`<form action="${goal.urls.complete}" method="POST" class="d-inline goal-action-form" data-action="complete" data-json-action="${goal.urls.complete_json}">`,`<input type="hidden" name="csrf_token" value="${csrf_token}">`,'<button type="submit" class="btn btn-success btn-sm me-2"><i class="fas fa-check me-1"></i>Mark as Complete</button></form>',`<form action="${goal.urls.fail}" method="POST" class="d-inline goal-action-form" data-action="fail" data-json-action="${goal.urls.fail_json}">`,`<input type="hidden" name="csrf_token" value="${csrf_token}">`,'<button type="submit" class="btn btn-danger btn-sm"><i class="fas fa-times me-1"></i>Mark as Not Completed</button></form>','</div>'
+].join('');return card;}function add_active_goal(goal){const container=document.getElementById('active_goals');if(!container){return;}if(!container.querySelector('.current-goal')){container.innerHTML='';}container.prepend(active_goal_card(goal));}function update_overdue_banner(){const banner=document.getElementById('overdue_banner');if(!banner){return;}const count=Number(banner.dataset.count)-1;if(count<=0){banner.remove();return;}banner.dataset.count=count;banner.querySelector('strong').textContent='You have '+count+' overdue goal'+(count>1 ? 's':'')+'\u0020that need review!';}function remove_active_goal(goal_id){const card=document.querySelector(`.current-goal[data-goal-id="${goal_id}"]`);if(card){if(card.classList.contains('overdue-goal')){update_overdue_banner();}card.remove();}const container=document.getElementById('active_goals');if(container&&!container.querySelector('.current-goal')){container.innerHTML=NO_ACTIVE_GOALS_HTML;}}function history_item(goal){const item=document.createElement('div');item.className='history-item';item.dataset.goalId=goal.id;const header=document.createElement('div');header.className='history-header';const title=document.createElement('h6');title.className='history-title text-white';title.textContent=goal.title;const badge=document.createElement('span');const badge_colors={completed:'success',failed:'danger'};badge.className='badge bg-'+(badge_colors[goal.status]||'secondary');badge.textContent=goal.status==='failed'
+? 'Not Completed':goal.status.charAt(0).toUpperCase()+goal.status.slice(1);header.append(title,badge);const category=document.createElement('small');category.className='text-white';category.textContent=goal.category;const created=document.createElement('small');created.className='text-white d-block';created.textContent=goal.created_at ? format_date(goal.created_at):'';item.append(header,category,created);return item;}function add_to_history(goal){const body=document.getElementById('goal_history');if(!body){return;}let list=body.querySelector('.goal-history');if(!list){body.innerHTML='';list=document.createElement('div');list.className='goal-history';body.appendChild(list);}const listed=list.querySelector(`.history-item[data-goal-id="${goal.id}"]`);if(listed){listed.remove();}list.prepend(history_item(goal));const button=document.getElementById('show_more_goals_btn');const expanded=button!==null&&button.textContent==='Show less';list.querySelectorAll('.history-divider,#show_more_goals_btn').forEach(element=>element.remove());const items=Array.from(list.querySelectorAll('.history-item'));items.slice(HISTORY_LIMIT).forEach(item=>item.remove());const kept=items.slice(0,HISTORY_LIMIT);kept.forEach((item,index)=>{const extra=index>=HISTORY_VISIBLE;item.classList.toggle('extra-goal',extra);item.classList.toggle('d-none',extra&&!expanded);if(index<kept.length-1){const divider=document.createElement('hr');const extra_divider=index+1>=HISTORY_VISIBLE;divider.className='history-divider';divider.classList.toggle('extra-goal',extra_divider);divider.classList.toggle('d-none',extra_divider&&!expanded);item.after(divider);}});if(kept.length>HISTORY_VISIBLE){const toggle=document.createElement('button');toggle.className='btn btn-outline-primary btn-sm mt-2';toggle.type='button';toggle.id='show_more_goals_btn';toggle.textContent=expanded ? 'Show less':'Show more';toggle.addEventListener('click',()=>window.toggle_extra_goals());list.appendChild(toggle);}}function set_busy(form,busy){form.querySelectorAll('button').forEach(button=>{button.disabled=busy;});}document.addEventListener('submit',function(e){const form=e.target;if(!form.classList.contains('goal-action-form')||!form.dataset.jsonAction){return;}e.preventDefault();set_busy(form,true);post_json_form(form).then(result=>{const data=result.data;if(data.goal&&(result.ok||result.status===409)){remove_active_goal(data.goal.id);add_to_history(data.goal);}if(result.ok){const points=data.points_awarded
+? '\u0020(+'+data.points_awarded+' points)':'';showAlert(escape_html(data.message)+points,data.category);}else{set_busy(form,false);showAlert(escape_html(data.error||'Something went wrong.'),'warning');}}).catch(error=>{console.error('Error updating goal:',error);form.submit();});});const create_form=document.getElementById('create_goal_form');if(create_form&&create_form.dataset.jsonAction){create_form.addEventListener('submit',function(e){e.preventDefault();if(!document.getElementById('category').value){showAlert('Please select a goal category.','warning');return;}if(!document.getElementById('title').value.trim()){showAlert('Please enter a goal title.','warning');return;}set_busy(create_form,true);post_json_form(create_form).then(result=>{set_busy(create_form,false);const data=result.data;if(result.ok){add_active_goal(data.goal);create_form.reset();if(suggestions_container){suggestions_container.style.display='none';}showAlert(escape_html(data.message),'success');return;}const errors=data.errors ? Object.values(data.errors).flat():[data.error];errors.forEach(message=>showAlert(escape_html(message||'Something went wrong.'),'danger'));}).catch(error=>{console.error('Error creating goal:',error);create_form.submit();});});}window.toggle_extra_goals=function(){const extraGoals=document.querySelectorAll('.extra-goal');const btn=document.getElementById('show_more_goals_btn');let expanded=false;extraGoals.forEach(goal=>{if(goal.classList.contains('d-none')){goal.classList.remove('d-none');expanded=true;}else{goal.classList.add('d-none');}});if(btn){btn.textContent=expanded ? 'Show less':'Show more';}}});
\ No newline at end of file
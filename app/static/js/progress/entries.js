@@ -1 +1,10 @@
-class EntryManager{constructor(){this.init();}init(){}toggle_entry(entry_id){const preview=document.getElementById('preview_'+entry_id);const full=document.getElementById('full_'+entry_id);if(preview.classList.contains('d-none')){preview.classList.remove('d-none');full.classList.add('d-none');}else{preview.classList.add('d-none');full.classList.remove('d-none');}}}window.entryManager=new EntryManager();window.toggle_entry=function(entry_id){window.entryManager.toggle_entry(entry_id);};window.toggle_extra_entries=function(day_index){const extra_entries=document.querySelectorAll('.extra_entry_'+day_index);const btn=document.getElementById('show_more_btn_'+day_index);let expanded=false;extra_entries.forEach(entry=>{if(entry.classList.contains('d-none')){entry.classList.remove('d-none');expanded=true;}else{entry.classList.add('d-none');}});if(btn){btn.textContent=expanded ? 'Show less':'Show more';}}window.toggle_extra_goals=function(){const extra_goals=document.querySelectorAll('.extra-goal');const btn=document.getElementById('show_more_goals_btn');let expanded=false;extra_goals.forEach(goal=>{if(goal.classList.contains('d-none')){goal.classList.remove('d-none');expanded=true;}else{goal.classList.add('d-none');}});if(btn){btn.textContent=expanded ? 'Show less':'Show more';}}
\ No newline at end of file
+class EntryManager{constructor(){this.init();}init(){}toggle_entry(entry_id){const preview=document.getElementById('preview_'+entry_id);const full=document.getElementById('full_'+entry_id);if(preview.classList.contains('d-none')){preview.classList.remove('d-none');full.classList.add('d-none');}else{preview.classList.add('d-none');full.classList.remove('d-none');}}render_top_days(top_days){const container=document.getElementById('top_days');if(container){container.innerHTML=this.top_days_html(top_days);}}top_days_html(top_days){if(!top_days.length){return [
+'<div class="text-center"><div class="empty-state-card">','<i class="fas fa-book-open empty-icon"></i>','<p class="empty-text">No diary entries yet. Start writing to see your top days!</p>','</div></div>'
+].join('');}const escape_html=text=>{const element=document.createElement('div');element.textContent=text;return element.innerHTML;};const date_format={year:'numeric',month:'long',day:'2-digit'};const days=top_days.map((day,day_index)=>{const entries=day.entries.map((entry,index)=>{const entry_id=`${day.date}_${index+1}`;const extra_class=index>=3 ? ` d-none extra-entry extra_entry_${day_index}`:'';const toggle=label=>`<button class="entry-toggle-btn" onclick="toggle_entry('${entry_id}')">${label}</button>`;const preview=entry.content.length>100
+? escape_html(entry.content.slice(0,100))+'...'+toggle('Read more'):escape_html(entry.content);const rating=entry.rating===1
+? '<span class="rating-badge positive"><i class="fas fa-thumbs-up me-1"></i>Encouraged</span>':'<span class="rating-badge negative"><i class="fas fa-thumbs-down me-1"></i>Want to change</span>';return [
+`<div class="entry-item${extra_class}" id="entry_${entry_id}">`,`<div class="entry-preview" id="preview_${entry_id}"><p class="entry-text">${preview}</p></div>`,`<div class="entry-full d-none" id="full_${entry_id}">`,`<p class="entry-text">${escape_html(entry.content)}</p>${toggle('Show less')}</div>`,`<div class="entry-rating">${rating}</div>`,'</div>'
+].join('');});const show_more=day.entries.length>3
+? `<button class="btn btn-outline-primary btn-sm mt-2 show-more-btn" type="button" onclick="toggle_extra_entries(${day_index})" id="show_more_btn_${day_index}">Show more</button>`:'';const date_label=new Date(`${day.date}T00:00:00`).toLocaleDateString('en-US',date_format);return [
+'<div class="col-md-6 col-lg-4 mb-4"><div class="sci-fi-entry-card">','<div class="entry-card-glow"></div>','<div class="entry-card-header">',`<div class="entry-date"><i class="fas fa-calendar-alt me-2"></i>${date_label}</div>`,`<div class="entry-points"><span class="points-badge">${day.points+' pts'}</span></div>`,'</div>',`<div class="entry-card-body">${entries.join('')}${show_more}</div>`,'</div></div>'
+].join('');});return `<div class="row">${days.join('')}</div>`;}}window.entryManager=new EntryManager();window.toggle_entry=function(entry_id){window.entryManager.toggle_entry(entry_id);};window.toggle_extra_entries=function(day_index){const extra_entries=document.querySelectorAll('.extra_entry_'+day_index);const btn=document.getElementById('show_more_btn_'+day_index);let expanded=false;extra_entries.forEach(entry=>{if(entry.classList.contains('d-none')){entry.classList.remove('d-none');expanded=true;}else{entry.classList.add('d-none');}});if(btn){btn.textContent=expanded ? 'Show less':'Show more';}};window.toggle_extra_goals=function(){const extra_goals=document.querySelectorAll('.extra-goal');const btn=document.getElementById('show_more_goals_btn');let expanded=false;extra_goals.forEach(goal=>{if(goal.classList.contains('d-none')){goal.classList.remove('d-none');expanded=true;}else{goal.classList.add('d-none');}});if(btn){btn.textContent=expanded ? 'Show less':'Show more';}};
\ No newline at end of file
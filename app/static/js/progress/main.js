@@ -1 +1 @@
-class ProgressPage{constructor(){this.charts=null;this.init();}init(){this.setup_data();this.init_charts();this.init_tooltips();}setup_data(){const weekday_data_element=document.getElementById('weekday_data');const weekday_config=JSON.parse(weekday_data_element.textContent);window.progress_data={points_data:JSON.parse(document.getElementById('points_data').textContent),weekday_config:weekday_config,goal_stats_data:JSON.parse(document.getElementById('goal_stats_data').textContent)};}init_charts(){this.charts=new ProgressCharts();}init_tooltips(){const tooltip_trigger_list=[].slice.call(document.querySelectorAll('[data-bs-toggle="tooltip"]'));tooltip_trigger_list.map(function(tooltip_trigger_el){return new bootstrap.Tooltip(tooltip_trigger_el);});}}document.addEventListener('DOMContentLoaded',function(){window.progress_page=new ProgressPage();const points_today_card=document.getElementById('points_today_card');if(points_today_card){points_today_card.addEventListener('click',function(){fetch('/api/points-breakdown').then(response=>response.json()).then(data=>{const modal_title=document.getElementById('genericModalLabel');const modal_body=document.getElementById('genericModalBody');modal_title.textContent="Today's Points Breakdown";if(data.length===0){modal_body.innerHTML='<p>No points earned yet today. Go complete a goal or write a diary entry!</p>';}else{let content='<ul class="list-group">';data.forEach(item=>{content+=`<li class="list-group-item d-flex justify-content-between align-items-center">${item.source}<span class="badge bg-primary rounded-pill">${item.points}</span></li>`;});content+='</ul>';modal_body.innerHTML=content;}const modal_element=document.getElementById('genericModal');const modal_content=modal_element.querySelector('.modal-content');const modal_header=modal_element.querySelector('.modal-header');const modal_body_elem=modal_element.querySelector('.modal-body');const modal_footer=modal_element.querySelector('.modal-footer');modal_content.classList.add('points-breakdown');modal_header.classList.add('points-breakdown');modal_body_elem.classList.add('points-breakdown');modal_footer.classList.add('points-breakdown');const modal=new bootstrap.Modal(modal_element);modal.show();modal_element.addEventListener('hidden.bs.modal',function(){modal_content.classList.remove('points-breakdown');modal_header.classList.remove('points-breakdown');modal_body_elem.classList.remove('points-breakdown');modal_footer.classList.remove('points-breakdown');},{once:true});}).catch(error=>{console.error('Error fetching points breakdown:',error);const modal_body=document.getElementById('genericModalBody');modal_body.innerHTML='<p>Could not load points breakdown. Please try again later.</p>';const modal=new bootstrap.Modal(document.getElementById('genericModal'));modal.show();});});}});if(window.wordcloud_data&&document.getElementById('wordcloud')){console.log('Wordcloud data available:',window.wordcloud_data);console.log('Wordcloud element found:',document.getElementById('wordcloud'));function loadWordCloudScript(callback){if(window.WordCloud){console.log('WordCloud library already loaded');callback();return;}console.log('Loading WordCloud library...');var script=document.createElement('script');script.src='https://unpkg.com/wordcloud@1.2.2/src/wordcloud2.min.js';script.onload=function(){console.log('WordCloud library loaded successfully');console.log('WordCloud function available:',typeof window.WordCloud);callback();};script.onerror=function(){console.error('Failed to load WordCloud library from unpkg,trying jsdelivr...');var fallbackScript=document.createElement('script');fallbackScript.src='https://cdn.jsdelivr.net/npm/wordcloud@1.2.2/src/wordcloud2.min.js';fallbackScript.onload=function(){console.log('WordCloud library loaded successfully from jsdelivr');console.log('WordCloud function available:',typeof window.WordCloud);callback();};fallbackScript.onerror=function(){console.error('Failed to load WordCloud library from both CDNs');};document.head.appendChild(fallbackScript);};document.head.appendChild(script);}loadWordCloudScript(function(){console.log('Creating wordcloud with data:',window.wordcloud_data);console.log('Raw wordcloud data type:',typeof window.wordcloud_data);console.log('Raw wordcloud data length:',window.wordcloud_data.length);console.log('First few raw items:',window.wordcloud_data.slice(0,3));var words=window.wordcloud_data.map(function(item){return [item[0],item[1]];});console.log('Processed words:',words);console.log('Sample word data:',words.slice(0,3));console.log('Word data types:',words.slice(0,3).map(w=>[typeof w[0],typeof w[1]]));var wordcloudElem=document.getElementById('wordcloud');console.log('Wordcloud element:',wordcloudElem);WordCloud(wordcloudElem,{list:words,gridSize:12,weightFactor:function(size){const minSize=14;const maxSize=48;return minSize+((size-10)/90)*(maxSize-minSize);},fontFamily:'Orbitron,Arial,sans-serif',color:function(){var colors=['#00d4ff','#ff00ff','#4fd1c7','#fff','#00ffb3','#ff6ec7'];return colors[Math.floor(Math.random()*colors.length)];},backgroundColor:'rgba(26,26,46,1)',rotateRatio:0.2,rotationSteps:2,minSize:14,click:function(item){var word=item[0];window.location.href='/read-diary?search='+encodeURIComponent(word);},drawOutOfBound:false,shuffle:true,hover:window.innerWidth>600,shrinkToFit:true});var exportCanvas=document.getElementById('wordcloud_canvas');if(exportCanvas&&wordcloudElem){var rect=wordcloudElem.getBoundingClientRect();exportCanvas.width=Math.floor(rect.width);exportCanvas.height=Math.floor(rect.height);WordCloud(exportCanvas,{list:words,gridSize:12,weightFactor:function(size){const minSize=14;const maxSize=48;return minSize+((size-10)/90)*(maxSize-minSize);},fontFamily:'Orbitron,Arial,sans-serif',color:function(){var colors=['#00d4ff','#ff00ff','#4fd1c7','#fff','#00ffb3','#ff6ec7'];return colors[Math.floor(Math.random()*colors.length)];},backgroundColor:'rgba(26,26,46,1)',rotateRatio:0.2,rotationSteps:2,minSize:14,drawOutOfBound:false,shuffle:true,shrinkToFit:true});console.log('Wordcloud rendered to export canvas');}else{console.error('Export canvas or wordcloud element not found!');}});}else{console.log('Wordcloud conditions not met:');console.log('-wordcloudData available:',!!window.wordcloud_data);console.log('-wordcloud element exists:',!!document.getElementById('wordcloud'));if(window.wordcloud_data){console.log('-wordcloudData:',window.wordcloud_data);}}
\ No newline at end of file
+class ProgressPage{constructor(){this.charts=null;this.init();}init(){this.setup_data();this.init_charts();this.init_tooltips();}setup_data(){this.widget_urls=JSON.parse(document.getElementById('progress_widgets').textContent);window.progress_data={};}load_widget(name){return fetch(this.widget_urls[name],{credentials:'same-origin'}).then(response=>{if(!response.ok){throw new Error(`Widget ${name}failed with ${response.status}`);}return response.json();}).then(data=>{window.progress_data[name]=data;return data;});}init_charts(){this.charts=new ProgressCharts();const widgets={'points':data=>this.charts.init_points_chart(data.points),'weekday':data=>this.charts.init_weekday_chart(data),'goal-stats':data=>this.charts.init_goal_category_chart(data),'top-days':data=>window.entryManager.render_top_days(data.top_days),'wordcloud':data=>{if(data.has_sufficient_data&&document.getElementById('wordcloud')){render_wordcloud(data.words);}}};Object.entries(widgets).forEach(([name,render])=>{this.load_widget(name).then(render).catch(error=>console.error(`Error loading ${name}widget:`,error));});}init_tooltips(){const tooltip_trigger_list=[].slice.call(document.querySelectorAll('[data-bs-toggle="tooltip"]'));tooltip_trigger_list.map(function(tooltip_trigger_el){return new bootstrap.Tooltip(tooltip_trigger_el);});}}document.addEventListener('DOMContentLoaded',function(){window.progress_page=new ProgressPage();const points_today_card=document.getElementById('points_today_card');if(points_today_card){points_today_card.addEventListener('click',function(){fetch('/api/points-breakdown').then(response=>response.json()).then(data=>{const modal_title=document.getElementById('genericModalLabel');const modal_body=document.getElementById('genericModalBody');modal_title.textContent="Today's Points Breakdown";if(data.length===0){modal_body.innerHTML='<p>No points earned yet today. Go complete a goal or write a diary entry!</p>';}else{let content='<ul class="list-group">';data.forEach(item=>{content+=`<li class="list-group-item d-flex justify-content-between align-items-center">${item.source}<span class="badge bg-primary rounded-pill">${item.points}</span></li>`;});content+='</ul>';modal_body.innerHTML=content;}const modal_element=document.getElementById('genericModal');const modal_content=modal_element.querySelector('.modal-content');const modal_header=modal_element.querySelector('.modal-header');const modal_body_elem=modal_element.querySelector('.modal-body');const modal_footer=modal_element.querySelector('.modal-footer');modal_content.classList.add('points-breakdown');modal_header.classList.add('points-breakdown');modal_body_elem.classList.add('points-breakdown');modal_footer.classList.add('points-breakdown');const modal=new bootstrap.Modal(modal_element);modal.show();modal_element.addEventListener('hidden.bs.modal',function(){modal_content.classList.remove('points-breakdown');modal_header.classList.remove('points-breakdown');modal_body_elem.classList.remove('points-breakdown');modal_footer.classList.remove('points-breakdown');},{once:true});}).catch(error=>{console.error('Error fetching points breakdown:',error);const modal_body=document.getElementById('genericModalBody');modal_body.innerHTML='<p>Could not load points breakdown. Please try again later.</p>';const modal=new bootstrap.Modal(document.getElementById('genericModal'));modal.show();});});}});function loadWordCloudScript(callback){if(window.WordCloud){console.log('WordCloud library already loaded');callback();return;}console.log('Loading WordCloud library...');var script=document.createElement('script');script.src='https://unpkg.com/wordcloud@1.2.2/src/wordcloud2.min.js';script.onload=function(){console.log('WordCloud library loaded successfully');console.log('WordCloud function available:',typeof window.WordCloud);callback();};script.onerror=function(){console.error('Failed to load WordCloud library from unpkg,trying jsdelivr...');var fallbackScript=document.createElement('script');fallbackScript.src='https://cdn.jsdelivr.net/npm/wordcloud@1.2.2/src/wordcloud2.min.js';fallbackScript.onload=function(){console.log('WordCloud library loaded successfully from jsdelivr');console.log('WordCloud function available:',typeof window.WordCloud);callback();};fallbackScript.onerror=function(){console.error('Failed to load WordCloud library from both CDNs');};document.head.appendChild(fallbackScript);};document.head.appendChild(script);}function render_wordcloud(wordcloud_data){loadWordCloudScript(function(){console.log('Creating wordcloud with data:',wordcloud_data);console.log('Raw wordcloud data type:',typeof wordcloud_data);console.log('Raw wordcloud data length:',wordcloud_data.length);console.log('First few raw items:',wordcloud_data.slice(0,3));var words=wordcloud_data.map(function(item){return [item[0],item[1]];});console.log('Processed words:',words);console.log('Sample word data:',words.slice(0,3));console.log('Word data types:',words.slice(0,3).map(w=>[typeof w[0],typeof w[1]]));var wordcloudElem=document.getElementById('wordcloud');console.log('Wordcloud element:',wordcloudElem);WordCloud(wordcloudElem,{list:words,gridSize:12,weightFactor:function(size){const minSize=14;const maxSize=48;return minSize+((size-10)/90)*(maxSize-minSize);},fontFamily:'Orbitron,Arial,sans-serif',color:function(){var colors=['#00d4ff','#ff00ff','#4fd1c7','#fff','#00ffb3','#ff6ec7'];return colors[Math.floor(Math.random()*colors.length)];},backgroundColor:'rgba(26,26,46,1)',rotateRatio:0.2,rotationSteps:2,minSize:14,click:function(item){var word=item[0];window.location.href='/read-diary?search='+encodeURIComponent(word);},drawOutOfBound:false,shuffle:true,hover:window.innerWidth>600,shrinkToFit:true});var exportCanvas=document.getElementById('wordcloud_canvas');if(exportCanvas&&wordcloudElem){var rect=wordcloudElem.getBoundingClientRect();exportCanvas.width=Math.floor(rect.width);exportCanvas.height=Math.floor(rect.height);WordCloud(exportCanvas,{list:words,gridSize:12,weightFactor:function(size){const minSize=14;const maxSize=48;return minSize+((size-10)/90)*(maxSize-minSize);},fontFamily:'Orbitron,Arial,sans-serif',color:function(){var colors=['#00d4ff','#ff00ff','#4fd1c7','#fff','#00ffb3','#ff6ec7'];return colors[Math.floor(Math.random()*colors.length)];},backgroundColor:'rgba(26,26,46,1)',rotateRatio:0.2,rotationSteps:2,minSize:14,drawOutOfBound:false,shuffle:true,shrinkToFit:true});console.log('Wordcloud rendered to export canvas');}else{console.error('Export canvas or wordcloud element not found!');}});}
\ No newline at end of file
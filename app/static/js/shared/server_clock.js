@@ -1 +1 @@
-class ServerClock{constructor(elementId,serverTimeISO,timezone){this.element=document.getElementById(elementId);this.timezone=timezone;if(!this.element){console.error(`Server clock element with id '${elementId}' not found`);return;}this.serverTime=new Date(serverTimeISO);this.startTime=Date.now();console.log('Server clock initialized for UTC time display');this.updateClock();this.interval=setInterval(()=>this.updateClock(),1000);}updateClock(){const elapsed=Date.now()-this.startTime;const currentTime=new Date(this.serverTime.getTime()+elapsed);const timeString=currentTime.toISOString().slice(11,19);this.element.textContent=`Server Time:${timeString}${this.timezone}`;}destroy(){if(this.interval){clearInterval(this.interval);this.interval=null;}}}document.addEventListener('DOMContentLoaded',function(){const serverTimeElement=document.getElementById('server-time-data');if(serverTimeElement){const serverTime=serverTimeElement.dataset.serverTime;const timezone=serverTimeElement.dataset.timezone;console.log('Initializing server clock with:',serverTime,timezone);new ServerClock('server-clock',serverTime,timezone);}else{console.error('Server time data element not found');}});
\ No newline at end of file
+class ServerClock{constructor(elementId,serverTimeISO,timezone){this.element=document.getElementById(elementId);this.timezone=timezone;if(!this.element){console.error(`Server clock element with id '${elementId}' not found`);return;}this.serverTime=new Date(serverTimeISO);this.startTime=Date.now();if(this.startTime-this.serverTime.getTime()>60000){this.serverTime=new Date(this.startTime);}console.log('Server clock initialized for UTC time display');this.updateClock();this.interval=setInterval(()=>this.updateClock(),1000);}updateClock(){const elapsed=Date.now()-this.startTime;const currentTime=new Date(this.serverTime.getTime()+elapsed);const timeString=currentTime.toISOString().slice(11,19);this.element.textContent=`Server Time:${timeString}${this.timezone}`;}destroy(){if(this.interval){clearInterval(this.interval);this.interval=null;}}}document.addEventListener('DOMContentLoaded',function(){const serverTimeElement=document.getElementById('server-time-data');if(serverTimeElement){const serverTime=serverTimeElement.dataset.serverTime;const timezone=serverTimeElement.dataset.timezone;console.log('Initializing server clock with:',serverTime,timezone);new ServerClock('server-clock',serverTime,timezone);}else{console.error('Server time data element not found');}});
\ No newline at end of file
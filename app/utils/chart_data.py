@@ -0,0 +1,153 @@
+"""
+Chart Data - Downsampled cumulative points for the progress chart.
+
+The cumulative series is computed in the database with a window function, so
+a date range can be requested without summing everything before it in
+Python. Series longer than the requested resolution are reduced with
+Largest-Triangle-Three-Buckets (LTTB), which keeps the peaks, dips and steps
+that give the line its shape. The progress page embeds an overview and the
+chart fetches finer detail for the visible range as the user zooms or pans.
+"""
+
+from datetime import date
+from typing import Any, List, Optional, Sequence, Tuple
+from sqlalchemy import func, select
+from ..models import db, DailyStats
+
+# Points embedded in the page and the most a single request may ask for
+DEFAULT_CHART_RESOLUTION = 300
+MAX_CHART_RESOLUTION = 2000
+
+
+def lttb(series: Sequence[Tuple[float, float]], threshold: int) -> List[int]:
+    """Pick the indices of ``threshold`` points that best preserve the shape.
+
+    The first and last points are always kept. The rest of the series is
+    split into equal buckets, and from each bucket the point forming the
+    largest triangle with the previously kept point and the average of the
+    next bucket is chosen.
+
+    Args:
+        series: (x, y) pairs ordered by x.
+        threshold: Number of points to keep.
+
+    Returns:
+        Indices into ``series`` of the kept points, in order.
+    """
+    length = len(series)
+    if threshold >= length:
+        return list(range(length))
+    if threshold < 3:
+        raise ValueError("LTTB needs to keep at least 3 points")
+
+    bucket_size = (length - 2) / (threshold - 2)
+    kept = [0]
+    previous = 0
+
+    for bucket in range(threshold - 2):
+        start = int(bucket * bucket_size) + 1
+        end = int((bucket + 1) * bucket_size) + 1
+
+        # Average of the next bucket (or the last point for the final bucket)
+        next_start = end
+        next_end = min(int((bucket + 2) * bucket_size) + 1, length)
+        if next_start >= next_end:
+            next_start, next_end = length - 1, length
+        count = next_end - next_start
+        avg_x = sum(series[i][0] for i in range(next_start, next_end)) / count
+        avg_y = sum(series[i][1] for i in range(next_start, next_end)) / count
+
+        prev_x, prev_y = series[previous]
+        best, best_area = start, -1.0
+        for i in range(start, end):
+            x, y = series[i]
+            area = abs(
+                (prev_x - avg_x) * (y - prev_y) - (prev_x - x) * (avg_y - prev_y)
+            )
+            if area > best_area:
+                best, best_area = i, area
+        kept.append(best)
+        previous = best
+
+    kept.append(length - 1)
+    return kept
+
+
+def downsample_points(
+    points_data: List[List[Any]], resolution: int
+) -> List[List[Any]]:
+    """Downsample ``[date_string, cumulative]`` pairs with LTTB.
+
+    Args:
+        points_data: Pairs ordered by date, as the chart expects them.
+        resolution: Maximum number of pairs to return.
+
+    Returns:
+        The pairs that were kept.
+    """
+    if len(points_data) <= resolution:
+        return points_data
+    series = [
+        (date.fromisoformat(day).toordinal(), value) for day, value in points_data
+    ]
+    return [points_data[i] for i in lttb(series, resolution)]
+
+
+def get_cumulative_points(
+    user_id: int, start: Optional[date] = None, end: Optional[date] = None
+) -> List[List[Any]]:
+    """Return ``[date_string, cumulative]`` pairs for a date range.
+
+    Cumulative totals include every day before ``start``.
+
+    Args:
+        user_id: The ID of the user.
+        start: First day to return (inclusive), from the beginning when None.
+        end: Last day to return (inclusive), up to the latest day when None.
+
+    Returns:
+        Pairs ordered by date.
+    """
+    running = (
+        select(
+            DailyStats.date,
+            func.sum(func.coalesce(DailyStats.points, 0))
+            .over(order_by=DailyStats.date)
+            .label("cumulative"),
+        )
+        .where(DailyStats.user_id == user_id)
+        .subquery()
+    )
+    query = select(running.c.date, running.c.cumulative).order_by(running.c.date)
+    if start is not None:
+        query = query.where(running.c.date >= start)
+    if end is not None:
+        query = query.where(running.c.date <= end)
+    return [[str(row.date), row.cumulative] for row in db.session.execute(query)]
+
+
+def get_chart_data(
+    user_id: int,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    resolution: int = DEFAULT_CHART_RESOLUTION,
+) -> dict:
+    """Return the cumulative points chart for a range at a given resolution.
+
+    Args:
+        user_id: The ID of the user.
+        start: First day of the range (inclusive), all history when None.
+        end: Last day of the range (inclusive), up to the latest day when None.
+        resolution: Maximum number of points, capped at MAX_CHART_RESOLUTION.
+
+    Returns:
+        Dict with the ``points``, the number of days in the range
+        (``total``) and whether the series was ``downsampled``.
+    """
+    resolution = max(3, min(resolution, MAX_CHART_RESOLUTION))
+    points = get_cumulative_points(user_id, start, end)
+    return {
+        "points": downsample_points(points, resolution),
+        "total": len(points),
+        "downsampled": len(points) > resolution,
+    }
@@ -0,0 +1,72 @@
+"""
+Checkpoints - Resume points for long-running maintenance jobs.
+
+A job loads its checkpoint by name, skips work at or before the stored
+(user_id, date) position, and advances the checkpoint in the same transaction
+as each chunk it commits. Once a job finishes, the next run starts over.
+"""
+
+from datetime import date, datetime, timezone
+from typing import Optional
+from ..models import db, MaintenanceCheckpoint
+
+
+def load_checkpoint(name: str, restart: bool = False) -> MaintenanceCheckpoint:
+    """Return the checkpoint for a job, creating or resetting it as needed.
+
+    Args:
+        name: Unique job name, e.g. ``"integrity-repair"``.
+        restart: Discard any unfinished progress.
+
+    Returns:
+        The committed checkpoint to resume from.
+    """
+    checkpoint = MaintenanceCheckpoint.query.filter_by(name=name).first()
+    if checkpoint is None:
+        checkpoint = MaintenanceCheckpoint(name=name, processed=0)
+        db.session.add(checkpoint)
+    elif restart or checkpoint.is_finished:
+        checkpoint.last_user_id = None
+        checkpoint.last_date = None
+        checkpoint.processed = 0
+        checkpoint.started_at = datetime.now(timezone.utc)
+        checkpoint.updated_at = None
+        checkpoint.finished_at = None
+    db.session.commit()
+    return checkpoint
+
+
+def is_done(
+    checkpoint: MaintenanceCheckpoint, user_id: int, day: Optional[date] = None
+) -> bool:
+    """Whether a (user_id, date) position was completed by an earlier run."""
+    if checkpoint.last_user_id is None:
+        return False
+    if user_id != checkpoint.last_user_id:
+        return user_id < checkpoint.last_user_id
+    if day is None or checkpoint.last_date is None:
+        return True
+    return day <= checkpoint.last_date
+
+
+def advance_checkpoint(
+    checkpoint: MaintenanceCheckpoint,
+    user_id: int,
+    day: Optional[date] = None,
+    processed: int = 0,
+) -> None:
+    """Move the checkpoint forward without committing.
+
+    Call this before committing a chunk so the work and the checkpoint are
+    saved together.
+    """
+    checkpoint.last_user_id = user_id
+    checkpoint.last_date = day
+    checkpoint.processed += processed
+    checkpoint.updated_at = datetime.now(timezone.utc)
+
+
+def finish_checkpoint(checkpoint: MaintenanceCheckpoint) -> None:
+    """Mark a job as complete and commit."""
+    checkpoint.finished_at = datetime.now(timezone.utc)
+    db.session.commit()
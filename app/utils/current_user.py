@@ -0,0 +1,94 @@
+"""
+Current User - Request-scoped access to the logged-in user.
+
+The User row is loaded at most once per request and kept on ``flask.g``, so
+routes, context processors and helpers share it. The fields templates need on
+every page (email, user name, display name) are also available as a
+UserProfile snapshot, which can optionally be cached across requests with
+USER_PROFILE_CACHE. The cache is per process and entries expire after
+USER_PROFILE_CACHE_TIMEOUT seconds; change_username invalidates the entry in
+the process that handled it.
+"""
+
+import time
+from typing import Dict, NamedTuple, Optional, Tuple
+from flask import current_app, g, session
+from ..models import db, User
+
+# user_id -> (expires_at, profile), per process
+_profile_cache: Dict[int, Tuple[float, "UserProfile"]] = {}
+
+
+class UserProfile(NamedTuple):
+    """Profile fields that are read on every page view."""
+
+    id: int
+    email: str
+    user_name: Optional[str]
+
+    @property
+    def display_name(self) -> str:
+        """The user name, or the email prefix if no user name is set."""
+        return self.user_name if self.user_name else self.email.split("@")[0]
+
+
+def get_current_user() -> Optional[User]:
+    """Return the logged-in User, loading it at most once per request.
+
+    Returns:
+        The User for the session, or None if nobody is logged in.
+    """
+    user_id = session.get("user_id")
+    if user_id is None:
+        return None
+
+    if "current_user" not in g or g.current_user_id != user_id:
+        g.current_user = db.session.get(User, user_id)
+        g.current_user_id = user_id
+    return g.current_user
+
+
+def get_current_profile() -> Optional[UserProfile]:
+    """Return the logged-in user's profile fields.
+
+    Uses the cross-request profile cache when USER_PROFILE_CACHE is enabled,
+    otherwise the request's User row.
+
+    Returns:
+        UserProfile for the session, or None if nobody is logged in.
+    """
+    user_id = session.get("user_id")
+    if user_id is None:
+        return None
+
+    if "current_profile" in g and g.current_profile.id == user_id:
+        return g.current_profile
+
+    use_cache = current_app.config.get("USER_PROFILE_CACHE", False)
+    profile = None
+    if use_cache:
+        cached = _profile_cache.get(user_id)
+        if cached is not None and cached[0] > time.monotonic():
+            profile = cached[1]
+
+    if profile is None:
+        user = get_current_user()
+        if user is None:
+            return None
+        profile = UserProfile(user.id, user.email, user.user_name)
+        if use_cache:
+            timeout = current_app.config.get("USER_PROFILE_CACHE_TIMEOUT", 300)
+            _profile_cache[user_id] = (time.monotonic() + timeout, profile)
+
+    g.current_profile = profile
+    return profile
+
+
+def invalidate_user_profile(user_id: int) -> None:
+    """Drop a user's cached profile after their profile fields change.
+
+    Args:
+        user_id: The ID of the user whose profile changed.
+    """
+    _profile_cache.pop(user_id, None)
+    g.pop("current_profile", None)
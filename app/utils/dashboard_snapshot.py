@@ -0,0 +1,183 @@
+"""
+Dashboard Snapshot - Aggregated data for the /progress page.
+
+Collects every figure the progress dashboard shows from a small, fixed number
+of queries, instead of one or more queries per widget. Totals, weekday
+averages and the trend come from the weekly and monthly rollups; only the
+chart and the best days still read daily_stats. The number of queries does
+not grow with the length of the user's history.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+from datetime import date, datetime, timezone
+from ..models import db, DiaryEntry, DailyStats, Goal
+from .goal_helpers import get_current_goals, get_goal_statistics
+from .progress_helpers import WEEKDAY_NAMES, trend_message_from_rollups
+from .rollups import load_rollups
+from .streak_engine import get_streak_summary
+
+# Days with points up to which the chart shows one point per day; longer
+# histories are charted per week from the rollups
+CHART_DAILY_DAYS = 365
+
+
+@dataclass
+class DashboardSnapshot:
+    """Everything the progress dashboard renders for one user."""
+
+    points_today: int = 0
+    total_points: int = 0
+    current_streak: int = 0
+    longest_streak: int = 0
+    total_entries: int = 0
+    num_positive: int = 0
+    num_change: int = 0
+    unique_weekdays_count: int = 0
+    first_entry_date: Optional[date] = None
+    points_data: List[List[Any]] = field(default_factory=list)
+    top_days: List[Dict[str, Any]] = field(default_factory=list)
+    weekday_data: List[Dict[str, Any]] = field(default_factory=list)
+    trend_message: str = ""
+    current_goals: List[Goal] = field(default_factory=list)
+    goal_stats: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def has_sufficient_weekday_data(self) -> bool:
+        """Weekday chart unlocks once entries exist on two different weekdays."""
+        return self.unique_weekdays_count >= 2
+
+    @property
+    def is_new_user(self) -> bool:
+        """New users have not written any diary entries yet."""
+        return self.total_entries == 0
+
+
+def get_longest_recorded_streak(user_id: int) -> int:
+    """Return the longest streak recorded in the user's daily stats."""
+    return (
+        db.session.query(db.func.max(DailyStats.longest_streak))
+        .filter_by(user_id=user_id)
+        .scalar()
+        or 0
+    )
+
+
+def get_best_days(user_id: int, limit: int = 3) -> List[Any]:
+    """Return the user's highest-scoring days as (date, points) rows."""
+    return (
+        db.session.query(DailyStats.date, DailyStats.points)
+        .filter_by(user_id=user_id)
+        .filter(DailyStats.points > 0)
+        .order_by(DailyStats.points.desc())
+        .limit(limit)
+        .all()
+    )
+
+
+def top_days_with_entries(user_id: int, best_days: List[Any]) -> List[Dict]:
+    """Attach the diary entries for each best day, in a single query.
+
+    Args:
+        user_id: The ID of the user.
+        best_days: Rows with ``date`` and ``points``, best first.
+
+    Returns:
+        Dicts with the day's ``date``, ``points`` and ``entries``.
+    """
+    if not best_days:
+        return []
+    top_entries = (
+        DiaryEntry.query.filter(
+            DiaryEntry.user_id == user_id,
+            DiaryEntry.entry_date.in_([day.date for day in best_days]),
+        )
+        .order_by(DiaryEntry.id)
+        .all()
+    )
+    return [
+        {
+            "date": day.date,
+            "points": day.points,
+            "entries": [e for e in top_entries if e.entry_date == day.date],
+        }
+        for day in best_days
+    ]
+
+
+def build_dashboard_snapshot(
+    user_id: int, today: Optional[date] = None, widgets: bool = True
+) -> DashboardSnapshot:
+    """Build the progress dashboard data for a user.
+
+    Args:
+        user_id: The ID of the user.
+        today: Today's date (defaults to the current UTC date).
+        widgets: Whether to build the chart series and best days. The progress
+            page shell leaves them to the widget endpoints.
+
+    Returns:
+        A populated DashboardSnapshot.
+    """
+    if today is None:
+        today = datetime.now(timezone.utc).date()
+
+    snapshot = DashboardSnapshot()
+
+    # 1. Totals, weekday averages and the trend from the weekly/monthly rollups
+    rollups = load_rollups(user_id)
+    snapshot.total_points = rollups.total_points
+    snapshot.points_today = rollups.day_points(today)
+    snapshot.total_entries = rollups.total_entries
+    snapshot.num_positive = rollups.num_positive
+    snapshot.num_change = rollups.num_change
+    snapshot.first_entry_date = rollups.first_entry_date
+    snapshot.unique_weekdays_count = rollups.unique_weekdays_with_entries
+    snapshot.weekday_data = [
+        {"name": name, "avg_points": avg_points}
+        for name, avg_points in zip(WEEKDAY_NAMES, rollups.weekday_averages())
+    ]
+    snapshot.trend_message = trend_message_from_rollups(rollups, today)
+
+    # 2. Chart, longest streak and best days: from the daily rows for normal
+    # histories, from the weekly rollups plus two small queries for long ones
+    best_days = []
+    if not widgets:
+        snapshot.longest_streak = get_longest_recorded_streak(user_id)
+    elif rollups.active_days <= CHART_DAILY_DAYS:
+        stats_rows = (
+            db.session.query(
+                DailyStats.date, DailyStats.points, DailyStats.longest_streak
+            )
+            .filter_by(user_id=user_id)
+            .order_by(DailyStats.date)
+            .all()
+        )
+        cumulative_points = 0
+        for row in stats_rows:
+            cumulative_points += row.points or 0
+            snapshot.points_data.append([str(row.date), cumulative_points])
+            snapshot.longest_streak = max(
+                snapshot.longest_streak, row.longest_streak or 0
+            )
+        best_days = sorted(
+            (row for row in stats_rows if (row.points or 0) > 0),
+            key=lambda row: row.points,
+            reverse=True,
+        )[:3]
+    else:
+        snapshot.points_data = rollups.weekly_points_data(today)
+        snapshot.longest_streak = get_longest_recorded_streak(user_id)
+        best_days = get_best_days(user_id)
+
+    # 3. Entries for the three best days, in a single query
+    snapshot.top_days = top_days_with_entries(user_id, best_days)
+
+    # 4. Streaks from the maintained streak state
+    snapshot.current_streak = get_streak_summary(user_id, today).current
+
+    # 5. Goals
+    snapshot.current_goals = get_current_goals(user_id)
+    snapshot.goal_stats = get_goal_statistics(user_id)
+
+    return snapshot
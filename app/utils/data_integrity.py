@@ -0,0 +1,397 @@
+"""
+Data Integrity - Find and repair DailyStats rows the PointsLog doesn't explain.
+
+find_stats_mismatches() compares every DailyStats row with points against its
+PointsLog total, and gathers the diary and goal context for each mismatch, in
+a single join-and-aggregate query. repair_missing_entries() adds the missing
+PointsLog rows in chunks, committing each chunk with a checkpoint so an
+interrupted repair resumes where it stopped.
+"""
+
+import csv
+import json
+from dataclasses import asdict, dataclass, field
+from datetime import date, datetime, timezone
+from typing import Callable, Dict, List, Optional, Set, TextIO, Tuple
+from sqlalchemy import and_, case, func, insert, select
+from ..models import db, DailyStats, DiaryEntry, Goal, PointsLog, User
+from ..models.goal import GoalStatus
+from ..models.points_log import PointsSourceType
+from .checkpoints import (
+    advance_checkpoint,
+    finish_checkpoint,
+    is_done,
+    load_checkpoint,
+)
+from .points_service import describe_award
+
+# Mismatched days repaired per transaction
+REPAIR_CHUNK_SIZE = 200
+
+REPAIR_CHECKPOINT = "integrity-repair"
+
+REPORT_FIELDS = (
+    "user_id",
+    "date",
+    "daily_stats",
+    "points_log",
+    "difference",
+    "diary_entries",
+    "expected_diary_points",
+    "goals",
+    "expected_goal_points",
+    "estimated_login_bonuses",
+)
+
+_FINAL_GOAL_STATUSES = (GoalStatus.COMPLETED, GoalStatus.FAILED)
+_AWARD_SOURCES = (
+    PointsSourceType.DIARY_ENTRY.value,
+    PointsSourceType.GOAL_COMPLETED.value,
+    PointsSourceType.GOAL_FAILED.value,
+)
+
+
+@dataclass
+class IntegrityIssue:
+    """A day whose DailyStats points differ from its PointsLog total."""
+
+    user_id: int
+    date: date
+    daily_stats: int
+    points_log: int
+    diary_entries: int
+    expected_diary_points: int
+    goals: int
+    expected_goal_points: int
+
+    @property
+    def difference(self) -> int:
+        """Points in DailyStats that have no PointsLog row."""
+        return self.daily_stats - self.points_log
+
+    @property
+    def estimated_login_bonuses(self) -> int:
+        """Points left over once diary and goal awards are accounted for."""
+        expected = self.expected_diary_points + self.expected_goal_points
+        return max(0, self.daily_stats - expected)
+
+    def to_dict(self) -> Dict:
+        data = asdict(self)
+        data["date"] = self.date.isoformat()
+        data["difference"] = self.difference
+        data["estimated_login_bonuses"] = self.estimated_login_bonuses
+        return {name: data[name] for name in REPORT_FIELDS}
+
+
+@dataclass
+class IntegrityReport:
+    """Result of a full integrity analysis."""
+
+    users: int
+    daily_stats_with_points: int
+    points_log_entries: int
+    issues: List[IntegrityIssue] = field(default_factory=list)
+    generated_at: datetime = field(
+        default_factory=lambda: datetime.now(timezone.utc)
+    )
+
+
+def find_stats_mismatches(
+    min_user_id: Optional[int] = None, max_user_id: Optional[int] = None
+) -> List[IntegrityIssue]:
+    """Return every DailyStats day with points that PointsLog doesn't match.
+
+    Args:
+        min_user_id: First user ID to check (inclusive), all when None.
+        max_user_id: Last user ID to check (inclusive), all when None.
+
+    Returns:
+        The mismatched days, ordered by user and date.
+    """
+    log_totals = (
+        select(
+            PointsLog.user_id,
+            PointsLog.date,
+            func.sum(PointsLog.points).label("total"),
+        )
+        .group_by(PointsLog.user_id, PointsLog.date)
+        .subquery()
+    )
+    log_total = func.coalesce(log_totals.c.total, 0)
+
+    mismatch_query = (
+        select(
+            DailyStats.user_id,
+            DailyStats.date,
+            DailyStats.points,
+            log_total.label("log_total"),
+        )
+        .outerjoin(
+            log_totals,
+            and_(
+                log_totals.c.user_id == DailyStats.user_id,
+                log_totals.c.date == DailyStats.date,
+            ),
+        )
+        .where(DailyStats.points > 0, log_total != DailyStats.points)
+    )
+    if min_user_id is not None:
+        mismatch_query = mismatch_query.where(DailyStats.user_id >= min_user_id)
+    if max_user_id is not None:
+        mismatch_query = mismatch_query.where(DailyStats.user_id <= max_user_id)
+    mismatches = mismatch_query.cte("mismatches")
+
+    diary = (
+        select(
+            mismatches.c.user_id,
+            mismatches.c.date,
+            func.count(DiaryEntry.id).label("entries"),
+            func.sum(case((DiaryEntry.rating == 1, 5), else_=2)).label("points"),
+        )
+        .join(
+            DiaryEntry,
+            and_(
+                DiaryEntry.user_id == mismatches.c.user_id,
+                DiaryEntry.entry_date == mismatches.c.date,
+            ),
+        )
+        .group_by(mismatches.c.user_id, mismatches.c.date)
+        .subquery()
+    )
+    goals = (
+        select(
+            mismatches.c.user_id,
+            mismatches.c.date,
+            func.count(Goal.id).label("goals"),
+            func.sum(case((Goal.status == GoalStatus.COMPLETED, 10), else_=1)).label(
+                "points"
+            ),
+        )
+        .join(
+            Goal,
+            and_(
+                Goal.user_id == mismatches.c.user_id,
+                Goal.week_start <= mismatches.c.date,
+                Goal.week_end >= mismatches.c.date,
+                Goal.status.in_(_FINAL_GOAL_STATUSES),
+            ),
+        )
+        .group_by(mismatches.c.user_id, mismatches.c.date)
+        .subquery()
+    )
+
+    rows = db.session.execute(
+        select(
+            mismatches.c.user_id,
+            mismatches.c.date,
+            mismatches.c.points,
+            mismatches.c.log_total,
+            func.coalesce(diary.c.entries, 0),
+            func.coalesce(diary.c.points, 0),
+            func.coalesce(goals.c.goals, 0),
+            func.coalesce(goals.c.points, 0),
+        )
+        .outerjoin(
+            diary,
+            and_(
+                diary.c.user_id == mismatches.c.user_id,
+                diary.c.date == mismatches.c.date,
+            ),
+        )
+        .outerjoin(
+            goals,
+            and_(
+                goals.c.user_id == mismatches.c.user_id,
+                goals.c.date == mismatches.c.date,
+            ),
+        )
+        .order_by(mismatches.c.user_id, mismatches.c.date)
+    )
+    return [IntegrityIssue(*row) for row in rows]
+
+
+def analyze_data_integrity() -> IntegrityReport:
+    """Check all users and return the report with summary counts."""
+    return IntegrityReport(
+        users=db.session.query(func.count(User.id)).scalar(),
+        daily_stats_with_points=db.session.query(func.count(DailyStats.id))
+        .filter(DailyStats.points > 0)
+        .scalar(),
+        points_log_entries=db.session.query(func.count(PointsLog.id)).scalar(),
+        issues=find_stats_mismatches(),
+    )
+
+
+def write_json_report(report: IntegrityReport, stream: TextIO) -> None:
+    """Write the report as a JSON document with a summary and the issues."""
+    json.dump(
+        {
+            "generated_at": report.generated_at.isoformat(),
+            "summary": {
+                "users": report.users,
+                "daily_stats_with_points": report.daily_stats_with_points,
+                "points_log_entries": report.points_log_entries,
+                "inconsistencies": len(report.issues),
+            },
+            "issues": [issue.to_dict() for issue in report.issues],
+        },
+        stream,
+        indent=2,
+    )
+    stream.write("\n")
+
+
+def write_csv_report(report: IntegrityReport, stream: TextIO) -> None:
+    """Write the issues as CSV, one row per mismatched day."""
+    writer = csv.DictWriter(stream, fieldnames=REPORT_FIELDS)
+    writer.writeheader()
+    for issue in report.issues:
+        writer.writerow(issue.to_dict())
+
+
+def _repair_rows(chunk: List[IntegrityIssue]) -> List[Dict]:
+    """Build the PointsLog rows that explain a chunk of mismatched days.
+
+    Diary entries and goals are loaded once for the whole chunk. A diary entry
+    or goal that already has a PointsLog row, on any day, is not awarded again.
+    """
+    user_ids = {issue.user_id for issue in chunk}
+    days = {issue.date for issue in chunk}
+
+    awarded: Set[Tuple[str, int]] = set(
+        db.session.execute(
+            select(PointsLog.source_type, PointsLog.source_id).where(
+                PointsLog.user_id.in_(user_ids),
+                PointsLog.source_type.in_(_AWARD_SOURCES),
+                PointsLog.source_id.isnot(None),
+            )
+        ).all()
+    )
+
+    diary_by_day: Dict[Tuple[int, date], List] = {}
+    for entry in db.session.execute(
+        select(
+            DiaryEntry.id, DiaryEntry.user_id, DiaryEntry.entry_date, DiaryEntry.rating
+        )
+        .where(DiaryEntry.user_id.in_(user_ids), DiaryEntry.entry_date.in_(days))
+        .order_by(DiaryEntry.id)
+    ):
+        diary_by_day.setdefault((entry.user_id, entry.entry_date), []).append(entry)
+
+    goals_by_user: Dict[int, List] = {}
+    for goal in db.session.execute(
+        select(
+            Goal.id,
+            Goal.user_id,
+            Goal.title,
+            Goal.status,
+            Goal.week_start,
+            Goal.week_end,
+        )
+        .where(
+            Goal.user_id.in_(user_ids),
+            Goal.status.in_(_FINAL_GOAL_STATUSES),
+            Goal.week_start <= max(days),
+            Goal.week_end >= min(days),
+        )
+        .order_by(Goal.id)
+    ):
+        goals_by_user.setdefault(goal.user_id, []).append(goal)
+
+    rows = []
+    for issue in chunk:
+        missing = issue.difference
+        created = 0
+
+        def add(source_type, points, description, source_id=None):
+            rows.append(
+                {
+                    "user_id": issue.user_id,
+                    "date": issue.date,
+                    "points": points,
+                    "source_type": source_type.value,
+                    "source_id": source_id,
+                    "description": description,
+                }
+            )
+            if source_id is not None:
+                awarded.add((source_type.value, source_id))
+
+        for entry in diary_by_day.get((issue.user_id, issue.date), []):
+            source = PointsSourceType.DIARY_ENTRY
+            if (source.value, entry.id) in awarded:
+                continue
+            points, description = describe_award(source, rating=entry.rating)
+            if created + points <= missing:
+                add(source, points, description, entry.id)
+                created += points
+
+        for goal in goals_by_user.get(issue.user_id, []):
+            if not goal.week_start <= issue.date <= goal.week_end:
+                continue
+            source = (
+                PointsSourceType.GOAL_COMPLETED
+                if goal.status == GoalStatus.COMPLETED
+                else PointsSourceType.GOAL_FAILED
+            )
+            if (source.value, goal.id) in awarded:
+                continue
+            points, description = describe_award(source, goal_title=goal.title)
+            if created + points <= missing:
+                add(source, points, description, goal.id)
+                created += points
+
+        # Whatever is left came from daily login bonuses, one point each
+        for _ in range(missing - created):
+            add(PointsSourceType.DAILY_LOGIN, 1, "Daily Login Bonus")
+
+    return rows
+
+
+def repair_missing_entries(
+    issues: List[IntegrityIssue],
+    chunk_size: int = REPAIR_CHUNK_SIZE,
+    restart: bool = False,
+    progress: Optional[Callable[[int, int], None]] = None,
+) -> int:
+    """Add the PointsLog rows missing for the given mismatched days.
+
+    Only days where DailyStats has more points than the PointsLog can be
+    repaired this way. Each chunk is inserted and committed together with the
+    ``integrity-repair`` checkpoint; days at or before the checkpoint are
+    skipped, so re-running after a crash continues where it stopped.
+
+    Args:
+        issues: Mismatches from find_stats_mismatches().
+        chunk_size: Days repaired per transaction.
+        restart: Ignore the checkpoint of an unfinished earlier run.
+        progress: Called with (days done, days total) after each chunk.
+
+    Returns:
+        Number of PointsLog rows created.
+    """
+    checkpoint = load_checkpoint(REPAIR_CHECKPOINT, restart=restart)
+    pending = sorted(
+        (
+            issue
+            for issue in issues
+            if issue.difference > 0
+            and not is_done(checkpoint, issue.user_id, issue.date)
+        ),
+        key=lambda issue: (issue.user_id, issue.date),
+    )
+
+    created = 0
+    for start in range(0, len(pending), chunk_size):
+        chunk = pending[start : start + chunk_size]
+        rows = _repair_rows(chunk)
+        if rows:
+            db.session.execute(insert(PointsLog), rows)
+        advance_checkpoint(checkpoint, chunk[-1].user_id, chunk[-1].date, len(chunk))
+        db.session.commit()
+        created += len(rows)
+        if progress is not None:
+            progress(start + len(chunk), len(pending))
+
+    finish_checkpoint(checkpoint)
+    return created
@@ -0,0 +1,150 @@
+"""
+Data Stamp - A per-user version for conditional GETs.
+
+Diary entry, daily stats, goal, points and profile writes bump the user's
+row in user_data_stamps. The user's pages (/diary, /progress, /goals,
+/read-diary) and the JSON API derive a private ETag from that version, so a
+conditional GET for an unchanged page is answered with a 304 after a single
+primary-key lookup, before the view runs any of its queries.
+
+Bulk writes that bypass the ORM call touch_user_data() themselves.
+"""
+
+import hashlib
+import os
+import time
+from datetime import date, datetime, time as day_start, timezone
+from typing import Dict, NamedTuple, Optional, Tuple
+from flask import Flask, current_app, session
+from flask_wtf.csrf import generate_csrf
+from sqlalchemy import select
+from ..models import db, UserDataStamp
+from ..models.database import dialect_insert, get_dialect, get_executor
+
+# Stamp for users with no recorded writes (no data, or written before stamps)
+NEVER = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+# Pages and path prefixes answered from the data version
+REVALIDATED_PAGES = ("/diary", "/progress", "/goals", "/read-diary")
+REVALIDATED_PREFIXES = ("/api/",)
+
+# Template and static file fingerprint per app root, when RELEASE_ID is unset
+_release_ids: Dict[str, str] = {}
+
+
+class DataVersion(NamedTuple):
+    """How many times, and when last, a user's data was written."""
+
+    version: int
+    updated_at: datetime
+
+
+def touch_user_data(
+    user_id: int, connection=None, now: Optional[datetime] = None
+) -> None:
+    """Bump a user's data version.
+
+    Args:
+        user_id: The ID of the user whose data was written.
+        connection: Optional connection to run on instead of the session.
+        now: The time of the write (defaults to the current UTC time).
+    """
+    if now is None:
+        now = datetime.now(timezone.utc)
+    table = UserDataStamp.__table__
+    stmt = dialect_insert(get_dialect(connection), table)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c.user_id],
+        set_={
+            "updated_at": stmt.excluded.updated_at,
+            "version": table.c.version + 1,
+        },
+    )
+    get_executor(connection).execute(
+        stmt, {"user_id": user_id, "updated_at": now, "version": 1}
+    )
+
+
+def get_data_version(user_id: int) -> DataVersion:
+    """Return a user's data version and when it last changed, in UTC.
+
+    Args:
+        user_id: The ID of the user.
+
+    Returns:
+        The DataVersion, or version 0 at NEVER if nothing has been recorded.
+    """
+    row = db.session.execute(
+        select(UserDataStamp.version, UserDataStamp.updated_at).where(
+            UserDataStamp.user_id == user_id
+        )
+    ).first()
+    if row is None:
+        return DataVersion(0, NEVER)
+    updated_at = row.updated_at
+    # SQLite hands back naive datetimes; stamps are always stored in UTC
+    if updated_at.tzinfo is None:
+        updated_at = updated_at.replace(tzinfo=timezone.utc)
+    return DataVersion(row.version, updated_at)
+
+
+def is_revalidated_path(path: str) -> bool:
+    """Whether responses for ``path`` are validated by the data version."""
+    return path in REVALIDATED_PAGES or path.startswith(REVALIDATED_PREFIXES)
+
+
+def release_id(app: Flask) -> str:
+    """Identify the deployed templates and assets.
+
+    RELEASE_ID from the config, or a fingerprint of the template and static
+    file timestamps, so pages cached before a deploy are not reused after it.
+    """
+    configured = app.config.get("RELEASE_ID")
+    if configured:
+        return configured
+    if app.root_path not in _release_ids:
+        digest = hashlib.sha1()
+        for folder in (app.template_folder, app.static_folder):
+            if folder is None:
+                continue
+            root = os.path.join(app.root_path, folder)
+            for directory, _, files in sorted(os.walk(root)):
+                for name in sorted(files):
+                    path = os.path.join(directory, name)
+                    digest.update(f"{path}:{os.path.getmtime(path)}".encode())
+        _release_ids[app.root_path] = digest.hexdigest()[:12]
+    return _release_ids[app.root_path]
+
+
+def _session_fingerprint() -> str:
+    """Fingerprint what a cached page embeds from the session.
+
+    Pages carry a CSRF token tied to the session's raw token and signed with
+    a timestamp, so they are revalidated when the session changes and at
+    least twice per token lifetime.
+    """
+    generate_csrf()  # Make sure the session has its raw token before hashing it
+    field_name = current_app.config.get("WTF_CSRF_FIELD_NAME", "csrf_token")
+    time_limit = current_app.config.get("WTF_CSRF_TIME_LIMIT", 3600)
+    window = int(time.time() // (time_limit / 2)) if time_limit else 0
+    raw = f"{session.get(field_name, '')}:{window}:{release_id(current_app)}"
+    return hashlib.sha1(raw.encode()).hexdigest()[:12]
+
+
+def data_validators(user_id: int, today: date) -> Tuple[str, datetime]:
+    """Return the ETag and Last-Modified for one of the user's responses.
+
+    Some figures depend on the current day as well as the stored data, so
+    both validators also change at midnight UTC.
+
+    Args:
+        user_id: The ID of the user.
+        today: Today's date.
+
+    Returns:
+        (etag, last_modified) for the response.
+    """
+    stamp = get_data_version(user_id)
+    etag = f"{user_id}-{stamp.version}-{today.isoformat()}-{_session_fingerprint()}"
+    midnight = datetime.combine(today, day_start.min, tzinfo=timezone.utc)
+    return etag, max(stamp.updated_at, midnight)
@@ -0,0 +1,71 @@
+"""
+Diary Navigation - Date lookups for paging through the diary reader.
+
+Every lookup is a MIN/MAX or EXISTS over the (user_id, entry_date) index, so
+finding the first, previous or next diary day costs the same whether the user
+has written for a week or for years. Nothing loads the full list of dates.
+"""
+
+from datetime import date
+from typing import NamedTuple, Optional
+from sqlalchemy import exists, func, select
+from ..models import db, DiaryEntry
+
+
+class DiaryDateRange(NamedTuple):
+    """The first and last dates a user has diary entries for."""
+
+    first: Optional[date]
+    last: Optional[date]
+
+
+class DayNavigation(NamedTuple):
+    """Whether a day has entries, and the diary days either side of it."""
+
+    exists: bool
+    prev_date: Optional[date]
+    next_date: Optional[date]
+
+
+def get_diary_date_range(user_id: int) -> DiaryDateRange:
+    """Get the first and last diary dates for a user.
+
+    Args:
+        user_id: The ID of the user.
+
+    Returns:
+        DiaryDateRange, with both dates None when the diary is empty.
+    """
+    row = db.session.execute(
+        select(
+            func.min(DiaryEntry.entry_date), func.max(DiaryEntry.entry_date)
+        ).where(DiaryEntry.user_id == user_id)
+    ).one()
+    return DiaryDateRange(row[0], row[1])
+
+
+def get_day_navigation(user_id: int, day: date) -> DayNavigation:
+    """Look up a diary day and its neighbours in a single query.
+
+    Args:
+        user_id: The ID of the user.
+        day: The date being read.
+
+    Returns:
+        DayNavigation with the nearest earlier and later diary dates.
+    """
+    user_entries = DiaryEntry.user_id == user_id
+    day_exists = exists().where(user_entries, DiaryEntry.entry_date == day)
+    prev_date = (
+        select(func.max(DiaryEntry.entry_date))
+        .where(user_entries, DiaryEntry.entry_date < day)
+        .scalar_subquery()
+    )
+    next_date = (
+        select(func.min(DiaryEntry.entry_date))
+        .where(user_entries, DiaryEntry.entry_date > day)
+        .scalar_subquery()
+    )
+
+    row = db.session.execute(select(day_exists, prev_date, next_date)).one()
+    return DayNavigation(bool(row[0]), row[1], row[2])
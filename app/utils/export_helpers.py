@@ -0,0 +1,187 @@
+"""
+Export Helpers - Streaming exports of a user's data.
+
+Rows are read in batches with ``yield_per`` (a server-side cursor on
+PostgreSQL) and written out one record at a time, so memory use stays flat
+however long a user's history is. The generators are meant to be wrapped in
+``stream_with_context`` and returned as a streaming Response.
+"""
+
+import csv
+import io
+import json
+from typing import Any, Dict, Iterator
+from sqlalchemy import select
+from ..models import db, DiaryEntry, Goal, DailyStats
+
+# Rows fetched from the database per round trip
+EXPORT_BATCH_SIZE = 500
+
+
+def _enum_value(value: Any) -> str:
+    return value.value if hasattr(value, "value") else str(value)
+
+
+def iter_diary_entries(user_id: int) -> Iterator[Dict[str, Any]]:
+    """Yield a user's diary entries as export records, oldest first."""
+    rows = db.session.execute(
+        select(DiaryEntry.entry_date, DiaryEntry.content, DiaryEntry.rating)
+        .where(DiaryEntry.user_id == user_id)
+        .order_by(DiaryEntry.id)
+        .execution_options(yield_per=EXPORT_BATCH_SIZE)
+    )
+    for row in rows:
+        yield {
+            "date": row.entry_date.isoformat(),
+            "content": row.content,
+            "rating": row.rating,
+        }
+
+
+def iter_goals(user_id: int) -> Iterator[Dict[str, Any]]:
+    """Yield a user's goals as export records, oldest first."""
+    rows = db.session.execute(
+        select(Goal.title, Goal.category, Goal.status, Goal.created_at)
+        .where(Goal.user_id == user_id)
+        .order_by(Goal.id)
+        .execution_options(yield_per=EXPORT_BATCH_SIZE)
+    )
+    for row in rows:
+        yield {
+            "title": row.title,
+            "category": _enum_value(row.category),
+            "status": _enum_value(row.status),
+            "created_at": row.created_at.isoformat() if row.created_at else None,
+        }
+
+
+def iter_daily_stats(user_id: int) -> Iterator[Dict[str, Any]]:
+    """Yield a user's daily stats as export records, oldest first."""
+    rows = db.session.execute(
+        select(
+            DailyStats.date,
+            DailyStats.points,
+            DailyStats.current_streak,
+            DailyStats.longest_streak,
+        )
+        .where(DailyStats.user_id == user_id)
+        .order_by(DailyStats.date)
+        .execution_options(yield_per=EXPORT_BATCH_SIZE)
+    )
+    for row in rows:
+        yield {
+            "date": row.date.isoformat(),
+            "points": row.points,
+            "current_streak": row.current_streak,
+            "longest_streak": row.longest_streak,
+        }
+
+
+def _json_member(key: str, value: Any) -> str:
+    """Render one top-level member the way json.dumps(indent=2) does."""
+    rendered = json.dumps(value, indent=2).replace("\n", "\n  ")
+    return f"  {json.dumps(key)}: {rendered}"
+
+
+def _json_array(key: str, records: Iterator[Dict[str, Any]]) -> Iterator[str]:
+    """Stream a top-level array member, one record per chunk."""
+    first = True
+    for record in records:
+        rendered = json.dumps(record, indent=2).replace("\n", "\n    ")
+        prefix = f"  {json.dumps(key)}: [\n    " if first else ",\n    "
+        yield prefix + rendered
+        first = False
+    yield f"  {json.dumps(key)}: []" if first else "\n  ]"
+
+
+def generate_json_export(user_id: int, email: str, user_name: str) -> Iterator[str]:
+    """Stream a user's data export as an indented JSON document.
+
+    Produces the same document as ``json.dumps(data, indent=2)`` over the full
+    export, without ever holding more than one batch of rows.
+
+    Args:
+        user_id: The ID of the user being exported.
+        email: The user's email address.
+        user_name: The user's display name (may be None).
+
+    Yields:
+        Chunks of the JSON document.
+    """
+    yield "{\n"
+    yield _json_member("user", {"email": email, "user_name": user_name})
+    yield ",\n"
+    yield from _json_array("diary_entries", iter_diary_entries(user_id))
+    yield ",\n"
+    yield from _json_array("goals", iter_goals(user_id))
+    yield ",\n"
+    yield from _json_array("stats", iter_daily_stats(user_id))
+    yield "\n}"
+
+
+def generate_csv_export(user_id: int) -> Iterator[str]:
+    """Stream a user's data export as CSV.
+
+    The layout matches the original export: a titled section each for diary
+    entries, goals and stats, separated by blank rows. Output is flushed after
+    each section header and every EXPORT_BATCH_SIZE rows.
+
+    Args:
+        user_id: The ID of the user being exported.
+
+    Yields:
+        Chunks of CSV text.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    def flush() -> str:
+        chunk = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate(0)
+        return chunk
+
+    sections = [
+        (
+            "Diary Entries",
+            ["Date", "Content", "Rating"],
+            select(DiaryEntry.entry_date, DiaryEntry.content, DiaryEntry.rating)
+            .where(DiaryEntry.user_id == user_id)
+            .order_by(DiaryEntry.id),
+        ),
+        (
+            "Goals",
+            ["Title", "Category", "Status", "Created At"],
+            select(Goal.title, Goal.category, Goal.status, Goal.created_at)
+            .where(Goal.user_id == user_id)
+            .order_by(Goal.id),
+        ),
+        (
+            "Stats",
+            ["Date", "Points", "Current Streak", "Longest Streak"],
+            select(
+                DailyStats.date,
+                DailyStats.points,
+                DailyStats.current_streak,
+                DailyStats.longest_streak,
+            )
+            .where(DailyStats.user_id == user_id)
+            .order_by(DailyStats.date),
+        ),
+    ]
+
+    for index, (title, header, stmt) in enumerate(sections):
+        if index:
+            writer.writerow([])
+        writer.writerow([title])
+        writer.writerow(header)
+        yield flush()
+
+        rows = db.session.execute(
+            stmt.execution_options(yield_per=EXPORT_BATCH_SIZE)
+        )
+        for count, row in enumerate(rows, start=1):
+            writer.writerow(list(row))
+            if count % EXPORT_BATCH_SIZE == 0:
+                yield flush()
+        yield flush()
@@ -0,0 +1,230 @@
+"""
+Export Jobs - Background data exports for large accounts.
+
+A user requests an export and the request returns immediately with a pending
+ExportJob. The export worker (``flask export-worker``) claims the job, writes
+a zip archive with the JSON and CSV exports to EXPORT_DIR and marks the job
+ready; the archive is then served from disk with range support. Finished jobs
+and their files are removed after EXPORT_RETENTION_HOURS. Jobs left running
+for EXPORT_JOB_TIMEOUT_MINUTES, e.g. by a worker that was killed, are marked
+failed so the user can request a new export.
+
+With EXPORT_JOBS_INLINE enabled the archive is built during the request, so
+tests and local development need no worker.
+"""
+
+import os
+import secrets
+import time
+import zipfile
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+from flask import current_app
+from sqlalchemy import update
+from ..models import db, ExportJob, User
+from ..models.export_job import ExportStatus
+from .export_helpers import generate_csv_export, generate_json_export
+
+
+def get_export_dir() -> str:
+    """Return the directory archives are written to, creating it if needed."""
+    export_dir = current_app.config.get("EXPORT_DIR") or os.path.join(
+        current_app.instance_path, "exports"
+    )
+    os.makedirs(export_dir, exist_ok=True)
+    return export_dir
+
+
+def get_export_path(job: ExportJob) -> Optional[str]:
+    """Return the archive path for a ready job, or None."""
+    if not job.is_ready or not job.file_name:
+        return None
+    return os.path.join(get_export_dir(), job.file_name)
+
+
+def get_latest_export_job(user_id: int) -> Optional[ExportJob]:
+    """Return the user's most recent export job, if any."""
+    return (
+        ExportJob.query.filter_by(user_id=user_id)
+        .order_by(ExportJob.created_at.desc(), ExportJob.id.desc())
+        .first()
+    )
+
+
+def request_export(user_id: int) -> ExportJob:
+    """Queue an export for a user.
+
+    A user has at most one export in progress; requesting another returns it,
+    unless it has been running for longer than EXPORT_JOB_TIMEOUT_MINUTES.
+
+    Args:
+        user_id: The ID of the user to export.
+
+    Returns:
+        The pending (or already running) ExportJob.
+    """
+    fail_stale_exports(user_id)
+    job = get_latest_export_job(user_id)
+    if job is None or not job.is_in_progress:
+        job = ExportJob(user_id=user_id, status=ExportStatus.PENDING.value)
+        db.session.add(job)
+        db.session.commit()
+
+    if current_app.config.get("EXPORT_JOBS_INLINE"):
+        build_export_archive(job.id)
+    return job
+
+
+def _claim_job(job_id: int) -> bool:
+    """Move a pending job to running; False if another worker took it."""
+    result = db.session.execute(
+        update(ExportJob)
+        .where(ExportJob.id == job_id)
+        .where(ExportJob.status == ExportStatus.PENDING.value)
+        .values(
+            status=ExportStatus.RUNNING.value,
+            started_at=datetime.now(timezone.utc),
+        )
+    )
+    db.session.commit()
+    return result.rowcount == 1
+
+
+def fail_stale_exports(user_id: Optional[int] = None) -> int:
+    """Mark jobs running for longer than EXPORT_JOB_TIMEOUT_MINUTES as failed.
+
+    Args:
+        user_id: Only fail this user's jobs (defaults to every user's).
+
+    Returns:
+        Number of jobs failed.
+    """
+    minutes = current_app.config.get("EXPORT_JOB_TIMEOUT_MINUTES", 30)
+    now = datetime.now(timezone.utc)
+    # A Core UPDATE: the commit below expires any loaded jobs anyway
+    stmt = (
+        update(ExportJob.__table__)
+        .where(ExportJob.status == ExportStatus.RUNNING.value)
+        .where(ExportJob.started_at < now - timedelta(minutes=minutes))
+        .values(
+            status=ExportStatus.FAILED.value,
+            error=f"Export did not finish within {minutes} minutes",
+            finished_at=now,
+        )
+    )
+    if user_id is not None:
+        stmt = stmt.where(ExportJob.user_id == user_id)
+    result = db.session.execute(stmt)
+    db.session.commit()
+    return result.rowcount
+
+
+def build_export_archive(job_id: int) -> bool:
+    """Build the archive for a pending export job.
+
+    Args:
+        job_id: The ID of the export job.
+
+    Returns:
+        True if this call built the archive, False if the job was not pending.
+    """
+    if not _claim_job(job_id):
+        return False
+
+    partial_path = None
+    try:
+        job = db.session.get(ExportJob, job_id)
+        user = db.session.get(User, job.user_id)
+        if user is None:
+            raise ValueError(f"User {job.user_id} no longer exists")
+        file_name = f"export-{job.id}-{secrets.token_hex(8)}.zip"
+        path = os.path.join(get_export_dir(), file_name)
+        partial_path = f"{path}.part"
+
+        with zipfile.ZipFile(partial_path, "w", zipfile.ZIP_DEFLATED) as archive:
+            json_chunks = generate_json_export(user.id, user.email, user.user_name)
+            with archive.open("user_data.json", "w") as member:
+                for chunk in json_chunks:
+                    member.write(chunk.encode("utf-8"))
+            with archive.open("user_data.csv", "w") as member:
+                for chunk in generate_csv_export(user.id):
+                    member.write(chunk.encode("utf-8"))
+        os.replace(partial_path, path)
+    except Exception as e:
+        db.session.rollback()
+        if partial_path is not None and os.path.exists(partial_path):
+            os.remove(partial_path)
+        current_app.logger.exception(f"Export job {job_id} failed")
+        job = db.session.get(ExportJob, job_id)
+        if job is not None:
+            job.status = ExportStatus.FAILED.value
+            job.error = str(e)
+            job.finished_at = datetime.now(timezone.utc)
+            db.session.commit()
+        return True
+
+    job.status = ExportStatus.READY.value
+    job.file_name = file_name
+    job.file_size = os.path.getsize(path)
+    job.finished_at = datetime.now(timezone.utc)
+    db.session.commit()
+    return True
+
+
+def delete_export_job(job: ExportJob) -> None:
+    """Delete a job and its archive without committing."""
+    path = get_export_path(job)
+    if path and os.path.exists(path):
+        os.remove(path)
+    db.session.delete(job)
+
+
+def cleanup_expired_exports() -> int:
+    """Delete finished jobs older than EXPORT_RETENTION_HOURS, with their files.
+
+    Also fails jobs that have been running for too long, so they are deleted
+    in turn once they expire.
+
+    Returns:
+        Number of jobs deleted.
+    """
+    fail_stale_exports()
+    hours = current_app.config.get("EXPORT_RETENTION_HOURS", 24)
+    cutoff = datetime.now(timezone.utc) - timedelta(hours=hours)
+    expired = ExportJob.query.filter(
+        ExportJob.status.in_([ExportStatus.READY.value, ExportStatus.FAILED.value]),
+        ExportJob.finished_at < cutoff,
+    ).all()
+    for job in expired:
+        delete_export_job(job)
+    db.session.commit()
+    return len(expired)
+
+
+def process_pending_exports(limit: int = 10) -> int:
+    """Build archives for up to ``limit`` pending jobs, oldest first.
+
+    Returns:
+        Number of jobs processed.
+    """
+    job_ids = [
+        row.id
+        for row in db.session.query(ExportJob.id)
+        .filter_by(status=ExportStatus.PENDING.value)
+        .order_by(ExportJob.id)
+        .limit(limit)
+    ]
+    return sum(1 for job_id in job_ids if build_export_archive(job_id))
+
+
+def run_export_worker(poll_interval: float = 5.0) -> None:
+    """Build pending exports forever, removing expired ones between passes.
+
+    Args:
+        poll_interval: Seconds to wait after finding no pending jobs
+    """
+    while True:
+        processed = process_pending_exports()
+        cleanup_expired_exports()
+        if processed == 0:
+            time.sleep(poll_interval)
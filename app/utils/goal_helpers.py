@@ -1,7 +1,16 @@
-from typing import Optional, List, Dict, Any
+from dataclasses import dataclass, field
+from typing import Optional, List, Dict, Any, Iterable, Tuple
 from datetime import datetime, date, timezone
+from sqlalchemy import func, or_, select
 from ..models.goal import Goal, GoalCategory, GoalStatus
-from ..models.database import db
+from ..models.goal_stats import GoalStats
+from ..models.database import db, dialect_insert, get_dialect, get_executor
+
+# Past goals listed under "Recent Goals"
+GOAL_HISTORY_LIMIT = 10
+
+# Statuses counted in goal_stats
+FINISHED_STATUSES = (GoalStatus.COMPLETED, GoalStatus.FAILED)
 
 
 def get_current_goals(user_id: int) -> List[Goal]:
@@ -58,30 +67,78 @@ def create_goal(
     return goal
 
 
-def update_goal_progress(goal_id: int, progress_notes: str) -> Optional[Goal]:
-    goal = Goal.query.get(goal_id)
+def get_user_goal(goal_id: int, user_id: Optional[int] = None) -> Optional[Goal]:
+    """Load a goal, optionally only if it belongs to the given user.
+
+    Args:
+        goal_id: The ID of the goal.
+        user_id: The ID of the user who must own the goal, or None for any.
+
+    Returns:
+        The Goal, or None if it does not exist or belongs to someone else.
+    """
+    goal = db.session.get(Goal, goal_id)
+    if goal is None or (user_id is not None and goal.user_id != user_id):
+        return None
+    return goal
+
+
+def update_goal_progress(
+    goal_id: int, progress_notes: str, user_id: Optional[int] = None
+) -> Optional[Goal]:
+    goal = get_user_goal(goal_id, user_id)
     if goal:
         goal.progress_notes = progress_notes
         db.session.commit()
     return goal
 
 
-def complete_goal(goal_id: int) -> Optional[Goal]:
-    goal = Goal.query.get(goal_id)
+def complete_goal(
+    goal_id: int, user_id: Optional[int] = None, commit: bool = True
+) -> Optional[Goal]:
+    goal = get_user_goal(goal_id, user_id)
     if goal and goal.status == GoalStatus.ACTIVE:
         goal.status = GoalStatus.COMPLETED
-        db.session.commit()
+        if commit:
+            db.session.commit()
     return goal
 
 
-def fail_goal(goal_id: int) -> Optional[Goal]:
-    goal = Goal.query.get(goal_id)
+def fail_goal(
+    goal_id: int, user_id: Optional[int] = None, commit: bool = True
+) -> Optional[Goal]:
+    goal = get_user_goal(goal_id, user_id)
     if goal and goal.status == GoalStatus.ACTIVE:
         goal.status = GoalStatus.FAILED
-        db.session.commit()
+        if commit:
+            db.session.commit()
     return goal
 
 
+def goal_to_dict(goal: Goal) -> Dict[str, Any]:
+    """Serialize a goal for the JSON API.
+
+    Args:
+        goal: The Goal to serialize.
+
+    Returns:
+        Dictionary of the goal's fields, progress and dates.
+    """
+    return {
+        "id": goal.id,
+        "title": goal.title,
+        "category": goal.category.value,
+        "description": goal.description,
+        "status": goal.status.value,
+        "progress_notes": goal.progress_notes,
+        "days_remaining": goal.days_remaining,
+        "progress_percentage": goal.progress_percentage,
+        "week_start": goal.week_start.strftime("%Y-%m-%d"),
+        "week_end": goal.week_end.strftime("%Y-%m-%d"),
+        "created_at": goal.created_at.isoformat() if goal.created_at else None,
+    }
+
+
 def get_goal_history(user_id: int, limit: int = 10) -> List[Goal]:
     return (
         Goal.query.filter_by(user_id=user_id)
@@ -91,38 +148,166 @@ def get_goal_history(user_id: int, limit: int = 10) -> List[Goal]:
     )
 
 
-def get_goal_statistics(user_id: int) -> Dict[str, Any]:
-    """Gather statistics about a user's goals.
-    
+def _enum_name(value) -> str:
+    return value.name if hasattr(value, "name") else value
+
+
+def _counter_key(goal_state) -> Optional[Tuple[str, str]]:
+    """The (category, status) counter a goal belongs to, if it is finished."""
+    if goal_state is None:
+        return None
+    category, status = goal_state
+    if _enum_name(status) not in {s.name for s in FINISHED_STATUSES}:
+        return None
+    return _enum_name(category), _enum_name(status)
+
+
+def record_goal_change(
+    user_id: int, old_state, new_state, connection=None
+) -> None:
+    """Move a goal between the user's goal_stats counters.
+
     Args:
-        user_id: The ID of the user to get statistics for.
-        
+        user_id: The ID of the goal's owner.
+        old_state: (category, status) before the change, None for a new goal.
+        new_state: (category, status) after the change, None for a deleted goal.
+        connection: Optional connection to run on instead of the session.
+    """
+    deltas: Dict[Tuple[str, str], int] = {}
+    old_key, new_key = _counter_key(old_state), _counter_key(new_state)
+    if old_key == new_key:
+        return
+    if old_key is not None:
+        deltas[old_key] = -1
+    if new_key is not None:
+        deltas[new_key] = 1
+
+    table = GoalStats.__table__
+    stmt = dialect_insert(get_dialect(connection), table)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c.user_id, table.c.category, table.c.status],
+        set_={"count": table.c["count"] + stmt.excluded["count"]},
+    )
+    get_executor(connection).execute(
+        stmt,
+        [
+            {"user_id": user_id, "category": category, "status": status, "count": n}
+            for (category, status), n in deltas.items()
+        ],
+    )
+
+
+def compute_goal_counts(user_ids: List[int], connection=None) -> List[Any]:
+    """Count finished goals per user, category and status from the goals table.
+
+    Args:
+        user_ids: The IDs of the users to count goals for.
+        connection: Optional connection to run on instead of the session.
+
     Returns:
-        Dictionary containing goal statistics including completion rate,
-        category breakdowns, and total counts.
+        (user_id, category, status, count) rows.
     """
-    goals = Goal.query.filter(
-        Goal.user_id == user_id,
-        Goal.status.in_([GoalStatus.COMPLETED, GoalStatus.FAILED]),
-    ).all()
+    return (
+        get_executor(connection)
+        .execute(
+            select(Goal.user_id, Goal.category, Goal.status, func.count())
+            .where(
+                Goal.user_id.in_(user_ids),
+                Goal.status.in_(FINISHED_STATUSES),
+            )
+            .group_by(Goal.user_id, Goal.category, Goal.status)
+        )
+        .all()
+    )
 
-    completed_goals = sum(1 for g in goals if g.status == GoalStatus.COMPLETED)
-    failed_goals = sum(1 for g in goals if g.status == GoalStatus.FAILED)
-    total_past_goals = completed_goals + failed_goals
 
-    success_rate = (
-        (completed_goals / total_past_goals * 100) if total_past_goals > 0 else 0
+def rebuild_goal_stats(user_ids: List[int], connection=None) -> int:
+    """Recompute the goal_stats counters of some users from their goals.
+
+    Used after bulk goal writes that bypass the ORM. Does not commit.
+
+    Args:
+        user_ids: The IDs of the users whose goals changed.
+        connection: Optional connection to run on instead of the session.
+
+    Returns:
+        Number of counter rows written.
+    """
+    if not user_ids:
+        return 0
+    executor = get_executor(connection)
+    table = GoalStats.__table__
+    rows = [
+        {
+            "user_id": user_id,
+            "category": category.name,
+            "status": status.name,
+            "count": count,
+        }
+        for user_id, category, status, count in compute_goal_counts(
+            user_ids, connection
+        )
+    ]
+    executor.execute(table.delete().where(table.c.user_id.in_(user_ids)))
+    if rows:
+        executor.execute(table.insert(), rows)
+    return len(rows)
+
+
+def count_goals(user_id: int) -> List[Tuple[GoalCategory, GoalStatus, int]]:
+    """Read a user's finished goal counts per category and status.
+
+    Reads the goal_stats counters through Core, so changes made by the
+    flush-time listeners earlier in the same transaction are visible.
+
+    Args:
+        user_id: The ID of the user to count goals for.
+
+    Returns:
+        (category, status, count) rows for every completed or failed
+        combination the user has.
+    """
+    table = GoalStats.__table__
+    rows = db.session.execute(
+        select(table.c.category, table.c.status, table.c["count"]).where(
+            table.c.user_id == user_id, table.c["count"] > 0
+        )
     )
+    return [
+        (GoalCategory[category], GoalStatus[status], count)
+        for category, status, count in rows
+    ]
+
+
+def statistics_from_counts(
+    counts: Iterable[Tuple[GoalCategory, GoalStatus, int]]
+) -> Dict[str, Any]:
+    """Build the goal statistics from per category and status counts.
 
+    Args:
+        counts: (category, status, count) rows, as returned by count_goals.
+
+    Returns:
+        Dictionary containing goal statistics including completion rate,
+        category breakdowns, and total counts.
+    """
     category_stats = {
         category.value: {"completed": 0, "failed": 0} for category in GoalCategory
     }
+    completed_goals = failed_goals = 0
 
-    for goal in goals:
-        if goal.status == GoalStatus.COMPLETED:
-            category_stats[goal.category.value]["completed"] += 1
-        elif goal.status == GoalStatus.FAILED:
-            category_stats[goal.category.value]["failed"] += 1
+    for category, status, count in counts:
+        if status == GoalStatus.COMPLETED:
+            category_stats[category.value]["completed"] += count
+            completed_goals += count
+        elif status == GoalStatus.FAILED:
+            category_stats[category.value]["failed"] += count
+            failed_goals += count
+
+    total_past_goals = completed_goals + failed_goals
+    success_rate = (
+        (completed_goals / total_past_goals * 100) if total_past_goals > 0 else 0
+    )
 
     return {
         "total_completed": completed_goals,
@@ -132,6 +317,80 @@ def get_goal_statistics(user_id: int) -> Dict[str, Any]:
     }
 
 
+def get_goal_statistics(user_id: int) -> Dict[str, Any]:
+    """Gather statistics about a user's goals.
+    
+    Args:
+        user_id: The ID of the user to get statistics for.
+        
+    Returns:
+        Dictionary containing goal statistics including completion rate,
+        category breakdowns, and total counts.
+    """
+    return statistics_from_counts(count_goals(user_id))
+
+
+@dataclass
+class GoalsOverview:
+    """Everything the goals page shows about a user's goals."""
+
+    current: List[Goal] = field(default_factory=list)
+    overdue: List[Goal] = field(default_factory=list)
+    history: List[Goal] = field(default_factory=list)
+    stats: Dict[str, Any] = field(default_factory=dict)
+
+
+def load_goals_overview(
+    user_id: int,
+    today: Optional[date] = None,
+    history_limit: int = GOAL_HISTORY_LIMIT,
+) -> GoalsOverview:
+    """Load the current, overdue and recent goals and the goal statistics.
+
+    One scan fetches the active goals and the most recent ``history_limit``
+    goals, newest first, and splits them in memory. The statistics are read
+    from the goal_stats counters.
+
+    Args:
+        user_id: The ID of the user.
+        today: The date goals are current on (defaults to today in UTC).
+        history_limit: Number of goals to list in the history.
+
+    Returns:
+        The user's GoalsOverview.
+    """
+    if today is None:
+        today = datetime.now(timezone.utc).date()
+
+    recent_ids = (
+        select(Goal.id)
+        .where(Goal.user_id == user_id)
+        .order_by(Goal.created_at.desc())
+        .limit(history_limit)
+    )
+    goals = (
+        Goal.query.filter(
+            Goal.user_id == user_id,
+            or_(Goal.status == GoalStatus.ACTIVE, Goal.id.in_(recent_ids)),
+        )
+        .order_by(Goal.created_at.desc())
+        .all()
+    )
+
+    overview = GoalsOverview(
+        history=goals[:history_limit],
+        stats=statistics_from_counts(count_goals(user_id)),
+    )
+    for goal in goals:
+        if goal.status != GoalStatus.ACTIVE:
+            continue
+        if goal.week_end < today:
+            overview.overdue.append(goal)
+        elif goal.week_start <= today:
+            overview.current.append(goal)
+    return overview
+
+
 def get_predefined_goals() -> Dict[GoalCategory, List[str]]:
     return {
         GoalCategory.EXERCISE: [
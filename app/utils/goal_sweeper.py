@@ -0,0 +1,162 @@
+"""
+Goal Sweeper - Expire goals that were left active after their week ended.
+
+Overdue goals stay listed for review on the goals page for
+GOAL_EXPIRY_GRACE_DAYS after their end date. After that,
+sweep_overdue_goals() marks them as not completed in batched UPDATEs and
+awards GOAL_EXPIRY_POINTS for each one through PointsService. Because the
+UPDATEs bypass the ORM, the sweep also recounts the goal_stats counters and
+bumps the data version of every user it touched.
+
+Run it from cron with ``flask sweep-goals``. Single-node deployments can set
+GOAL_SWEEP_INTERVAL instead, and the web process runs the sweep in a
+background thread.
+"""
+
+import threading
+import time
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from typing import Optional
+from flask import Flask, current_app
+from sqlalchemy import select, update
+from ..models import db, Goal
+from ..models.goal import GoalStatus
+from ..models.points_log import PointsSourceType
+from .data_stamp import touch_user_data
+from .goal_helpers import rebuild_goal_stats
+from .points_service import PointsAward, PointsService
+
+# Goals expired per UPDATE and transaction
+SWEEP_BATCH_SIZE = 500
+
+
+@dataclass
+class SweepResult:
+    """Summary of a goal sweep."""
+
+    goals_expired: int = 0
+    users: int = 0
+    points_awarded: int = 0
+    batches: int = 0
+
+
+def sweep_overdue_goals(
+    today: Optional[date] = None,
+    grace_days: Optional[int] = None,
+    points: Optional[int] = None,
+    batch_size: int = SWEEP_BATCH_SIZE,
+) -> SweepResult:
+    """Mark active goals that ended more than ``grace_days`` ago as failed.
+
+    Each batch is committed on its own, so an interrupted sweep keeps the
+    batches it finished and the next run picks up the rest. Goals finished
+    by their owner while the sweep runs are left alone.
+
+    Args:
+        today: The current date (defaults to today in UTC).
+        grace_days: Days an overdue goal stays active (GOAL_EXPIRY_GRACE_DAYS).
+        points: Points awarded per expired goal (GOAL_EXPIRY_POINTS).
+        batch_size: Goals expired per UPDATE.
+
+    Returns:
+        SweepResult with the number of goals, users, points and batches.
+    """
+    if today is None:
+        today = datetime.now(timezone.utc).date()
+    if grace_days is None:
+        grace_days = current_app.config.get("GOAL_EXPIRY_GRACE_DAYS", 7)
+    if points is None:
+        points = current_app.config.get("GOAL_EXPIRY_POINTS", 0)
+    cutoff = today - timedelta(days=grace_days)
+
+    result = SweepResult()
+    users = set()
+    while True:
+        goal_ids = db.session.scalars(
+            select(Goal.id)
+            .where(Goal.status == GoalStatus.ACTIVE, Goal.week_end < cutoff)
+            .order_by(Goal.id)
+            .limit(batch_size)
+        ).all()
+        if not goal_ids:
+            break
+
+        expired = db.session.execute(
+            update(Goal.__table__)
+            .where(Goal.id.in_(goal_ids), Goal.status == GoalStatus.ACTIVE)
+            .values(status=GoalStatus.FAILED)
+            .returning(Goal.id, Goal.user_id, Goal.title)
+        ).all()
+        batch_users = sorted({goal.user_id for goal in expired})
+
+        if points > 0:
+            PointsService.record_points_bulk(
+                [
+                    PointsAward(
+                        user_id=goal.user_id,
+                        points=points,
+                        source_type=PointsSourceType.GOAL_EXPIRED,
+                        description=f"Goal Expired: '{goal.title}'",
+                        source_id=goal.id,
+                        target_date=today,
+                    )
+                    for goal in expired
+                ]
+            )
+            result.points_awarded += points * len(expired)
+
+        rebuild_goal_stats(batch_users)
+        for user_id in batch_users:
+            touch_user_data(user_id)
+        db.session.commit()
+
+        result.goals_expired += len(expired)
+        result.batches += 1
+        users.update(batch_users)
+
+    result.users = len(users)
+    return result
+
+
+def run_sweeper(app: Flask, interval: float) -> None:
+    """Sweep overdue goals every ``interval`` seconds, forever.
+
+    Args:
+        app: The application to sweep in.
+        interval: Seconds between sweeps.
+    """
+    while True:
+        time.sleep(interval)
+        with app.app_context():
+            try:
+                result = sweep_overdue_goals()
+                if result.goals_expired:
+                    app.logger.info(
+                        f"Expired {result.goals_expired} overdue goal(s) "
+                        f"for {result.users} user(s)"
+                    )
+            except Exception:
+                db.session.rollback()
+                app.logger.exception("Goal sweep failed")
+            finally:
+                db.session.remove()
+
+
+def start_sweeper_thread(app: Flask) -> Optional[threading.Thread]:
+    """Start the background sweeper if GOAL_SWEEP_INTERVAL is set.
+
+    Args:
+        app: The application to sweep in.
+
+    Returns:
+        The started daemon thread, or None if the sweeper is disabled.
+    """
+    interval = app.config.get("GOAL_SWEEP_INTERVAL", 0)
+    if not interval or app.config.get("TESTING"):
+        return None
+    thread = threading.Thread(
+        target=run_sweeper, args=(app, interval), name="goal-sweeper", daemon=True
+    )
+    thread.start()
+    return thread
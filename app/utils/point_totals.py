@@ -0,0 +1,181 @@
+"""
+Point Totals - A running total of each user's points.
+
+Every DailyStats write adds its change in points to the user's row in
+user_totals, in the same transaction, so PointsService awards and any other
+stats write keep the total current. get_total_points() reads it with one
+primary-key lookup instead of summing the user's whole daily_stats history.
+
+Bulk writes that bypass the ORM (e.g. the DailyStats rebuild) call
+rebuild_point_totals() for the users they touched; reconcile_point_totals()
+compares the stored totals with daily_stats and repairs any that differ.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+from sqlalchemy import func, select
+from ..models import db, DailyStats, User, UserTotals
+from ..models.database import dialect_insert, get_dialect, get_executor
+
+
+@dataclass
+class TotalsMismatch:
+    """A stored total that differs from the user's daily_stats."""
+
+    user_id: int
+    stored: Optional[int]  # None when the user has no totals row
+    expected: int
+
+
+def _upsert(rows: List[Dict[str, int]], increment: bool, connection=None) -> None:
+    table = UserTotals.__table__
+    stmt = dialect_insert(get_dialect(connection), table)
+    total = stmt.excluded.total_points
+    if increment:
+        total = table.c.total_points + total
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c.user_id], set_={"total_points": total}
+    )
+    get_executor(connection).execute(stmt, rows)
+
+
+def add_to_total_points(user_id: int, points: int, connection=None) -> None:
+    """Add points (or take them away, if negative) to a user's total.
+
+    Args:
+        user_id: The ID of the user.
+        points: Change in the user's points.
+        connection: Optional connection to run on instead of the session.
+    """
+    if points:
+        _upsert(
+            [{"user_id": user_id, "total_points": points}],
+            increment=True,
+            connection=connection,
+        )
+
+
+def compute_point_totals(user_ids: List[int], connection=None) -> Dict[int, int]:
+    """Sum the users' daily_stats points with one GROUP BY.
+
+    Args:
+        user_ids: The users to total.
+        connection: Optional connection to run on instead of the session.
+
+    Returns:
+        user_id -> total points, 0 for users without stats.
+    """
+    totals = {user_id: 0 for user_id in user_ids}
+    rows = get_executor(connection).execute(
+        select(DailyStats.user_id, func.sum(func.coalesce(DailyStats.points, 0)))
+        .where(DailyStats.user_id.in_(user_ids))
+        .group_by(DailyStats.user_id)
+    )
+    for user_id, total in rows:
+        totals[user_id] = total or 0
+    return totals
+
+
+def rebuild_point_totals(user_ids: List[int], connection=None) -> None:
+    """Recompute the users' stored totals from daily_stats. Does not commit.
+
+    Args:
+        user_ids: The users whose stats changed.
+        connection: Optional connection to run on instead of the session.
+    """
+    if not user_ids:
+        return
+    totals = compute_point_totals(user_ids, connection)
+    _upsert(
+        [
+            {"user_id": user_id, "total_points": total}
+            for user_id, total in totals.items()
+        ],
+        increment=False,
+        connection=connection,
+    )
+
+
+def get_total_points(user_id: int) -> int:
+    """Return the user's total points from their running total.
+
+    Falls back to summing daily_stats for users without a totals row, i.e.
+    those who have not earned any points.
+
+    Args:
+        user_id: The ID of the user.
+
+    Returns:
+        The cumulative points earned by the user.
+    """
+    total = db.session.execute(
+        select(UserTotals.total_points).where(UserTotals.user_id == user_id)
+    ).scalar()
+    if total is None:
+        return compute_point_totals([user_id])[user_id]
+    return total
+
+
+def check_point_totals(user_ids: List[int]) -> List[TotalsMismatch]:
+    """Compare users' stored totals against daily_stats.
+
+    Both sides are read in one statement, so they come from the same
+    snapshot: an award committed while the check runs is either in both or
+    in neither, and cannot show up as a difference.
+
+    Args:
+        user_ids: The users to check.
+
+    Returns:
+        One TotalsMismatch per user whose stored total is wrong.
+    """
+    sums = (
+        select(
+            DailyStats.user_id,
+            func.sum(func.coalesce(DailyStats.points, 0)).label("total"),
+        )
+        .where(DailyStats.user_id.in_(user_ids))
+        .group_by(DailyStats.user_id)
+        .subquery()
+    )
+    rows = db.session.execute(
+        select(User.id, UserTotals.total_points, sums.c.total)
+        .outerjoin(UserTotals, UserTotals.user_id == User.id)
+        .outerjoin(sums, sums.c.user_id == User.id)
+        .where(User.id.in_(user_ids))
+        .order_by(User.id)
+    )
+    return [
+        TotalsMismatch(user_id, stored, expected or 0)
+        for user_id, stored, expected in rows
+        if (stored or 0) != (expected or 0)
+    ]
+
+
+def reconcile_point_totals(
+    user_ids: List[int], dry_run: bool = False
+) -> List[TotalsMismatch]:
+    """Find the users whose stored total is wrong and, unless dry_run, fix it.
+
+    Commits the repaired totals.
+
+    Args:
+        user_ids: The users to check.
+        dry_run: Only report the differences.
+
+    Returns:
+        The totals that differed.
+    """
+    mismatches = check_point_totals(user_ids)
+    if mismatches and not dry_run:
+        # Apply the difference rather than the expected value, so awards
+        # committed since the check's snapshot are not lost
+        _upsert(
+            [
+                {"user_id": m.user_id, "total_points": m.expected - (m.stored or 0)}
+                for m in mismatches
+            ],
+            increment=True,
+        )
+        db.session.commit()
+    return mismatches
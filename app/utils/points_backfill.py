@@ -0,0 +1,226 @@
+"""
+Points Backfill - Populate the PointsLog from historical DailyStats.
+
+Users are split into partitions that can be backfilled in parallel, one
+process per partition. Within a partition each user's stats, diary entries,
+goals and existing log days are loaded once, the PointsLog rows are built in
+memory and bulk-inserted, and every chunk of users is committed together with
+the partition's checkpoint so a crashed run resumes where it stopped.
+"""
+
+import time
+from dataclasses import dataclass
+from datetime import date
+from typing import Dict, List, Set
+from sqlalchemy import insert, select
+from ..models import db, DailyStats, DiaryEntry, Goal, PointsLog
+from ..models.goal import GoalStatus
+from ..models.points_log import PointsSourceType
+from .checkpoints import (
+    advance_checkpoint,
+    finish_checkpoint,
+    is_done,
+    load_checkpoint,
+)
+from .data_stamp import touch_user_data
+from .points_service import describe_award
+
+# Users per transaction, and the most rows buffered before flushing early
+BACKFILL_CHUNK_USERS = 100
+BACKFILL_CHUNK_ROWS = 5000
+
+
+@dataclass
+class BackfillResult:
+    """Work done by a backfill run, for the throughput report."""
+
+    users: int = 0
+    days: int = 0
+    rows: int = 0
+    points: int = 0
+    seconds: float = 0.0
+
+    def __add__(self, other: "BackfillResult") -> "BackfillResult":
+        return BackfillResult(
+            users=self.users + other.users,
+            days=self.days + other.days,
+            rows=self.rows + other.rows,
+            points=self.points + other.points,
+            seconds=max(self.seconds, other.seconds),
+        )
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds else 0.0
+
+
+def partition_user_ids(user_ids: List[int], partitions: int) -> List[List[int]]:
+    """Split ordered user IDs into at most ``partitions`` contiguous ranges."""
+    partitions = max(1, min(partitions, len(user_ids)))
+    size, extra = divmod(len(user_ids), partitions)
+    ranges, start = [], 0
+    for index in range(partitions):
+        end = start + size + (1 if index < extra else 0)
+        ranges.append(user_ids[start:end])
+        start = end
+    return [ids for ids in ranges if ids]
+
+
+def checkpoint_name(index: int, partitions: int) -> str:
+    """Checkpoint name for one partition of a run with ``partitions`` workers."""
+    return f"points-backfill:{index + 1}/{partitions}"
+
+
+def build_user_rows(user_id: int, result: BackfillResult) -> List[Dict]:
+    """Build the PointsLog rows for one user's days that have no log entries.
+
+    Diary entries are awarded on their day. Finished goals are awarded once,
+    on the first day of their week that still has points to account for, and
+    whatever remains of a day's points becomes one-point login bonuses.
+
+    Args:
+        user_id: The user to backfill.
+        result: Updated with the days, rows and points built.
+
+    Returns:
+        Rows ready for a bulk PointsLog insert.
+    """
+    stats = db.session.execute(
+        select(DailyStats.date, DailyStats.points)
+        .where(DailyStats.user_id == user_id, DailyStats.points > 0)
+        .order_by(DailyStats.date)
+    ).all()
+    if not stats:
+        return []
+
+    logged_days: Set[date] = set(
+        db.session.scalars(
+            select(PointsLog.date).where(PointsLog.user_id == user_id).distinct()
+        )
+    )
+    diary_by_day: Dict[date, List] = {}
+    for entry in db.session.execute(
+        select(DiaryEntry.id, DiaryEntry.entry_date, DiaryEntry.rating)
+        .where(DiaryEntry.user_id == user_id)
+        .order_by(DiaryEntry.id)
+    ):
+        diary_by_day.setdefault(entry.entry_date, []).append(entry)
+    goals = db.session.execute(
+        select(Goal.id, Goal.title, Goal.status, Goal.week_start, Goal.week_end)
+        .where(
+            Goal.user_id == user_id,
+            Goal.status.in_([GoalStatus.COMPLETED, GoalStatus.FAILED]),
+        )
+        .order_by(Goal.id)
+    ).all()
+    awarded_goals: Set[int] = set(
+        db.session.scalars(
+            select(PointsLog.source_id).where(
+                PointsLog.user_id == user_id,
+                PointsLog.source_type.in_(
+                    [
+                        PointsSourceType.GOAL_COMPLETED.value,
+                        PointsSourceType.GOAL_FAILED.value,
+                    ]
+                ),
+            )
+        )
+    )
+
+    rows = []
+    for day, total_points in stats:
+        if day in logged_days:
+            continue
+        result.days += 1
+        accounted = 0
+
+        def add(source_type, points, description, source_id=None):
+            rows.append(
+                {
+                    "user_id": user_id,
+                    "date": day,
+                    "points": points,
+                    "source_type": source_type.value,
+                    "source_id": source_id,
+                    "description": description,
+                }
+            )
+
+        for entry in diary_by_day.get(day, []):
+            source = PointsSourceType.DIARY_ENTRY
+            points, description = describe_award(source, rating=entry.rating)
+            add(source, points, description, entry.id)
+            accounted += points
+
+        for goal in goals:
+            if goal.id in awarded_goals or not goal.week_start <= day <= goal.week_end:
+                continue
+            source = (
+                PointsSourceType.GOAL_COMPLETED
+                if goal.status == GoalStatus.COMPLETED
+                else PointsSourceType.GOAL_FAILED
+            )
+            points, description = describe_award(source, goal_title=goal.title)
+            if accounted + points <= total_points:
+                add(source, points, description, goal.id)
+                awarded_goals.add(goal.id)
+                accounted += points
+
+        # Remaining points are assumed to come from daily login bonuses
+        for _ in range(total_points - accounted):
+            add(PointsSourceType.DAILY_LOGIN, 1, "Daily Login Bonus")
+
+    result.rows += len(rows)
+    result.points += sum(row["points"] for row in rows)
+    return rows
+
+
+def backfill_partition(
+    user_ids: List[int], name: str, restart: bool = False
+) -> BackfillResult:
+    """Backfill the PointsLog for one partition of users.
+
+    Users at or before the partition's checkpoint are skipped. Rows are
+    inserted in bulk and committed with the checkpoint every
+    BACKFILL_CHUNK_USERS users, or sooner once BACKFILL_CHUNK_ROWS are pending.
+
+    Args:
+        user_ids: Ordered IDs of the users in the partition.
+        name: Checkpoint name for the partition.
+        restart: Ignore the checkpoint of an unfinished earlier run.
+
+    Returns:
+        BackfillResult for this partition.
+    """
+    started = time.perf_counter()
+    checkpoint = load_checkpoint(name, restart=restart)
+    result = BackfillResult()
+    pending: List[Dict] = []
+    chunk_users = 0
+
+    def commit_chunk(last_user_id: int) -> None:
+        nonlocal pending, chunk_users
+        if pending:
+            db.session.execute(insert(PointsLog), pending)
+            # The bulk insert bypasses the ORM events that bump data versions
+            for user_id in sorted({row["user_id"] for row in pending}):
+                touch_user_data(user_id)
+        advance_checkpoint(checkpoint, last_user_id, processed=chunk_users)
+        db.session.commit()
+        pending, chunk_users = [], 0
+
+    for user_id in user_ids:
+        if is_done(checkpoint, user_id):
+            continue
+        pending.extend(build_user_rows(user_id, result))
+        result.users += 1
+        chunk_users += 1
+        if chunk_users >= BACKFILL_CHUNK_USERS or len(pending) >= BACKFILL_CHUNK_ROWS:
+            commit_chunk(user_id)
+
+    if chunk_users:
+        commit_chunk(user_ids[-1])
+    finish_checkpoint(checkpoint)
+
+    result.seconds = time.perf_counter() - started
+    return result
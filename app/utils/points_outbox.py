@@ -0,0 +1,192 @@
+"""
+Points Outbox - Deferred point awards for diary and goal writes.
+
+Request handlers call enqueue_points_event() in the same transaction as the
+diary entry or goal change and return without touching PointsLog, DailyStats
+or the streak milestones. The points worker (``flask points-worker``) applies
+queued events with process_pending_events(). Applying an event is idempotent:
+it is skipped if its PointsLog row already exists, and each event is marked
+processed in the same transaction as its award and any streak milestone it
+completes.
+
+With POINTS_OUTBOX_INLINE enabled (development and tests), events are applied
+at the end of the request instead, so no worker is needed.
+"""
+
+import time
+from datetime import date, datetime, timezone
+from typing import Any, Dict, Optional
+from flask import current_app
+from sqlalchemy import select
+from ..models import db, PointsLog, PointsOutboxEvent
+from ..models.database import dialect_insert, get_dialect
+from ..models.points_log import PointsSourceType
+from .points_service import PointsService, describe_award
+from .streak_engine import run_ending_on
+
+# Events that keep failing are left for inspection after this many attempts
+MAX_ATTEMPTS = 5
+
+
+def enqueue_points_event(
+    user_id: int,
+    source_type: PointsSourceType,
+    source_id: int,
+    payload: Optional[Dict[str, Any]] = None,
+    event_date: Optional[date] = None,
+) -> Optional[int]:
+    """Queue a point award in the current transaction.
+
+    Queuing the same (source_type, source_id) twice is a no-op.
+
+    Args:
+        user_id: User receiving the points
+        source_type: DIARY_ENTRY, GOAL_COMPLETED or GOAL_FAILED
+        source_id: ID of the diary entry or goal
+        payload: Award details (``rating`` or ``goal_title``)
+        event_date: Day the points are for (defaults to today)
+
+    Returns:
+        The new event ID, or None if the event was already queued.
+    """
+    if event_date is None:
+        event_date = datetime.now(timezone.utc).date()
+
+    table = PointsOutboxEvent.__table__
+    stmt = (
+        dialect_insert(get_dialect(), table)
+        .values(
+            user_id=user_id,
+            event_type=source_type.value,
+            source_id=source_id,
+            payload=payload or {},
+            event_date=event_date,
+            created_at=datetime.now(timezone.utc),
+            attempts=0,
+        )
+        .on_conflict_do_nothing(index_elements=["event_type", "source_id"])
+        .returning(table.c.id)
+    )
+    return db.session.execute(stmt).scalar()
+
+
+def apply_points_event(event_id: int) -> bool:
+    """Apply one queued event and commit.
+
+    Args:
+        event_id: ID of the outbox event
+
+    Returns:
+        True if the event was applied now, False if it was already processed.
+    """
+    event = db.session.execute(
+        select(PointsOutboxEvent)
+        .where(
+            PointsOutboxEvent.id == event_id,
+            PointsOutboxEvent.processed_at.is_(None),
+        )
+        .with_for_update(skip_locked=True)
+    ).scalar_one_or_none()
+    if event is None:
+        return False
+
+    source_type = PointsSourceType(event.event_type)
+    already_awarded = db.session.query(
+        PointsLog.query.filter_by(
+            user_id=event.user_id,
+            source_type=event.event_type,
+            source_id=event.source_id,
+        ).exists()
+    ).scalar()
+
+    if not already_awarded:
+        points, description = describe_award(
+            source_type,
+            rating=event.payload.get("rating"),
+            goal_title=event.payload.get("goal_title"),
+        )
+        PointsService.record_points(
+            user_id=event.user_id,
+            points=points,
+            source_type=source_type,
+            description=description,
+            source_id=event.source_id,
+            target_date=event.event_date,
+        )
+
+    # Milestones dedupe themselves per day, so this is safe to repeat. The
+    # streak is the one ending on the event's day, however far behind the
+    # worker is
+    if source_type == PointsSourceType.DIARY_ENTRY:
+        streak = run_ending_on(event.user_id, event.event_date)
+        PointsService.record_streak_milestones(
+            event.user_id, streak, event.event_date
+        )
+
+    event.processed_at = datetime.now(timezone.utc)
+    event.attempts += 1
+    event.last_error = None
+    db.session.commit()
+
+    return True
+
+
+def process_pending_events(batch_size: int = 100) -> int:
+    """Apply up to ``batch_size`` pending events, oldest first.
+
+    A failing event is rolled back, its error recorded, and the batch moves
+    on; it is retried on later passes until MAX_ATTEMPTS.
+
+    Args:
+        batch_size: Maximum number of events to apply
+
+    Returns:
+        Number of events applied.
+    """
+    event_ids = db.session.scalars(
+        select(PointsOutboxEvent.id)
+        .where(
+            PointsOutboxEvent.processed_at.is_(None),
+            PointsOutboxEvent.attempts < MAX_ATTEMPTS,
+        )
+        .order_by(PointsOutboxEvent.id)
+        .limit(batch_size)
+    ).all()
+    db.session.rollback()
+
+    applied = 0
+    for event_id in event_ids:
+        try:
+            if apply_points_event(event_id):
+                applied += 1
+        except Exception as e:
+            db.session.rollback()
+            current_app.logger.exception(f"Points event {event_id} failed")
+            event = db.session.get(PointsOutboxEvent, event_id)
+            event.attempts += 1
+            event.last_error = str(e)
+            db.session.commit()
+
+    return applied
+
+
+def apply_inline(event_id: Optional[int]) -> None:
+    """Apply a just-queued event during the request if configured to.
+
+    Args:
+        event_id: ID returned by enqueue_points_event (None is ignored)
+    """
+    if event_id is not None and current_app.config.get("POINTS_OUTBOX_INLINE"):
+        apply_points_event(event_id)
+
+
+def run_worker(poll_interval: float = 2.0, batch_size: int = 100) -> None:
+    """Apply pending events forever, sleeping when the outbox is empty.
+
+    Args:
+        poll_interval: Seconds to wait after finding no events
+        batch_size: Maximum number of events per pass
+    """
+    while True:
+        if process_pending_events(batch_size) == 0:
+            time.sleep(poll_interval)
@@ -5,10 +5,23 @@ This service manages all point-earning activities and maintains consistency
 between PointsLog (detailed transactions) and DailyStats (aggregated cache).
 """
 
-from typing import Optional, List
-from datetime import datetime, date, timedelta, timezone
-from ..models import db, DiaryEntry, DailyStats, PointsLog
+from collections import defaultdict
+from typing import Dict, NamedTuple, Optional, List, Tuple
+from datetime import datetime, date, timezone
+from ..models import db, DailyStats, PointsLog, UserStreak
 from ..models.points_log import PointsSourceType
+from .streak_engine import load_streak_state, rebuild_streak_state
+
+
+class PointsAward(NamedTuple):
+    """One award for PointsService.record_points_bulk()."""
+
+    user_id: int
+    points: int
+    source_type: PointsSourceType
+    description: str
+    source_id: Optional[int]
+    target_date: date
 
 
 class PointsService:
@@ -25,6 +38,39 @@ class PointsService:
     ) -> PointsLog:
         """Award points to a user and update daily stats.
 
+        Args:
+            user_id: User receiving the points
+            points: Number of points to award
+            source_type: Type of activity earning the points
+            description: Human-readable description
+            source_id: Optional ID of the source object (diary entry, goal)
+            target_date: Date to award points for (defaults to today)
+
+        Returns:
+            The created PointsLog entry
+        """
+        log_entry = PointsService.record_points(
+            user_id, points, source_type, description, source_id, target_date
+        )
+
+        # Commit both changes together
+        db.session.commit()
+
+        return log_entry
+
+    @staticmethod
+    def record_points(
+        user_id: int,
+        points: int,
+        source_type: PointsSourceType,
+        description: str,
+        source_id: Optional[int] = None,
+        target_date: Optional[date] = None,
+    ) -> PointsLog:
+        """Add a points log entry and update daily stats without committing.
+
+        Lets callers apply an award in the same transaction as other changes.
+
         Args:
             user_id: User receiving the points
             points: Number of points to award
@@ -52,11 +98,61 @@ class PointsService:
         # Update daily stats cache
         PointsService._update_daily_stats(user_id, target_date, points)
 
-        # Commit both changes together
-        db.session.commit()
-
         return log_entry
 
+    @staticmethod
+    def record_points_bulk(awards: List[PointsAward]) -> List[PointsLog]:
+        """Add many points log entries and their daily stats without committing.
+
+        Loads the affected DailyStats rows in one query and adds each day's
+        total once, instead of a lookup per award.
+
+        Args:
+            awards: The awards to record
+
+        Returns:
+            The created PointsLog entries
+        """
+        if not awards:
+            return []
+
+        log_entries = [
+            PointsLog.create_entry(
+                user_id=award.user_id,
+                points=award.points,
+                source_type=award.source_type,
+                description=award.description,
+                date=award.target_date,
+                source_id=award.source_id,
+            )
+            for award in awards
+        ]
+
+        totals: Dict[Tuple[int, date], int] = defaultdict(int)
+        for award in awards:
+            totals[(award.user_id, award.target_date)] += award.points
+
+        existing = {
+            (stats.user_id, stats.date): stats
+            for stats in DailyStats.query.filter(
+                DailyStats.user_id.in_({user_id for user_id, _ in totals}),
+                DailyStats.date.in_({day for _, day in totals}),
+            )
+        }
+        for key, points in totals.items():
+            stats = existing.get(key)
+            if stats is None:
+                stats = DailyStats(user_id=key[0], date=key[1], points=0)
+                db.session.add(stats)
+            stats.points += points
+
+        # Update streak calculations for users awarded points today
+        today = datetime.now(timezone.utc).date()
+        for user_id in sorted({user_id for user_id, day in totals if day == today}):
+            PointsService._update_streak_calculations(user_id)
+
+        return log_entries
+
     @staticmethod
     def _update_daily_stats(user_id: int, target_date: date, points: int) -> None:
         """Update DailyStats cache with new points.
@@ -89,56 +185,17 @@ class PointsService:
         """
         today = datetime.now(timezone.utc).date()
 
-        # Calculate current streak (consecutive days with diary entries ending today)
-        current_streak = 0
-        check_date = today
-
-        # Work backwards from today checking for diary entries
-        while True:
-            has_diary_entry = (
-                DiaryEntry.query.filter_by(
-                    user_id=user_id, entry_date=check_date
-                ).first()
-                is not None
-            )
-
-            if has_diary_entry:
-                current_streak += 1
-                check_date = check_date - timedelta(days=1)
-            else:
-                break
-
-        # Calculate longest streak from all diary entries
-        # Get all diary entries ordered by date
-        all_entries = (
-            DiaryEntry.query.filter_by(user_id=user_id)
-            .order_by(DiaryEntry.entry_date)
-            .all()
+        # Diary writes keep the streak state current; seed it if missing
+        state = load_streak_state(user_id) or rebuild_streak_state(user_id)
+        current_streak = UserStreak.current_as_of(
+            state.last_entry_date, state.current_length, today
         )
 
-        longest_streak = 0
-        if all_entries:
-            # Get unique dates with diary entries
-            entry_dates = sorted(list(set(entry.entry_date for entry in all_entries)))
-
-            if entry_dates:
-                temp_streak = 1
-                longest_streak = 1
-
-                for i in range(1, len(entry_dates)):
-                    # Check if current date is exactly 1 day after previous date
-                    if (entry_dates[i] - entry_dates[i - 1]).days == 1:
-                        temp_streak += 1
-                        longest_streak = max(longest_streak, temp_streak)
-                    else:
-                        # Gap found, reset streak
-                        temp_streak = 1
-
         # Update all today's stats with calculated streaks
         today_stats = DailyStats.query.filter_by(user_id=user_id, date=today).first()
         if today_stats:
             today_stats.current_streak = current_streak
-            today_stats.longest_streak = longest_streak
+            today_stats.longest_streak = state.longest
 
     @staticmethod
     def get_daily_breakdown(
@@ -190,35 +247,26 @@ class PointsService:
         """Rebuild DailyStats from PointsLog for data consistency.
 
         This can be used to fix any inconsistencies between the detailed log
-        and the aggregated stats cache.
+        and the aggregated stats cache. Use ``flask rebuild-daily-stats`` to
+        rebuild many users at once.
 
         Args:
             user_id: User to rebuild stats for
         """
-        # Get all dates with log entries for this user
-        dates_with_points = (
-            db.session.query(PointsLog.date).filter_by(user_id=user_id).distinct().all()
-        )
+        from .stats_rebuild import bulk_rebuild_daily_stats
 
-        for (log_date,) in dates_with_points:
-            # Calculate total points for this date from log
-            total_points = PointsLog.get_daily_total(user_id, log_date)
-
-            # Update or create daily stats
-            stats = DailyStats.query.filter_by(user_id=user_id, date=log_date).first()
-            if not stats:
-                stats = DailyStats(user_id=user_id, date=log_date, points=total_points)
-                db.session.add(stats)
-            else:
-                stats.points = total_points
+        bulk_rebuild_daily_stats(min_user_id=user_id, max_user_id=user_id)
 
-        # Recalculate streaks
+        # Recalculate streaks even when no points changed
+        rebuild_streak_state(user_id)
         PointsService._update_streak_calculations(user_id)
 
         db.session.commit()
 
     @staticmethod
-    def check_and_award_streak_milestones(user_id: int, current_streak: int) -> None:
+    def check_and_award_streak_milestones(
+        user_id: int, current_streak: int, target_date: Optional[date] = None
+    ) -> None:
         """Check for streak milestones and award points if achieved.
 
         Awards 10 points every 7 days and 50 points every 30 days.
@@ -226,12 +274,35 @@ class PointsService:
 
         Args:
             user_id: User to check milestones for
-            current_streak: User's current streak count
+            current_streak: User's streak count on the target date
+            target_date: Day the streak ends on (defaults to today)
+        """
+        if PointsService.record_streak_milestones(
+            user_id, current_streak, target_date
+        ):
+            db.session.commit()
+
+    @staticmethod
+    def record_streak_milestones(
+        user_id: int, current_streak: int, target_date: Optional[date] = None
+    ) -> int:
+        """Record any streak milestone awards without committing.
+
+        Lets the points worker record them in the same transaction as the
+        diary award that completed the streak.
+
+        Args:
+            user_id: User to check milestones for
+            current_streak: User's streak count on the target date
+            target_date: Day the streak ends on (defaults to today)
+
+        Returns:
+            The milestone points recorded, 0 if none were due
         """
         if current_streak <= 0:
-            return
+            return 0
 
-        today = datetime.now(timezone.utc).date()
+        today = target_date or datetime.now(timezone.utc).date()
 
         # Check if we've already awarded streak points today to prevent duplicates
         # Use string values directly for better PostgreSQL compatibility
@@ -244,13 +315,13 @@ class PointsService:
         )
 
         if existing_streak_awards:
-            return  # Already awarded streak points today
+            return 0  # Already awarded streak points today
 
         points_awarded = 0
 
         # Award 10 points every 7 days
         if current_streak % 7 == 0:
-            PointsService.award_points(
+            PointsService.record_points(
                 user_id=user_id,
                 points=10,
                 source_type=PointsSourceType.STREAK_7_DAY,
@@ -261,7 +332,7 @@ class PointsService:
 
         # Award 50 points every 30 days
         if current_streak % 30 == 0:
-            PointsService.award_points(
+            PointsService.record_points(
                 user_id=user_id,
                 points=50,
                 source_type=PointsSourceType.STREAK_30_DAY,
@@ -270,6 +341,34 @@ class PointsService:
             )
             points_awarded += 50
 
+        return points_awarded
+
+
+def describe_award(
+    source_type: PointsSourceType,
+    rating: Optional[int] = None,
+    goal_title: Optional[str] = None,
+) -> Tuple[int, str]:
+    """Return the points and description for a diary or goal award.
+
+    Args:
+        source_type: DIARY_ENTRY, GOAL_COMPLETED or GOAL_FAILED
+        rating: Diary entry rating, for diary awards
+        goal_title: Goal title, for goal awards
+
+    Returns:
+        Tuple of (points, description)
+    """
+    if source_type == PointsSourceType.DIARY_ENTRY:
+        if rating == 1:
+            return 5, "Encouraged Behavior Diary"
+        return 2, "Growth Opportunity Diary"  # rating == -1
+    if source_type == PointsSourceType.GOAL_COMPLETED:
+        return 10, f"Goal Completed: '{goal_title}'"
+    if source_type == PointsSourceType.GOAL_FAILED:
+        return 1, f"Goal Failed: '{goal_title}'"
+    raise ValueError(f"No award rule for {source_type}")
+
 
 # Convenience functions for common point awards
 def award_diary_points(user_id: int, diary_entry_id: int, rating: int) -> PointsLog:
@@ -283,12 +382,7 @@ def award_diary_points(user_id: int, diary_entry_id: int, rating: int) -> Points
     Returns:
         The created PointsLog entry
     """
-    if rating == 1:
-        points = 5
-        description = "Encouraged Behavior Diary"
-    else:  # rating == -1
-        points = 2
-        description = "Growth Opportunity Diary"
+    points, description = describe_award(PointsSourceType.DIARY_ENTRY, rating=rating)
 
     return PointsService.award_points(
         user_id=user_id,
@@ -312,11 +406,14 @@ def award_goal_completion_points(
     Returns:
         The created PointsLog entry
     """
+    points, description = describe_award(
+        PointsSourceType.GOAL_COMPLETED, goal_title=goal_title
+    )
     return PointsService.award_points(
         user_id=user_id,
-        points=10,
+        points=points,
         source_type=PointsSourceType.GOAL_COMPLETED,
-        description=f"Goal Completed: '{goal_title}'",
+        description=description,
         source_id=goal_id,
     )
 
@@ -332,11 +429,14 @@ def award_goal_failure_points(user_id: int, goal_id: int, goal_title: str) -> Po
     Returns:
         The created PointsLog entry
     """
+    points, description = describe_award(
+        PointsSourceType.GOAL_FAILED, goal_title=goal_title
+    )
     return PointsService.award_points(
         user_id=user_id,
-        points=1,
+        points=points,
         source_type=PointsSourceType.GOAL_FAILED,
-        description=f"Goal Failed: '{goal_title}'",
+        description=description,
         source_id=goal_id,
     )
 
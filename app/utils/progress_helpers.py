@@ -1,6 +1,19 @@
 from datetime import date, datetime, timezone, timedelta
 from typing import List, Dict, Tuple, Any
 from ..models import User, DiaryEntry, DailyStats, db
+from .point_totals import get_total_points
+from .rollups import UserRollups, load_rollups
+from .streak_engine import get_streak_summary
+
+WEEKDAY_NAMES = [
+    "Sunday",
+    "Monday",
+    "Tuesday",
+    "Wednesday",
+    "Thursday",
+    "Friday",
+    "Saturday",
+]
 
 
 def get_display_name(user: User) -> str:
@@ -29,23 +42,6 @@ def get_today_stats(user_id: int, today: date) -> int:
     return stats_today.points if stats_today else 0
 
 
-def get_total_points(user_id: int) -> int:
-    """Return the total points for the user.
-
-    Args:
-        user_id: The ID of the user.
-
-    Returns:
-        The cumulative points earned by the user.
-    """
-    return (
-        db.session.query(db.func.sum(DailyStats.points))
-        .filter_by(user_id=user_id)
-        .scalar()
-        or 0
-    )
-
-
 def get_current_streak(user_id: int) -> int:
     """Return the current streak for the user based on consecutive diary entries.
 
@@ -55,24 +51,7 @@ def get_current_streak(user_id: int) -> int:
     Returns:
         The user's current daily streak count based on consecutive days with diary entries.
     """
-    today = datetime.now(timezone.utc).date()
-    current_streak = 0
-    check_date = today
-
-    # Work backwards from today checking for diary entries
-    while True:
-        has_diary_entry = (
-            DiaryEntry.query.filter_by(user_id=user_id, entry_date=check_date).first()
-            is not None
-        )
-
-        if has_diary_entry:
-            current_streak += 1
-            check_date = check_date - timedelta(days=1)
-        else:
-            break
-
-    return current_streak
+    return get_streak_summary(user_id).current
 
 
 def get_longest_streak(user_id: int) -> int:
@@ -154,44 +133,22 @@ def get_top_days_with_entries(user_id: int) -> List[Dict[str, Any]]:
 def get_weekday_data(user_id: int) -> Tuple[List[Dict[str, Any]], bool]:
     """Return weekday analysis data and data sufficiency indicator.
 
+    Averages are read from the user's monthly rollups.
+
     Args:
         user_id: The ID of the user.
 
     Returns:
         Tuple of (weekday_data_list, has_sufficient_data_boolean).
     """
-    day_analysis = (
-        db.session.query(
-            db.func.extract("dow", DailyStats.date).label("weekday"),
-            db.func.avg(DailyStats.points).label("avg_points"),
-            db.func.count(DailyStats.id).label("entry_count"),
-        )
-        .filter_by(user_id=user_id)
-        .filter(DailyStats.points > 0)
-        .group_by(db.func.extract("dow", DailyStats.date))
-        .all()
-    )
-    weekday_names = [
-        "Sunday",
-        "Monday",
-        "Tuesday",
-        "Wednesday",
-        "Thursday",
-        "Friday",
-        "Saturday",
+    rollups = load_rollups(user_id)
+    weekday_data = [
+        {"name": name, "avg_points": avg_points}
+        for name, avg_points in zip(WEEKDAY_NAMES, rollups.weekday_averages())
     ]
-    weekday_data = []
-    for i in range(7):
-        day_data = next((d for d in day_analysis if int(d.weekday) == i), None)
-        if day_data:
-            weekday_data.append(
-                {"name": weekday_names[i], "avg_points": round(day_data.avg_points, 1)}
-            )
-        else:
-            weekday_data.append({"name": weekday_names[i], "avg_points": 0})
 
     # Chart unlocks based on diary entries on different weekdays, not daily stats
-    has_sufficient_weekday_data = get_unique_weekdays_with_entries(user_id) >= 2
+    has_sufficient_weekday_data = rollups.unique_weekdays_with_entries >= 2
     return weekday_data, has_sufficient_weekday_data
 
 
@@ -222,33 +179,26 @@ def get_trend_message(user_id: int, today: date) -> str:
     Returns:
         Motivational message based on the last 14 days of activity.
     """
-    last_7_start = today - timedelta(days=6)
-    last_7_end = today
-    previous_7_start = today - timedelta(days=13)
-    previous_7_end = today - timedelta(days=7)
-    first_entry = (
-        DiaryEntry.query.filter_by(user_id=user_id)
-        .order_by(DiaryEntry.entry_date)
-        .first()
-    )
-    days_since_start = (today - first_entry.entry_date).days if first_entry else 0
+    return trend_message_from_rollups(load_rollups(user_id), today)
+
+
+def trend_message_from_rollups(rollups: UserRollups, today: date) -> str:
+    """Return the trend message from already loaded rollups.
+
+    Args:
+        rollups: The user's rollups.
+        today: Today's date.
+
+    Returns:
+        Motivational message based on the last 14 days of activity.
+    """
+    first_entry_date = rollups.first_entry_date
+    days_since_start = (today - first_entry_date).days if first_entry_date else 0
     if days_since_start < 13:
         return "Keep writing to unlock insights about your self-improvement journey!"
-    last_7_points = (
-        db.session.query(db.func.sum(DailyStats.points))
-        .filter_by(user_id=user_id)
-        .filter(DailyStats.date >= last_7_start)
-        .filter(DailyStats.date <= last_7_end)
-        .scalar()
-        or 0
-    )
-    previous_7_points = (
-        db.session.query(db.func.sum(DailyStats.points))
-        .filter_by(user_id=user_id)
-        .filter(DailyStats.date >= previous_7_start)
-        .filter(DailyStats.date <= previous_7_end)
-        .scalar()
-        or 0
+    last_7_points = rollups.points_between(today - timedelta(days=6), today)
+    previous_7_points = rollups.points_between(
+        today - timedelta(days=13), today - timedelta(days=7)
     )
     point_difference = last_7_points - previous_7_points
     if point_difference > 5:
@@ -0,0 +1,81 @@
+"""
+Progress Widgets - JSON payloads for the widgets on the progress page.
+
+The progress page renders its cards from the dashboard snapshot and loads
+each chart and list from its own endpoint, in parallel. Every builder here
+works from a couple of queries so an endpoint only pays for its own widget.
+"""
+
+from typing import Any, Callable, Dict
+from .chart_data import DEFAULT_CHART_RESOLUTION, get_chart_data
+from .dashboard_snapshot import get_best_days, top_days_with_entries
+from .goal_helpers import get_goal_statistics
+from .progress_helpers import WEEKDAY_NAMES, get_sample_weekday_data
+from .rollups import load_rollups
+from .word_index import get_wordcloud_data
+
+# Diary entries needed before the word cloud unlocks
+WORDCLOUD_MIN_ENTRIES = 10
+
+
+def points_widget(user_id: int) -> Dict[str, Any]:
+    """Cumulative points over time, downsampled for the overview chart."""
+    return get_chart_data(user_id, resolution=DEFAULT_CHART_RESOLUTION)
+
+
+def weekday_widget(user_id: int) -> Dict[str, Any]:
+    """Average points per weekday, with sample data for new users."""
+    rollups = load_rollups(user_id)
+    unique_weekdays = rollups.unique_weekdays_with_entries
+    return {
+        "weekday_data": [
+            {"name": name, "avg_points": avg_points}
+            for name, avg_points in zip(WEEKDAY_NAMES, rollups.weekday_averages())
+        ],
+        "has_sufficient_weekday_data": unique_weekdays >= 2,
+        "sample_weekday_data": get_sample_weekday_data(),
+        "unique_weekdays_count": unique_weekdays,
+    }
+
+
+def wordcloud_widget(user_id: int) -> Dict[str, Any]:
+    """The user's most used words, once they have written enough entries."""
+    entry_count = load_rollups(user_id).total_entries
+    unlocked = entry_count >= WORDCLOUD_MIN_ENTRIES
+    return {
+        "words": get_wordcloud_data(user_id) if unlocked else [],
+        "entry_count": entry_count,
+        "has_sufficient_data": unlocked,
+    }
+
+
+def top_days_widget(user_id: int) -> Dict[str, Any]:
+    """The three highest-scoring days with their diary entries."""
+    top_days = top_days_with_entries(user_id, get_best_days(user_id))
+    return {
+        "top_days": [
+            {
+                "date": day["date"].isoformat(),
+                "points": day["points"],
+                "entries": [
+                    {"content": entry.content, "rating": entry.rating}
+                    for entry in day["entries"]
+                ],
+            }
+            for day in top_days
+        ]
+    }
+
+
+def goal_stats_widget(user_id: int) -> Dict[str, Any]:
+    """Completed and failed goals, overall and per category."""
+    return get_goal_statistics(user_id)
+
+
+WIDGETS: Dict[str, Callable[[int], Dict[str, Any]]] = {
+    "points": points_widget,
+    "weekday": weekday_widget,
+    "wordcloud": wordcloud_widget,
+    "top-days": top_days_widget,
+    "goal-stats": goal_stats_widget,
+}
@@ -0,0 +1,387 @@
+"""
+Rollups - Weekly and monthly per-user totals for the progress page.
+
+Every DailyStats or DiaryEntry write folds its change into the user's week and
+month rows in stats_rollups with a single upsert. Progress reads (total
+points, weekday averages, the weekly trend and long-range charts) then load a
+few dozen rollup rows instead of every day of the user's history.
+
+Bulk writes that bypass the ORM (e.g. the DailyStats rebuild) call
+rebuild_rollups() for the users they touched; check_rollups() compares the
+stored rollups with a fresh computation from daily_stats and diary entries.
+"""
+
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from sqlalchemy import case, func, select
+from ..models import db, DailyStats, DiaryEntry, StatsRollup
+from ..models.database import dialect_insert, get_dialect, get_executor
+
+PERIOD_WEEK = "week"
+PERIOD_MONTH = "month"
+PERIODS = (PERIOD_WEEK, PERIOD_MONTH)
+
+# Column prefixes in SQL day-of-week order, matching WEEKDAY_NAMES
+WEEKDAY_KEYS = ("sun", "mon", "tue", "wed", "thu", "fri", "sat")
+
+COUNTER_COLUMNS = (
+    "points",
+    "active_days",
+    "entry_count",
+    "positive_count",
+    "negative_count",
+) + tuple(
+    f"{key}_{kind}" for key in WEEKDAY_KEYS for kind in ("points", "days", "entries")
+)
+
+RollupKey = Tuple[int, str, date]
+
+
+def sql_weekday(day: date) -> int:
+    """Return the weekday number used by SQL's dow (Sunday = 0)."""
+    return (day.weekday() + 1) % 7
+
+
+def period_start(period: str, day: date) -> date:
+    """Return the first day of the week (Monday) or month containing ``day``."""
+    if period == PERIOD_WEEK:
+        return day - timedelta(days=day.weekday())
+    return day.replace(day=1)
+
+
+def _empty_rollup() -> Dict[str, Any]:
+    return dict(dict.fromkeys(COUNTER_COLUMNS, 0), first_entry_date=None)
+
+
+def apply_rollup_delta(
+    user_id: int,
+    day: date,
+    deltas: Dict[str, int],
+    first_entry_date: Optional[date] = None,
+    connection=None,
+) -> None:
+    """Add counter deltas for one day to its week and month rollups.
+
+    Args:
+        user_id: The ID of the user.
+        day: The day the change belongs to.
+        deltas: Counter column -> amount to add (may be negative).
+        first_entry_date: A diary entry date to fold into first_entry_date.
+        connection: Optional connection to run on instead of the session.
+    """
+    deltas = {column: value for column, value in deltas.items() if value}
+    if not deltas and first_entry_date is None:
+        return
+
+    table = StatsRollup.__table__
+    stmt = dialect_insert(get_dialect(connection), table)
+    excluded_first = stmt.excluded.first_entry_date
+    set_ = {column: table.c[column] + stmt.excluded[column] for column in deltas}
+    set_["first_entry_date"] = case(
+        (table.c.first_entry_date.is_(None), excluded_first),
+        (excluded_first < table.c.first_entry_date, excluded_first),
+        else_=table.c.first_entry_date,
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c.user_id, table.c.period, table.c.period_start],
+        set_=set_,
+    )
+
+    row = {column: deltas.get(column, 0) for column in COUNTER_COLUMNS}
+    get_executor(connection).execute(
+        stmt,
+        [
+            dict(
+                row,
+                user_id=user_id,
+                period=period,
+                period_start=period_start(period, day),
+                first_entry_date=first_entry_date,
+            )
+            for period in PERIODS
+        ],
+    )
+
+
+def _stats_deltas(day: date, old_points: int, new_points: int) -> Dict[str, int]:
+    key = WEEKDAY_KEYS[sql_weekday(day)]
+    active = int(new_points > 0) - int(old_points > 0)
+    return {
+        "points": new_points - old_points,
+        "active_days": active,
+        f"{key}_points": new_points - old_points,
+        f"{key}_days": active,
+    }
+
+
+def _entry_deltas(day: date, rating: Optional[int], sign: int) -> Dict[str, int]:
+    return {
+        "entry_count": sign,
+        "positive_count": sign if rating == 1 else 0,
+        "negative_count": sign if rating == -1 else 0,
+        f"{WEEKDAY_KEYS[sql_weekday(day)]}_entries": sign,
+    }
+
+
+def record_stats_change(
+    user_id: int, day: date, old_points: int, new_points: int, connection=None
+) -> None:
+    """Fold a change in one day's DailyStats points into the rollups.
+
+    Args:
+        user_id: The ID of the user.
+        day: The DailyStats date.
+        old_points: Points before the change (0 for a new row).
+        new_points: Points after the change (0 for a deleted row).
+        connection: Optional connection to run on instead of the session.
+    """
+    if old_points == new_points:
+        return
+    apply_rollup_delta(
+        user_id, day, _stats_deltas(day, old_points, new_points), connection=connection
+    )
+
+
+def record_entry_change(
+    user_id: int, day: date, rating: Optional[int], sign: int, connection=None
+) -> None:
+    """Count a written (sign 1) or deleted (sign -1) diary entry.
+
+    A deleted entry leaves first_entry_date as it was; rebuild_rollups()
+    recomputes it.
+
+    Args:
+        user_id: The ID of the user.
+        day: The entry date.
+        rating: The entry rating (1 or -1).
+        sign: 1 for a new entry, -1 for a deleted one.
+        connection: Optional connection to run on instead of the session.
+    """
+    apply_rollup_delta(
+        user_id,
+        day,
+        _entry_deltas(day, rating, sign),
+        first_entry_date=day if sign > 0 else None,
+        connection=connection,
+    )
+
+
+def compute_rollups(
+    stats_rows: Iterable[Any], entry_rows: Iterable[Any]
+) -> Dict[RollupKey, Dict[str, Any]]:
+    """Compute rollups from scratch.
+
+    Args:
+        stats_rows: Rows of (user_id, date, points) from daily_stats.
+        entry_rows: Rows of (user_id, entry_date, rating, count) from diary
+            entries grouped by day and rating.
+
+    Returns:
+        (user_id, period, period_start) -> column values.
+    """
+    rollups: Dict[RollupKey, Dict[str, Any]] = defaultdict(_empty_rollup)
+
+    def add(user_id: int, day: date, deltas: Dict[str, int]) -> List[Dict]:
+        rows = [rollups[(user_id, p, period_start(p, day))] for p in PERIODS]
+        for row in rows:
+            for column, value in deltas.items():
+                row[column] += value
+        return rows
+
+    for user_id, day, points in stats_rows:
+        add(user_id, day, _stats_deltas(day, 0, points or 0))
+    for user_id, day, rating, count in entry_rows:
+        deltas = {k: v * count for k, v in _entry_deltas(day, rating, 1).items()}
+        for row in add(user_id, day, deltas):
+            first = row["first_entry_date"]
+            row["first_entry_date"] = day if first is None else min(first, day)
+
+    return rollups
+
+
+def _source_rows(user_ids: List[int]) -> Tuple[List[Any], List[Any]]:
+    """Load the daily_stats and grouped diary rows for some users."""
+    stats_rows = db.session.execute(
+        select(DailyStats.user_id, DailyStats.date, DailyStats.points).where(
+            DailyStats.user_id.in_(user_ids)
+        )
+    ).all()
+    entry_rows = db.session.execute(
+        select(
+            DiaryEntry.user_id,
+            DiaryEntry.entry_date,
+            DiaryEntry.rating,
+            func.count(DiaryEntry.id),
+        )
+        .where(DiaryEntry.user_id.in_(user_ids))
+        .group_by(DiaryEntry.user_id, DiaryEntry.entry_date, DiaryEntry.rating)
+    ).all()
+    return stats_rows, entry_rows
+
+
+def rebuild_rollups(user_id: int) -> int:
+    """Recompute a user's rollups from daily_stats and diary entries.
+
+    Does not commit.
+
+    Args:
+        user_id: The ID of the user.
+
+    Returns:
+        Number of rollup rows written.
+    """
+    rollups = compute_rollups(*_source_rows([user_id]))
+    db.session.execute(
+        StatsRollup.__table__.delete().where(StatsRollup.user_id == user_id)
+    )
+    if rollups:
+        db.session.execute(
+            StatsRollup.__table__.insert(),
+            [
+                dict(values, user_id=uid, period=period, period_start=start)
+                for (uid, period, start), values in rollups.items()
+            ],
+        )
+    return len(rollups)
+
+
+@dataclass
+class RollupMismatch:
+    """A stored rollup value that differs from the recomputed one."""
+
+    user_id: int
+    period: str
+    period_start: date
+    column: str
+    stored: Any
+    expected: Any
+
+
+def check_rollups(user_ids: List[int]) -> List[RollupMismatch]:
+    """Compare users' stored rollups against daily_stats and diary entries.
+
+    Args:
+        user_ids: The users to check.
+
+    Returns:
+        Every differing value, including missing and unexpected rows.
+    """
+    expected = compute_rollups(*_source_rows(user_ids))
+    columns = COUNTER_COLUMNS + ("first_entry_date",)
+    stored = {
+        (row.user_id, row.period, row.period_start): {c: row[c] for c in columns}
+        for row in db.session.execute(
+            select(StatsRollup.__table__).where(StatsRollup.user_id.in_(user_ids))
+        ).mappings()
+    }
+
+    empty = _empty_rollup()
+    mismatches = []
+    for key in sorted(set(expected) | set(stored)):
+        stored_values = stored.get(key, empty)
+        expected_values = expected.get(key, empty)
+        for column in columns:
+            if stored_values[column] != expected_values[column]:
+                mismatches.append(
+                    RollupMismatch(
+                        *key, column, stored_values[column], expected_values[column]
+                    )
+                )
+    return mismatches
+
+
+@dataclass
+class UserRollups:
+    """A user's weekly and monthly rollups, loaded with one query."""
+
+    weeks: Dict[date, Any] = field(default_factory=dict)
+    months: List[Any] = field(default_factory=list)
+
+    def _sum(self, column: str) -> int:
+        return sum(getattr(row, column) for row in self.months)
+
+    @property
+    def total_points(self) -> int:
+        return self._sum("points")
+
+    @property
+    def active_days(self) -> int:
+        return self._sum("active_days")
+
+    @property
+    def total_entries(self) -> int:
+        return self._sum("entry_count")
+
+    @property
+    def num_positive(self) -> int:
+        return self._sum("positive_count")
+
+    @property
+    def num_change(self) -> int:
+        return self._sum("negative_count")
+
+    @property
+    def first_entry_date(self) -> Optional[date]:
+        dates = [row.first_entry_date for row in self.months if row.first_entry_date]
+        return min(dates) if dates else None
+
+    @property
+    def unique_weekdays_with_entries(self) -> int:
+        return sum(1 for key in WEEKDAY_KEYS if self._sum(f"{key}_entries") > 0)
+
+    def weekday_averages(self) -> List[float]:
+        """Average points per active day for each weekday, Sunday first."""
+        averages = []
+        for key in WEEKDAY_KEYS:
+            days = self._sum(f"{key}_days")
+            points = self._sum(f"{key}_points")
+            averages.append(round(points / days, 1) if days else 0)
+        return averages
+
+    def day_points(self, day: date) -> int:
+        """Points on a single day, from its week's weekday column."""
+        week = self.weeks.get(period_start(PERIOD_WEEK, day))
+        if week is None:
+            return 0
+        return getattr(week, f"{WEEKDAY_KEYS[sql_weekday(day)]}_points")
+
+    def points_between(self, start: date, end: date) -> int:
+        """Points from ``start`` to ``end`` inclusive."""
+        return sum(
+            self.day_points(start + timedelta(days=offset))
+            for offset in range((end - start).days + 1)
+        )
+
+    def weekly_points_data(self, today: date) -> List[List[Any]]:
+        """Cumulative points at the end of each week, for long-range charts."""
+        data = []
+        cumulative = 0
+        for start in sorted(self.weeks):
+            cumulative += self.weeks[start].points
+            data.append([str(min(start + timedelta(days=6), today)), cumulative])
+        return data
+
+
+def load_rollups(user_id: int) -> UserRollups:
+    """Load all of a user's rollups.
+
+    Args:
+        user_id: The ID of the user.
+
+    Returns:
+        UserRollups with weeks keyed by their Monday and months oldest first.
+    """
+    rollups = UserRollups()
+    rows = db.session.execute(
+        select(StatsRollup.__table__)
+        .where(StatsRollup.user_id == user_id)
+        .order_by(StatsRollup.period_start)
+    )
+    for row in rows:
+        if row.period == PERIOD_WEEK:
+            rollups.weeks[row.period_start] = row
+        else:
+            rollups.months.append(row)
+    return rollups
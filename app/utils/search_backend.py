@@ -0,0 +1,353 @@
+"""
+Search Backend - Pluggable full-text search over diary entries.
+
+PostgreSQL uses ``tsvector`` matching backed by a GIN index, SQLite uses the
+FTS5 shadow table, and anything else falls back to substring matching. Every
+backend returns the same SearchHit rows, including ranks and the character
+offsets of each match so the snippet highlighter does not have to re-search.
+"""
+
+import re
+from datetime import date
+from typing import Any, List, NamedTuple, Optional, Tuple
+from flask import current_app
+from sqlalchemy import (
+    Date,
+    Float,
+    Integer,
+    String,
+    and_,
+    cast,
+    func,
+    literal,
+    or_,
+    select,
+    text,
+)
+from ..models import db, DiaryEntry
+from ..models.database import get_dialect
+from ..models.search_index import SQLITE_FTS_TABLE, POSTGRES_TSVECTOR
+
+# Control characters used to mark matches in highlighted index output
+MATCH_START = "\x02"
+MATCH_END = "\x03"
+
+TERM_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+
+class SearchHit(NamedTuple):
+    """A diary entry matching a search, with its rank and match offsets."""
+
+    entry_id: int
+    entry_date: date
+    content: str
+    rank: float
+    offsets: List[Tuple[int, int]]
+
+
+def parse_terms(search_text: str) -> List[str]:
+    """Split free text into lower-cased search terms.
+
+    Args:
+        search_text: Text typed into the search box.
+
+    Returns:
+        The word terms, in order, without punctuation.
+    """
+    return [term.lower() for term in TERM_PATTERN.findall(search_text or "")]
+
+
+def offsets_from_marked(marked: str) -> Tuple[str, List[Tuple[int, int]]]:
+    """Strip match markers from highlighted text and record their positions.
+
+    Args:
+        marked: Text with matches wrapped in MATCH_START / MATCH_END.
+
+    Returns:
+        Tuple of (plain text, list of (start, end) offsets into it).
+    """
+    plain = []
+    offsets = []
+    start = None
+    for char in marked:
+        if char == MATCH_START:
+            start = len(plain)
+        elif char == MATCH_END:
+            if start is not None:
+                offsets.append((start, len(plain)))
+            start = None
+        else:
+            plain.append(char)
+    return "".join(plain), offsets
+
+
+def find_offsets(content: str, search_text: str) -> List[Tuple[int, int]]:
+    """Find every case-insensitive occurrence of a phrase in the content."""
+    if not search_text:
+        return []
+    return [
+        (match.start(), match.end())
+        for match in re.finditer(re.escape(search_text), content, flags=re.IGNORECASE)
+    ]
+
+
+class SearchBackend:
+    """Substring search with ``ILIKE``, used when no full-text index exists.
+
+    Subclasses only provide the query that finds and ranks matches; ordering
+    and keyset pagination are shared so every backend pages the same way.
+    """
+
+    name = "like"
+
+    def search(
+        self,
+        user_id: int,
+        search_text: str = "",
+        target_date: Optional[date] = None,
+        rating: Optional[int] = None,
+        order_by_rank: bool = False,
+        limit: Optional[int] = None,
+        after: Optional[Tuple[Any, int]] = None,
+    ) -> List[SearchHit]:
+        """Search a user's diary entries.
+
+        Results are ordered by (entry_date, id) newest first, or by
+        (rank, id) best first, so a page can be continued from its last hit
+        without an OFFSET scan.
+
+        Paging by date is exact. Paging by rank is best-effort: ranks are
+        computed from statistics over every user's entries, so later pages
+        seek from the last hit's current rank, which keeps pages consistent
+        while the relative order of the hits holds. A write that reorders
+        hits can still make a later page repeat or skip some of them.
+
+        Args:
+            user_id: The ID of the user whose diary is searched.
+            search_text: Free text to match; empty matches every entry.
+            target_date: Optional date to restrict results to.
+            rating: Optional rating filter (-1 or 1).
+            order_by_rank: Order by relevance instead of newest first.
+            limit: Maximum number of hits to return (all when None).
+            after: Sort key of the last hit already shown, from sort_key().
+
+        Returns:
+            Matching entries as SearchHit rows.
+        """
+        use_index = self._use_index(search_text)
+        query = self._index_query if use_index else self._like_query
+        matches = query(user_id, search_text, target_date, rating)
+        hits = matches.subquery("hits")
+
+        first_key = hits.c.rank if order_by_rank else hits.c.entry_date
+        stmt = select(hits)
+        if after is not None:
+            pivot = after[0]
+            if order_by_rank:
+                # Ranks drift as the shared index changes, so seek from the
+                # current rank of the last hit shown while it still matches
+                current = select(hits.c.rank).where(hits.c.id == after[1])
+                pivot = func.coalesce(current.scalar_subquery(), pivot)
+            stmt = stmt.where(
+                or_(
+                    first_key < pivot,
+                    and_(first_key == pivot, hits.c.id < after[1]),
+                )
+            )
+        stmt = stmt.order_by(first_key.desc(), hits.c.id.desc())
+        if limit is not None:
+            stmt = stmt.limit(limit)
+
+        results = []
+        for row in db.session.execute(stmt):
+            if use_index:
+                content, offsets = offsets_from_marked(row.marked)
+            else:
+                content = row.marked
+                offsets = find_offsets(content, search_text)
+            results.append(
+                SearchHit(row.id, row.entry_date, content, float(row.rank), offsets)
+            )
+        return results
+
+    @staticmethod
+    def sort_key(hit: SearchHit, order_by_rank: bool = False) -> Tuple[Any, int]:
+        """Return the keyset pagination key for a hit."""
+        return (hit.rank if order_by_rank else hit.entry_date, hit.entry_id)
+
+    def _use_index(self, search_text: str) -> bool:
+        """Whether the full-text index can answer a search for this text."""
+        return self.name != "like" and bool(parse_terms(search_text))
+
+    def _index_query(self, user_id, search_text, target_date, rating):
+        """Select id, entry_date, rank and marked for matching entries."""
+        return self._like_query(user_id, search_text, target_date, rating)
+
+    @staticmethod
+    def _like_query(user_id, search_text, target_date, rating):
+        rank = literal(0.0)
+        conditions = [DiaryEntry.user_id == user_id]
+        if search_text:
+            conditions.append(DiaryEntry.content.ilike(f"%{search_text}%"))
+            # Rank by the number of occurrences of the phrase
+            content = func.lower(DiaryEntry.content)
+            rank = (
+                func.length(content)
+                - func.length(func.replace(content, search_text.lower(), ""))
+            ) / float(len(search_text))
+        if target_date is not None:
+            conditions.append(DiaryEntry.entry_date == target_date)
+        if rating is not None:
+            conditions.append(DiaryEntry.rating == rating)
+
+        return select(
+            DiaryEntry.id,
+            DiaryEntry.entry_date,
+            cast(rank, Float).label("rank"),
+            DiaryEntry.content.label("marked"),
+        ).where(*conditions)
+
+    @staticmethod
+    def _filters(target_date: Optional[date], rating: Optional[int]) -> str:
+        clauses = ""
+        if target_date is not None:
+            clauses += " AND d.entry_date = :target_date"
+        if rating is not None:
+            clauses += " AND d.rating = :rating"
+        return clauses
+
+
+class SQLiteFTSBackend(SearchBackend):
+    """SQLite FTS5 search with bm25 ranking and index-side highlighting."""
+
+    name = "fts5"
+
+    def _index_query(self, user_id, search_text, target_date, rating):
+        # Prefix-match every term, all terms required
+        match = " ".join(f'"{term}"*' for term in parse_terms(search_text))
+        return (
+            text(
+                f"""
+                SELECT
+                    d.id AS id,
+                    d.entry_date AS entry_date,
+                    -bm25({SQLITE_FTS_TABLE}) AS rank,
+                    highlight({SQLITE_FTS_TABLE}, 0, :start, :end) AS marked
+                FROM {SQLITE_FTS_TABLE}
+                JOIN diary_entry d ON d.id = {SQLITE_FTS_TABLE}.rowid
+                WHERE {SQLITE_FTS_TABLE} MATCH :match
+                  AND d.user_id = :user_id
+                  {self._filters(target_date, rating)}
+                """
+            )
+            .bindparams(
+                match=match,
+                user_id=user_id,
+                start=MATCH_START,
+                end=MATCH_END,
+                **_filter_params(target_date, rating),
+            )
+            .columns(id=Integer, entry_date=Date, rank=Float, marked=String)
+        )
+
+
+class PostgresFullTextBackend(SearchBackend):
+    """PostgreSQL ``tsvector`` search with ts_rank and ts_headline offsets."""
+
+    name = "postgres"
+
+    HEADLINE_OPTIONS = (
+        f'HighlightAll=TRUE, StartSel="{MATCH_START}", StopSel="{MATCH_END}"'
+    )
+
+    @staticmethod
+    def _tsquery(search_text: str) -> str:
+        # Prefix-match every term, all terms required
+        return " & ".join(f"{term}:*" for term in parse_terms(search_text))
+
+    def _has_lexemes(self, search_text: str) -> bool:
+        """Whether the english tsquery for the text keeps any terms."""
+        return bool(
+            db.session.execute(
+                text("SELECT numnode(to_tsquery('english', :tsquery))"),
+                {"tsquery": self._tsquery(search_text)},
+            ).scalar()
+        )
+
+    def _use_index(self, search_text):
+        # Stop words ("a", "the", "not", ...) drop out of an english tsquery,
+        # and one made only of stop words matches nothing, so those searches
+        # fall back to substring matching
+        return super()._use_index(search_text) and self._has_lexemes(search_text)
+
+    def _index_query(self, user_id, search_text, target_date, rating):
+        tsquery = self._tsquery(search_text)
+        return (
+            text(
+                f"""
+                SELECT
+                    d.id AS id,
+                    d.entry_date AS entry_date,
+                    ts_rank({POSTGRES_TSVECTOR}, q)::float8 AS rank,
+                    ts_headline('english', d.content, q, :headline_options) AS marked
+                FROM diary_entry d, to_tsquery('english', :tsquery) q
+                WHERE {POSTGRES_TSVECTOR} @@ q
+                  AND d.user_id = :user_id
+                  {self._filters(target_date, rating)}
+                """
+            )
+            .bindparams(
+                tsquery=tsquery,
+                user_id=user_id,
+                headline_options=self.HEADLINE_OPTIONS,
+                **_filter_params(target_date, rating),
+            )
+            .columns(id=Integer, entry_date=Date, rank=Float, marked=String)
+        )
+
+
+def _filter_params(target_date: Optional[date], rating: Optional[int]) -> dict:
+    params = {}
+    if target_date is not None:
+        params["target_date"] = target_date
+    if rating is not None:
+        params["rating"] = rating
+    return params
+
+
+def _sqlite_fts_available() -> bool:
+    return (
+        db.session.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+            {"name": SQLITE_FTS_TABLE},
+        ).first()
+        is not None
+    )
+
+
+def get_search_backend() -> SearchBackend:
+    """Return the search backend for the configured database.
+
+    The choice is made once per application and cached on it.
+
+    Returns:
+        The SearchBackend instance to use.
+    """
+    backend = current_app.extensions.get("search_backend")
+    if backend is not None:
+        return backend
+
+    configured = current_app.config.get("SEARCH_BACKEND", "auto")
+    dialect = get_dialect().name
+
+    if configured == "like":
+        backend = SearchBackend()
+    elif dialect == "postgresql":
+        backend = PostgresFullTextBackend()
+    elif dialect == "sqlite" and _sqlite_fts_available():
+        backend = SQLiteFTSBackend()
+    else:
+        backend = SearchBackend()
+
+    current_app.extensions["search_backend"] = backend
+    return backend
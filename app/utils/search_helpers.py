@@ -1,29 +1,35 @@
 import re
-from typing import Union, List
+from typing import Any, Dict, Union, List, Optional, Sequence, Tuple
 from datetime import datetime, date
 from flask import render_template, redirect
 from werkzeug.wrappers import Response as WerkzeugResponse
 from markupsafe import escape
-from ..models import DiaryEntry
+from .diary_navigation import DiaryDateRange
+from .search_backend import get_search_backend
+
+# Search results rendered with the page and returned per JSON request
+SEARCH_PAGE_SIZE = 20
 
 
 def handle_search(
     user_id: int, 
     display_name: str, 
-    diary_dates: List[date], 
+    date_range: DiaryDateRange,
     search_text: str, 
     search_date: str,
-    rating: int = None
+    rating: int = None,
+    sort: str = "date",
 ) -> Union[str, WerkzeugResponse]:
     """Handle search functionality for diary entries.
     
     Args:
         user_id: The ID of the user performing the search.
         display_name: The user's display name.
-        diary_dates: List of dates with diary entries.
+        date_range: The first and last dates with diary entries.
         search_text: The text to search for.
         search_date: The date to filter by.
         rating: Optional rating filter (-1 or 1).
+        sort: "date" for newest first, "relevance" for best match first.
         
     Returns:
         Rendered template or redirect response.
@@ -32,63 +38,142 @@ def handle_search(
     if search_date and not search_text and rating is None:
         return redirect(f"/read-diary?date={search_date}")
 
-    # Build the search query
-    query = DiaryEntry.query.filter_by(user_id=user_id)
+    # Only the first page is rendered; the page fetches the rest on scroll
+    result_data, next_cursor = get_search_page(
+        user_id, search_text, search_date, rating, sort
+    )
+
+    return render_template(
+        "reader/read_diary.html",
+        display_name=display_name,
+        date_range=date_range,
+        search_results=result_data,
+        next_cursor=next_cursor,
+        show_search_results=True,
+    )
+
+
+def get_search_page(
+    user_id: int,
+    search_text: str,
+    search_date: str,
+    rating: Optional[int] = None,
+    sort: str = "date",
+    cursor: Optional[str] = None,
+    page_size: int = SEARCH_PAGE_SIZE,
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """Fetch one page of search results.
+
+    Args:
+        user_id: The ID of the user performing the search.
+        search_text: The text to search for.
+        search_date: The date to filter by.
+        rating: Optional rating filter (-1 or 1).
+        sort: "date" for newest first, "relevance" for best match first.
+        cursor: Cursor returned with the previous page, if any.
+        page_size: Number of results per page.
+
+    Returns:
+        Tuple of (result dicts for the page, cursor for the next page or None).
 
-    # Add date filter if specified
+    Raises:
+        ValueError: If the cursor is malformed.
+    """
+    order_by_rank = sort == "relevance"
+
+    # Parse the date filter if specified
+    target_date = None
     if search_date:
         try:
             target_date = datetime.strptime(search_date, "%Y-%m-%d").date()
-            query = query.filter(DiaryEntry.entry_date == target_date)
         except ValueError:
             # Invalid date, ignore the date filter
             pass
 
-    # Add text search if specified
-    if search_text:
-        query = query.filter(DiaryEntry.content.ilike(f"%{search_text}%"))
-
-    # Add rating filter if specified
-    if rating is not None:
-        query = query.filter(DiaryEntry.rating == rating)
-
-    # Execute the search
-    search_results = query.order_by(DiaryEntry.entry_date.desc()).all()
+    # Fetch one extra hit to know whether another page exists
+    backend = get_search_backend()
+    hits = backend.search(
+        user_id,
+        search_text=search_text,
+        target_date=target_date,
+        rating=rating,
+        order_by_rank=order_by_rank,
+        limit=page_size + 1,
+        after=decode_search_cursor(cursor, order_by_rank) if cursor else None,
+    )
+    has_more = len(hits) > page_size
+    hits = hits[:page_size]
 
-    # Create search result snippets with highlighting
+    # Create search result snippets with highlighting from the index offsets
     result_data = []
-    for entry in search_results:
-        snippet = create_search_snippet(entry.content, search_text)
-        formatted_date = entry.entry_date.strftime("%A, %B %d, %Y")
+    for hit in hits:
+        snippet = create_search_snippet(
+            hit.content, search_text, match_offsets=hit.offsets
+        )
+        formatted_date = hit.entry_date.strftime("%A, %B %d, %Y")
 
         result_data.append(
             {
-                "date": entry.entry_date,
+                "date": hit.entry_date,
                 "formatted_date": formatted_date,
                 "snippet": snippet,
             }
         )
 
-    return render_template(
-        "reader/read_diary.html",
-        display_name=display_name,
-        diary_dates=diary_dates,
-        search_results=result_data,
-        show_search_results=True,
-    )
+    next_cursor = None
+    if has_more:
+        next_cursor = encode_search_cursor(
+            backend.sort_key(hits[-1], order_by_rank), order_by_rank
+        )
+    return result_data, next_cursor
 
 
-def create_search_snippet(content: str, search_text: str, context_chars: int = 20) -> str:
+def encode_search_cursor(key: Tuple[Any, int], order_by_rank: bool) -> str:
+    """Encode a pagination key as an opaque cursor string.
+
+    Relevance cursors keep the rank seen when the page was served, which is
+    only used if the last hit no longer matches; see SearchBackend.search
+    for why relevance paging is best-effort.
+    """
+    first, entry_id = key
+    first = repr(first) if order_by_rank else first.isoformat()
+    return f"{first}_{entry_id}"
+
+
+def decode_search_cursor(cursor: str, order_by_rank: bool) -> Tuple[Any, int]:
+    """Decode a cursor produced by encode_search_cursor.
+
+    Raises:
+        ValueError: If the cursor is malformed.
+    """
+    first, _, entry_id = cursor.rpartition("_")
+    if order_by_rank:
+        return float(first), int(entry_id)
+    return date.fromisoformat(first), int(entry_id)
+
+
+def create_search_snippet(
+    content: str,
+    search_text: str,
+    context_chars: int = 20,
+    match_offsets: Optional[Sequence[Tuple[int, int]]] = None,
+) -> str:
     """Create a search snippet with highlighted search terms.
     
     Args:
         content: The full content to create a snippet from.
         search_text: The text to highlight in the snippet.
         context_chars: Number of characters to show around the match.
+        match_offsets: Optional (start, end) match positions reported by the
+            search index. When given, every match inside the snippet window is
+            highlighted, which also covers multi-term and prefix matches.
         
     Returns:
         HTML snippet with highlighted search terms.
     """
+    if match_offsets:
+        return _snippet_from_offsets(content, match_offsets, context_chars)
+
     if not search_text:
         return content[:80] + "..." if len(content) > 80 else content
 
@@ -122,3 +207,33 @@ def create_search_snippet(content: str, search_text: str, context_chars: int = 2
     )
 
     return snippet
+
+
+def _snippet_from_offsets(
+    content: str, match_offsets: Sequence[Tuple[int, int]], context_chars: int
+) -> str:
+    """Build a snippet around the first match, marking every match in it."""
+    first_start, first_end = match_offsets[0]
+    start = max(0, first_start - context_chars)
+    end = min(len(content), first_end + context_chars)
+
+    parts = []
+    position = start
+    for match_start, match_end in match_offsets:
+        # Only highlight matches that lie fully inside the snippet window
+        if match_start < position or match_end > end:
+            continue
+        parts.append(str(escape(content[position:match_start])))
+        parts.append(f"<mark>{escape(content[match_start:match_end])}</mark>")
+        position = match_end
+    parts.append(str(escape(content[position:end])))
+
+    snippet = "".join(parts)
+
+    # Add ellipsis if we're not at the beginning/end
+    if start > 0:
+        snippet = "..." + snippet
+    if end < len(content):
+        snippet = snippet + "..."
+
+    return snippet
@@ -0,0 +1,162 @@
+"""
+Stats Rebuild - Bulk repair of DailyStats from the PointsLog.
+
+Per-day point totals are computed with one ``GROUP BY user_id, date`` per
+chunk of users and written back with batched ``INSERT ... ON CONFLICT``
+upserts, instead of one SUM and one lookup per user per day. Streak state and
+rollups are rebuilt only for users whose stats actually changed.
+"""
+
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Callable, Dict, List, Optional
+from sqlalchemy import func, select
+from ..models import db, DailyStats, PointsLog, User
+from ..models.database import dialect_insert, get_dialect
+from .data_stamp import touch_user_data
+from .point_totals import rebuild_point_totals
+from .points_service import PointsService
+from .rollups import rebuild_rollups
+from .streak_engine import rebuild_streak_state
+
+# Users per GROUP BY query and rows per executemany batch
+USER_CHUNK_SIZE = 500
+UPSERT_BATCH_SIZE = 1000
+
+# Changes kept in the result for the dry-run diff
+MAX_REPORTED_CHANGES = 1000
+
+
+@dataclass
+class StatsChange:
+    """A DailyStats row whose points differ from the PointsLog total."""
+
+    user_id: int
+    date: date
+    old_points: Optional[int]  # None when the row does not exist yet
+    new_points: int
+
+
+@dataclass
+class RebuildResult:
+    """Summary of a bulk rebuild."""
+
+    dry_run: bool = False
+    users_scanned: int = 0
+    days_checked: int = 0
+    inserted: int = 0
+    updated: int = 0
+    users_changed: int = 0
+    changes: List[StatsChange] = field(default_factory=list)
+
+    @property
+    def unchanged(self) -> int:
+        return self.days_checked - self.inserted - self.updated
+
+
+def _selected_user_ids(
+    min_user_id: Optional[int], max_user_id: Optional[int]
+) -> List[int]:
+    """Return the IDs of the users in the range, in order."""
+    query = select(User.id).order_by(User.id)
+    if min_user_id is not None:
+        query = query.where(User.id >= min_user_id)
+    if max_user_id is not None:
+        query = query.where(User.id <= max_user_id)
+    return db.session.scalars(query).all()
+
+
+def _upsert_points(rows: List[Dict]) -> None:
+    """Write points for (user_id, date) rows, creating missing DailyStats."""
+    table = DailyStats.__table__
+    insert = dialect_insert(get_dialect(), table)
+    stmt = insert.on_conflict_do_update(
+        index_elements=["user_id", "date"],
+        set_={"points": insert.excluded.points},
+    )
+    for start in range(0, len(rows), UPSERT_BATCH_SIZE):
+        db.session.execute(stmt, rows[start : start + UPSERT_BATCH_SIZE])
+
+
+def bulk_rebuild_daily_stats(
+    min_user_id: Optional[int] = None,
+    max_user_id: Optional[int] = None,
+    dry_run: bool = False,
+    progress: Optional[Callable[[int, int], None]] = None,
+) -> RebuildResult:
+    """Rebuild DailyStats points from the PointsLog for a range of users.
+
+    Only days that have PointsLog entries are checked, as in
+    PointsService.rebuild_daily_stats_from_log. Each chunk of users is
+    committed separately, so an interrupted run keeps its progress.
+
+    Args:
+        min_user_id: First user ID to rebuild (inclusive), all when None.
+        max_user_id: Last user ID to rebuild (inclusive), all when None.
+        dry_run: Report the differences without writing anything.
+        progress: Called with (users done, users total) after each chunk.
+
+    Returns:
+        RebuildResult with counts and, up to MAX_REPORTED_CHANGES, the changes.
+    """
+    result = RebuildResult(dry_run=dry_run)
+    user_ids = _selected_user_ids(min_user_id, max_user_id)
+
+    for start in range(0, len(user_ids), USER_CHUNK_SIZE):
+        chunk = user_ids[start : start + USER_CHUNK_SIZE]
+        first_id, last_id = chunk[0], chunk[-1]
+        totals = db.session.execute(
+            select(PointsLog.user_id, PointsLog.date, func.sum(PointsLog.points))
+            .where(PointsLog.user_id.between(first_id, last_id))
+            .group_by(PointsLog.user_id, PointsLog.date)
+        ).all()
+        existing = {
+            (row.user_id, row.date): row.points
+            for row in db.session.execute(
+                select(DailyStats.user_id, DailyStats.date, DailyStats.points).where(
+                    DailyStats.user_id.between(first_id, last_id)
+                )
+            )
+        }
+
+        upserts = []
+        changed_users = set()
+        for user_id, day, total in totals:
+            total = total or 0
+            result.days_checked += 1
+            key = (user_id, day)
+            old_points = existing.get(key)
+            if key in existing and (old_points or 0) == total:
+                continue
+
+            if key in existing:
+                result.updated += 1
+            else:
+                result.inserted += 1
+            changed_users.add(user_id)
+            upserts.append({"user_id": user_id, "date": day, "points": total})
+            if len(result.changes) < MAX_REPORTED_CHANGES:
+                result.changes.append(StatsChange(user_id, day, old_points, total))
+
+        if not dry_run and upserts:
+            # New rows need explicit streak defaults; conflicts only set points
+            for row in upserts:
+                row.setdefault("current_streak", 0)
+                row.setdefault("longest_streak", 0)
+            _upsert_points(upserts)
+            for user_id in sorted(changed_users):
+                rebuild_streak_state(user_id)
+                PointsService._update_streak_calculations(user_id)
+                # The upserts bypass the ORM events that maintain the rollups,
+                # the point totals and the data stamp
+                rebuild_rollups(user_id)
+                touch_user_data(user_id)
+            rebuild_point_totals(sorted(changed_users))
+            db.session.commit()
+
+        result.users_changed += len(changed_users)
+        result.users_scanned += len(chunk)
+        if progress is not None:
+            progress(result.users_scanned, len(user_ids))
+
+    return result
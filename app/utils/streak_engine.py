@@ -0,0 +1,302 @@
+"""
+Streak Engine - Set-based streak calculation.
+
+Works out a user's current and longest streak of consecutive diary days
+from a single query, instead of probing the database one day at a time.
+On PostgreSQL the gaps-and-islands grouping runs in SQL; other dialects
+fetch the distinct entry dates once and walk them in Python.
+
+The per-user UserStreak row is maintained incrementally from new diary
+entries, so the hot paths read streaks in O(1) and only fall back to the
+full computation to seed or repair that state.
+"""
+
+from typing import Iterable, NamedTuple, Optional
+from datetime import date, datetime, timedelta, timezone
+from sqlalchemy import text
+from ..models import db, DiaryEntry, UserStreak
+from ..models.database import get_dialect, get_executor
+
+
+class StreakSummary(NamedTuple):
+    """Streak figures for a user.
+
+    ``current`` is the run ending today, while ``last_run_length`` is the run
+    ending on ``last_entry_date`` - the seed for the incremental streak state.
+    """
+
+    current: int
+    longest: int
+    last_entry_date: Optional[date] = None
+    last_run_length: int = 0
+
+
+# Each island of consecutive dates shares the same (entry_date - row_number)
+# anchor, so grouping on it yields one row per run of consecutive days.
+_POSTGRES_STREAK_SQL = text(
+    """
+    WITH days AS (
+        SELECT DISTINCT entry_date
+        FROM diary_entry
+        WHERE user_id = :user_id
+    ),
+    islands AS (
+        SELECT
+            MAX(entry_date) AS run_end,
+            COUNT(*) AS run_length
+        FROM (
+            SELECT
+                entry_date,
+                entry_date
+                    - CAST(ROW_NUMBER() OVER (ORDER BY entry_date) AS INTEGER)
+                    AS anchor
+            FROM days
+        ) numbered
+        GROUP BY anchor
+    )
+    SELECT
+        COALESCE(MAX(CASE WHEN run_end = :today THEN run_length END), 0)
+            AS current_streak,
+        COALESCE(MAX(run_length), 0) AS longest_streak,
+        MAX(run_end) AS last_entry_date,
+        COALESCE(
+            MAX(
+                CASE WHEN run_end = (SELECT MAX(entry_date) FROM days)
+                THEN run_length END
+            ),
+            0
+        ) AS last_run_length
+    FROM islands
+    """
+)
+
+
+def summarize_dates(entry_dates: Iterable[date], today: date) -> StreakSummary:
+    """Compute streaks from an ascending sequence of distinct entry dates.
+
+    Args:
+        entry_dates: Distinct dates with diary entries, oldest first.
+        today: The date a current streak has to end on.
+
+    Returns:
+        StreakSummary with the run ending today and the longest run.
+    """
+    longest = 0
+    run_length = 0
+    previous = None
+
+    for entry_date in entry_dates:
+        if previous is not None and entry_date - previous == timedelta(days=1):
+            run_length += 1
+        else:
+            run_length = 1
+        longest = max(longest, run_length)
+        previous = entry_date
+
+    current = run_length if previous == today else 0
+    return StreakSummary(
+        current=current,
+        longest=longest,
+        last_entry_date=previous,
+        last_run_length=run_length,
+    )
+
+
+def compute_streaks(
+    user_id: int, today: Optional[date] = None, connection=None
+) -> StreakSummary:
+    """Compute the current and longest diary streak for a user.
+
+    Always issues exactly one query, regardless of how long the user's
+    history or streak is.
+
+    Args:
+        user_id: The ID of the user.
+        today: Date the current streak has to end on (defaults to today).
+        connection: Optional connection to run on instead of the session,
+            for use inside flush-time event handlers.
+
+    Returns:
+        StreakSummary with the current and longest streak.
+    """
+    if today is None:
+        today = datetime.now(timezone.utc).date()
+
+    executor, dialect = get_executor(connection), get_dialect(connection)
+
+    if dialect.name == "postgresql":
+        row = executor.execute(
+            _POSTGRES_STREAK_SQL, {"user_id": user_id, "today": today}
+        ).one()
+        return StreakSummary(
+            current=row.current_streak,
+            longest=row.longest_streak,
+            last_entry_date=row.last_entry_date,
+            last_run_length=row.last_run_length,
+        )
+
+    rows = executor.execute(
+        db.select(DiaryEntry.entry_date)
+        .where(DiaryEntry.user_id == user_id)
+        .distinct()
+        .order_by(DiaryEntry.entry_date)
+    )
+    return summarize_dates((row.entry_date for row in rows), today)
+
+
+def load_streak_state(user_id: int, connection=None):
+    """Load the stored streak state row for a user.
+
+    Reads through Core rather than the ORM identity map, so changes made by
+    the flush-time listener earlier in the same transaction are visible.
+
+    Args:
+        user_id: The ID of the user.
+        connection: Optional connection to run on instead of the session.
+
+    Returns:
+        The state row, or None if it has not been built yet.
+    """
+    streaks = UserStreak.__table__
+    return (
+        get_executor(connection)
+        .execute(db.select(streaks).where(streaks.c.user_id == user_id))
+        .first()
+    )
+
+
+def rebuild_streak_state(user_id: int, connection=None):
+    """Rebuild a user's streak state from their full diary history.
+
+    Args:
+        user_id: The ID of the user.
+        connection: Optional connection to run on instead of the session.
+
+    Returns:
+        The rebuilt state row.
+    """
+    executor = get_executor(connection)
+    streaks = UserStreak.__table__
+    summary = compute_streaks(user_id, connection=connection)
+
+    run_start = None
+    if summary.last_entry_date is not None:
+        run_start = summary.last_entry_date - timedelta(
+            days=summary.last_run_length - 1
+        )
+    values = {
+        "current_run_start": run_start,
+        "current_length": summary.last_run_length,
+        "longest": summary.longest,
+        "last_entry_date": summary.last_entry_date,
+    }
+
+    if load_streak_state(user_id, connection) is None:
+        executor.execute(streaks.insert().values(user_id=user_id, **values))
+    else:
+        executor.execute(
+            streaks.update().where(streaks.c.user_id == user_id).values(**values)
+        )
+    return load_streak_state(user_id, connection)
+
+
+def record_entry(user_id: int, entry_date: date, connection=None) -> None:
+    """Fold a newly written diary entry into the user's streak state.
+
+    Extending, restarting or ignoring the current run only needs the stored
+    row. Missing state and back-dated entries are rebuilt from history.
+
+    Args:
+        user_id: The ID of the user who wrote the entry.
+        entry_date: Date of the new entry.
+        connection: Optional connection to run on instead of the session.
+    """
+    state = load_streak_state(user_id, connection)
+
+    if (
+        state is None
+        or state.last_entry_date is None
+        or entry_date < state.last_entry_date
+    ):
+        rebuild_streak_state(user_id, connection)
+        return
+
+    if entry_date == state.last_entry_date:
+        return
+
+    if entry_date - state.last_entry_date == timedelta(days=1):
+        run_start = state.current_run_start
+        run_length = state.current_length + 1
+    else:
+        run_start = entry_date
+        run_length = 1
+
+    streaks = UserStreak.__table__
+    get_executor(connection).execute(
+        streaks.update()
+        .where(streaks.c.user_id == user_id)
+        .values(
+            current_run_start=run_start,
+            current_length=run_length,
+            longest=max(state.longest, run_length),
+            last_entry_date=entry_date,
+        )
+    )
+
+
+def get_streak_summary(user_id: int, today: Optional[date] = None) -> StreakSummary:
+    """Return the user's streaks from the stored state.
+
+    Falls back to computing them from history if no state exists yet, e.g.
+    for accounts that have not written since the state table was added.
+
+    Args:
+        user_id: The ID of the user.
+        today: Date the current streak has to end on (defaults to today).
+
+    Returns:
+        StreakSummary with the current and longest streak.
+    """
+    if today is None:
+        today = datetime.now(timezone.utc).date()
+
+    state = load_streak_state(user_id)
+    if state is None:
+        return compute_streaks(user_id, today)
+
+    return StreakSummary(
+        current=UserStreak.current_as_of(
+            state.last_entry_date, state.current_length, today
+        ),
+        longest=state.longest,
+        last_entry_date=state.last_entry_date,
+        last_run_length=state.current_length,
+    )
+
+
+def run_ending_on(user_id: int, day: date, connection=None) -> int:
+    """Count the consecutive diary days ending on ``day``.
+
+    Entries after ``day`` are ignored, so this is the streak as it stood on
+    that day, even when it is worked out later.
+
+    Args:
+        user_id: The ID of the user.
+        day: The last day of the run.
+        connection: Optional connection to run on instead of the session.
+
+    Returns:
+        Length of the run, 0 if there is no entry on ``day``.
+    """
+    rows = get_executor(connection).execute(
+        db.select(DiaryEntry.entry_date)
+        .where(DiaryEntry.user_id == user_id, DiaryEntry.entry_date <= day)
+        .distinct()
+        .order_by(DiaryEntry.entry_date.desc())
+    )
+    length = 0
+    for row in rows:
+        if row.entry_date != day - timedelta(days=length):
+            break
+        length += 1
+    return length
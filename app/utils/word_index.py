@@ -0,0 +1,209 @@
+"""
+Word Index - Incrementally maintained word counts for the word cloud.
+
+Diary entries are tokenized once, when they are written (or deleted), and
+their word counts are folded into the per-user word_frequencies table. The
+progress page then reads the word cloud with a single top-N query.
+
+Entries written before the index existed are counted by its migration.
+"""
+
+import re
+from collections import Counter
+from typing import Any, List, Optional
+from ..models import db, DiaryEntry, User
+from ..models.database import dialect_insert, get_dialect, get_executor
+from ..models.word_frequency import WordFrequency
+
+# Words longer than this are almost always pasted links or noise
+MAX_WORD_LENGTH = 64
+
+WORD_PATTERN = re.compile(r"\b\w+\b")
+
+# most common stop words in English
+STOP_WORDS = frozenset(
+    [
+        "the", "and", "is", "in", "it", "of", "to", "a", "for", "on", "with", "as",
+        "at", "by", "an", "be", "this", "that", "from", "or", "are", "was", "but",
+        "not", "have", "has", "had", "they", "you", "i", "we", "he", "she", "his",
+        "her", "their", "our", "my", "your", "so", "if", "do", "did", "does", "can",
+        "will", "just", "about", "me", "what", "when", "which", "who", "how", "all",
+        "no", "out", "up", "down", "into", "more", "than", "then", "them", "were",
+        "been", "would", "could", "should", "also", "because", "too", "very", "get",
+        "got", "go", "going", "one", "now", "over", "after", "before", "off", "even",
+        "still", "only", "see", "such", "where", "why", "these", "those", "each",
+        "other", "some", "any", "every", "much", "many", "most", "few", "lot", "lots",
+        "may", "might", "must", "like", "want", "needs", "need", "make", "made", "back",
+        "again", "new", "old", "first", "last", "time", "day", "days", "week", "weeks",
+        "month", "months", "year", "years", "today", "tomorrow", "yesterday", "soon",
+        "late", "early", "never", "always", "sometimes", "often", "usually", "once",
+        "twice", "next", "previous", "another", "same", "different", "right", "left",
+        "here", "there", "home", "work", "school", "place", "thing", "things", "way",
+        "ways", "life", "lives", "person", "people", "man", "woman", "child",
+        "children", "friend", "friends", "family", "families", "parent", "parents",
+        "mother", "father", "mom", "dad", "sister", "brother", "son", "daughter",
+        "husband", "wife", "partner", "boyfriend", "girlfriend", "teacher", "student",
+        "class", "classes", "group", "groups", "team", "teams", "member", "members",
+        "leader", "lead", "follow", "following", "followed", "find", "found", "lose",
+        "lost", "give", "gave", "take", "took", "keep", "kept", "let", "lets", "put",
+        "set", "run", "ran", "walk", "walked", "move", "moved", "stop", "stopped",
+        "start", "started", "end", "ended", "begin", "began", "finish", "finished",
+        "try", "tried", "use", "used", "worked", "play", "played",
+    ]
+)
+
+
+def tokenize(content: str) -> Counter:
+    """Count the word-cloud words in a piece of diary text.
+
+    Args:
+        content: The diary entry text.
+
+    Returns:
+        Counter of lower-cased words, without stop words and short words.
+    """
+    return Counter(
+        word
+        for word in WORD_PATTERN.findall(content.lower())
+        if len(word) > 2 and len(word) <= MAX_WORD_LENGTH and word not in STOP_WORDS
+    )
+
+
+def apply_word_counts(
+    user_id: int, counts: Counter, connection=None, increment: bool = True
+) -> None:
+    """Add word counts to a user's index in one batched upsert.
+
+    Args:
+        user_id: The ID of the user.
+        counts: Words and how often they occurred.
+        connection: Optional connection to run on instead of the session.
+        increment: Add to existing counts, or replace them.
+    """
+    if not counts:
+        return
+
+    table = WordFrequency.__table__
+    stmt = dialect_insert(get_dialect(connection), table)
+    count = stmt.excluded.count
+    if increment:
+        count = table.c.count + count
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c.user_id, table.c.word],
+        set_={"count": count},
+    )
+    get_executor(connection).execute(
+        stmt,
+        [
+            {"user_id": user_id, "word": word, "count": count}
+            for word, count in counts.items()
+        ],
+    )
+
+
+def add_to_word_index(user_id: int, content: str, connection=None) -> None:
+    """Index the words of a newly written diary entry.
+
+    Args:
+        user_id: The ID of the user who wrote the entry.
+        content: The entry text.
+        connection: Optional connection to run on instead of the session.
+    """
+    apply_word_counts(user_id, tokenize(content), connection)
+
+
+def remove_from_word_index(user_id: int, content: str, connection=None) -> None:
+    """Take the words of a deleted diary entry out of the index.
+
+    Args:
+        user_id: The ID of the user who wrote the entry.
+        content: The entry text.
+        connection: Optional connection to run on instead of the session.
+    """
+    counts = tokenize(content)
+    if not counts:
+        return
+
+    table = WordFrequency.__table__
+    executor = get_executor(connection)
+    executor.execute(
+        table.update()
+        .where(table.c.user_id == user_id)
+        .where(table.c.word == db.bindparam("w"))
+        .values(count=table.c.count - db.bindparam("c")),
+        [{"w": word, "c": count} for word, count in counts.items()],
+    )
+    executor.execute(
+        table.delete()
+        .where(table.c.user_id == user_id)
+        .where(table.c.word.in_(list(counts)))
+        .where(table.c.count <= 0)
+    )
+
+
+def get_wordcloud_data(user_id: int) -> List[List[Any]]:
+    """Return normalized word cloud data from the index.
+
+    Args:
+        user_id: The ID of the user.
+
+    Returns:
+        Up to 30 [word, weight] pairs, weights scaled for the word cloud.
+    """
+    # Get the most common words
+    most_common = (
+        db.session.query(WordFrequency.word, WordFrequency.count)
+        .filter_by(user_id=user_id)
+        .order_by(WordFrequency.count.desc(), WordFrequency.word)
+        .limit(50)  # Get more words initially
+        .all()
+    )
+    if not most_common:
+        return []
+
+    # Normalize frequencies to a 0-100 scale
+    max_freq = most_common[0].count  # Highest frequency
+    min_freq = most_common[-1].count if len(most_common) > 1 else 1  # Lowest frequency
+
+    # Create normalized word cloud data
+    wordcloud_data = []
+    for word, count in most_common[:30]:  # Take top 30
+        # Normalize to 10-100 scale (avoid too small values)
+        if max_freq == min_freq:
+            normalized_weight = 50  # If all words have same frequency
+        else:
+            # Scale from 70 to 150
+            normalized_weight = 70 + (150 * (count - min_freq) / (max_freq - min_freq))
+
+        wordcloud_data.append([word, int(normalized_weight)])
+
+    return wordcloud_data
+
+
+def rebuild_word_index(user_id: int, batch_size: int = 500) -> int:
+    """Rebuild a user's word index from their diary history.
+
+    Entries are streamed in batches, so memory is bounded by the size of the
+    user's vocabulary rather than the size of their diary. Counts are written
+    as totals, so a concurrent rebuild of the same user cannot double them.
+
+    Args:
+        user_id: The ID of the user.
+        batch_size: Number of entries fetched per round trip.
+
+    Returns:
+        Number of distinct words indexed.
+    """
+    WordFrequency.query.filter_by(user_id=user_id).delete()
+
+    counts = Counter()
+    contents = (
+        db.session.query(DiaryEntry.content)
+        .filter_by(user_id=user_id)
+        .execution_options(yield_per=batch_size)
+    )
+    for row in contents:
+        counts.update(tokenize(row.content))
+
+    apply_word_counts(user_id, counts, increment=False)
+    return len(counts)
@@ -1,6 +1,7 @@
 /**
  * Charts functionality for the progress page
  * Handles points over time chart and weekday performance chart
+ * Each chart is created once its widget data has been loaded
  */
 
 class ProgressCharts {
@@ -8,24 +9,24 @@ class ProgressCharts {
         this.points_chart = null;
         this.weekday_chart = null;
         this.goal_category_chart = null;
-        this.init();
+        this.overview_points = [];
+        this.detail_timer = null;
+        this.detail_request = 0;
     }
 
-    init() {
-        this.init_points_chart();
-        this.init_weekday_chart();
-        this.init_goal_category_chart();
-    }
-
-    init_points_chart() {
-        const points_data = window.progress_data.points_data;
+    init_points_chart(points_data) {
         const data_points = points_data.map(item => ({
             x: item[0],  // "YYYY-MM-DD"
             y: item[1]
         }));
 
-        const ctx = document.getElementById('pointsChart').getContext('2d');
+        this.overview_points = data_points;
+
+        const canvas = document.getElementById('pointsChart');
+        const chart_url = canvas.dataset.chartUrl;
+        const ctx = canvas.getContext('2d');
         Chart.register(ChartZoom);
+        const on_range_change = ({chart}) => this.schedule_detail_fetch(chart, chart_url);
 
         this.points_chart = new Chart(ctx, {
             type: 'line',
@@ -60,12 +61,14 @@ class ProgressCharts {
                             pinch: {
                                 enabled: true
                             },
-                            mode: 'x'
+                            mode: 'x',
+                            onZoomComplete: on_range_change
                         },
                         pan: {
                             enabled: true,
                             mode: 'x',
-                            modifierKey: null 
+                            modifierKey: null,
+                            onPanComplete: on_range_change
                         },
                     }   
                 },
@@ -85,8 +88,40 @@ class ProgressCharts {
         });
     }
 
-    init_weekday_chart() {
-        const weekday_config = window.progress_data.weekday_config;
+    schedule_detail_fetch(chart, chart_url) {
+        if (!chart_url) {
+            return;
+        }
+        // Wait for the wheel or drag to settle before asking for detail
+        clearTimeout(this.detail_timer);
+        this.detail_timer = setTimeout(() => this.fetch_detail(chart, chart_url), 250);
+    }
+
+    fetch_detail(chart, chart_url) {
+        const to_date = ms => new Date(ms).toISOString().slice(0, 10);
+        const start = to_date(chart.scales.x.min);
+        const end = to_date(chart.scales.x.max);
+        const resolution = Math.min(Math.round(chart.width), 1000);
+        const request_id = ++this.detail_request;
+
+        const params = new URLSearchParams({ start, end, resolution });
+        fetch(`${chart_url}?${params}`, { credentials: 'same-origin' })
+            .then(response => response.ok ? response.json() : null)
+            .then(result => {
+                // Ignore responses for a range the user has already moved past
+                if (!result || request_id !== this.detail_request) {
+                    return;
+                }
+                const detail = result.points.map(item => ({ x: item[0], y: item[1] }));
+                const outside = this.overview_points.filter(point => point.x < start || point.x > end);
+                chart.data.datasets[0].data = outside.concat(detail)
+                    .sort((a, b) => (a.x < b.x ? -1 : a.x > b.x ? 1 : 0));
+                chart.update('none');
+            })
+            .catch(() => {});
+    }
+
+    init_weekday_chart(weekday_config) {
         const weekday_data = weekday_config.weekday_data;
         const has_sufficient_weekday_data = weekday_config.has_sufficient_weekday_data;
         const sample_weekday_data = weekday_config.sample_weekday_data;
@@ -159,8 +194,7 @@ class ProgressCharts {
         }
     }
 
-    init_goal_category_chart() {
-        const goal_stats_data = window.progress_data.goal_stats_data;
+    init_goal_category_chart(goal_stats_data) {
         if (!goal_stats_data || !goal_stats_data.has_stats) {
             return;
         }
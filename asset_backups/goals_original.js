@@ -171,6 +171,271 @@ document.addEventListener('DOMContentLoaded', function() {
         requestAnimationFrame(updateNumber);
     }
     
+    // Goal actions are posted to the JSON API and the page is patched in place
+    const csrf_meta = document.querySelector('meta[name="csrf-token"]');
+    const HISTORY_LIMIT = 10;
+    const HISTORY_VISIBLE = 5;
+    const NO_ACTIVE_GOALS_HTML = [
+        '<div class="card goal-card mb-4"><div class="card-body text-center">',
+        '<div class="card-icon mb-3"><i class="fas fa-plus-circle"></i></div>',
+        '<p class="text-white">No active goals. Set a new goal to get started!</p>',
+        '</div></div>'
+    ].join('');
+
+    function escape_html(text) {
+        const element = document.createElement('div');
+        element.textContent = text;
+        return element.innerHTML;
+    }
+
+    function format_date(iso) {
+        const [year, month, day] = iso.slice(0, 10).split('-').map(Number);
+        return new Date(Date.UTC(year, month - 1, day)).toLocaleDateString('en-US', {
+            month: 'short', day: '2-digit', year: 'numeric', timeZone: 'UTC'
+        });
+    }
+
+    function post_json_form(form) {
+        return fetch(form.dataset.jsonAction, {
+            method: 'POST',
+            body: new FormData(form),
+            credentials: 'same-origin',
+            headers: {
+                'Accept': 'application/json',
+                'X-CSRFToken': csrf_meta ? csrf_meta.getAttribute('content') : ''
+            }
+        }).then(response => response.json().then(data => ({
+            ok: response.ok,
+            status: response.status,
+            data: data
+        })));
+    }
+
+    function active_goal_card(goal) {
+        const csrf_token = csrf_meta ? csrf_meta.getAttribute('content') : '';
+        const card = document.createElement('div');
+        card.className = 'card goal-card current-goal mb-4';
+        card.dataset.goalId = goal.id;
+        card.innerHTML = [
+            '<div class="card-header"><div class="d-flex justify-content-between align-items-center">',
+            '<div class="d-flex align-items-center"><div class="card-icon me-3"><i class="fas fa-bullseye"></i></div>',
+            '<h5 class="mb-0 text-white">Active Goal</h5></div>',
+            `<div><span class="badge bg-primary">${escape_html(goal.category)}</span></div></div></div>`,
+            '<div class="card-body">',
+            `<h4 class="goal-title text-white">${escape_html(goal.title)}</h4>`,
+            goal.description ? `<p class="goal-description text-white">${escape_html(goal.description)}</p>` : '',
+            `<div class="mb-2"><span class="badge bg-secondary">${'Start:\u0020' + format_date(goal.week_start)}</span>`,
+            `<span class="badge bg-dark">${'End:\u0020' + format_date(goal.week_end)}</span></div>`,
+            '<div class="progress-section mb-3"><div class="d-flex justify-content-between mb-2">',
+            '<span class="progress-label text-white">Week Progress</span>',
+            `<span class="progress-percentage text-white">${goal.progress_percentage.toFixed(1) + '%'}</span></div>`,
+            `<div class="progress"><div class="progress-bar" role="progressbar" style="width:${goal.progress_percentage}%" aria-valuenow="${goal.progress_percentage}" aria-valuemin="0" aria-valuemax="100"></div></div>`,
+            `<small class="text-white">${goal.days_remaining + ' days remaining'}</small></div>`,
+            `<form action="${goal.urls.complete}" method="POST" class="d-inline goal-action-form" data-action="complete" data-json-action="${goal.urls.complete_json}">`,
+            `<input type="hidden" name="csrf_token" value="${csrf_token}">`,
+            '<button type="submit" class="btn btn-success btn-sm me-2"><i class="fas fa-check me-1"></i>Mark as Complete</button></form>',
+            `<form action="${goal.urls.fail}" method="POST" class="d-inline goal-action-form" data-action="fail" data-json-action="${goal.urls.fail_json}">`,
+            `<input type="hidden" name="csrf_token" value="${csrf_token}">`,
+            '<button type="submit" class="btn btn-danger btn-sm"><i class="fas fa-times me-1"></i>Mark as Not Completed</button></form>',
+            '</div>'
+        ].join('');
+        return card;
+    }
+
+    function add_active_goal(goal) {
+        const container = document.getElementById('active_goals');
+        if (!container) {
+            return;
+        }
+        if (!container.querySelector('.current-goal')) {
+            container.innerHTML = '';
+        }
+        container.prepend(active_goal_card(goal));
+    }
+
+    function update_overdue_banner() {
+        const banner = document.getElementById('overdue_banner');
+        if (!banner) {
+            return;
+        }
+        const count = Number(banner.dataset.count) - 1;
+        if (count <= 0) {
+            banner.remove();
+            return;
+        }
+        banner.dataset.count = count;
+        banner.querySelector('strong').textContent =
+            'You have ' + count + ' overdue goal' + (count > 1 ? 's' : '') + '\u0020that need review!';
+    }
+
+    function remove_active_goal(goal_id) {
+        const card = document.querySelector(`.current-goal[data-goal-id="${goal_id}"]`);
+        if (card) {
+            if (card.classList.contains('overdue-goal')) {
+                update_overdue_banner();
+            }
+            card.remove();
+        }
+        const container = document.getElementById('active_goals');
+        if (container && !container.querySelector('.current-goal')) {
+            container.innerHTML = NO_ACTIVE_GOALS_HTML;
+        }
+    }
+
+    function history_item(goal) {
+        const item = document.createElement('div');
+        item.className = 'history-item';
+        item.dataset.goalId = goal.id;
+
+        const header = document.createElement('div');
+        header.className = 'history-header';
+        const title = document.createElement('h6');
+        title.className = 'history-title text-white';
+        title.textContent = goal.title;
+        const badge = document.createElement('span');
+        const badge_colors = { completed: 'success', failed: 'danger' };
+        badge.className = 'badge bg-' + (badge_colors[goal.status] || 'secondary');
+        badge.textContent = goal.status === 'failed'
+            ? 'Not Completed'
+            : goal.status.charAt(0).toUpperCase() + goal.status.slice(1);
+        header.append(title, badge);
+
+        const category = document.createElement('small');
+        category.className = 'text-white';
+        category.textContent = goal.category;
+        const created = document.createElement('small');
+        created.className = 'text-white d-block';
+        created.textContent = goal.created_at ? format_date(goal.created_at) : '';
+
+        item.append(header, category, created);
+        return item;
+    }
+
+    function add_to_history(goal) {
+        const body = document.getElementById('goal_history');
+        if (!body) {
+            return;
+        }
+        let list = body.querySelector('.goal-history');
+        if (!list) {
+            body.innerHTML = '';
+            list = document.createElement('div');
+            list.className = 'goal-history';
+            body.appendChild(list);
+        }
+        const listed = list.querySelector(`.history-item[data-goal-id="${goal.id}"]`);
+        if (listed) {
+            listed.remove();
+        }
+        list.prepend(history_item(goal));
+
+        // Lay the list out again as the template does: dividers, the first
+        // few goals visible and the rest behind "Show more"
+        const button = document.getElementById('show_more_goals_btn');
+        const expanded = button !== null && button.textContent === 'Show less';
+        list.querySelectorAll('.history-divider, #show_more_goals_btn').forEach(element => element.remove());
+        const items = Array.from(list.querySelectorAll('.history-item'));
+        items.slice(HISTORY_LIMIT).forEach(item => item.remove());
+        const kept = items.slice(0, HISTORY_LIMIT);
+        kept.forEach((item, index) => {
+            const extra = index >= HISTORY_VISIBLE;
+            item.classList.toggle('extra-goal', extra);
+            item.classList.toggle('d-none', extra && !expanded);
+            if (index < kept.length - 1) {
+                const divider = document.createElement('hr');
+                const extra_divider = index + 1 >= HISTORY_VISIBLE;
+                divider.className = 'history-divider';
+                divider.classList.toggle('extra-goal', extra_divider);
+                divider.classList.toggle('d-none', extra_divider && !expanded);
+                item.after(divider);
+            }
+        });
+        if (kept.length > HISTORY_VISIBLE) {
+            const toggle = document.createElement('button');
+            toggle.className = 'btn btn-outline-primary btn-sm mt-2';
+            toggle.type = 'button';
+            toggle.id = 'show_more_goals_btn';
+            toggle.textContent = expanded ? 'Show less' : 'Show more';
+            toggle.addEventListener('click', () => window.toggle_extra_goals());
+            list.appendChild(toggle);
+        }
+    }
+
+    function set_busy(form, busy) {
+        form.querySelectorAll('button').forEach(button => {
+            button.disabled = busy;
+        });
+    }
+
+    // Complete and fail buttons, including those on cards added by the page
+    document.addEventListener('submit', function(e) {
+        const form = e.target;
+        if (!form.classList.contains('goal-action-form') || !form.dataset.jsonAction) {
+            return;
+        }
+        e.preventDefault();
+        set_busy(form, true);
+        post_json_form(form)
+            .then(result => {
+                const data = result.data;
+                if (data.goal && (result.ok || result.status === 409)) {
+                    remove_active_goal(data.goal.id);
+                    add_to_history(data.goal);
+                }
+                if (result.ok) {
+                    // The points are queued, so the header total catches up later
+                    const points = data.points_awarded
+                        ? '\u0020(+' + data.points_awarded + ' points)'
+                        : '';
+                    showAlert(escape_html(data.message) + points, data.category);
+                } else {
+                    set_busy(form, false);
+                    showAlert(escape_html(data.error || 'Something went wrong.'), 'warning');
+                }
+            })
+            .catch(error => {
+                console.error('Error updating goal:', error);
+                form.submit();
+            });
+    });
+
+    // Create goals without reloading the page
+    const create_form = document.getElementById('create_goal_form');
+    if (create_form && create_form.dataset.jsonAction) {
+        create_form.addEventListener('submit', function(e) {
+            e.preventDefault();
+            if (!document.getElementById('category').value) {
+                showAlert('Please select a goal category.', 'warning');
+                return;
+            }
+            if (!document.getElementById('title').value.trim()) {
+                showAlert('Please enter a goal title.', 'warning');
+                return;
+            }
+            set_busy(create_form, true);
+            post_json_form(create_form)
+                .then(result => {
+                    set_busy(create_form, false);
+                    const data = result.data;
+                    if (result.ok) {
+                        add_active_goal(data.goal);
+                        create_form.reset();
+                        if (suggestions_container) {
+                            suggestions_container.style.display = 'none';
+                        }
+                        showAlert(escape_html(data.message), 'success');
+                        return;
+                    }
+                    const errors = data.errors ? Object.values(data.errors).flat() : [data.error];
+                    errors.forEach(message => showAlert(escape_html(message || 'Something went wrong.'), 'danger'));
+                })
+                .catch(error => {
+                    console.error('Error creating goal:', error);
+                    create_form.submit();
+                });
+        });
+    }
+    
     // Toggle extra goals in Recent Goals section
     window.toggle_extra_goals = function() {
         const extraGoals = document.querySelectorAll('.extra-goal');
@@ -16,26 +16,54 @@ class ProgressPage {
     }
 
     /**
-     * Setup data from the server
+     * Setup the widget endpoints from the server
      */
     setup_data() {
-        // Get weekday data from the JSON script tag
-        const weekday_data_element = document.getElementById('weekday_data');
-        const weekday_config = JSON.parse(weekday_data_element.textContent);
-        
-        // Setup global data object for other modules to access
-        window.progress_data = {
-            points_data: JSON.parse(document.getElementById('points_data').textContent),
-            weekday_config: weekday_config,
-            goal_stats_data: JSON.parse(document.getElementById('goal_stats_data').textContent)
-        };
+        // Widget name -> JSON endpoint, from the JSON script tag
+        this.widget_urls = JSON.parse(document.getElementById('progress_widgets').textContent);
+        window.progress_data = {};
+    }
+
+    /**
+     * Fetch one widget's data. Unchanged widgets are revalidated by the
+     * browser cache and come back as 304s.
+     * @param {string} name - The widget name
+     */
+    load_widget(name) {
+        return fetch(this.widget_urls[name], { credentials: 'same-origin' })
+            .then(response => {
+                if (!response.ok) {
+                    throw new Error(`Widget ${name} failed with ${response.status}`);
+                }
+                return response.json();
+            })
+            .then(data => {
+                window.progress_data[name] = data;
+                return data;
+            });
     }
 
     /**
-     * Initialize charts
+     * Initialize charts and lists, loading their widgets in parallel
      */
     init_charts() {
         this.charts = new ProgressCharts();
+        const widgets = {
+            'points': data => this.charts.init_points_chart(data.points),
+            'weekday': data => this.charts.init_weekday_chart(data),
+            'goal-stats': data => this.charts.init_goal_category_chart(data),
+            'top-days': data => window.entryManager.render_top_days(data.top_days),
+            'wordcloud': data => {
+                if (data.has_sufficient_data && document.getElementById('wordcloud')) {
+                    render_wordcloud(data.words);
+                }
+            }
+        };
+        Object.entries(widgets).forEach(([name, render]) => {
+            this.load_widget(name)
+                .then(render)
+                .catch(error => console.error(`Error loading ${name} widget:`, error));
+        });
     }
 
     /**
@@ -110,62 +138,59 @@ document.addEventListener('DOMContentLoaded', function() {
     }
 });
 
-// Word Cloud rendering
-// Requires wordcloud2.js to be loaded on the page
-if (window.wordcloud_data && document.getElementById('wordcloud')) {
-    console.log('Wordcloud data available:', window.wordcloud_data);
-    console.log('Wordcloud element found:', document.getElementById('wordcloud'));
-    
-    // Dynamically load wordcloud2.js if not already loaded
-    function loadWordCloudScript(callback) {
-        if (window.WordCloud) {
-            console.log('WordCloud library already loaded');
-            callback();
-            return;
-        }
-        console.log('Loading WordCloud library...');
-        var script = document.createElement('script');
-        // Try a different CDN
-        script.src = 'https://unpkg.com/wordcloud@1.2.2/src/wordcloud2.min.js';
-        script.onload = function() {
-            console.log('WordCloud library loaded successfully');
+// Dynamically load wordcloud2.js if not already loaded
+function loadWordCloudScript(callback) {
+    if (window.WordCloud) {
+        console.log('WordCloud library already loaded');
+        callback();
+        return;
+    }
+    console.log('Loading WordCloud library...');
+    var script = document.createElement('script');
+    // Try a different CDN
+    script.src = 'https://unpkg.com/wordcloud@1.2.2/src/wordcloud2.min.js';
+    script.onload = function() {
+        console.log('WordCloud library loaded successfully');
+        console.log('WordCloud function available:', typeof window.WordCloud);
+        callback();
+    };
+    script.onerror = function() {
+        console.error('Failed to load WordCloud library from unpkg, trying jsdelivr...');
+        // Fallback to jsdelivr
+        var fallbackScript = document.createElement('script');
+        fallbackScript.src = 'https://cdn.jsdelivr.net/npm/wordcloud@1.2.2/src/wordcloud2.min.js';
+        fallbackScript.onload = function() {
+            console.log('WordCloud library loaded successfully from jsdelivr');
             console.log('WordCloud function available:', typeof window.WordCloud);
             callback();
         };
-        script.onerror = function() {
-            console.error('Failed to load WordCloud library from unpkg, trying jsdelivr...');
-            // Fallback to jsdelivr
-            var fallbackScript = document.createElement('script');
-            fallbackScript.src = 'https://cdn.jsdelivr.net/npm/wordcloud@1.2.2/src/wordcloud2.min.js';
-            fallbackScript.onload = function() {
-                console.log('WordCloud library loaded successfully from jsdelivr');
-                console.log('WordCloud function available:', typeof window.WordCloud);
-                callback();
-            };
-            fallbackScript.onerror = function() {
-                console.error('Failed to load WordCloud library from both CDNs');
-            };
-            document.head.appendChild(fallbackScript);
+        fallbackScript.onerror = function() {
+            console.error('Failed to load WordCloud library from both CDNs');
         };
-        document.head.appendChild(script);
-    }
+        document.head.appendChild(fallbackScript);
+    };
+    document.head.appendChild(script);
+}
 
+// Word Cloud rendering
+// Requires wordcloud2.js, loaded on first use
+function render_wordcloud(wordcloud_data) {
     loadWordCloudScript(function() {
-        console.log('Creating wordcloud with data:', window.wordcloud_data);
-        console.log('Raw wordcloud data type:', typeof window.wordcloud_data);
-        console.log('Raw wordcloud data length:', window.wordcloud_data.length);
-        console.log('First few raw items:', window.wordcloud_data.slice(0, 3));
-        
-        var words = window.wordcloud_data.map(function(item) {
+        console.log('Creating wordcloud with data:', wordcloud_data);
+        console.log('Raw wordcloud data type:', typeof wordcloud_data);
+        console.log('Raw wordcloud data length:', wordcloud_data.length);
+        console.log('First few raw items:', wordcloud_data.slice(0, 3));
+    
+        var words = wordcloud_data.map(function(item) {
             return [item[0], item[1]];
         });
         console.log('Processed words:', words);
         console.log('Sample word data:', words.slice(0, 3));
         console.log('Word data types:', words.slice(0, 3).map(w => [typeof w[0], typeof w[1]]));
-        
+    
         var wordcloudElem = document.getElementById('wordcloud');
         console.log('Wordcloud element:', wordcloudElem);
-        
+    
         // Render to visible div with real data
         WordCloud(wordcloudElem, {
             list: words,
@@ -230,11 +255,4 @@ if (window.wordcloud_data && document.getElementById('wordcloud')) {
             console.error('Export canvas or wordcloud element not found!');
         }
     });
-} else {
-    console.log('Wordcloud conditions not met:');
-    console.log('- wordcloudData available:', !!window.wordcloud_data);
-    console.log('- wordcloud element exists:', !!document.getElementById('wordcloud'));
-    if (window.wordcloud_data) {
-        console.log('- wordcloudData:', window.wordcloud_data);
-    }
-} 
\ No newline at end of file
+}
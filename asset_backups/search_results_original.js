@@ -0,0 +1,94 @@
+// Diary Search Results - Infinite scroll
+document.addEventListener('DOMContentLoaded', function() {
+    const results_list = document.getElementById('search_results_list');
+    const more = document.getElementById('search_results_more');
+    if (!results_list || !more) {
+        return;
+    }
+
+    let loading = false;
+
+    // Build a result card matching the server-rendered markup
+    function build_result_card(result) {
+        const card = document.createElement('div');
+        card.className = 'diary-entry-content search-result-card';
+
+        const main = document.createElement('div');
+        main.className = 'search-result-main';
+
+        const date_span = document.createElement('span');
+        date_span.className = 'search-result-date';
+        const icon = document.createElement('i');
+        icon.className = 'fas fa-calendar-alt';
+        icon.style.color = '#4fd1c7';
+        date_span.appendChild(icon);
+        date_span.appendChild(document.createTextNode(' ' + result.formatted_date));
+
+        // The snippet is escaped on the server, with only <mark> tags added
+        const snippet = document.createElement('span');
+        snippet.className = 'search-result-snippet';
+        snippet.innerHTML = result.snippet;
+
+        main.appendChild(date_span);
+        main.appendChild(snippet);
+
+        const btn_wrapper = document.createElement('div');
+        btn_wrapper.className = 'search-result-btn';
+        const link = document.createElement('a');
+        link.href = '/read-diary?date=' + encodeURIComponent(result.date);
+        link.className = 'btn btn-outline-primary btn-sm';
+        link.textContent = 'Read Full Day';
+        btn_wrapper.appendChild(link);
+
+        card.appendChild(main);
+        card.appendChild(btn_wrapper);
+        return card;
+    }
+
+    // Fetch the page after the cursor and append it to the list
+    function load_next_page() {
+        if (loading || !more.dataset.cursor) {
+            return;
+        }
+        loading = true;
+
+        const url = new URL(more.dataset.endpoint, window.location.origin);
+        url.searchParams.set('cursor', more.dataset.cursor);
+
+        fetch(url, { headers: { 'Accept': 'application/json' } })
+            .then(response => {
+                if (!response.ok) {
+                    throw new Error('HTTP ' + response.status);
+                }
+                return response.json();
+            })
+            .then(data => {
+                data.results.forEach(result => {
+                    results_list.appendChild(build_result_card(result));
+                });
+                if (data.next_cursor) {
+                    more.dataset.cursor = data.next_cursor;
+                    // Re-observe so a sentinel that is still visible fires again
+                    observer.unobserve(more);
+                    observer.observe(more);
+                } else {
+                    observer.disconnect();
+                    more.remove();
+                }
+                loading = false;
+            })
+            .catch(error => {
+                console.error('Error loading search results:', error);
+                more.textContent = 'Could not load more results.';
+                observer.disconnect();
+            });
+    }
+
+    // Load the next page shortly before the end of the list comes into view
+    const observer = new IntersectionObserver(function(entries) {
+        if (entries.some(entry => entry.isIntersecting)) {
+            load_next_page();
+        }
+    }, { rootMargin: '200px' });
+    observer.observe(more);
+});
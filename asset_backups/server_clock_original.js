@@ -16,6 +16,12 @@ class ServerClock {
         // Parse the server time string to avoid browser timezone interference
         this.serverTime = new Date(serverTimeISO);
         this.startTime = Date.now();
+
+        // A page revalidated from the browser cache still carries the time it
+        // was first rendered; use the local clock rather than a stale time
+        if (this.startTime - this.serverTime.getTime() > 60000) {
+            this.serverTime = new Date(this.startTime);
+        }
         
         console.log('Server clock initialized for UTC time display');
         
@@ -0,0 +1,69 @@
+"""Add points_outbox table for deferred point awards
+
+Revision ID: a1d5e9c3f7b2
+Revises: f3c8d2a6b4e1
+Create Date: 2025-08-07 14:22:51.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+
+# revision identifiers, used by Alembic.
+revision = 'a1d5e9c3f7b2'
+down_revision = 'f3c8d2a6b4e1'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # ### PointsOutboxEvent table creation ###
+
+    connection = op.get_bind()
+    inspector = inspect(connection)
+
+    if 'points_outbox' in inspector.get_table_names():
+        print("ℹ points_outbox table already exists, skipping creation")
+    else:
+        op.create_table('points_outbox',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('user_id', sa.Integer(), nullable=False),
+            sa.Column('event_type', sa.String(20), nullable=False),
+            sa.Column('source_id', sa.Integer(), nullable=False),
+            sa.Column('payload', sa.JSON(), nullable=False),
+            sa.Column('event_date', sa.Date(), nullable=False),
+            sa.Column('created_at', sa.DateTime(), nullable=True),
+            sa.Column('processed_at', sa.DateTime(), nullable=True),
+            sa.Column('attempts', sa.Integer(), nullable=False),
+            sa.Column('last_error', sa.Text(), nullable=True),
+            sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+            sa.PrimaryKeyConstraint('id'),
+            sa.UniqueConstraint('event_type', 'source_id', name='outbox_source_uc')
+        )
+        op.create_index(
+            'idx_points_outbox_pending',
+            'points_outbox',
+            ['processed_at', 'id'],
+        )
+        print("✓ Created points_outbox table")
+
+    print("✓ points_outbox migration completed successfully")
+
+    # ### end PointsOutboxEvent table creation ###
+
+
+def downgrade():
+    # ### PointsOutboxEvent table removal ###
+
+    connection = op.get_bind()
+    inspector = inspect(connection)
+
+    if 'points_outbox' in inspector.get_table_names():
+        op.drop_index('idx_points_outbox_pending', table_name='points_outbox')
+        op.drop_table('points_outbox')
+        print("✓ points_outbox table dropped")
+    else:
+        print("ℹ points_outbox table does not exist, nothing to drop")
+
+    # ### end PointsOutboxEvent table removal ###
@@ -0,0 +1,65 @@
+"""Add goal_stats table for finished goal counts per category and status
+
+Revision ID: a4e7c2d9f1b3
+Revises: f8d4b2e6a1c7
+Create Date: 2025-08-14 10:12:38.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+
+# revision identifiers, used by Alembic.
+revision = 'a4e7c2d9f1b3'
+down_revision = 'f8d4b2e6a1c7'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # ### GoalStats table creation ###
+
+    connection = op.get_bind()
+    inspector = inspect(connection)
+
+    if 'goal_stats' in inspector.get_table_names():
+        print("ℹ goal_stats table already exists, skipping creation")
+    else:
+        op.create_table('goal_stats',
+            sa.Column('user_id', sa.Integer(), nullable=False),
+            sa.Column('category', sa.String(length=20), nullable=False),
+            sa.Column('status', sa.String(length=10), nullable=False),
+            sa.Column('count', sa.Integer(), nullable=False),
+            sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+            sa.PrimaryKeyConstraint('user_id', 'category', 'status')
+        )
+        print("✓ Created goal_stats table")
+
+    # Count every user's existing completed and failed goals
+    op.execute(sa.text("DELETE FROM goal_stats"))
+    op.execute(sa.text(
+        "INSERT INTO goal_stats (user_id, category, status, count) "
+        "SELECT user_id, CAST(category AS VARCHAR(20)), "
+        "CAST(status AS VARCHAR(10)), COUNT(*) FROM goals "
+        "WHERE status IN ('COMPLETED', 'FAILED') "
+        "GROUP BY user_id, category, status"
+    ))
+    print("✓ goal_stats migration completed successfully")
+
+    # ### end GoalStats table creation ###
+
+
+def downgrade():
+    # ### GoalStats table removal ###
+
+    connection = op.get_bind()
+    inspector = inspect(connection)
+
+    if 'goal_stats' in inspector.get_table_names():
+        op.drop_table('goal_stats')
+        print("✓ goal_stats table dropped")
+    else:
+        print("ℹ goal_stats table does not exist, nothing to drop")
+
+    # ### end GoalStats table removal ###
@@ -0,0 +1,67 @@
+"""Add export_jobs table for background data exports
+
+Revision ID: b7e2f4c9d1a3
+Revises: a1d5e9c3f7b2
+Create Date: 2025-08-08 11:05:19.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7e2f4c9d1a3'
+down_revision = 'a1d5e9c3f7b2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # ### ExportJob table creation ###
+
+    connection = op.get_bind()
+    inspector = inspect(connection)
+
+    if 'export_jobs' in inspector.get_table_names():
+        print("ℹ export_jobs table already exists, skipping creation")
+    else:
+        op.create_table('export_jobs',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('user_id', sa.Integer(), nullable=False),
+            sa.Column('status', sa.String(20), nullable=False),
+            sa.Column('file_name', sa.String(255), nullable=True),
+            sa.Column('file_size', sa.Integer(), nullable=True),
+            sa.Column('error', sa.Text(), nullable=True),
+            sa.Column('created_at', sa.DateTime(), nullable=True),
+            sa.Column('started_at', sa.DateTime(), nullable=True),
+            sa.Column('finished_at', sa.DateTime(), nullable=True),
+            sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+            sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index(
+            'idx_export_jobs_user_created', 'export_jobs', ['user_id', 'created_at']
+        )
+        op.create_index('idx_export_jobs_status', 'export_jobs', ['status'])
+        print("✓ Created export_jobs table")
+
+    print("✓ export_jobs migration completed successfully")
+
+    # ### end ExportJob table creation ###
+
+
+def downgrade():
+    # ### ExportJob table removal ###
+
+    connection = op.get_bind()
+    inspector = inspect(connection)
+
+    if 'export_jobs' in inspector.get_table_names():
+        op.drop_index('idx_export_jobs_status', table_name='export_jobs')
+        op.drop_index('idx_export_jobs_user_created', table_name='export_jobs')
+        op.drop_table('export_jobs')
+        print("✓ export_jobs table dropped")
+    else:
+        print("ℹ export_jobs table does not exist, nothing to drop")
+
+    # ### end ExportJob table removal ###
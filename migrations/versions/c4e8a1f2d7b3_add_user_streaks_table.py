@@ -0,0 +1,59 @@
+"""Add user_streaks table for incrementally maintained streak state
+
+Revision ID: c4e8a1f2d7b3
+Revises: bb3c496b0bdc
+Create Date: 2025-08-02 10:14:21.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+
+# revision identifiers, used by Alembic.
+revision = 'c4e8a1f2d7b3'
+down_revision = 'bb3c496b0bdc'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # ### UserStreak table creation ###
+
+    connection = op.get_bind()
+    inspector = inspect(connection)
+
+    if 'user_streaks' in inspector.get_table_names():
+        print("ℹ user_streaks table already exists, skipping creation")
+    else:
+        op.create_table('user_streaks',
+            sa.Column('user_id', sa.Integer(), nullable=False),
+            sa.Column('current_run_start', sa.Date(), nullable=True),
+            sa.Column('current_length', sa.Integer(), nullable=False),
+            sa.Column('longest', sa.Integer(), nullable=False),
+            sa.Column('last_entry_date', sa.Date(), nullable=True),
+            sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+            sa.PrimaryKeyConstraint('user_id')
+        )
+        print("✓ Created user_streaks table")
+
+    # Existing users are seeded lazily on their next write, or all at once
+    # with `flask rebuild-streaks`.
+    print("✓ user_streaks migration completed successfully")
+
+    # ### end UserStreak table creation ###
+
+
+def downgrade():
+    # ### UserStreak table removal ###
+
+    connection = op.get_bind()
+    inspector = inspect(connection)
+
+    if 'user_streaks' in inspector.get_table_names():
+        op.drop_table('user_streaks')
+        print("✓ user_streaks table dropped")
+    else:
+        print("ℹ user_streaks table does not exist, nothing to drop")
+
+    # ### end UserStreak table removal ###
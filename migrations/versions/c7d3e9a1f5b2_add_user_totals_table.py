@@ -0,0 +1,61 @@
+"""Add user_totals table for a running total of each user's points
+
+Revision ID: c7d3e9a1f5b2
+Revises: a4e7c2d9f1b3
+Create Date: 2025-08-21 09:26:51.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+
+# revision identifiers, used by Alembic.
+revision = 'c7d3e9a1f5b2'
+down_revision = 'a4e7c2d9f1b3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # ### UserTotals table creation ###
+
+    connection = op.get_bind()
+    inspector = inspect(connection)
+
+    if 'user_totals' in inspector.get_table_names():
+        print("ℹ user_totals table already exists, skipping creation")
+    else:
+        op.create_table('user_totals',
+            sa.Column('user_id', sa.Integer(), nullable=False),
+            sa.Column('total_points', sa.BigInteger(), nullable=False),
+            sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+            sa.PrimaryKeyConstraint('user_id')
+        )
+        print("✓ Created user_totals table")
+
+    # Total every user's existing daily stats
+    op.execute(sa.text("DELETE FROM user_totals"))
+    op.execute(sa.text(
+        "INSERT INTO user_totals (user_id, total_points) "
+        "SELECT user_id, COALESCE(SUM(points), 0) FROM daily_stats "
+        "GROUP BY user_id"
+    ))
+    print("✓ user_totals migration completed successfully")
+
+    # ### end UserTotals table creation ###
+
+
+def downgrade():
+    # ### UserTotals table removal ###
+
+    connection = op.get_bind()
+    inspector = inspect(connection)
+
+    if 'user_totals' in inspector.get_table_names():
+        op.drop_table('user_totals')
+        print("✓ user_totals table dropped")
+    else:
+        print("ℹ user_totals table does not exist, nothing to drop")
+
+    # ### end UserTotals table removal ###
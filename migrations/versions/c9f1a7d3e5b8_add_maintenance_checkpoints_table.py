@@ -0,0 +1,60 @@
+"""Add maintenance_checkpoints table for resumable maintenance jobs
+
+Revision ID: c9f1a7d3e5b8
+Revises: b7e2f4c9d1a3
+Create Date: 2025-08-09 09:42:37.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+
+# revision identifiers, used by Alembic.
+revision = 'c9f1a7d3e5b8'
+down_revision = 'b7e2f4c9d1a3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # ### MaintenanceCheckpoint table creation ###
+
+    connection = op.get_bind()
+    inspector = inspect(connection)
+
+    if 'maintenance_checkpoints' in inspector.get_table_names():
+        print("ℹ maintenance_checkpoints table already exists, skipping creation")
+    else:
+        op.create_table('maintenance_checkpoints',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('name', sa.String(100), nullable=False),
+            sa.Column('last_user_id', sa.Integer(), nullable=True),
+            sa.Column('last_date', sa.Date(), nullable=True),
+            sa.Column('processed', sa.Integer(), nullable=False),
+            sa.Column('started_at', sa.DateTime(), nullable=True),
+            sa.Column('updated_at', sa.DateTime(), nullable=True),
+            sa.Column('finished_at', sa.DateTime(), nullable=True),
+            sa.PrimaryKeyConstraint('id'),
+            sa.UniqueConstraint('name')
+        )
+        print("✓ Created maintenance_checkpoints table")
+
+    print("✓ maintenance_checkpoints migration completed successfully")
+
+    # ### end MaintenanceCheckpoint table creation ###
+
+
+def downgrade():
+    # ### MaintenanceCheckpoint table removal ###
+
+    connection = op.get_bind()
+    inspector = inspect(connection)
+
+    if 'maintenance_checkpoints' in inspector.get_table_names():
+        op.drop_table('maintenance_checkpoints')
+        print("✓ maintenance_checkpoints table dropped")
+    else:
+        print("ℹ maintenance_checkpoints table does not exist, nothing to drop")
+
+    # ### end MaintenanceCheckpoint table removal ###
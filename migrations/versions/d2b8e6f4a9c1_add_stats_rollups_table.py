@@ -0,0 +1,150 @@
+"""Add stats_rollups table for weekly and monthly progress rollups
+
+Revision ID: d2b8e6f4a9c1
+Revises: c9f1a7d3e5b8
+Create Date: 2025-08-10 14:18:52.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+
+# revision identifiers, used by Alembic.
+revision = 'd2b8e6f4a9c1'
+down_revision = 'c9f1a7d3e5b8'
+branch_labels = None
+depends_on = None
+
+# Weekday column prefixes in SQL day-of-week order (Sunday = 0)
+WEEKDAY_KEYS = ('sun', 'mon', 'tue', 'wed', 'thu', 'fri', 'sat')
+
+
+def _fill_rollups_sql(dialect_name):
+    """INSERT ... SELECT computing every user's week and month rollups.
+
+    Mirrors app.utils.rollups.compute_rollups: daily_stats rows give the
+    points and active days, diary entries the entry counts, and each is also
+    counted in its weekday's columns.
+    """
+    if dialect_name == 'postgresql':
+        dow = "CAST(EXTRACT(DOW FROM on_day) AS INTEGER)"
+        starts = {
+            'week': "CAST(DATE_TRUNC('week', on_day) AS DATE)",
+            'month': "CAST(DATE_TRUNC('month', on_day) AS DATE)",
+        }
+    else:
+        dow = "CAST(STRFTIME('%w', on_day) AS INTEGER)"
+        starts = {
+            'week': "DATE(on_day, 'weekday 0', '-6 days')",
+            'month': "DATE(on_day, 'start of month')",
+        }
+
+    weekday_columns = []
+    weekday_sums = []
+    for number, key in enumerate(WEEKDAY_KEYS):
+        for suffix, source in (('points', 'points'), ('days', 'active'),
+                               ('entries', 'entries')):
+            weekday_columns.append(f"{key}_{suffix}")
+            weekday_sums.append(
+                f"SUM(CASE WHEN dow = {number} THEN {source} ELSE 0 END)"
+            )
+
+    days = (
+        "SELECT user_id, date AS on_day, COALESCE(points, 0) AS points, "
+        "CASE WHEN points > 0 THEN 1 ELSE 0 END AS active, 0 AS entries, "
+        "0 AS positive, 0 AS negative, CAST(NULL AS DATE) AS entry_date "
+        "FROM daily_stats "
+        "UNION ALL "
+        "SELECT user_id, entry_date, 0, 0, 1, "
+        "CASE WHEN rating = 1 THEN 1 ELSE 0 END, "
+        "CASE WHEN rating = -1 THEN 1 ELSE 0 END, entry_date "
+        "FROM diary_entry"
+    )
+    statements = []
+    for period, start in starts.items():
+        statements.append(
+            "INSERT INTO stats_rollups (user_id, period, period_start, points, "
+            "active_days, entry_count, positive_count, negative_count, "
+            f"first_entry_date, {', '.join(weekday_columns)}) "
+            f"SELECT user_id, '{period}', period_start, SUM(points), SUM(active), "
+            "SUM(entries), SUM(positive), SUM(negative), MIN(entry_date), "
+            f"{', '.join(weekday_sums)} "
+            f"FROM (SELECT u.*, {dow} AS dow, {start} AS period_start "
+            f"FROM ({days}) AS u) AS d "
+            "GROUP BY user_id, period_start"
+        )
+    return statements
+
+
+def upgrade():
+    # ### StatsRollup table creation ###
+
+    connection = op.get_bind()
+    inspector = inspect(connection)
+
+    if 'stats_rollups' in inspector.get_table_names():
+        print("ℹ stats_rollups table already exists, skipping creation")
+    else:
+        op.create_table('stats_rollups',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('user_id', sa.Integer(), nullable=False),
+            sa.Column('period', sa.String(5), nullable=False),
+            sa.Column('period_start', sa.Date(), nullable=False),
+            sa.Column('points', sa.Integer(), nullable=False, server_default='0'),
+            sa.Column('active_days', sa.Integer(), nullable=False, server_default='0'),
+            sa.Column('entry_count', sa.Integer(), nullable=False, server_default='0'),
+            sa.Column('positive_count', sa.Integer(), nullable=False, server_default='0'),
+            sa.Column('negative_count', sa.Integer(), nullable=False, server_default='0'),
+            sa.Column('first_entry_date', sa.Date(), nullable=True),
+            sa.Column('sun_points', sa.Integer(), nullable=False, server_default='0'),
+            sa.Column('sun_days', sa.Integer(), nullable=False, server_default='0'),
+            sa.Column('sun_entries', sa.Integer(), nullable=False, server_default='0'),
+            sa.Column('mon_points', sa.Integer(), nullable=False, server_default='0'),
+            sa.Column('mon_days', sa.Integer(), nullable=False, server_default='0'),
+            sa.Column('mon_entries', sa.Integer(), nullable=False, server_default='0'),
+            sa.Column('tue_points', sa.Integer(), nullable=False, server_default='0'),
+            sa.Column('tue_days', sa.Integer(), nullable=False, server_default='0'),
+            sa.Column('tue_entries', sa.Integer(), nullable=False, server_default='0'),
+            sa.Column('wed_points', sa.Integer(), nullable=False, server_default='0'),
+            sa.Column('wed_days', sa.Integer(), nullable=False, server_default='0'),
+            sa.Column('wed_entries', sa.Integer(), nullable=False, server_default='0'),
+            sa.Column('thu_points', sa.Integer(), nullable=False, server_default='0'),
+            sa.Column('thu_days', sa.Integer(), nullable=False, server_default='0'),
+            sa.Column('thu_entries', sa.Integer(), nullable=False, server_default='0'),
+            sa.Column('fri_points', sa.Integer(), nullable=False, server_default='0'),
+            sa.Column('fri_days', sa.Integer(), nullable=False, server_default='0'),
+            sa.Column('fri_entries', sa.Integer(), nullable=False, server_default='0'),
+            sa.Column('sat_points', sa.Integer(), nullable=False, server_default='0'),
+            sa.Column('sat_days', sa.Integer(), nullable=False, server_default='0'),
+            sa.Column('sat_entries', sa.Integer(), nullable=False, server_default='0'),
+            sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+            sa.PrimaryKeyConstraint('id'),
+            sa.UniqueConstraint(
+                'user_id', 'period', 'period_start', name='user_period_start_uc'
+            )
+        )
+        print("✓ Created stats_rollups table")
+
+    # Roll up every user's existing daily stats and diary entries
+    op.execute(sa.text("DELETE FROM stats_rollups"))
+    for statement in _fill_rollups_sql(connection.dialect.name):
+        op.execute(sa.text(statement))
+    print("✓ stats_rollups migration completed successfully")
+
+    # ### end StatsRollup table creation ###
+
+
+def downgrade():
+    # ### StatsRollup table removal ###
+
+    connection = op.get_bind()
+    inspector = inspect(connection)
+
+    if 'stats_rollups' in inspector.get_table_names():
+        op.drop_table('stats_rollups')
+        print("✓ stats_rollups table dropped")
+    else:
+        print("ℹ stats_rollups table does not exist, nothing to drop")
+
+    # ### end StatsRollup table removal ###
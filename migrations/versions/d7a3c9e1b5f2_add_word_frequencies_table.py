@@ -0,0 +1,115 @@
+"""Add word_frequencies table for the incremental word cloud index
+
+Revision ID: d7a3c9e1b5f2
+Revises: c4e8a1f2d7b3
+Create Date: 2025-08-04 19:32:08.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+
+# revision identifiers, used by Alembic.
+revision = 'd7a3c9e1b5f2'
+down_revision = 'c4e8a1f2d7b3'
+branch_labels = None
+depends_on = None
+
+# Word counts inserted per statement while indexing existing entries
+INSERT_BATCH_SIZE = 1000
+
+
+def _index_existing_entries(connection):
+    """Count the words of every existing diary entry into word_frequencies.
+
+    Tokenizing needs the app's word rules, so this streams the entries in
+    user order and inserts each user's counts once their entries are read.
+    Memory is bounded by one user's vocabulary.
+    """
+    from collections import Counter
+    from app.utils.word_index import tokenize
+
+    word_frequencies = sa.table(
+        'word_frequencies',
+        sa.column('user_id', sa.Integer),
+        sa.column('word', sa.String),
+        sa.column('count', sa.Integer),
+    )
+
+    def insert_counts(user_id, counts):
+        rows = [
+            {'user_id': user_id, 'word': word, 'count': count}
+            for word, count in counts.items()
+        ]
+        for start in range(0, len(rows), INSERT_BATCH_SIZE):
+            connection.execute(
+                word_frequencies.insert(), rows[start:start + INSERT_BATCH_SIZE]
+            )
+
+    entries = connection.execution_options(stream_results=True).execute(
+        sa.text("SELECT user_id, content FROM diary_entry ORDER BY user_id")
+    )
+    users = 0
+    current_user, counts = None, Counter()
+    for user_id, content in entries:
+        if user_id != current_user:
+            if current_user is not None:
+                insert_counts(current_user, counts)
+                users += 1
+            current_user, counts = user_id, Counter()
+        counts.update(tokenize(content or ''))
+    if current_user is not None:
+        insert_counts(current_user, counts)
+        users += 1
+    return users
+
+
+def upgrade():
+    # ### WordFrequency table creation ###
+
+    connection = op.get_bind()
+    inspector = inspect(connection)
+
+    if 'word_frequencies' in inspector.get_table_names():
+        print("ℹ word_frequencies table already exists, skipping creation")
+    else:
+        op.create_table('word_frequencies',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('user_id', sa.Integer(), nullable=False),
+            sa.Column('word', sa.String(64), nullable=False),
+            sa.Column('count', sa.Integer(), nullable=False),
+            sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+            sa.PrimaryKeyConstraint('id'),
+            sa.UniqueConstraint('user_id', 'word', name='user_word_uc')
+        )
+        op.create_index(
+            'idx_word_frequencies_user_count',
+            'word_frequencies',
+            ['user_id', 'count'],
+        )
+        print("✓ Created word_frequencies table")
+
+    # Index every user's existing diary entries
+    op.execute(sa.text("DELETE FROM word_frequencies"))
+    users = _index_existing_entries(connection)
+    print(f"✓ Indexed the diary entries of {users} user(s)")
+    print("✓ word_frequencies migration completed successfully")
+
+    # ### end WordFrequency table creation ###
+
+
+def downgrade():
+    # ### WordFrequency table removal ###
+
+    connection = op.get_bind()
+    inspector = inspect(connection)
+
+    if 'word_frequencies' in inspector.get_table_names():
+        op.drop_index('idx_word_frequencies_user_count', table_name='word_frequencies')
+        op.drop_table('word_frequencies')
+        print("✓ word_frequencies table dropped")
+    else:
+        print("ℹ word_frequencies table does not exist, nothing to drop")
+
+    # ### end WordFrequency table removal ###
@@ -0,0 +1,88 @@
+"""Add full-text search index for diary entries
+
+Revision ID: e2b6f4a8c1d9
+Revises: d7a3c9e1b5f2
+Create Date: 2025-08-05 10:14:37.000000
+
+"""
+from alembic import op
+from sqlalchemy import inspect
+
+
+# revision identifiers, used by Alembic.
+revision = 'e2b6f4a8c1d9'
+down_revision = 'd7a3c9e1b5f2'
+branch_labels = None
+depends_on = None
+
+FTS_TABLE = 'diary_entry_fts'
+
+
+def upgrade():
+    # ### Diary full-text search index creation ###
+
+    connection = op.get_bind()
+    dialect = connection.dialect.name
+
+    if dialect == 'postgresql':
+        op.execute(
+            "CREATE INDEX IF NOT EXISTS idx_diary_entry_content_fts "
+            "ON diary_entry USING GIN (to_tsvector('english', content))"
+        )
+        print("✓ Created GIN full-text index on diary_entry.content")
+
+    elif dialect == 'sqlite':
+        inspector = inspect(connection)
+        if FTS_TABLE in inspector.get_table_names():
+            print(f"ℹ {FTS_TABLE} table already exists, skipping creation")
+        else:
+            op.execute(
+                f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5("
+                "content, content='diary_entry', content_rowid='id')"
+            )
+            op.execute(
+                f"CREATE TRIGGER {FTS_TABLE}_ai AFTER INSERT ON diary_entry "
+                f"BEGIN INSERT INTO {FTS_TABLE}(rowid, content) "
+                "VALUES (new.id, new.content); END"
+            )
+            op.execute(
+                f"CREATE TRIGGER {FTS_TABLE}_ad AFTER DELETE ON diary_entry "
+                f"BEGIN INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, content) "
+                "VALUES ('delete', old.id, old.content); END"
+            )
+            op.execute(
+                f"CREATE TRIGGER {FTS_TABLE}_au AFTER UPDATE ON diary_entry "
+                f"BEGIN INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, content) "
+                "VALUES ('delete', old.id, old.content); "
+                f"INSERT INTO {FTS_TABLE}(rowid, content) "
+                "VALUES (new.id, new.content); END"
+            )
+            # Index the entries that already exist
+            op.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+            print(f"✓ Created {FTS_TABLE} table and sync triggers")
+
+    else:
+        print(f"ℹ No full-text index for {dialect}, search uses substring matching")
+
+    print("✓ Diary search index migration completed successfully")
+
+    # ### end Diary full-text search index creation ###
+
+
+def downgrade():
+    # ### Diary full-text search index removal ###
+
+    connection = op.get_bind()
+    dialect = connection.dialect.name
+
+    if dialect == 'postgresql':
+        op.execute("DROP INDEX IF EXISTS idx_diary_entry_content_fts")
+        print("✓ GIN full-text index dropped")
+
+    elif dialect == 'sqlite':
+        for suffix in ('ai', 'ad', 'au'):
+            op.execute(f"DROP TRIGGER IF EXISTS {FTS_TABLE}_{suffix}")
+        op.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+        print(f"✓ {FTS_TABLE} table dropped")
+
+    # ### end Diary full-text search index removal ###
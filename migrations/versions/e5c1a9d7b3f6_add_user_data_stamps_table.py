@@ -0,0 +1,61 @@
+"""Add user_data_stamps table for conditional progress widget requests
+
+Revision ID: e5c1a9d7b3f6
+Revises: d2b8e6f4a9c1
+Create Date: 2025-08-12 09:41:07.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+
+# revision identifiers, used by Alembic.
+revision = 'e5c1a9d7b3f6'
+down_revision = 'd2b8e6f4a9c1'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # ### UserDataStamp table creation ###
+
+    connection = op.get_bind()
+    inspector = inspect(connection)
+
+    if 'user_data_stamps' in inspector.get_table_names():
+        print("ℹ user_data_stamps table already exists, skipping creation")
+    else:
+        op.create_table('user_data_stamps',
+            sa.Column('user_id', sa.Integer(), nullable=False),
+            sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+            sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+            sa.PrimaryKeyConstraint('user_id')
+        )
+        print("✓ Created user_data_stamps table")
+
+    # Stamp every existing user as changed now, so cached widgets from before
+    # the upgrade are revalidated once.
+    op.execute(sa.text(
+        "INSERT INTO user_data_stamps (user_id, updated_at) "
+        "SELECT id, CURRENT_TIMESTAMP FROM users "
+        "WHERE id NOT IN (SELECT user_id FROM user_data_stamps)"
+    ))
+    print("✓ user_data_stamps migration completed successfully")
+
+    # ### end UserDataStamp table creation ###
+
+
+def downgrade():
+    # ### UserDataStamp table removal ###
+
+    connection = op.get_bind()
+    inspector = inspect(connection)
+
+    if 'user_data_stamps' in inspector.get_table_names():
+        op.drop_table('user_data_stamps')
+        print("✓ user_data_stamps table dropped")
+    else:
+        print("ℹ user_data_stamps table does not exist, nothing to drop")
+
+    # ### end UserDataStamp table removal ###
@@ -0,0 +1,61 @@
+"""Add composite indexes for points_log lookups
+
+Revision ID: f3c8d2a6b4e1
+Revises: e2b6f4a8c1d9
+Create Date: 2025-08-06 09:41:12.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+
+# revision identifiers, used by Alembic.
+revision = 'f3c8d2a6b4e1'
+down_revision = 'e2b6f4a8c1d9'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # ### points_log index creation ###
+
+    connection = op.get_bind()
+
+    index_statements = [
+        # Login bonus and streak milestone checks (source_type = / IN ...)
+        "CREATE INDEX IF NOT EXISTS idx_points_log_user_date_source "
+        "ON points_log (user_id, date, source_type)",
+        # Daily breakdown, ordered by created_at
+        "CREATE INDEX IF NOT EXISTS idx_points_log_user_date_created "
+        "ON points_log (user_id, date, created_at)",
+    ]
+
+    for statement in index_statements:
+        connection.execute(sa.text(statement))
+        index_name = statement.split('EXISTS ')[1].split(' ON')[0]
+        print(f"✓ Created index: {index_name}")
+
+    inspector = inspect(connection)
+    actual_indexes = sorted(
+        idx['name'] for idx in inspector.get_indexes('points_log')
+        if idx['name'] and idx['name'].startswith('idx_points_log_')
+    )
+    print(f"✓ Migration completed. points_log indexes: {actual_indexes}")
+
+    # ### end points_log index creation ###
+
+
+def downgrade():
+    # ### points_log index removal ###
+
+    connection = op.get_bind()
+
+    for index_name in [
+        'idx_points_log_user_date_created',
+        'idx_points_log_user_date_source',
+    ]:
+        connection.execute(sa.text(f"DROP INDEX IF EXISTS {index_name}"))
+        print(f"✓ Dropped index: {index_name}")
+
+    # ### end points_log index removal ###
@@ -0,0 +1,56 @@
+"""Add a per-user data version to user_data_stamps
+
+Revision ID: f8d4b2e6a1c7
+Revises: e5c1a9d7b3f6
+Create Date: 2025-08-13 16:05:33.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+
+# revision identifiers, used by Alembic.
+revision = 'f8d4b2e6a1c7'
+down_revision = 'e5c1a9d7b3f6'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # ### UserDataStamp version column ###
+
+    connection = op.get_bind()
+    inspector = inspect(connection)
+
+    columns = [c['name'] for c in inspector.get_columns('user_data_stamps')]
+    if 'version' in columns:
+        print("ℹ user_data_stamps.version already exists, skipping")
+    else:
+        with op.batch_alter_table('user_data_stamps') as batch_op:
+            batch_op.add_column(
+                sa.Column('version', sa.BigInteger(), nullable=False, server_default='0')
+            )
+        print("✓ Added version column to user_data_stamps")
+
+    # Users with no stamp row yet start at version 0 on their first write.
+    print("✓ user_data_stamps version migration completed successfully")
+
+    # ### end UserDataStamp version column ###
+
+
+def downgrade():
+    # ### UserDataStamp version column removal ###
+
+    connection = op.get_bind()
+    inspector = inspect(connection)
+
+    columns = [c['name'] for c in inspector.get_columns('user_data_stamps')]
+    if 'version' in columns:
+        with op.batch_alter_table('user_data_stamps') as batch_op:
+            batch_op.drop_column('version')
+        print("✓ version column dropped from user_data_stamps")
+    else:
+        print("ℹ user_data_stamps.version does not exist, nothing to drop")
+
+    # ### end UserDataStamp version column removal ###
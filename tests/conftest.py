@@ -138,3 +138,32 @@ def sample_daily_stats(app, sample_user):
 def auth_headers(sample_user):
     """Get authentication headers for a logged-in user."""
     return {"Cookie": f"user_id={sample_user.id}"}
+
+
+@pytest.fixture
+def query_counter(app):
+    """Count the SQL statements executed against the test database.
+
+    Usage:
+        with query_counter() as queries:
+            ...
+        assert len(queries) == 1
+    """
+    from contextlib import contextmanager
+    from sqlalchemy import event
+
+    @contextmanager
+    def _count():
+        statements = []
+
+        def _record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        engine = db.engine
+        event.listen(engine, "before_cursor_execute", _record)
+        try:
+            yield statements
+        finally:
+            event.remove(engine, "before_cursor_execute", _record)
+
+    return _count
@@ -306,7 +306,7 @@ class TestChartRegression:
         soup = BeautifulSoup(response.data, 'html.parser')
         
         # Check for data scripts with correct IDs and structure
-        data_scripts = ['points_data', 'weekday_data', 'goal_stats_data']
+        data_scripts = ['progress_widgets']
         
         for script_id in data_scripts:
             script = soup.find('script', id=script_id)
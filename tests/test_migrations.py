@@ -3,7 +3,7 @@ import os
 import tempfile
 from alembic.config import Config
 from alembic import command
-from sqlalchemy import create_engine, inspect
+from sqlalchemy import create_engine, inspect, text
 from app import create_app
 from app.models import db
 
@@ -74,3 +74,88 @@ def test_migrations(migration_app):
     assert "diary_entry" not in tables
     assert "daily_stats" not in tables
     assert "goal" not in tables
+
+
+def test_word_index_is_filled_from_existing_entries(migration_app):
+    """The word_frequencies migration indexes entries written before it."""
+    app, db_path = migration_app
+    run_alembic_command(app, db_path, "upgrade", "c4e8a1f2d7b3")
+
+    engine = create_engine(f"sqlite:///{db_path}")
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                "INSERT INTO users (id, email, password) "
+                "VALUES (1, 'a@b.c', 'x'), (2, 'd@e.f', 'x')"
+            )
+        )
+        conn.execute(
+            text(
+                "INSERT INTO diary_entry (user_id, entry_date, content, rating) "
+                "VALUES (1, '2025-06-16', 'Gratitude gratitude and calm', 1), "
+                "(2, '2025-06-16', 'Coffee', 1), "
+                "(1, '2025-06-17', 'Calm evening', 1)"
+            )
+        )
+
+    run_alembic_command(app, db_path, "upgrade", "d7a3c9e1b5f2")
+
+    with engine.connect() as conn:
+        rows = conn.execute(
+            text("SELECT user_id, word, count FROM word_frequencies")
+        ).all()
+    assert sorted(rows) == [
+        (1, "calm", 2),
+        (1, "evening", 1),
+        (1, "gratitude", 2),
+        (2, "coffee", 1),
+    ]
+
+
+def test_rollups_are_filled_from_existing_data(migration_app):
+    """The stats_rollups migration rolls up data written before it."""
+    app, db_path = migration_app
+    run_alembic_command(app, db_path, "upgrade", "c9f1a7d3e5b8")
+
+    engine = create_engine(f"sqlite:///{db_path}")
+    with engine.begin() as conn:
+        conn.execute(
+            text("INSERT INTO users (id, email, password) VALUES (1, 'a@b.c', 'x')")
+        )
+        # Monday 2025-06-16 with points, Tuesday without
+        conn.execute(
+            text(
+                "INSERT INTO daily_stats (user_id, date, points) "
+                "VALUES (1, '2025-06-16', 5), (1, '2025-06-17', 0)"
+            )
+        )
+        conn.execute(
+            text(
+                "INSERT INTO diary_entry (user_id, entry_date, content, rating) "
+                "VALUES (1, '2025-06-16', 'a', 1), (1, '2025-06-16', 'b', -1), "
+                "(1, '2025-06-22', 'c', 1)"
+            )
+        )
+
+    run_alembic_command(app, db_path, "upgrade", "d2b8e6f4a9c1")
+
+    with engine.connect() as conn:
+        rows = conn.execute(
+            text("SELECT * FROM stats_rollups ORDER BY period DESC")
+        ).mappings().all()
+    assert [(row["period"], row["period_start"]) for row in rows] == [
+        ("week", "2025-06-16"),
+        ("month", "2025-06-01"),
+    ]
+    for row in rows:
+        assert (
+            row["points"],
+            row["active_days"],
+            row["entry_count"],
+            row["positive_count"],
+            row["negative_count"],
+            row["first_entry_date"],
+        ) == (5, 1, 3, 2, 1, "2025-06-16")
+        assert (row["mon_points"], row["mon_days"], row["mon_entries"]) == (5, 1, 2)
+        assert (row["tue_points"], row["tue_days"], row["tue_entries"]) == (0, 0, 0)
+        assert row["sun_entries"] == 1
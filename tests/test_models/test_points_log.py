@@ -0,0 +1,82 @@
+"""
+Query-plan regression tests for the points_log indexes.
+
+The SQLite plans are checked on every run. The PostgreSQL plans are checked
+when TEST_POSTGRES_URL points at a scratch database; the tables are created
+inside a transaction that is rolled back.
+"""
+
+import os
+from datetime import date
+import pytest
+from sqlalchemy import create_engine, select, text
+from app.models import db, User, PointsLog
+
+DAY = date(2025, 1, 15)
+
+# The lookups behind get_daily_breakdown, get_daily_total, the login-bonus
+# check in auth.login_page and check_and_award_streak_milestones
+HOT_QUERIES = {
+    "daily_breakdown": (
+        select(PointsLog)
+        .where(PointsLog.user_id == 1, PointsLog.date == DAY)
+        .order_by(PointsLog.created_at.desc())
+    ),
+    "daily_total": select(db.func.sum(PointsLog.points)).where(
+        PointsLog.user_id == 1, PointsLog.date == DAY
+    ),
+    "login_bonus": select(PointsLog).where(
+        PointsLog.user_id == 1,
+        PointsLog.date == DAY,
+        PointsLog.source_type == "daily_login",
+    ),
+    "streak_milestones": select(PointsLog).where(
+        PointsLog.user_id == 1,
+        PointsLog.date == DAY,
+        PointsLog.source_type.in_(["streak_7_day", "streak_30_day"]),
+    ),
+}
+
+
+def _literal_sql(statement, dialect):
+    compiled = statement.compile(dialect=dialect, compile_kwargs={"literal_binds": True})
+    return str(compiled)
+
+
+@pytest.mark.parametrize("name", sorted(HOT_QUERIES))
+def test_sqlite_plan_uses_points_log_index(app, name):
+    with app.app_context():
+        connection = db.session.connection()
+        sql = _literal_sql(HOT_QUERIES[name], connection.dialect)
+        plan = " ".join(
+            row[-1] for row in connection.execute(text(f"EXPLAIN QUERY PLAN {sql}"))
+        )
+
+        assert "idx_points_log_user_date" in plan
+        assert "SCAN points_log" not in plan
+
+
+@pytest.mark.skipif(
+    not os.environ.get("TEST_POSTGRES_URL"),
+    reason="TEST_POSTGRES_URL is not set",
+)
+@pytest.mark.parametrize("name", sorted(HOT_QUERIES))
+def test_postgres_plan_uses_points_log_index(name):
+    engine = create_engine(os.environ["TEST_POSTGRES_URL"])
+    with engine.connect() as connection:
+        transaction = connection.begin()
+        try:
+            db.metadata.create_all(
+                connection, tables=[User.__table__, PointsLog.__table__]
+            )
+            # Empty tables would always be sequentially scanned
+            connection.execute(text("SET LOCAL enable_seqscan = off"))
+            sql = _literal_sql(HOT_QUERIES[name], connection.dialect)
+            plan = " ".join(
+                row[0] for row in connection.execute(text(f"EXPLAIN {sql}"))
+            )
+        finally:
+            transaction.rollback()
+
+    assert "idx_points_log_user_date" in plan
+    assert "Seq Scan on points_log" not in plan
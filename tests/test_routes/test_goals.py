@@ -396,4 +396,149 @@ class TestGoalsRoutes:
         
         # Check that all goals are displayed
         for title, _ in goals_data:
-            assert title.encode() in response.data
\ No newline at end of file
+            assert title.encode() in response.data
+
+    @pytest.mark.parametrize("past_goals", [2, 40])
+    def test_goals_page_query_count(
+        self, client, app, sample_user, query_counter, past_goals
+    ):
+        """The goals page issues a fixed number of queries regardless of history."""
+        with app.app_context():
+            for i in range(past_goals):
+                db.session.add(
+                    Goal(
+                        user_id=sample_user.id,
+                        category=GoalCategory.CREATIVE,
+                        title=f"Past Goal {i}",
+                        week_start=date.today() - timedelta(days=7 * (i + 1)),
+                        week_end=date.today() - timedelta(days=7 * i + 1),
+                        status=GoalStatus.COMPLETED,
+                    )
+                )
+            db.session.commit()
+
+        with client.session_transaction() as sess:
+            sess["user_id"] = sample_user.id
+
+        with query_counter() as queries:
+            response = client.get("/goals")
+
+        assert response.status_code == 200
+        assert len([q for q in queries if "FROM goals" in q]) == 1
+        assert len([q for q in queries if "FROM goal_stats" in q]) == 1
+
+    def _add_active_goal(self, user_id, title="JSON Goal"):
+        goal = Goal(
+            user_id=user_id,
+            category=GoalCategory.MINDFULNESS,
+            title=title,
+            week_start=date.today(),
+            week_end=date.today() + timedelta(days=6),
+            status=GoalStatus.ACTIVE,
+        )
+        db.session.add(goal)
+        db.session.commit()
+        return goal.id
+
+    def test_create_goal_json(self, client, app, sample_user):
+        """The JSON create endpoint returns the new goal and its action URLs."""
+        with client.session_transaction() as sess:
+            sess["user_id"] = sample_user.id
+
+        response = client.post(
+            "/api/goals",
+            data={
+                "category": GoalCategory.HOME.value,
+                "title": "Clear the garage",
+                "description": "",
+            },
+        )
+
+        assert response.status_code == 201
+        goal = response.get_json()["goal"]
+        assert goal["title"] == "Clear the garage"
+        assert goal["status"] == "active"
+        assert goal["urls"]["complete_json"] == f"/api/goals/{goal['id']}/complete"
+
+        response = client.post(
+            "/api/goals", data={"category": GoalCategory.HOME.value, "title": ""}
+        )
+        assert response.status_code == 400
+        assert "title" in response.get_json()["errors"]
+
+    def test_complete_goal_json_returns_delta(self, client, app, sample_user):
+        """Completing a goal returns the goal and the points awarded."""
+        with app.app_context():
+            goal_id = self._add_active_goal(sample_user.id)
+
+        with client.session_transaction() as sess:
+            sess["user_id"] = sample_user.id
+
+        response = client.post(f"/api/goals/{goal_id}/complete")
+
+        assert response.status_code == 200
+        data = response.get_json()
+        assert data["goal"]["status"] == "completed"
+        assert data["points_awarded"] == 10
+        assert "stats" not in data
+        assert "<html" not in response.get_data(as_text=True)
+
+        # A finished goal cannot be finished again the other way
+        response = client.post(f"/api/goals/{goal_id}/fail")
+        assert response.status_code == 409
+        with app.app_context():
+            assert db.session.get(Goal, goal_id).status == GoalStatus.COMPLETED
+
+    def test_goal_stays_active_when_its_award_cannot_be_queued(
+        self, client, app, sample_user, monkeypatch
+    ):
+        """The status change is rolled back with a failed points event."""
+        with app.app_context():
+            goal_id = self._add_active_goal(sample_user.id)
+
+        def fail_to_enqueue(*args, **kwargs):
+            raise RuntimeError("outbox unavailable")
+
+        monkeypatch.setattr(
+            "app.routes.goals.enqueue_points_event", fail_to_enqueue
+        )
+        with client.session_transaction() as sess:
+            sess["user_id"] = sample_user.id
+        csrf_token = extract_csrf_token(client.get("/goals").data)
+
+        response = client.post(
+            f"/goals/{goal_id}/complete", data={"csrf_token": csrf_token}
+        )
+
+        assert response.status_code == 500
+        with app.app_context():
+            assert db.session.get(Goal, goal_id).status == GoalStatus.ACTIVE
+
+    def test_goal_actions_require_ownership(self, client, app, sample_user):
+        """Users cannot finish or update someone else's goal."""
+        with app.app_context():
+            other = User(email="other@example.com", password="Password123")
+            db.session.add(other)
+            db.session.commit()
+            goal_id = self._add_active_goal(other.id, "Not yours")
+
+        with client.session_transaction() as sess:
+            sess["user_id"] = sample_user.id
+
+        assert client.post(f"/api/goals/{goal_id}/fail").status_code == 404
+        assert (
+            client.post(
+                f"/api/goals/{goal_id}/update", data={"progress_notes": "Mine now"}
+            ).status_code
+            == 404
+        )
+        assert client.post(f"/goals/{goal_id}/complete").status_code == 404
+        with app.app_context():
+            goal = db.session.get(Goal, goal_id)
+            assert goal.status == GoalStatus.ACTIVE
+            assert goal.progress_notes is None
+
+    def test_goal_json_actions_require_login(self, client):
+        """The JSON goal actions reject anonymous requests."""
+        assert client.post("/api/goals").status_code == 401
+        assert client.post("/api/goals/1/complete").status_code == 401
@@ -296,3 +296,170 @@ class TestProgressRoutes:
             assert '<p class="card-value">0</p>' in response_data
             assert '<h5 class="card-title">Positive Behaviors</h5>' in response_data
             assert '<p class="card-value">0</p>' in response_data
+
+    @pytest.mark.parametrize("days", [3, 60])
+    def test_progress_page_query_count(self, client, app, sample_user, query_counter, days):
+        """The progress page issues a fixed number of queries regardless of history."""
+        with app.app_context():
+            for i in range(days):
+                entry_date = date.today() - timedelta(days=i)
+                db.session.add(
+                    DiaryEntry(
+                        user_id=sample_user.id,
+                        content=f"Reflection number {i}",
+                        rating=1,
+                        entry_date=entry_date,
+                    )
+                )
+                db.session.add(
+                    DailyStats(user_id=sample_user.id, date=entry_date, points=5)
+                )
+            db.session.commit()
+
+        with client.session_transaction() as sess:
+            sess["user_id"] = sample_user.id
+
+        with query_counter() as queries:
+            response = client.get("/progress")
+
+        assert response.status_code == 200
+        assert len(queries) <= 10
+
+    def test_points_chart_api_requires_login(self, client):
+        """The chart data endpoint rejects anonymous requests."""
+        response = client.get("/api/points-chart")
+        assert response.status_code == 401
+
+    def test_points_chart_api_rejects_bad_range(self, client, sample_user):
+        """Malformed dates or resolutions are a 400, not a server error."""
+        with client.session_transaction() as sess:
+            sess["user_id"] = sample_user.id
+
+        assert client.get("/api/points-chart?start=yesterday").status_code == 400
+        assert client.get("/api/points-chart?resolution=lots").status_code == 400
+
+    def test_points_chart_api_returns_range(self, client, app, sample_user):
+        """A range is downsampled to the resolution with cumulative totals."""
+        start = date(2025, 1, 1)
+        with app.app_context():
+            for i in range(100):
+                db.session.add(
+                    DailyStats(
+                        user_id=sample_user.id,
+                        date=start + timedelta(days=i),
+                        points=1,
+                    )
+                )
+            db.session.commit()
+
+        with client.session_transaction() as sess:
+            sess["user_id"] = sample_user.id
+
+        response = client.get(
+            "/api/points-chart?start=2025-01-11&end=2025-02-09&resolution=10"
+        )
+        assert response.status_code == 200
+        data = response.get_json()
+        assert data["total"] == 30
+        assert data["downsampled"] is True
+        assert len(data["points"]) == 10
+        assert data["points"][0] == ["2025-01-11", 11]
+        assert data["points"][-1] == ["2025-02-09", 40]
+
+    def test_progress_widgets_require_login(self, client):
+        """Widget endpoints reject anonymous requests."""
+        assert client.get("/api/progress/points").status_code == 401
+
+    def test_unknown_progress_widget(self, client, sample_user):
+        """Unknown widget names are a 404."""
+        with client.session_transaction() as sess:
+            sess["user_id"] = sample_user.id
+
+        assert client.get("/api/progress/everything").status_code == 404
+
+    def test_progress_widgets_return_json(self, client, app, sample_user):
+        """Every widget returns its data with private validators."""
+        with app.app_context():
+            db.session.add(
+                DiaryEntry(
+                    user_id=sample_user.id,
+                    content="A <b>bold</b> day",
+                    rating=1,
+                    entry_date=date(2025, 6, 2),
+                )
+            )
+            db.session.add(
+                DailyStats(user_id=sample_user.id, date=date(2025, 6, 2), points=7)
+            )
+            db.session.commit()
+
+        with client.session_transaction() as sess:
+            sess["user_id"] = sample_user.id
+
+        for widget in ("points", "weekday", "wordcloud", "top-days", "goal-stats"):
+            response = client.get(f"/api/progress/{widget}")
+            assert response.status_code == 200, widget
+            assert response.headers["ETag"].startswith('W/"')
+            assert "Last-Modified" in response.headers
+            assert "private" in response.headers["Cache-Control"]
+
+        top_days = client.get("/api/progress/top-days").get_json()["top_days"]
+        assert top_days == [
+            {
+                "date": "2025-06-02",
+                "points": 7,
+                "entries": [{"content": "A <b>bold</b> day", "rating": 1}],
+            }
+        ]
+        assert client.get("/api/progress/points").get_json()["points"] == [
+            ["2025-06-02", 7]
+        ]
+
+    def test_unchanged_widget_is_not_modified(
+        self, client, app, sample_user, query_counter
+    ):
+        """A widget revalidates with a 304 until the user's data changes."""
+        with client.session_transaction() as sess:
+            sess["user_id"] = sample_user.id
+
+        etag = client.get("/api/progress/weekday").headers["ETag"]
+        with query_counter() as queries:
+            response = client.get(
+                "/api/progress/weekday", headers={"If-None-Match": etag}
+            )
+        assert response.status_code == 304
+        assert len(queries) == 1
+
+        with app.app_context():
+            db.session.add(
+                DailyStats(user_id=sample_user.id, date=date.today(), points=3)
+            )
+            db.session.commit()
+
+        response = client.get("/api/progress/weekday", headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.headers["ETag"] != etag
+
+    def test_unchanged_progress_page_is_not_modified(
+        self, client, app, sample_user, query_counter
+    ):
+        """The progress page is answered with a 304 before running its queries."""
+        with client.session_transaction() as sess:
+            sess["user_id"] = sample_user.id
+
+        response = client.get("/progress")
+        assert "private" in response.headers["Cache-Control"]
+        assert "public" not in response.headers["Cache-Control"]
+        etag = response.headers["ETag"]
+
+        with query_counter() as queries:
+            response = client.get("/progress", headers={"If-None-Match": etag})
+        assert response.status_code == 304
+        assert len(queries) == 1
+
+        with app.app_context():
+            db.session.get(User, sample_user.id).user_name = "Renamed"
+            db.session.commit()
+
+        response = client.get("/progress", headers={"If-None-Match": etag})
+        assert response.status_code == 200
@@ -0,0 +1,122 @@
+"""
+Tests for the diary reader search pages
+"""
+
+import pytest
+from datetime import date, timedelta
+from app.models import DiaryEntry, db
+from app.utils.search_helpers import SEARCH_PAGE_SIZE
+
+
+def _login(client, user):
+    with client.session_transaction() as sess:
+        sess["user_id"] = user.id
+
+
+def _add_entries(user_id, count, content="Morning walk in the park"):
+    start = date(2024, 1, 1)
+    db.session.add_all(
+        [
+            DiaryEntry(
+                user_id=user_id,
+                content=content,
+                rating=1,
+                entry_date=start + timedelta(days=i // 2),
+            )
+            for i in range(count)
+        ]
+    )
+    db.session.commit()
+
+
+class TestReaderSearch:
+    """Test cases for paginated diary search"""
+
+    def test_search_page_renders_first_page_only(self, client, app, sample_user):
+        with app.app_context():
+            _add_entries(sample_user.id, SEARCH_PAGE_SIZE + 5)
+        _login(client, sample_user)
+
+        response = client.get("/read-diary?search=walk")
+
+        assert response.status_code == 200
+        assert response.data.count(b"search-result-card\"") == SEARCH_PAGE_SIZE
+        assert b'id="search_results_more"' in response.data
+
+    def test_json_pages_cover_every_result_once(self, client, app, sample_user):
+        with app.app_context():
+            _add_entries(sample_user.id, SEARCH_PAGE_SIZE * 2 + 3)
+        _login(client, sample_user)
+
+        seen = []
+        cursor = ""
+        while True:
+            response = client.get(f"/api/diary-search?search=walk&cursor={cursor}")
+            assert response.status_code == 200
+            data = response.get_json()
+            seen.extend(result["date"] for result in data["results"])
+            cursor = data["next_cursor"]
+            if not cursor:
+                break
+
+        assert len(seen) == SEARCH_PAGE_SIZE * 2 + 3
+        assert seen == sorted(seen, reverse=True)
+
+    def test_relevance_pages_do_not_repeat(self, client, app, sample_user):
+        with app.app_context():
+            _add_entries(sample_user.id, SEARCH_PAGE_SIZE + 2)
+        _login(client, sample_user)
+
+        first = client.get("/api/diary-search?search=walk&sort=relevance").get_json()
+        second = client.get(
+            f"/api/diary-search?search=walk&sort=relevance&cursor={first['next_cursor']}"
+        ).get_json()
+
+        assert len(first["results"]) == SEARCH_PAGE_SIZE
+        assert len(second["results"]) == 2
+        assert second["next_cursor"] is None
+
+    def test_invalid_cursor_is_rejected(self, client, sample_user):
+        _login(client, sample_user)
+        response = client.get("/api/diary-search?search=walk&cursor=nonsense")
+        assert response.status_code == 400
+
+    def test_json_search_requires_login(self, client):
+        response = client.get("/api/diary-search?search=walk")
+        assert response.status_code == 401
+
+
+class TestReaderNavigation:
+    """Test cases for reading diary days"""
+
+    def test_day_page_links_neighbours(self, client, app, sample_user):
+        with app.app_context():
+            _add_entries(sample_user.id, 6)
+        _login(client, sample_user)
+
+        response = client.get("/read-diary?date=2024-01-02")
+
+        assert response.status_code == 200
+        assert b'href="/read-diary?date=2024-01-01"' in response.data
+        assert b'href="/read-diary?date=2024-01-03"' in response.data
+
+    def test_day_without_entries_redirects(self, client, app, sample_user):
+        with app.app_context():
+            _add_entries(sample_user.id, 2)
+        _login(client, sample_user)
+
+        response = client.get("/read-diary?date=2023-05-05")
+
+        assert response.status_code == 302
+
+    @pytest.mark.parametrize("days", [3, 400])
+    def test_day_page_query_count(self, client, app, sample_user, query_counter, days):
+        with app.app_context():
+            _add_entries(sample_user.id, days * 2)
+        _login(client, sample_user)
+
+        with query_counter() as statements:
+            response = client.get("/read-diary?date=2024-01-02")
+
+        assert response.status_code == 200
+        assert len(statements) <= 8
@@ -126,31 +126,18 @@ class TestTemplateJavaScriptIntegration:
         
         soup = BeautifulSoup(response.data, 'html.parser')
         
-        # Check for data scripts with correct IDs
-        points_data = soup.find('script', id='points_data')
-        assert points_data is not None, "Script with id='points_data' not found"
-        
-        weekday_data = soup.find('script', id='weekday_data')
-        assert weekday_data is not None, "Script with id='weekday_data' not found"
-        
-        goal_stats_data = soup.find('script', id='goal_stats_data')
-        assert goal_stats_data is not None, "Script with id='goal_stats_data' not found"
-        
-        # Verify data scripts contain valid JSON
-        try:
-            json.loads(points_data.string)
-        except (json.JSONDecodeError, TypeError):
-            pytest.fail("points_data script does not contain valid JSON")
+        # Widget data is loaded from JSON endpoints listed in a data script
+        widgets_script = soup.find('script', id='progress_widgets')
+        assert widgets_script is not None, "Script with id='progress_widgets' not found"
         
+        # Verify the data script contains valid JSON
         try:
-            json.loads(weekday_data.string)
+            widget_urls = json.loads(widgets_script.string)
         except (json.JSONDecodeError, TypeError):
-            pytest.fail("weekday_data script does not contain valid JSON")
+            pytest.fail("progress_widgets script does not contain valid JSON")
         
-        try:
-            json.loads(goal_stats_data.string)
-        except (json.JSONDecodeError, TypeError):
-            pytest.fail("goal_stats_data script does not contain valid JSON")
+        for widget in ('points', 'weekday', 'wordcloud', 'top-days', 'goal-stats'):
+            assert widget in widget_urls, f"No endpoint for the {widget} widget"
 
     def test_csrf_token_meta_tag_exists(self, client, sample_user):
         """Test that pages have CSRF token meta tag for JavaScript."""
@@ -307,15 +294,14 @@ class TestJavaScriptDataStructures:
         
         soup = BeautifulSoup(response.data, 'html.parser')
         
-        # Get weekday data script
-        weekday_script = soup.find('script', id='weekday_data')
-        if weekday_script and weekday_script.string:
-            data = json.loads(weekday_script.string)
-            
-            # Check for expected keys (snake_case)
-            assert 'weekday_data' in data, "weekday_data key not found"
-            assert 'has_sufficient_weekday_data' in data, "has_sufficient_weekday_data key not found"
-            assert 'sample_weekday_data' in data, "sample_weekday_data key not found"
+        # Get the weekday widget data
+        widget_urls = json.loads(soup.find('script', id='progress_widgets').string)
+        data = client.get(widget_urls['weekday']).get_json()
+        
+        # Check for expected keys (snake_case)
+        assert 'weekday_data' in data, "weekday_data key not found"
+        assert 'has_sufficient_weekday_data' in data, "has_sufficient_weekday_data key not found"
+        assert 'sample_weekday_data' in data, "sample_weekday_data key not found"
 
     def test_tour_config_structure(self, client, sample_user):
         """Test that tour configuration has the correct structure."""
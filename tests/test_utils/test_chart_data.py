@@ -0,0 +1,63 @@
+"""
+Tests for the downsampled cumulative points chart
+"""
+
+from datetime import date, timedelta
+import pytest
+from app.models import DailyStats, db
+from app.utils.chart_data import (
+    downsample_points,
+    get_chart_data,
+    get_cumulative_points,
+    lttb,
+)
+
+
+class TestLttb:
+    """Test cases for Largest-Triangle-Three-Buckets downsampling"""
+
+    def test_keeps_endpoints_and_threshold(self):
+        series = [(x, x % 7) for x in range(500)]
+        kept = lttb(series, 50)
+
+        assert len(kept) == 50
+        assert kept[0] == 0 and kept[-1] == 499
+        assert kept == sorted(kept)
+
+    def test_preserves_spike(self):
+        series = [(x, 0) for x in range(1000)]
+        series[613] = (613, 100)
+
+        assert 613 in lttb(series, 20)
+
+    def test_short_series_is_unchanged(self):
+        points = [["2025-01-01", 1], ["2025-01-02", 3]]
+        assert downsample_points(points, 300) == points
+
+    def test_rejects_tiny_threshold(self):
+        with pytest.raises(ValueError):
+            lttb([(x, x) for x in range(10)], 2)
+
+
+class TestCumulativePoints:
+    """Test cases for the cumulative series from the database"""
+
+    def test_range_includes_earlier_points(self, app, sample_user):
+        with app.app_context():
+            start = date(2025, 3, 1)
+            for i in range(10):
+                db.session.add(
+                    DailyStats(
+                        user_id=sample_user.id, date=start + timedelta(days=i), points=i
+                    )
+                )
+            db.session.commit()
+
+            points = get_cumulative_points(
+                sample_user.id, date(2025, 3, 5), date(2025, 3, 6)
+            )
+            assert points == [["2025-03-05", 10], ["2025-03-06", 15]]
+
+            data = get_chart_data(sample_user.id, resolution=1)
+            assert len(data["points"]) == 3
+            assert data["points"][-1] == ["2025-03-10", 45]
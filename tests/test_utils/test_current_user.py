@@ -0,0 +1,81 @@
+"""
+Tests for the request-scoped current user and profile cache
+"""
+
+import pytest
+from flask import session
+from app.utils import current_user as current_user_module
+from app.utils.current_user import get_current_user, get_current_profile
+
+
+def _login(client, user):
+    with client.session_transaction() as sess:
+        sess["user_id"] = user.id
+
+
+def _user_queries(statements):
+    return [s for s in statements if "FROM users" in s]
+
+
+@pytest.fixture(autouse=True)
+def clear_profile_cache():
+    current_user_module._profile_cache.clear()
+    yield
+    current_user_module._profile_cache.clear()
+
+
+class TestCurrentUser:
+    """Test cases for loading the logged-in user"""
+
+    def test_user_is_loaded_once_per_request(self, app, sample_user, query_counter):
+        with app.test_request_context():
+            session["user_id"] = sample_user.id
+            with query_counter() as statements:
+                first = get_current_user()
+                second = get_current_user()
+                profile = get_current_profile()
+
+            assert first is second
+            assert profile.display_name == "Test User"
+            assert len(_user_queries(statements)) == 1
+
+    def test_anonymous_request_has_no_user(self, app):
+        with app.test_request_context():
+            assert get_current_user() is None
+            assert get_current_profile() is None
+
+    def test_page_view_loads_user_once(self, client, sample_user, query_counter):
+        _login(client, sample_user)
+
+        with query_counter() as statements:
+            response = client.get("/diary")
+
+        assert response.status_code == 200
+        assert len(_user_queries(statements)) == 1
+
+
+class TestProfileCache:
+    """Test cases for the opt-in cross-request profile cache"""
+
+    def test_cached_profile_skips_user_query(
+        self, app, client, sample_user, query_counter
+    ):
+        app.config["USER_PROFILE_CACHE"] = True
+        _login(client, sample_user)
+        client.get("/read-diary")
+
+        with query_counter() as statements:
+            response = client.get("/read-diary")
+
+        assert response.status_code == 200
+        assert _user_queries(statements) == []
+
+    def test_change_username_invalidates_cache(self, app, client, sample_user):
+        app.config["USER_PROFILE_CACHE"] = True
+        _login(client, sample_user)
+        client.get("/read-diary")
+
+        client.post("/change-username", data={"new_username": "renamed"})
+        response = client.get("/read-diary")
+
+        assert b"Hello, renamed" in response.data
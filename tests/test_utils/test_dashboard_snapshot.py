@@ -0,0 +1,99 @@
+"""
+Tests for the aggregated progress dashboard snapshot
+"""
+
+import pytest
+from datetime import datetime, timezone, timedelta
+from app.models import DiaryEntry, DailyStats, db
+from app.utils.dashboard_snapshot import build_dashboard_snapshot
+from app.utils.progress_helpers import (
+    get_today_stats,
+    get_total_points,
+    get_current_streak,
+    get_longest_streak,
+    get_total_entries,
+    get_points_data,
+    get_top_days_with_entries,
+    get_weekday_data,
+    get_trend_message,
+    get_unique_weekdays_with_entries,
+)
+
+
+def _create_history(user_id, days, today):
+    """Create one diary entry and matching stats per day, ending today."""
+    for i in range(days):
+        entry_date = today - timedelta(days=i)
+        rating = 1 if i % 3 else -1
+        db.session.add(
+            DiaryEntry(
+                user_id=user_id,
+                content=f"Entry {i}",
+                rating=rating,
+                entry_date=entry_date,
+            )
+        )
+        db.session.add(
+            DailyStats(
+                user_id=user_id,
+                date=entry_date,
+                points=(5 if rating == 1 else 2) + i % 4,
+                current_streak=days - i,
+                longest_streak=days - i,
+            )
+        )
+    db.session.commit()
+
+
+class TestDashboardSnapshot:
+    """Test cases for build_dashboard_snapshot"""
+
+    def test_empty_user(self, app, sample_user):
+        with app.app_context():
+            snapshot = build_dashboard_snapshot(sample_user.id)
+
+            assert snapshot.total_points == 0
+            assert snapshot.total_entries == 0
+            assert snapshot.points_data == []
+            assert snapshot.top_days == []
+            assert snapshot.is_new_user
+            assert not snapshot.has_sufficient_weekday_data
+            assert len(snapshot.weekday_data) == 7
+
+    def test_matches_individual_helpers(self, app, sample_user):
+        with app.app_context():
+            user_id = sample_user.id
+            today = datetime.now(timezone.utc).date()
+            _create_history(user_id, 20, today)
+
+            snapshot = build_dashboard_snapshot(user_id, today)
+            weekday_data, has_sufficient = get_weekday_data(user_id)
+
+            assert snapshot.points_today == get_today_stats(user_id, today)
+            assert snapshot.total_points == get_total_points(user_id)
+            assert snapshot.current_streak == get_current_streak(user_id) == 20
+            assert snapshot.longest_streak == get_longest_streak(user_id)
+            assert snapshot.total_entries == get_total_entries(user_id)
+            assert snapshot.points_data == get_points_data(user_id)
+            assert snapshot.weekday_data == weekday_data
+            assert snapshot.has_sufficient_weekday_data == has_sufficient
+            assert snapshot.trend_message == get_trend_message(user_id, today)
+            assert (
+                snapshot.unique_weekdays_count
+                == get_unique_weekdays_with_entries(user_id)
+            )
+            assert [(d["date"], d["points"]) for d in snapshot.top_days] == [
+                (d["date"], d["points"]) for d in get_top_days_with_entries(user_id)
+            ]
+            assert snapshot.num_positive + snapshot.num_change == 20
+
+    @pytest.mark.parametrize("days", [3, 90])
+    def test_query_count_is_fixed(self, app, sample_user, query_counter, days):
+        with app.app_context():
+            today = datetime.now(timezone.utc).date()
+            _create_history(sample_user.id, days, today)
+
+            with query_counter() as queries:
+                build_dashboard_snapshot(sample_user.id, today)
+
+            assert len(queries) <= 6
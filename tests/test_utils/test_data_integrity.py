@@ -0,0 +1,153 @@
+"""
+Tests for the data integrity check and repair
+"""
+
+import csv
+import io
+import json
+from datetime import date
+from app.models import (
+    DailyStats,
+    DiaryEntry,
+    Goal,
+    MaintenanceCheckpoint,
+    PointsLog,
+    db,
+)
+from app.models.goal import GoalCategory, GoalStatus
+from app.models.points_log import PointsSourceType
+from app.utils.checkpoints import load_checkpoint
+from app.utils.data_integrity import (
+    REPAIR_CHECKPOINT,
+    REPORT_FIELDS,
+    analyze_data_integrity,
+    find_stats_mismatches,
+    repair_missing_entries,
+    write_csv_report,
+    write_json_report,
+)
+
+DAY = date(2025, 5, 6)
+
+
+def _stats(user_id, day, points):
+    db.session.add(DailyStats(user_id=user_id, date=day, points=points))
+
+
+def _seed_mismatch(user_id):
+    """A day with a diary entry, a completed goal and a login bonus, no log."""
+    db.session.add(
+        DiaryEntry(user_id=user_id, content="Entry", rating=1, entry_date=DAY)
+    )
+    db.session.add(
+        Goal(
+            user_id=user_id,
+            category=GoalCategory.EXERCISE,
+            title="Run",
+            week_start=date(2025, 5, 5),
+            week_end=date(2025, 5, 11),
+            status=GoalStatus.COMPLETED,
+        )
+    )
+    _stats(user_id, DAY, 16)
+    db.session.commit()
+
+
+class TestFindStatsMismatches:
+    """Test cases for the set-based mismatch query"""
+
+    def test_reports_mismatch_with_context_in_one_query(
+        self, app, sample_user, query_counter
+    ):
+        with app.app_context():
+            _seed_mismatch(sample_user.id)
+
+            with query_counter() as queries:
+                issues = find_stats_mismatches()
+
+            assert len(queries) == 1
+            assert len(issues) == 1
+            issue = issues[0]
+            assert (issue.daily_stats, issue.points_log, issue.difference) == (
+                16,
+                0,
+                16,
+            )
+            assert (issue.diary_entries, issue.expected_diary_points) == (1, 5)
+            assert (issue.goals, issue.expected_goal_points) == (1, 10)
+            assert issue.estimated_login_bonuses == 1
+
+    def test_ignores_consistent_and_empty_days(self, app, sample_user):
+        with app.app_context():
+            PointsLog.create_entry(
+                sample_user.id, 5, PointsSourceType.DIARY_ENTRY, "Entry", date=DAY
+            )
+            _stats(sample_user.id, DAY, 5)
+            _stats(sample_user.id, date(2025, 5, 7), 0)
+            db.session.commit()
+
+            assert find_stats_mismatches() == []
+
+    def test_reports_are_machine_readable(self, app, sample_user):
+        with app.app_context():
+            _seed_mismatch(sample_user.id)
+            report = analyze_data_integrity()
+
+            stream = io.StringIO()
+            write_json_report(report, stream)
+            data = json.loads(stream.getvalue())
+            assert data["summary"]["inconsistencies"] == 1
+            assert data["issues"][0]["date"] == "2025-05-06"
+            assert data["issues"][0]["difference"] == 16
+
+            stream = io.StringIO()
+            write_csv_report(report, stream)
+            rows = list(csv.DictReader(io.StringIO(stream.getvalue())))
+            assert tuple(rows[0]) == REPORT_FIELDS
+            assert rows[0]["estimated_login_bonuses"] == "1"
+
+
+class TestRepairMissingEntries:
+    """Test cases for the chunked, resumable repair"""
+
+    def test_repair_creates_missing_entries(self, app, sample_user):
+        with app.app_context():
+            _seed_mismatch(sample_user.id)
+
+            created = repair_missing_entries(find_stats_mismatches())
+
+            sources = sorted(e.source_type for e in PointsLog.query.all())
+            assert created == 3
+            assert sources == ["daily_login", "diary_entry", "goal_completed"]
+            assert find_stats_mismatches() == []
+            assert MaintenanceCheckpoint.query.one().is_finished
+
+    def test_goal_is_awarded_once_across_days(self, app, sample_user):
+        with app.app_context():
+            _seed_mismatch(sample_user.id)
+            _stats(sample_user.id, date(2025, 5, 7), 10)
+            db.session.commit()
+
+            repair_missing_entries(find_stats_mismatches(), chunk_size=1)
+
+            goal_rows = PointsLog.query.filter_by(source_type="goal_completed")
+            assert goal_rows.count() == 1
+
+    def test_repair_resumes_after_checkpoint(self, app, sample_user):
+        with app.app_context():
+            _stats(sample_user.id, date(2025, 5, 1), 2)
+            _stats(sample_user.id, date(2025, 5, 2), 3)
+            db.session.commit()
+
+            # Simulate a run that committed the first day and then crashed
+            checkpoint = load_checkpoint(REPAIR_CHECKPOINT)
+            checkpoint.last_user_id = sample_user.id
+            checkpoint.last_date = date(2025, 5, 1)
+            db.session.commit()
+
+            repair_missing_entries(find_stats_mismatches(), chunk_size=1)
+            assert {e.date for e in PointsLog.query.all()} == {date(2025, 5, 2)}
+
+            # A finished repair starts over on the next run
+            repair_missing_entries(find_stats_mismatches())
+            assert find_stats_mismatches() == []
@@ -0,0 +1,82 @@
+"""
+Tests for the per-user data version behind conditional GETs
+"""
+
+from datetime import date, datetime, timezone
+from app.models import DiaryEntry, Goal, User, UserDataStamp, db
+from app.models.goal import GoalCategory, GoalStatus
+from app.models.points_log import PointsSourceType
+from app.utils.data_stamp import (
+    NEVER,
+    data_validators,
+    get_data_version,
+    is_revalidated_path,
+    touch_user_data,
+)
+from app.utils.points_service import PointsService
+
+TODAY = date(2025, 6, 18)
+
+
+class TestDataVersion:
+    """Test cases for bumping and reading data versions"""
+
+    def test_writes_bump_the_version(self, app, sample_user):
+        with app.app_context():
+            user_id = sample_user.id
+            assert get_data_version(user_id) == (0, NEVER)
+
+            db.session.add(
+                DiaryEntry(user_id=user_id, content="Entry", rating=1, entry_date=TODAY)
+            )
+            db.session.commit()
+            after_entry = get_data_version(user_id)
+            assert after_entry.version >= 1
+            assert after_entry.updated_at > NEVER
+
+            goal = Goal(
+                user_id=user_id,
+                category=GoalCategory.EXERCISE,
+                title="Run",
+                week_start=date(2025, 6, 16),
+                week_end=date(2025, 6, 22),
+            )
+            db.session.add(goal)
+            db.session.commit()
+            goal.status = GoalStatus.COMPLETED
+            db.session.commit()
+            after_goal = get_data_version(user_id).version
+            assert after_goal >= after_entry.version + 2
+
+            PointsService.award_points(
+                user_id, 5, PointsSourceType.DIARY_ENTRY, "Entry", target_date=TODAY
+            )
+            db.session.commit()
+            after_points = get_data_version(user_id).version
+            assert after_points > after_goal
+
+            db.session.get(User, user_id).user_name = "Renamed"
+            db.session.commit()
+            assert get_data_version(user_id).version == after_points + 1
+            assert UserDataStamp.query.count() == 1
+
+    def test_validators_change_with_the_version_and_the_day(self, app, sample_user):
+        with app.test_request_context():
+            user_id = sample_user.id
+            touch_user_data(user_id, now=datetime(2025, 6, 17, 9, tzinfo=timezone.utc))
+            db.session.commit()
+
+            etag, last_modified = data_validators(user_id, TODAY)
+            # Last-Modified never predates the start of the day
+            assert last_modified == datetime(2025, 6, 18, tzinfo=timezone.utc)
+            assert data_validators(user_id, date(2025, 6, 19))[0] != etag
+
+            touch_user_data(user_id, now=datetime(2025, 6, 17, 9, tzinfo=timezone.utc))
+            db.session.commit()
+            assert data_validators(user_id, TODAY)[0] != etag
+
+    def test_revalidated_paths(self):
+        assert is_revalidated_path("/progress")
+        assert is_revalidated_path("/api/diary-search")
+        assert not is_revalidated_path("/profile")
+        assert not is_revalidated_path("/static/js/progress/main.js")
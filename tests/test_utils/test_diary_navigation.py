@@ -0,0 +1,77 @@
+"""
+Tests for diary reader date navigation
+"""
+
+from datetime import date
+from app.models import DiaryEntry, db
+from app.utils.diary_navigation import get_day_navigation, get_diary_date_range
+
+
+def _add_days(user_id, *days):
+    db.session.add_all(
+        [
+            DiaryEntry(user_id=user_id, content="Entry", rating=1, entry_date=day)
+            for day in days
+        ]
+    )
+    db.session.commit()
+
+
+class TestDiaryNavigation:
+    """Test cases for date range and neighbour lookups"""
+
+    def test_empty_diary(self, app, sample_user):
+        with app.app_context():
+            assert get_diary_date_range(sample_user.id) == (None, None)
+            assert get_day_navigation(sample_user.id, date(2025, 1, 1)) == (
+                False,
+                None,
+                None,
+            )
+
+    def test_date_range(self, app, sample_user):
+        with app.app_context():
+            _add_days(sample_user.id, date(2025, 3, 1), date(2024, 6, 5))
+            assert get_diary_date_range(sample_user.id) == (
+                date(2024, 6, 5),
+                date(2025, 3, 1),
+            )
+
+    def test_neighbours_skip_empty_days(self, app, sample_user):
+        with app.app_context():
+            _add_days(
+                sample_user.id,
+                date(2025, 1, 1),
+                date(2025, 1, 5),
+                date(2025, 1, 5),
+                date(2025, 2, 1),
+            )
+
+            navigation = get_day_navigation(sample_user.id, date(2025, 1, 5))
+
+            assert navigation.exists is True
+            assert navigation.prev_date == date(2025, 1, 1)
+            assert navigation.next_date == date(2025, 2, 1)
+
+    def test_first_and_last_day_have_one_neighbour(self, app, sample_user):
+        with app.app_context():
+            _add_days(sample_user.id, date(2025, 1, 1), date(2025, 1, 2))
+
+            first = get_day_navigation(sample_user.id, date(2025, 1, 1))
+            last = get_day_navigation(sample_user.id, date(2025, 1, 2))
+
+            assert first.prev_date is None and first.next_date == date(2025, 1, 2)
+            assert last.prev_date == date(2025, 1, 1) and last.next_date is None
+
+    def test_missing_day_is_reported(self, app, sample_user):
+        with app.app_context():
+            _add_days(sample_user.id, date(2025, 1, 1), date(2025, 1, 3))
+            navigation = get_day_navigation(sample_user.id, date(2025, 1, 2))
+            assert navigation.exists is False
+
+    def test_other_users_dates_are_ignored(self, app, sample_user):
+        with app.app_context():
+            _add_days(sample_user.id, date(2025, 1, 2))
+            _add_days(sample_user.id + 1, date(2025, 1, 1), date(2025, 1, 3))
+            navigation = get_day_navigation(sample_user.id, date(2025, 1, 2))
+            assert navigation == (True, None, None)
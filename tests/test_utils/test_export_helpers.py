@@ -0,0 +1,137 @@
+"""
+Tests for the streaming data exports
+"""
+
+import csv
+import io
+import json
+from datetime import date, timedelta
+from app.models import DiaryEntry, DailyStats, db
+from app.utils import export_helpers
+from app.utils.export_helpers import generate_csv_export, generate_json_export
+
+
+def _login(client, user):
+    with client.session_transaction() as sess:
+        sess["user_id"] = user.id
+
+
+class TestJsonExport:
+    """Test cases for the streamed JSON export"""
+
+    def test_matches_json_dumps_layout(self, app, sample_user, sample_goal):
+        with app.app_context():
+            db.session.add_all(
+                [
+                    DiaryEntry(
+                        user_id=sample_user.id,
+                        content='Said "hello"\nto a stranger',
+                        rating=1,
+                        entry_date=date(2025, 1, 1),
+                    ),
+                    DailyStats(user_id=sample_user.id, date=date(2025, 1, 1), points=5),
+                ]
+            )
+            db.session.commit()
+
+            document = "".join(
+                generate_json_export(sample_user.id, "test@example.com", None)
+            )
+            data = json.loads(document)
+
+            assert document == json.dumps(data, indent=2)
+            assert data["user"] == {"email": "test@example.com", "user_name": None}
+            assert data["diary_entries"][0]["content"] == 'Said "hello"\nto a stranger'
+            assert len(data["goals"]) == 1
+            assert data["stats"][0]["points"] == 5
+
+    def test_empty_sections(self, app, sample_user):
+        with app.app_context():
+            data = json.loads(
+                "".join(generate_json_export(sample_user.id, "a@b.c", "A"))
+            )
+            assert data["diary_entries"] == []
+            assert data["goals"] == []
+            assert data["stats"] == []
+
+    def test_download_streams_every_entry(self, app, client, sample_user, monkeypatch):
+        monkeypatch.setattr(export_helpers, "EXPORT_BATCH_SIZE", 7)
+        with app.app_context():
+            db.session.add_all(
+                [
+                    DiaryEntry(
+                        user_id=sample_user.id,
+                        content=f"Entry {i}",
+                        rating=1,
+                        entry_date=date(2024, 1, 1) + timedelta(days=i),
+                    )
+                    for i in range(30)
+                ]
+            )
+            db.session.commit()
+        _login(client, sample_user)
+
+        response = client.get("/download-data/json")
+
+        assert response.status_code == 200
+        assert response.is_streamed
+        assert "attachment" in response.headers["Content-Disposition"]
+        data = json.loads(response.get_data(as_text=True))
+        assert [e["content"] for e in data["diary_entries"]] == [
+            f"Entry {i}" for i in range(30)
+        ]
+
+
+class TestCsvExport:
+    """Test cases for the streamed CSV export"""
+
+    def test_sections_and_rows(self, app, sample_user, monkeypatch):
+        monkeypatch.setattr(export_helpers, "EXPORT_BATCH_SIZE", 2)
+        with app.app_context():
+            db.session.add_all(
+                [
+                    DiaryEntry(
+                        user_id=sample_user.id,
+                        content=f"Entry, {i}",
+                        rating=1,
+                        entry_date=date(2025, 1, 1) + timedelta(days=i),
+                    )
+                    for i in range(5)
+                ]
+            )
+            db.session.add(
+                DailyStats(user_id=sample_user.id, date=date(2025, 1, 1), points=5)
+            )
+            db.session.commit()
+
+            chunks = list(generate_csv_export(sample_user.id))
+            rows = list(csv.reader(io.StringIO("".join(chunks))))
+
+        assert rows[:3] == [
+            ["Diary Entries"],
+            ["Date", "Content", "Rating"],
+            ["2025-01-01", "Entry, 0", "1"],
+        ]
+        assert rows[7:10] == [
+            [],
+            ["Goals"],
+            ["Title", "Category", "Status", "Created At"],
+        ]
+        assert rows[10:] == [
+            [],
+            ["Stats"],
+            ["Date", "Points", "Current Streak", "Longest Streak"],
+            ["2025-01-01", "5", "0", "0"],
+        ]
+        # The header is sent before any rows are fetched
+        assert chunks[0] == "Diary Entries\r\nDate,Content,Rating\r\n"
+
+    def test_download_streams_csv(self, client, sample_user):
+        _login(client, sample_user)
+
+        response = client.get("/download-data/csv")
+
+        assert response.status_code == 200
+        assert response.is_streamed
+        assert response.mimetype == "text/csv"
+        assert response.get_data(as_text=True).startswith("Diary Entries")
@@ -0,0 +1,151 @@
+"""
+Tests for background export jobs
+"""
+
+import io
+import json
+import zipfile
+from datetime import datetime, timedelta, timezone
+import pytest
+from app.models import DiaryEntry, ExportJob, db
+from app.models.export_job import ExportStatus
+from app.utils.export_jobs import (
+    build_export_archive,
+    cleanup_expired_exports,
+    get_export_path,
+    process_pending_exports,
+    request_export,
+)
+
+
+@pytest.fixture
+def export_dir(app, tmp_path):
+    app.config["EXPORT_DIR"] = str(tmp_path)
+    app.config["EXPORT_JOBS_INLINE"] = False
+    return tmp_path
+
+
+def _login(client, user):
+    with client.session_transaction() as sess:
+        sess["user_id"] = user.id
+
+
+class TestExportJobs:
+    """Test cases for queuing and building export archives"""
+
+    def test_request_returns_pending_job(self, app, sample_user, export_dir):
+        with app.app_context():
+            job = request_export(sample_user.id)
+            again = request_export(sample_user.id)
+
+            assert job.status == ExportStatus.PENDING.value
+            assert again.id == job.id
+            assert list(export_dir.iterdir()) == []
+
+    def test_worker_builds_archive(self, app, sample_user, export_dir):
+        with app.app_context():
+            db.session.add(DiaryEntry(user_id=sample_user.id, content="Calm", rating=1))
+            db.session.commit()
+            job = request_export(sample_user.id)
+
+            assert process_pending_exports() == 1
+            assert process_pending_exports() == 0
+
+            job = db.session.get(ExportJob, job.id)
+            assert job.is_ready
+            with zipfile.ZipFile(get_export_path(job)) as archive:
+                assert sorted(archive.namelist()) == ["user_data.csv", "user_data.json"]
+                data = json.loads(archive.read("user_data.json"))
+                assert data["diary_entries"][0]["content"] == "Calm"
+                assert archive.read("user_data.csv").startswith(b"Diary Entries")
+
+    def test_expired_exports_are_removed(self, app, sample_user, export_dir):
+        with app.app_context():
+            job = request_export(sample_user.id)
+            process_pending_exports()
+            job = db.session.get(ExportJob, job.id)
+            path = get_export_path(job)
+            job.finished_at = datetime.now(timezone.utc) - timedelta(hours=25)
+            db.session.commit()
+
+            assert cleanup_expired_exports() == 1
+            assert ExportJob.query.count() == 0
+            assert list(export_dir.iterdir()) == []
+            assert path is not None
+
+    def test_stale_running_job_is_failed(self, app, sample_user, export_dir):
+        with app.app_context():
+            job = request_export(sample_user.id)
+            job.status = ExportStatus.RUNNING.value
+            job.started_at = datetime.now(timezone.utc) - timedelta(hours=2)
+            db.session.commit()
+            stuck_id = job.id
+
+            # The dead worker's job no longer blocks a new export
+            new_job = request_export(sample_user.id)
+
+            assert new_job.id != stuck_id
+            assert new_job.status == ExportStatus.PENDING.value
+            stuck = db.session.get(ExportJob, stuck_id)
+            assert stuck.status == ExportStatus.FAILED.value
+            assert "did not finish" in stuck.error
+
+    def test_job_for_deleted_user_fails(self, app, sample_user, export_dir):
+        with app.app_context():
+            job_id = request_export(sample_user.id).id
+            db.session.delete(sample_user)
+            db.session.commit()
+
+            assert build_export_archive(job_id) is True
+
+            job = db.session.get(ExportJob, job_id)
+            assert job.status == ExportStatus.FAILED.value
+            assert "no longer exists" in job.error
+
+
+class TestExportRoutes:
+    """Test cases for the export status and download endpoints"""
+
+    def test_status_and_ranged_download(self, app, client, sample_user, export_dir):
+        _login(client, sample_user)
+
+        response = client.post(
+            "/download-data/export", headers={"Accept": "application/json"}
+        )
+        assert response.status_code == 202
+        status = response.get_json()
+        assert status["status"] == "pending"
+        assert status["download_url"] is None
+
+        with app.app_context():
+            process_pending_exports()
+
+        status = client.get(status["status_url"]).get_json()
+        assert status["status"] == "ready"
+
+        full = client.get(status["download_url"])
+        assert full.status_code == 200
+        assert full.mimetype == "application/zip"
+        zipfile.ZipFile(io.BytesIO(full.data))
+
+        partial = client.get(status["download_url"], headers={"Range": "bytes=0-9"})
+        assert partial.status_code == 206
+        assert partial.data == full.data[:10]
+
+    def test_other_users_cannot_see_job(self, app, client, sample_user, export_dir):
+        with app.app_context():
+            job_id = request_export(sample_user.id).id
+
+        with client.session_transaction() as sess:
+            sess["user_id"] = sample_user.id + 1
+
+        assert client.get(f"/download-data/export/{job_id}").status_code == 404
+        assert client.get(f"/download-data/export/{job_id}/download").status_code == 404
+
+    def test_form_request_redirects_to_profile(self, client, sample_user, export_dir):
+        _login(client, sample_user)
+
+        response = client.post("/download-data/export")
+
+        assert response.status_code == 302
+        assert response.headers["Location"].endswith("/profile")
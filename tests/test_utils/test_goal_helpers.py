@@ -4,13 +4,18 @@ Tests for goal helper utilities
 
 import pytest
 from datetime import datetime, date, timezone, timedelta
-from app.models import Goal, db
+from app.models import Goal, GoalStats, db
 from app.models.goal import GoalCategory, GoalStatus
 from app.utils.goal_helpers import (
     get_current_goals,
     get_overdue_goals,
     create_goal,
     get_goal_statistics,
+    load_goals_overview,
+    complete_goal,
+    fail_goal,
+    count_goals,
+    rebuild_goal_stats,
 )
 
 
@@ -140,3 +145,145 @@ class TestGoalHelpers:
             assert stats["total_completed"] == 0
             assert stats["success_rate"] == 0
             assert stats["has_stats"] is False
+
+    def test_load_goals_overview_splits_goals(self, app, sample_user):
+        """The overview splits one scan into current, overdue and history"""
+        with app.app_context():
+            today = date(2024, 6, 15)
+            statuses = [
+                ("Current Goal", GoalStatus.ACTIVE, today - timedelta(days=2)),
+                ("Overdue Goal", GoalStatus.ACTIVE, today - timedelta(days=9)),
+                ("Done Goal", GoalStatus.COMPLETED, today - timedelta(days=20)),
+                ("Missed Goal", GoalStatus.FAILED, today - timedelta(days=30)),
+            ]
+            for index, (title, status, start) in enumerate(statuses):
+                db.session.add(
+                    Goal(
+                        user_id=sample_user.id,
+                        category=GoalCategory.EXERCISE,
+                        title=title,
+                        week_start=start,
+                        week_end=start + timedelta(days=6),
+                        status=status,
+                        created_at=datetime(2024, 6, 14 - index),
+                    )
+                )
+            db.session.commit()
+
+            overview = load_goals_overview(sample_user.id, today=today)
+
+            assert [g.title for g in overview.current] == ["Current Goal"]
+            assert [g.title for g in overview.overdue] == ["Overdue Goal"]
+            assert [g.title for g in overview.history] == [
+                "Current Goal",
+                "Overdue Goal",
+                "Done Goal",
+                "Missed Goal",
+            ]
+            assert overview.stats == get_goal_statistics(sample_user.id)
+            assert overview.stats["total_completed"] == 1
+
+    def test_load_goals_overview_keeps_old_active_goals(self, app, sample_user):
+        """Active goals older than the history window are still listed"""
+        with app.app_context():
+            today = date(2024, 6, 15)
+            db.session.add(
+                Goal(
+                    user_id=sample_user.id,
+                    category=GoalCategory.LEARNING,
+                    title="Forgotten Goal",
+                    week_start=today - timedelta(days=60),
+                    week_end=today - timedelta(days=54),
+                    status=GoalStatus.ACTIVE,
+                    created_at=datetime(2024, 4, 16),
+                )
+            )
+            for day in range(1, 4):
+                db.session.add(
+                    Goal(
+                        user_id=sample_user.id,
+                        category=GoalCategory.LEARNING,
+                        title=f"Finished {day}",
+                        week_start=today - timedelta(days=10),
+                        week_end=today - timedelta(days=4),
+                        status=GoalStatus.COMPLETED,
+                        created_at=datetime(2024, 6, day),
+                    )
+                )
+            db.session.commit()
+
+            overview = load_goals_overview(
+                sample_user.id, today=today, history_limit=2
+            )
+
+            assert [g.title for g in overview.overdue] == ["Forgotten Goal"]
+            assert [g.title for g in overview.history] == ["Finished 3", "Finished 2"]
+            assert overview.stats["total_completed"] == 3
+
+    def test_goal_stats_follow_status_changes(self, app, sample_user):
+        """Completing, failing and deleting goals keeps the counters current"""
+        with app.app_context():
+            goals = [
+                create_goal(sample_user.id, GoalCategory.SOCIAL, f"Goal {i}")
+                for i in range(3)
+            ]
+            assert count_goals(sample_user.id) == []
+
+            complete_goal(goals[0].id)
+            complete_goal(goals[1].id)
+            fail_goal(goals[2].id)
+            counts = sorted(count_goals(sample_user.id), key=lambda row: row[1].value)
+            assert counts == [
+                (GoalCategory.SOCIAL, GoalStatus.COMPLETED, 2),
+                (GoalCategory.SOCIAL, GoalStatus.FAILED, 1),
+            ]
+
+            goals[1].category = GoalCategory.HOME
+            db.session.delete(goals[2])
+            db.session.commit()
+
+            stats = get_goal_statistics(sample_user.id)
+            assert stats["total_completed"] == 2
+            assert stats["success_rate"] == 100.0
+            assert stats["category_stats"][GoalCategory.SOCIAL.value] == {
+                "completed": 1,
+                "failed": 0,
+            }
+            assert stats["category_stats"][GoalCategory.HOME.value] == {
+                "completed": 1,
+                "failed": 0,
+            }
+
+    def test_goal_stats_read_without_loading_goals(
+        self, app, sample_user, query_counter
+    ):
+        """Statistics are one primary-key range read of goal_stats"""
+        with app.app_context():
+            goal = create_goal(sample_user.id, GoalCategory.CREATIVE, "Paint")
+            complete_goal(goal.id)
+
+            with query_counter() as queries:
+                stats = get_goal_statistics(sample_user.id)
+
+            assert stats["total_completed"] == 1
+            assert len(queries) == 1
+            assert "goal_stats" in queries[0]
+
+    def test_rebuild_goal_stats(self, app, sample_user):
+        """Bulk goal updates are recounted from the goals table"""
+        with app.app_context():
+            for i in range(3):
+                create_goal(sample_user.id, GoalCategory.LEARNING, f"Read {i}")
+            Goal.query.filter_by(user_id=sample_user.id).update(
+                {"status": GoalStatus.FAILED}
+            )
+            db.session.commit()
+            assert count_goals(sample_user.id) == []
+
+            assert rebuild_goal_stats([sample_user.id]) == 1
+            db.session.commit()
+
+            assert count_goals(sample_user.id) == [
+                (GoalCategory.LEARNING, GoalStatus.FAILED, 3)
+            ]
+            assert GoalStats.query.filter_by(user_id=sample_user.id).count() == 1
@@ -0,0 +1,102 @@
+"""
+Tests for the overdue goal sweeper
+"""
+
+from datetime import date, timedelta
+from app.models import DailyStats, Goal, PointsLog, User, db
+from app.models.goal import GoalCategory, GoalStatus
+from app.models.points_log import PointsSourceType
+from app.utils.data_stamp import get_data_version
+from app.utils.goal_helpers import get_goal_statistics
+from app.utils.goal_sweeper import sweep_overdue_goals
+
+TODAY = date(2025, 5, 20)
+
+
+def _goal(user_id, title, week_end, status=GoalStatus.ACTIVE):
+    goal = Goal(
+        user_id=user_id,
+        category=GoalCategory.EXERCISE,
+        title=title,
+        week_start=week_end - timedelta(days=6),
+        week_end=week_end,
+        status=status,
+    )
+    db.session.add(goal)
+    db.session.commit()
+    return goal.id
+
+
+class TestSweepOverdueGoals:
+    """Test cases for sweep_overdue_goals"""
+
+    def test_expires_only_goals_past_the_grace_period(self, app, sample_user):
+        with app.app_context():
+            stale = _goal(sample_user.id, "Stale", TODAY - timedelta(days=8))
+            recent = _goal(sample_user.id, "Recent", TODAY - timedelta(days=2))
+            live = _goal(sample_user.id, "Live", TODAY + timedelta(days=3))
+            done = _goal(
+                sample_user.id,
+                "Done",
+                TODAY - timedelta(days=30),
+                status=GoalStatus.COMPLETED,
+            )
+            version = get_data_version(sample_user.id).version
+
+            result = sweep_overdue_goals(today=TODAY, grace_days=7, points=0)
+
+            assert (result.goals_expired, result.users, result.batches) == (1, 1, 1)
+            statuses = {
+                goal.id: goal.status
+                for goal in Goal.query.filter_by(user_id=sample_user.id)
+            }
+            assert statuses == {
+                stale: GoalStatus.FAILED,
+                recent: GoalStatus.ACTIVE,
+                live: GoalStatus.ACTIVE,
+                done: GoalStatus.COMPLETED,
+            }
+            stats = get_goal_statistics(sample_user.id)
+            assert stats["category_stats"][GoalCategory.EXERCISE.value] == {
+                "completed": 1,
+                "failed": 1,
+            }
+            assert get_data_version(sample_user.id).version > version
+            assert PointsLog.query.count() == 0
+
+    def test_awards_configured_points_in_batches(self, app, sample_user):
+        with app.app_context():
+            other = User(email="sweep@example.com", password="testpassword123")
+            db.session.add(other)
+            db.session.commit()
+            for i in range(3):
+                _goal(sample_user.id, f"Old {i}", TODAY - timedelta(days=10 + i))
+            _goal(other.id, "Other", TODAY - timedelta(days=10))
+
+            result = sweep_overdue_goals(
+                today=TODAY, grace_days=7, points=2, batch_size=2
+            )
+
+            assert result.goals_expired == 4
+            assert result.users == 2
+            assert result.batches == 2
+            assert result.points_awarded == 8
+            logs = PointsLog.query.filter_by(user_id=sample_user.id).all()
+            assert {log.source_type for log in logs} == {
+                PointsSourceType.GOAL_EXPIRED.value
+            }
+            assert len(logs) == 3
+            stats = DailyStats.query.filter_by(user_id=sample_user.id, date=TODAY)
+            assert stats.one().points == 6
+
+            # Nothing is left to expire on the next run
+            assert sweep_overdue_goals(today=TODAY, grace_days=7).goals_expired == 0
+
+    def test_sweep_goals_command(self, app, runner, sample_user):
+        with app.app_context():
+            _goal(sample_user.id, "Forgotten", date.today() - timedelta(days=60))
+
+        result = runner.invoke(args=["sweep-goals", "--grace-days", "7"])
+
+        assert result.exit_code == 0
+        assert "Expired 1 goal(s) for 1 user(s)" in result.output
@@ -0,0 +1,135 @@
+"""
+Tests for the write-through point totals
+"""
+
+from datetime import date, timedelta
+from sqlalchemy import update
+from app.models import DailyStats, UserTotals, db
+from app.models.points_log import PointsSourceType
+from app.utils.point_totals import (
+    check_point_totals,
+    get_total_points,
+    reconcile_point_totals,
+)
+from app.utils.points_service import PointsService
+
+TODAY = date(2025, 6, 18)
+
+
+def _award(user_id, points, day=TODAY):
+    PointsService.award_points(
+        user_id, points, PointsSourceType.DIARY_ENTRY, "Entry", target_date=day
+    )
+
+
+def _stored_total(user_id):
+    totals = db.session.get(UserTotals, user_id)
+    return None if totals is None else totals.total_points
+
+
+def _corrupt_total(user_id, total):
+    db.session.execute(
+        update(UserTotals)
+        .where(UserTotals.user_id == user_id)
+        .values(total_points=total)
+    )
+    db.session.commit()
+
+
+class TestPointTotalsMaintenance:
+    """Test cases for keeping the totals in step with daily stats"""
+
+    def test_awards_update_the_total(self, app, sample_user):
+        with app.app_context():
+            assert get_total_points(sample_user.id) == 0
+            _award(sample_user.id, 5)
+            _award(sample_user.id, 3)
+            _award(sample_user.id, 2, day=TODAY - timedelta(days=1))
+
+            assert _stored_total(sample_user.id) == 10
+            assert get_total_points(sample_user.id) == 10
+
+    def test_stats_updates_and_deletes_adjust_the_total(self, app, sample_user):
+        with app.app_context():
+            _award(sample_user.id, 5)
+            _award(sample_user.id, 4, day=TODAY - timedelta(days=1))
+
+            stats = DailyStats.query.filter_by(user_id=sample_user.id, date=TODAY)
+            stats.one().points = 8
+            db.session.commit()
+            assert _stored_total(sample_user.id) == 12
+
+            db.session.delete(stats.one())
+            db.session.commit()
+            assert _stored_total(sample_user.id) == 4
+            assert check_point_totals([sample_user.id]) == []
+
+    def test_total_is_read_with_one_query(self, app, sample_user, query_counter):
+        with app.app_context():
+            _award(sample_user.id, 7)
+
+            with query_counter() as queries:
+                assert get_total_points(sample_user.id) == 7
+
+            assert len(queries) == 1
+            assert "daily_stats" not in queries[0]
+
+
+class TestReconcilePointTotals:
+    """Test cases for reconcile_point_totals and its command"""
+
+    def test_dry_run_reports_without_fixing(self, app, sample_user):
+        with app.app_context():
+            _award(sample_user.id, 6)
+            _corrupt_total(sample_user.id, 1)
+
+            mismatches = reconcile_point_totals([sample_user.id], dry_run=True)
+
+            assert [(m.stored, m.expected) for m in mismatches] == [(1, 6)]
+            assert _stored_total(sample_user.id) == 1
+
+    def test_fixes_wrong_and_missing_totals(self, app, sample_user):
+        with app.app_context():
+            _award(sample_user.id, 6)
+            _corrupt_total(sample_user.id, 1)
+
+            assert len(reconcile_point_totals([sample_user.id])) == 1
+            assert _stored_total(sample_user.id) == 6
+
+            UserTotals.query.filter_by(user_id=sample_user.id).delete()
+            db.session.commit()
+            mismatches = reconcile_point_totals([sample_user.id])
+            assert [(m.stored, m.expected) for m in mismatches] == [(None, 6)]
+            assert _stored_total(sample_user.id) == 6
+            assert reconcile_point_totals([sample_user.id]) == []
+
+    def test_check_reads_both_totals_in_one_statement(
+        self, app, sample_user, query_counter
+    ):
+        with app.app_context():
+            _award(sample_user.id, 6)
+            _corrupt_total(sample_user.id, 1)
+
+            with query_counter() as queries:
+                mismatches = check_point_totals([sample_user.id])
+
+            assert [(m.stored, m.expected) for m in mismatches] == [(1, 6)]
+            assert len(queries) == 1
+            assert "user_totals" in queries[0] and "daily_stats" in queries[0]
+
+    def test_reconcile_point_totals_command(self, app, runner, sample_user):
+        with app.app_context():
+            _award(sample_user.id, 6)
+            _corrupt_total(sample_user.id, 2)
+            user_id = sample_user.id
+
+        result = runner.invoke(args=["reconcile-point-totals", "--dry-run"])
+        assert result.exit_code == 0
+        assert f"User {user_id}: stored 2, expected 6" in result.output
+        assert "Would fix the point totals of 1 user(s)." in result.output
+
+        result = runner.invoke(args=["reconcile-point-totals"])
+        assert "Fixed the point totals of 1 user(s)." in result.output
+
+        result = runner.invoke(args=["reconcile-point-totals"])
+        assert "Point totals are consistent for 1 user(s)." in result.output
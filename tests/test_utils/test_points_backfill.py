@@ -0,0 +1,107 @@
+"""
+Tests for the chunked, resumable PointsLog backfill
+"""
+
+from datetime import date
+from app.models import (
+    DailyStats,
+    DiaryEntry,
+    Goal,
+    MaintenanceCheckpoint,
+    PointsLog,
+    User,
+    db,
+)
+from app.models.goal import GoalCategory, GoalStatus
+from app.models.points_log import PointsSourceType
+from app.utils.checkpoints import load_checkpoint
+from app.utils.data_integrity import find_stats_mismatches
+from app.utils.points_backfill import backfill_partition, partition_user_ids
+
+
+def _stats(user_id, day, points):
+    db.session.add(DailyStats(user_id=user_id, date=day, points=points))
+
+
+class TestPartitionUserIds:
+    """Test cases for splitting users across workers"""
+
+    def test_partitions_are_contiguous_and_balanced(self):
+        assert partition_user_ids([1, 2, 3, 4, 5], 2) == [[1, 2, 3], [4, 5]]
+        assert partition_user_ids([1, 2], 4) == [[1], [2]]
+        assert partition_user_ids([], 4) == []
+
+
+class TestBackfillPartition:
+    """Test cases for backfill_partition"""
+
+    def test_backfills_diary_goal_and_login_points(self, app, sample_user):
+        with app.app_context():
+            first, second = date(2025, 5, 6), date(2025, 5, 7)
+            db.session.add(
+                DiaryEntry(
+                    user_id=sample_user.id, content="Entry", rating=-1, entry_date=first
+                )
+            )
+            db.session.add(
+                Goal(
+                    user_id=sample_user.id,
+                    category=GoalCategory.EXERCISE,
+                    title="Run",
+                    week_start=date(2025, 5, 5),
+                    week_end=date(2025, 5, 11),
+                    status=GoalStatus.COMPLETED,
+                )
+            )
+            _stats(sample_user.id, first, 13)
+            _stats(sample_user.id, second, 11)
+            db.session.commit()
+
+            result = backfill_partition([sample_user.id], "test-backfill")
+
+            assert (result.users, result.days, result.points) == (1, 2, 24)
+            sources = [
+                e.source_type
+                for e in PointsLog.query.filter_by(date=first).order_by(PointsLog.id)
+            ]
+            assert sources == ["diary_entry", "goal_completed", "daily_login"]
+            # The goal is only awarded once, so the second day is login bonuses
+            second_day = PointsLog.query.filter_by(date=second).all()
+            assert {e.source_type for e in second_day} == {"daily_login"}
+            assert find_stats_mismatches() == []
+
+    def test_days_with_log_entries_are_skipped(self, app, sample_user):
+        with app.app_context():
+            day = date(2025, 5, 6)
+            PointsLog.create_entry(
+                sample_user.id, 1, PointsSourceType.DAILY_LOGIN, "Login", date=day
+            )
+            _stats(sample_user.id, day, 5)
+            db.session.commit()
+
+            result = backfill_partition([sample_user.id], "test-backfill")
+
+            assert result.rows == 0
+            assert PointsLog.query.count() == 1
+
+    def test_resumes_after_last_committed_user(self, app, sample_user):
+        with app.app_context():
+            other = User(email="other@example.com", password="testpassword123")
+            db.session.add(other)
+            db.session.commit()
+            day = date(2025, 5, 6)
+            _stats(sample_user.id, day, 1)
+            _stats(other.id, day, 1)
+            db.session.commit()
+
+            # Simulate a run that committed the first user and then crashed
+            checkpoint = load_checkpoint("test-backfill")
+            checkpoint.last_user_id = sample_user.id
+            db.session.commit()
+
+            result = backfill_partition([sample_user.id, other.id], "test-backfill")
+
+            assert result.users == 1
+            assert {e.user_id for e in PointsLog.query.all()} == {other.id}
+            checkpoint = MaintenanceCheckpoint.query.filter_by(name="test-backfill")
+            assert checkpoint.one().is_finished
@@ -0,0 +1,171 @@
+"""
+Tests for the points outbox and worker
+"""
+
+from datetime import date, timedelta
+from app.models import DiaryEntry, DailyStats, PointsLog, PointsOutboxEvent, db
+from app.models.points_log import PointsSourceType
+from app.utils.points_outbox import (
+    MAX_ATTEMPTS,
+    apply_points_event,
+    enqueue_points_event,
+    process_pending_events,
+)
+
+
+def _add_entry(user_id, entry_date, rating=1):
+    entry = DiaryEntry(
+        user_id=user_id, content="Entry", rating=rating, entry_date=entry_date
+    )
+    db.session.add(entry)
+    db.session.flush()
+    enqueue_points_event(
+        user_id,
+        PointsSourceType.DIARY_ENTRY,
+        entry.id,
+        {"rating": rating},
+        event_date=entry_date,
+    )
+    db.session.commit()
+    return entry
+
+
+class TestPointsOutbox:
+    """Test cases for queuing and applying point awards"""
+
+    def test_enqueue_is_idempotent(self, app, sample_user):
+        with app.app_context():
+            payload = {"goal_title": "Run"}
+            first = enqueue_points_event(
+                sample_user.id, PointsSourceType.GOAL_COMPLETED, 7, payload
+            )
+            second = enqueue_points_event(
+                sample_user.id, PointsSourceType.GOAL_COMPLETED, 7, payload
+            )
+            db.session.commit()
+
+            assert first is not None
+            assert second is None
+            assert PointsOutboxEvent.query.count() == 1
+
+    def test_worker_applies_pending_events_once(self, app, sample_user):
+        with app.app_context():
+            day = date(2025, 3, 1)
+            _add_entry(sample_user.id, day, rating=1)
+            _add_entry(sample_user.id, day, rating=-1)
+
+            assert PointsLog.query.count() == 0
+            assert process_pending_events() == 2
+            assert process_pending_events() == 0
+
+            stats = DailyStats.query.filter_by(user_id=sample_user.id, date=day).one()
+            assert stats.points == 7
+            assert PointsLog.query.count() == 2
+            assert all(e.processed_at for e in PointsOutboxEvent.query.all())
+
+    def test_already_awarded_event_is_not_applied_twice(self, app, sample_user):
+        with app.app_context():
+            entry = _add_entry(sample_user.id, date(2025, 3, 1))
+            event = PointsOutboxEvent.query.one()
+            apply_points_event(event.id)
+
+            # Simulate a crash after the award but before marking processed
+            event.processed_at = None
+            db.session.commit()
+            apply_points_event(event.id)
+
+            assert (
+                PointsLog.query.filter_by(source_id=entry.id, source_type="diary_entry")
+                .count()
+                == 1
+            )
+
+    def test_failing_event_records_error(self, app, sample_user):
+        with app.app_context():
+            enqueue_points_event(sample_user.id, PointsSourceType.DAILY_LOGIN, 1)
+            db.session.commit()
+
+            for _ in range(MAX_ATTEMPTS + 1):
+                assert process_pending_events() == 0
+
+            event = PointsOutboxEvent.query.one()
+            assert event.processed_at is None
+            assert event.attempts == MAX_ATTEMPTS
+            assert "No award rule" in event.last_error
+
+    def test_diary_events_award_streak_milestones(self, app, sample_user):
+        with app.app_context():
+            start = date(2025, 3, 1)
+            for offset in range(7):
+                _add_entry(sample_user.id, start + timedelta(days=offset))
+
+            process_pending_events()
+
+            milestone = PointsLog.query.filter_by(
+                source_type=PointsSourceType.STREAK_7_DAY.value
+            ).one()
+            assert milestone.date == start + timedelta(days=6)
+
+    def test_lagging_worker_still_awards_streak_milestones(self, app, sample_user):
+        with app.app_context():
+            start = date(2025, 3, 1)
+            for offset in range(7):
+                _add_entry(sample_user.id, start + timedelta(days=offset))
+            # Written before the worker caught up with the 7th day
+            _add_entry(sample_user.id, start + timedelta(days=7))
+
+            process_pending_events()
+
+            milestone = PointsLog.query.filter_by(
+                source_type=PointsSourceType.STREAK_7_DAY.value
+            ).one()
+            assert milestone.date == start + timedelta(days=6)
+
+    def test_failed_milestone_leaves_event_pending(
+        self, app, sample_user, monkeypatch
+    ):
+        with app.app_context():
+            start = date(2025, 3, 1)
+            for offset in range(6):
+                _add_entry(sample_user.id, start + timedelta(days=offset))
+            process_pending_events()
+            _add_entry(sample_user.id, start + timedelta(days=6))
+
+            def fail(*args, **kwargs):
+                raise RuntimeError("milestone check failed")
+
+            monkeypatch.setattr(
+                "app.utils.points_outbox.PointsService.record_streak_milestones",
+                fail,
+            )
+            assert process_pending_events() == 0
+            monkeypatch.undo()
+
+            event = PointsOutboxEvent.query.filter_by(processed_at=None).one()
+            assert "milestone check failed" in event.last_error
+            assert process_pending_events() == 1
+            assert (
+                PointsLog.query.filter_by(
+                    source_type=PointsSourceType.STREAK_7_DAY.value
+                ).count()
+                == 1
+            )
+
+
+class TestDeferredDiaryWrites:
+    """Test cases for diary writes when no inline processing is configured"""
+
+    def test_diary_post_only_queues_points(self, app, client, sample_user):
+        app.config["POINTS_OUTBOX_INLINE"] = False
+        with client.session_transaction() as sess:
+            sess["user_id"] = sample_user.id
+
+        response = client.post("/diary", data={"content": "Calm day", "rating": "1"})
+
+        assert response.status_code == 200
+        with app.app_context():
+            assert PointsOutboxEvent.query.count() == 1
+            assert PointsLog.query.count() == 0
+
+            process_pending_events()
+            assert PointsLog.query.count() == 1
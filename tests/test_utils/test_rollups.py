@@ -0,0 +1,159 @@
+"""
+Tests for the weekly and monthly stats rollups
+"""
+
+from datetime import date, timedelta
+from app.models import DailyStats, DiaryEntry, StatsRollup, db
+from app.models.points_log import PointsSourceType
+from app.utils import dashboard_snapshot
+from app.utils.dashboard_snapshot import build_dashboard_snapshot
+from app.utils.points_service import PointsService
+from app.utils.rollups import (
+    PERIOD_MONTH,
+    PERIOD_WEEK,
+    check_rollups,
+    load_rollups,
+    rebuild_rollups,
+)
+
+# A Wednesday, so the 14-day trend windows span three weeks
+TODAY = date(2025, 6, 18)
+
+
+def _entry(user_id, day, rating=1):
+    entry = DiaryEntry(user_id=user_id, content="Entry", rating=rating, entry_date=day)
+    db.session.add(entry)
+    return entry
+
+
+class TestRollupMaintenance:
+    """Test cases for keeping rollups in step with writes"""
+
+    def test_points_and_entries_are_rolled_up(self, app, sample_user):
+        with app.app_context():
+            user_id = sample_user.id
+            _entry(user_id, TODAY)
+            _entry(user_id, TODAY - timedelta(days=1), rating=-1)
+            PointsService.award_points(
+                user_id, 5, PointsSourceType.DIARY_ENTRY, "Entry", target_date=TODAY
+            )
+            PointsService.award_points(
+                user_id, 1, PointsSourceType.DAILY_LOGIN, "Login", target_date=TODAY
+            )
+            db.session.commit()
+
+            week = StatsRollup.query.filter_by(period=PERIOD_WEEK).one()
+            month = StatsRollup.query.filter_by(period=PERIOD_MONTH).one()
+            assert week.period_start == date(2025, 6, 16)
+            assert month.period_start == date(2025, 6, 1)
+            for rollup in (week, month):
+                assert (rollup.points, rollup.active_days) == (6, 1)
+                assert (rollup.wed_points, rollup.wed_days) == (6, 1)
+                assert (rollup.positive_count, rollup.negative_count) == (1, 1)
+                assert (rollup.wed_entries, rollup.tue_entries) == (1, 1)
+                assert rollup.first_entry_date == TODAY - timedelta(days=1)
+            assert check_rollups([user_id]) == []
+
+    def test_updates_and_deletes_are_applied(self, app, sample_user):
+        with app.app_context():
+            user_id = sample_user.id
+            stats = DailyStats(user_id=user_id, date=TODAY, points=0)
+            entry = _entry(user_id, TODAY)
+            db.session.add(stats)
+            db.session.commit()
+            assert load_rollups(user_id).active_days == 0
+
+            stats.points = 4
+            db.session.commit()
+            assert load_rollups(user_id).active_days == 1
+
+            db.session.delete(stats)
+            db.session.delete(entry)
+            db.session.commit()
+            rollups = load_rollups(user_id)
+            assert (rollups.total_points, rollups.total_entries) == (0, 0)
+
+    def test_rebuild_fixes_drifted_rollups(self, app, sample_user):
+        with app.app_context():
+            user_id = sample_user.id
+            db.session.add(DailyStats(user_id=user_id, date=TODAY, points=3))
+            db.session.commit()
+            StatsRollup.query.update({"points": 99})
+            db.session.commit()
+
+            mismatches = check_rollups([user_id])
+            assert {(m.period, m.column, m.stored) for m in mismatches} == {
+                (PERIOD_WEEK, "points", 99),
+                (PERIOD_MONTH, "points", 99),
+            }
+
+            rebuild_rollups(user_id)
+            db.session.commit()
+            assert check_rollups([user_id]) == []
+
+    def test_check_rollups_command(self, app, runner, sample_user):
+        with app.app_context():
+            db.session.add(DailyStats(user_id=sample_user.id, date=TODAY, points=3))
+            db.session.commit()
+
+            assert runner.invoke(args=["check-rollups"]).exit_code == 0
+            StatsRollup.query.delete()
+            db.session.commit()
+            result = runner.invoke(args=["check-rollups"])
+            assert result.exit_code != 0
+            assert "rebuild-rollups" in result.output
+
+            runner.invoke(args=["rebuild-rollups"])
+            assert runner.invoke(args=["check-rollups"]).exit_code == 0
+
+
+class TestRollupReads:
+    """Test cases for reading progress figures from rollups"""
+
+    def test_points_between_spans_weeks(self, app, sample_user):
+        with app.app_context():
+            for offset in range(14):
+                day = TODAY - timedelta(days=offset)
+                db.session.add(
+                    DailyStats(user_id=sample_user.id, date=day, points=offset + 1)
+                )
+            db.session.commit()
+
+            rollups = load_rollups(sample_user.id)
+            assert rollups.points_between(TODAY - timedelta(days=6), TODAY) == 28
+            assert (
+                rollups.points_between(
+                    TODAY - timedelta(days=13), TODAY - timedelta(days=7)
+                )
+                == 77
+            )
+            assert rollups.day_points(TODAY) == 1
+
+    def test_long_history_charts_weekly(
+        self, app, sample_user, query_counter, monkeypatch
+    ):
+        monkeypatch.setattr(dashboard_snapshot, "CHART_DAILY_DAYS", 7)
+        with app.app_context():
+            for offset in range(21):
+                day = TODAY - timedelta(days=offset)
+                db.session.add(
+                    DailyStats(
+                        user_id=sample_user.id, date=day, points=2, longest_streak=3
+                    )
+                )
+            _entry(sample_user.id, TODAY)
+            db.session.commit()
+
+            with query_counter() as queries:
+                snapshot = build_dashboard_snapshot(sample_user.id, TODAY)
+
+            assert len(queries) <= 7
+            assert snapshot.points_data == [
+                ["2025-06-01", 8],
+                ["2025-06-08", 22],
+                ["2025-06-15", 36],
+                ["2025-06-18", 42],
+            ]
+            assert snapshot.total_points == 42
+            assert snapshot.longest_streak == 3
+            assert len(snapshot.top_days) == 3
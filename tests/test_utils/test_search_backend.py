@@ -0,0 +1,184 @@
+"""
+Tests for the pluggable diary search backend
+"""
+
+from datetime import date
+from app.models import DiaryEntry, User, db
+from app.utils.search_backend import (
+    PostgresFullTextBackend,
+    SearchBackend,
+    SQLiteFTSBackend,
+    get_search_backend,
+    offsets_from_marked,
+    parse_terms,
+)
+from app.utils.search_helpers import create_search_snippet
+
+
+def _add_entries(user_id, *contents):
+    entries = [
+        DiaryEntry(
+            user_id=user_id,
+            content=content,
+            rating=1,
+            entry_date=date(2025, 1, day),
+        )
+        for day, content in enumerate(contents, start=1)
+    ]
+    db.session.add_all(entries)
+    db.session.commit()
+    return entries
+
+
+class TestSearchParsing:
+    """Test cases for term parsing and highlight markers"""
+
+    def test_parse_terms_drops_punctuation(self):
+        assert parse_terms('Calm, "walk"!') == ["calm", "walk"]
+
+    def test_offsets_from_marked(self):
+        content, offsets = offsets_from_marked("a \x02calm\x03 \x02walk\x03")
+        assert content == "a calm walk"
+        assert offsets == [(2, 6), (7, 11)]
+
+
+class TestSearchBackend:
+    """Test cases for searching diary entries"""
+
+    def test_sqlite_uses_fts_backend(self, app):
+        with app.app_context():
+            assert isinstance(get_search_backend(), SQLiteFTSBackend)
+
+    def test_multi_term_prefix_search(self, app, sample_user):
+        with app.app_context():
+            _add_entries(
+                sample_user.id,
+                "Went walking in the calm morning",
+                "A calm evening at home",
+                "Walked to work",
+            )
+
+            hits = SQLiteFTSBackend().search(sample_user.id, "calm walk")
+
+            assert len(hits) == 1
+            hit = hits[0]
+            assert hit.content == "Went walking in the calm morning"
+            assert [hit.content[s:e] for s, e in hit.offsets] == ["walking", "calm"]
+
+    def test_index_follows_updates_and_deletes(self, app, sample_user):
+        with app.app_context():
+            first, second = _add_entries(
+                sample_user.id, "Gratitude journal", "Gratitude walk"
+            )
+            first.content = "Morning run"
+            db.session.delete(second)
+            db.session.commit()
+
+            backend = SQLiteFTSBackend()
+            assert backend.search(sample_user.id, "gratitude") == []
+            assert len(backend.search(sample_user.id, "morning")) == 1
+
+    def test_results_are_scoped_to_user(self, app, sample_user):
+        with app.app_context():
+            _add_entries(sample_user.id, "Private thoughts")
+            assert SQLiteFTSBackend().search(sample_user.id + 1, "private") == []
+
+    def test_relevance_ordering(self, app, sample_user):
+        with app.app_context():
+            _add_entries(
+                sample_user.id,
+                "Calm day with some reading and cooking and cleaning",
+                "Calm calm calm",
+            )
+
+            hits = SQLiteFTSBackend().search(
+                sample_user.id, "calm", order_by_rank=True
+            )
+
+            assert [hit.content for hit in hits][0] == "Calm calm calm"
+
+    def test_like_backend_matches_fts_results(self, app, sample_user):
+        with app.app_context():
+            _add_entries(sample_user.id, "A calm morning", "Busy afternoon")
+
+            hits = SearchBackend().search(sample_user.id, "calm", rating=1)
+
+            assert len(hits) == 1
+            assert hits[0].offsets == [(2, 6)]
+
+    def test_stop_word_only_search_falls_back_to_substring(
+        self, app, sample_user, monkeypatch
+    ):
+        with app.app_context():
+            _add_entries(sample_user.id, "The calm morning", "Busy afternoon")
+            backend = PostgresFullTextBackend()
+            # What PostgreSQL reports for an english tsquery of "the:*"
+            monkeypatch.setattr(backend, "_has_lexemes", lambda search_text: False)
+
+            hits = backend.search(sample_user.id, "the")
+
+            assert [hit.content for hit in hits] == ["The calm morning"]
+            assert hits[0].offsets == [(0, 3)]
+
+
+class TestSearchSnippet:
+    """Test cases for highlighting snippets from index offsets"""
+
+    def test_highlights_every_offset_and_escapes(self):
+        snippet = create_search_snippet(
+            "<b>calm</b> walk", "calm walk", match_offsets=[(3, 7), (12, 16)]
+        )
+        assert snippet == "&lt;b&gt;<mark>calm</mark>&lt;/b&gt; <mark>walk</mark>"
+
+    def test_without_offsets_keeps_substring_behaviour(self):
+        snippet = create_search_snippet("Calm morning", "calm")
+        assert snippet == "<mark>calm</mark> morning"
+
+
+class TestSearchKeysetPagination:
+    """Test cases for continuing a search from the last hit of a page"""
+
+    def test_pages_continue_after_last_hit(self, app, sample_user):
+        with app.app_context():
+            _add_entries(sample_user.id, *["calm day"] * 5)
+            backend = SQLiteFTSBackend()
+
+            first = backend.search(sample_user.id, "calm", limit=2)
+            rest = backend.search(
+                sample_user.id, "calm", after=backend.sort_key(first[-1])
+            )
+
+            ids = [hit.entry_id for hit in first + rest]
+            assert len(ids) == 5
+            assert len(set(ids)) == 5
+            assert [hit.entry_date for hit in first + rest] == sorted(
+                (hit.entry_date for hit in first + rest), reverse=True
+            )
+
+    def test_relevance_pages_survive_rank_changes(self, app, sample_user):
+        with app.app_context():
+            _add_entries(
+                sample_user.id,
+                *[" ".join(["calm"] * count + ["day"]) for count in range(1, 6)],
+            )
+            backend = SQLiteFTSBackend()
+            first = backend.search(sample_user.id, "calm", order_by_rank=True, limit=2)
+            after = backend.sort_key(first[-1], order_by_rank=True)
+
+            # Another user's entries change the bm25 statistics of the shared index
+            other = User(email="other@example.com", password="testpassword123")
+            db.session.add(other)
+            db.session.commit()
+            _add_entries(other.id, *["rainy evening"] * 10)
+            rest = backend.search(
+                sample_user.id, "calm", order_by_rank=True, after=after
+            )
+
+            ranks = {
+                hit.entry_id: hit.rank
+                for hit in backend.search(sample_user.id, "calm")
+            }
+            assert ranks[first[-1].entry_id] != after[0]
+            ids = [hit.entry_id for hit in first + rest]
+            assert len(ids) == 5
+            assert len(set(ids)) == 5
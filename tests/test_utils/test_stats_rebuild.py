@@ -0,0 +1,104 @@
+"""
+Tests for the bulk DailyStats rebuild
+"""
+
+from datetime import date
+from app.models import DailyStats, PointsLog, User, db
+from app.models.points_log import PointsSourceType
+from app.utils.stats_rebuild import bulk_rebuild_daily_stats
+
+
+def _log(user_id, day, points):
+    PointsLog.create_entry(
+        user_id, points, PointsSourceType.DIARY_ENTRY, "Entry", date=day
+    )
+
+
+def _make_user(email):
+    user = User(email=email, password="testpassword123")
+    db.session.add(user)
+    db.session.commit()
+    return user.id
+
+
+class TestBulkRebuildDailyStats:
+    """Test cases for bulk_rebuild_daily_stats"""
+
+    def test_inserts_missing_and_fixes_mismatched_days(self, app, sample_user):
+        with app.app_context():
+            first, second = date(2025, 4, 1), date(2025, 4, 2)
+            _log(sample_user.id, first, 5)
+            _log(sample_user.id, first, 2)
+            _log(sample_user.id, second, 10)
+            db.session.add(DailyStats(user_id=sample_user.id, date=first, points=3))
+            db.session.commit()
+
+            result = bulk_rebuild_daily_stats()
+
+            assert (result.inserted, result.updated, result.unchanged) == (1, 1, 0)
+            points = {
+                s.date: s.points
+                for s in DailyStats.query.filter_by(user_id=sample_user.id)
+            }
+            assert points == {first: 7, second: 10}
+
+            assert bulk_rebuild_daily_stats().unchanged == 2
+
+    def test_dry_run_reports_without_writing(self, app, sample_user):
+        with app.app_context():
+            day = date(2025, 4, 1)
+            _log(sample_user.id, day, 5)
+            db.session.commit()
+
+            result = bulk_rebuild_daily_stats(dry_run=True)
+
+            assert result.inserted == 1
+            assert [(c.date, c.old_points, c.new_points) for c in result.changes] == [
+                (day, None, 5)
+            ]
+            assert DailyStats.query.count() == 0
+
+    def test_user_range_limits_the_rebuild(self, app, sample_user):
+        with app.app_context():
+            other_id = _make_user("other@example.com")
+            day = date(2025, 4, 1)
+            _log(sample_user.id, day, 5)
+            _log(other_id, day, 5)
+            db.session.commit()
+
+            result = bulk_rebuild_daily_stats(min_user_id=other_id)
+
+            assert result.users_scanned == 1
+            assert DailyStats.query.filter_by(user_id=sample_user.id).count() == 0
+            assert DailyStats.query.filter_by(user_id=other_id).count() == 1
+
+    def test_totals_use_one_grouped_query(self, app, sample_user, query_counter):
+        with app.app_context():
+            other_id = _make_user("other@example.com")
+            for day in range(1, 11):
+                _log(sample_user.id, date(2025, 4, day), 5)
+                _log(other_id, date(2025, 4, day), 5)
+            db.session.commit()
+
+            with query_counter() as queries:
+                bulk_rebuild_daily_stats(dry_run=True)
+
+            assert len(queries) == 3
+            assert sum("GROUP BY" in q for q in queries) == 1
+
+    def test_progress_callback(self, app, sample_user):
+        with app.app_context():
+            calls = []
+            bulk_rebuild_daily_stats(progress=lambda *args: calls.append(args))
+            assert calls == [(1, 1)]
+
+    def test_cli_dry_run_prints_diff(self, app, runner, sample_user):
+        with app.app_context():
+            _log(sample_user.id, date(2025, 4, 1), 5)
+            db.session.commit()
+
+        result = runner.invoke(args=["rebuild-daily-stats", "--dry-run"])
+
+        assert result.exit_code == 0
+        assert f"User {sample_user.id} 2025-04-01: missing -> 5" in result.output
+        assert "Would insert 1" in result.output
@@ -0,0 +1,223 @@
+"""
+Tests for the set-based streak engine
+"""
+
+import pytest
+from datetime import date, datetime, timezone, timedelta
+from app.models import DiaryEntry, DailyStats, UserStreak, db
+from app.utils.points_service import PointsService
+from app.utils.streak_engine import (
+    compute_streaks,
+    summarize_dates,
+    load_streak_state,
+    rebuild_streak_state,
+    get_streak_summary,
+    run_ending_on,
+)
+
+
+def _add_entries(user_id, dates):
+    for entry_date in dates:
+        db.session.add(
+            DiaryEntry(
+                user_id=user_id,
+                content=f"Entry for {entry_date}",
+                rating=1,
+                entry_date=entry_date,
+            )
+        )
+    db.session.commit()
+
+
+class TestSummarizeDates:
+    """Test cases for the pure-Python streak walk"""
+
+    def test_no_dates(self):
+        assert summarize_dates([], date(2025, 1, 10))[:2] == (0, 0)
+
+    def test_run_ending_today(self):
+        today = date(2025, 1, 10)
+        dates = [today - timedelta(days=i) for i in range(4, -1, -1)]
+        assert summarize_dates(dates, today)[:2] == (5, 5)
+
+    def test_run_ending_yesterday_is_not_current(self):
+        today = date(2025, 1, 10)
+        dates = [today - timedelta(days=i) for i in range(3, 0, -1)]
+        assert summarize_dates(dates, today)[:2] == (0, 3)
+
+    def test_longest_run_in_the_past(self):
+        today = date(2025, 1, 10)
+        dates = [
+            date(2024, 12, 1),
+            date(2024, 12, 2),
+            date(2024, 12, 3),
+            date(2024, 12, 4),
+            date(2025, 1, 9),
+            date(2025, 1, 10),
+        ]
+        assert summarize_dates(dates, today)[:2] == (2, 4)
+
+
+class TestComputeStreaks:
+    """Test cases for compute_streaks against the database"""
+
+    def test_without_entries(self, app, sample_user):
+        with app.app_context():
+            assert compute_streaks(sample_user.id)[:2] == (0, 0)
+
+    def test_multiple_entries_on_one_day_count_once(self, app, sample_user):
+        with app.app_context():
+            today = datetime.now(timezone.utc).date()
+            _add_entries(sample_user.id, [today, today, today - timedelta(days=1)])
+
+            assert compute_streaks(sample_user.id)[:2] == (2, 2)
+
+    def test_gap_resets_current_streak(self, app, sample_user):
+        with app.app_context():
+            today = datetime.now(timezone.utc).date()
+            old_run = [today - timedelta(days=d) for d in range(20, 10, -1)]
+            _add_entries(sample_user.id, old_run + [today])
+
+            assert compute_streaks(sample_user.id)[:2] == (1, 10)
+
+    def test_run_ending_on_ignores_later_entries(self, app, sample_user):
+        with app.app_context():
+            day = date(2025, 3, 10)
+            _add_entries(
+                sample_user.id,
+                [day - timedelta(days=d) for d in range(-2, 4)]
+                + [day - timedelta(days=6)],
+            )
+
+            assert run_ending_on(sample_user.id, day) == 4
+            assert run_ending_on(sample_user.id, day - timedelta(days=4)) == 0
+
+    def test_ignores_other_users(self, app, sample_user):
+        from app.models import User
+
+        with app.app_context():
+            other = User(email="other@example.com", password="password123")
+            db.session.add(other)
+            db.session.commit()
+            today = datetime.now(timezone.utc).date()
+            _add_entries(other.id, [today - timedelta(days=d) for d in range(5)])
+
+            assert compute_streaks(sample_user.id)[:2] == (0, 0)
+
+    def test_update_streak_calculations_uses_engine(self, app, sample_user):
+        with app.app_context():
+            today = datetime.now(timezone.utc).date()
+            _add_entries(sample_user.id, [today - timedelta(days=d) for d in range(3)])
+            db.session.add(DailyStats(user_id=sample_user.id, date=today, points=5))
+            db.session.commit()
+
+            PointsService._update_streak_calculations(sample_user.id)
+            db.session.commit()
+
+            stats = DailyStats.query.filter_by(user_id=sample_user.id, date=today).one()
+            assert stats.current_streak == 3
+            assert stats.longest_streak == 3
+
+
+class TestStreakState:
+    """Test cases for the incrementally maintained streak state"""
+
+    def test_state_follows_new_entries(self, app, sample_user):
+        with app.app_context():
+            today = datetime.now(timezone.utc).date()
+            _add_entries(sample_user.id, [today - timedelta(days=d) for d in (4, 3)])
+            _add_entries(sample_user.id, [today - timedelta(days=d) for d in (1, 0)])
+
+            state = load_streak_state(sample_user.id)
+            assert state.last_entry_date == today
+            assert state.current_run_start == today - timedelta(days=1)
+            assert state.current_length == 2
+            assert state.longest == 2
+
+    def test_same_day_entry_is_ignored(self, app, sample_user):
+        with app.app_context():
+            today = datetime.now(timezone.utc).date()
+            _add_entries(sample_user.id, [today - timedelta(days=1), today, today])
+
+            state = load_streak_state(sample_user.id)
+            assert state.current_length == 2
+
+    def test_backdated_entry_rebuilds_from_history(self, app, sample_user):
+        with app.app_context():
+            today = datetime.now(timezone.utc).date()
+            _add_entries(sample_user.id, [today - timedelta(days=2), today])
+            _add_entries(sample_user.id, [today - timedelta(days=1)])
+
+            state = load_streak_state(sample_user.id)
+            assert state.current_length == 3
+            assert state.longest == 3
+
+    def test_state_matches_full_recomputation(self, app, sample_user):
+        with app.app_context():
+            today = datetime.now(timezone.utc).date()
+            dates = [today - timedelta(days=d) for d in (30, 29, 28, 27, 10, 2, 1, 0)]
+            _add_entries(sample_user.id, dates)
+
+            summary = get_streak_summary(sample_user.id)
+            assert summary[:2] == compute_streaks(sample_user.id)[:2] == (3, 4)
+
+    def test_streak_ending_yesterday_is_not_current(self, app, sample_user):
+        with app.app_context():
+            today = datetime.now(timezone.utc).date()
+            _add_entries(
+                sample_user.id, [today - timedelta(days=2), today - timedelta(days=1)]
+            )
+
+            summary = get_streak_summary(sample_user.id)
+            assert summary.current == 0
+            assert summary.longest == 2
+
+    def test_update_streak_calculations_does_not_scan_history(
+        self, app, sample_user, query_counter
+    ):
+        with app.app_context():
+            today = datetime.now(timezone.utc).date()
+            _add_entries(sample_user.id, [today - timedelta(days=d) for d in range(50)])
+            db.session.add(DailyStats(user_id=sample_user.id, date=today, points=5))
+            db.session.commit()
+
+            with query_counter() as queries:
+                PointsService._update_streak_calculations(sample_user.id)
+
+            assert not any("diary_entry" in statement for statement in queries)
+            stats = DailyStats.query.filter_by(user_id=sample_user.id, date=today).one()
+            assert stats.current_streak == 50
+            assert stats.longest_streak == 50
+
+    def test_rebuild_command(self, app, sample_user, runner):
+        with app.app_context():
+            today = datetime.now(timezone.utc).date()
+            _add_entries(sample_user.id, [today - timedelta(days=d) for d in range(3)])
+            UserStreak.query.delete()
+            db.session.commit()
+
+            result = runner.invoke(args=["rebuild-streaks"])
+
+            assert result.exit_code == 0
+            assert "Rebuilt streak state for 1 user(s)." in result.output
+            state = load_streak_state(sample_user.id)
+            assert state.current_length == 3
+
+
+class TestStreakQueryBenchmark:
+    """Query count must not grow with the length of the streak"""
+
+    @pytest.mark.parametrize("streak_length", [1, 30, 400])
+    def test_constant_query_count(self, app, sample_user, query_counter, streak_length):
+        with app.app_context():
+            today = datetime.now(timezone.utc).date()
+            _add_entries(
+                sample_user.id,
+                [today - timedelta(days=d) for d in range(streak_length)],
+            )
+
+            with query_counter() as queries:
+                streaks = compute_streaks(sample_user.id, today)
+
+            assert streaks[:2] == (streak_length, streak_length)
+            assert len(queries) == 1
@@ -0,0 +1,124 @@
+"""
+Tests for the incremental word cloud index
+"""
+
+from datetime import date, timedelta
+from app.models import DiaryEntry, WordFrequency, db
+from app.utils.word_index import (
+    tokenize,
+    get_wordcloud_data,
+    rebuild_word_index,
+    STOP_WORDS,
+)
+
+
+def _word_counts(user_id):
+    return {
+        row.word: row.count
+        for row in WordFrequency.query.filter_by(user_id=user_id).all()
+    }
+
+
+class TestTokenize:
+    """Test cases for the word cloud tokenizer"""
+
+    def test_filters_stop_words_and_short_words(self):
+        counts = tokenize("I went running and the running felt GREAT ok")
+        assert counts == {"went": 1, "running": 2, "felt": 1, "great": 1}
+
+    def test_stop_words_are_shared(self):
+        assert isinstance(STOP_WORDS, frozenset)
+        assert "the" in STOP_WORDS
+
+
+class TestWordIndex:
+    """Test cases for maintaining and reading the word index"""
+
+    def test_new_entries_are_indexed(self, app, sample_user):
+        with app.app_context():
+            db.session.add_all(
+                [
+                    DiaryEntry(
+                        user_id=sample_user.id, content="Calm morning walk", rating=1
+                    ),
+                    DiaryEntry(
+                        user_id=sample_user.id, content="Calm evening", rating=1
+                    ),
+                ]
+            )
+            db.session.commit()
+
+            assert _word_counts(sample_user.id) == {
+                "calm": 2,
+                "morning": 1,
+                "evening": 1,
+            }
+
+    def test_deleted_entries_are_removed(self, app, sample_user):
+        with app.app_context():
+            keep = DiaryEntry(user_id=sample_user.id, content="Calm morning", rating=1)
+            drop = DiaryEntry(user_id=sample_user.id, content="Calm evening", rating=1)
+            db.session.add_all([keep, drop])
+            db.session.commit()
+
+            db.session.delete(drop)
+            db.session.commit()
+
+            assert _word_counts(sample_user.id) == {"calm": 1, "morning": 1}
+
+    def test_wordcloud_data_is_weighted(self, app, sample_user):
+        with app.app_context():
+            for i in range(3):
+                db.session.add(
+                    DiaryEntry(
+                        user_id=sample_user.id,
+                        content="gratitude " * (i + 1) + "focus",
+                        rating=1,
+                    )
+                )
+            db.session.commit()
+
+            data = get_wordcloud_data(sample_user.id)
+
+            assert data[0] == ["gratitude", 220]
+            assert data[1] == ["focus", 70]
+
+    def test_wordcloud_data_empty(self, app, sample_user):
+        with app.app_context():
+            assert get_wordcloud_data(sample_user.id) == []
+
+    def test_rebuild_matches_incremental_index(self, app, sample_user):
+        with app.app_context():
+            for i in range(5):
+                db.session.add(
+                    DiaryEntry(
+                        user_id=sample_user.id,
+                        content=f"Reflecting on patience and growth {i}",
+                        rating=1,
+                        entry_date=date.today() - timedelta(days=i),
+                    )
+                )
+            db.session.commit()
+            incremental = _word_counts(sample_user.id)
+
+            WordFrequency.query.delete()
+            db.session.commit()
+            rebuild_word_index(sample_user.id)
+            db.session.commit()
+
+            assert _word_counts(sample_user.id) == incremental
+
+    def test_rebuild_command(self, app, sample_user, runner):
+        with app.app_context():
+            db.session.add(
+                DiaryEntry(user_id=sample_user.id, content="Patience wins", rating=1)
+            )
+            db.session.commit()
+            WordFrequency.query.delete()
+            db.session.commit()
+
+            result = runner.invoke(args=["rebuild-word-index"])
+
+            assert result.exit_code == 0
+            assert "indexed 2 distinct words" in result.output
+            assert _word_counts(sample_user.id) == {"patience": 1, "wins": 1}